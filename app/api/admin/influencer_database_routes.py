@@ -360,10 +360,11 @@ async def get_analytics_status(
 @router.post("/influencer-database/{influencer_id}/trigger-analytics")
 async def trigger_analytics(
     influencer_id: UUID,
+    refresh_mode: str = Query("full", pattern="^(full|delta)$"),
     db: AsyncSession = Depends(get_db),
     current_user=Depends(require_admin()),
 ):
-    """Manually trigger or retry analytics for an influencer."""
+    """Manually trigger or retry analytics for an influencer (delta = counters + new posts only)."""
     try:
         # Get current record
         result = await db.execute(
@@ -386,7 +387,11 @@ async def trigger_analytics(
         job = await job_queue.enqueue_job(
             user_id=str(current_user.id),
             job_type='imd_creator_analytics',
-            params={'username': record["username"], 'influencer_db_id': str(record["id"])},
+            params={
+                'username': record["username"],
+                'influencer_db_id': str(record["id"]),
+                'refresh_mode': refresh_mode,
+            },
             queue_type=QueueType.API_QUEUE,
             user_tier='enterprise',  # Admin operation
             idempotency_key=f"imd_analytics_{record['username']}_{int(time.time())}",
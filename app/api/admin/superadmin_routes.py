@@ -1115,4 +1115,22 @@ async def system_health(
             "status": "unhealthy",
             "error": str(e),
             "timestamp": datetime.utcnow().isoformat()
-        }
\ No newline at end of file
+        }
+
+
+# ============= Apify Usage =============
+
+@router.get("/apify/usage")
+async def apify_usage(
+    hours: int = Query(24, ge=1, le=24 * 31, description="Window for the per-tenant totals"),
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(require_admin())
+):
+    """Apify spend per tenant (window and month to date) and the live budget buckets"""
+    from app.services.apify_budget_governor import apify_budget_governor
+
+    try:
+        return await apify_budget_governor.get_usage(db, hours=hours)
+    except Exception as e:
+        logger.error(f"Error getting Apify usage: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
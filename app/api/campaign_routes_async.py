@@ -4,7 +4,6 @@ This replaces the synchronous campaign routes for post addition
 """
 
 import logging
-import json
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from uuid import UUID
@@ -16,6 +15,7 @@ from app.database.optimized_pools import get_db_optimized as get_db
 from app.middleware.auth_middleware import get_current_active_user
 from app.models.auth import UserInDB
 from app.core.job_queue import job_queue, JobPriority, QueueType
+from app.services.job_result_store import job_result_store
 from pydantic import BaseModel
 
 # Define the schema locally (copied from campaign_routes.py)
@@ -282,7 +282,7 @@ async def get_job_result(
         result = await db.execute(
             text("""
                 SELECT
-                    id, user_id, status, result, error
+                    id, user_id, status, result, result_ref, error
                 FROM job_queue
                 WHERE id = :job_id AND user_id = :user_id
             """).execution_options(prepare=False),
@@ -311,8 +311,8 @@ async def get_job_result(
 
         if job.status == "completed":
             # Parse and return the result
-            if job.result:
-                result_data = json.loads(job.result)
+            if job.result or job.result_ref:
+                result_data = await job_result_store.resolve(job.result, job.result_ref)
                 return result_data
             else:
                 raise HTTPException(
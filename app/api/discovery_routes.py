@@ -332,7 +332,8 @@ async def bulk_unlock_profiles(
     Unlock multiple profiles at once (async 202 pattern).
 
     Credits are validated upfront (25 per profile that isn't already unlocked).
-    Processing happens in a background worker with concurrency control (3 at a time).
+    Processing happens in a background worker as one set-based transaction
+    (single aggregated credit spend; only newly unlocked profiles are charged).
     Poll /api/v1/jobs/{job_id}/status for progress and /api/v1/jobs/{job_id}/result
     for the final BulkProfileUnlockResponse.
     """
@@ -451,7 +452,7 @@ async def bulk_unlock_profiles(
             },
             priority=JobPriority.BULK,
             queue_type=QueueType.BULK_QUEUE,
-            estimated_duration=len(profiles_to_unlock) * 15,  # ~15s per profile
+            estimated_duration=10 + len(profiles_to_unlock) // 50,  # one transaction for the batch
             user_tier=user_tier
         )
 
@@ -9,13 +9,15 @@ import time
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 
-from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy import text
 import asyncio
 
-from app.core.job_queue import job_queue, JobPriority, QueueType, JobStatus
+from app.core.job_queue import job_queue, fetch_job_row, JobPriority, QueueType, JobStatus
 from app.database.optimized_pools import optimized_pools
+from app.services.job_progress_channel import job_progress_channel
+from app.services.job_result_store import job_result_store
 from app.middleware.auth_middleware import get_current_active_user
 from app.database.unified_models import User
 
@@ -28,6 +30,21 @@ def _safe_json_parse(value):
         return value
     return json.loads(value)
 
+
+async def _live_progress(job_id: str, status: str, progress_percent, progress_message):
+    """
+    Progress of a running job: the write-behind value from job_progress_channel
+    when present, else the (possibly up to one flush interval old) row values.
+    """
+    if status == 'processing':
+        live = await job_progress_channel.get(job_id)
+        if live:
+            return (
+                live.get('progress_percent', progress_percent),
+                live.get('progress_message', progress_message),
+            )
+    return progress_percent, progress_message
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["fast-handoff"])
@@ -390,41 +407,43 @@ async def get_job_status(
     try:
         # Verify job ownership and get status
         async with optimized_pools.get_user_session() as session:
-            result = await session.execute(text("""
+            job_data = await fetch_job_row(session, """
                 SELECT
                     id, job_type, status, priority, queue_name,
-                    params, result, error_details, created_at, started_at, completed_at,
+                    params, result, result_ref, error_details, created_at, started_at, completed_at,
                     estimated_duration, progress_percent, progress_message, retry_count
-                FROM job_queue
+                FROM {table}
                 WHERE id = :job_id AND user_id = :user_id
-            """).execution_options(prepare=False), {
+            """, {
                 'job_id': job_id,
                 'user_id': str(current_user.id)
             })
 
-            job_data = result.fetchone()
-
         if not job_data:
             return JSONResponse(
                 status_code=404,
                 content=FastHandoffResponse.error("job_not_found", "Job not found")
             )
 
+        progress_percent, progress_message = await _live_progress(
+            job_id, job_data.status, job_data.progress_percent, job_data.progress_message
+        )
+
         # Build comprehensive status response
         status_response = {
             "job_id": str(job_data.id),
             "job_type": job_data.job_type,
             "status": job_data.status,
-            "progress_percent": job_data.progress_percent or 0,
-            "progress_message": job_data.progress_message,
+            "progress_percent": progress_percent or 0,
+            "progress_message": progress_message,
             "created_at": job_data.created_at.isoformat() if job_data.created_at else None,
             "started_at": job_data.started_at.isoformat() if job_data.started_at else None,
             "completed_at": job_data.completed_at.isoformat() if job_data.completed_at else None,
         }
 
         # Add result or error details
-        if job_data.status == 'completed' and job_data.result:
-            status_response["result"] = _safe_json_parse(job_data.result)
+        if job_data.status == 'completed' and (job_data.result or job_data.result_ref):
+            status_response["result"] = await job_result_store.resolve(job_data.result, job_data.result_ref)
         elif job_data.status == 'failed' and job_data.error_details:
             status_response["error_details"] = _safe_json_parse(job_data.error_details)
             status_response["retry_count"] = job_data.retry_count
@@ -460,20 +479,22 @@ async def get_job_status(
 @router.get("/jobs/{job_id}/result")
 async def get_job_result(
     job_id: str,
+    request: Request,
     current_user: User = Depends(get_current_active_user)
-) -> JSONResponse:
+):
     """
     Retrieve the completed job result in the original response shape.
     Returns 202 if still processing, 200 if completed, 404/500 for errors.
+    Offloaded (large) results are streamed from the job result store - as the
+    stored gzip bytes when the client accepts gzip, decompressed otherwise.
     """
     try:
         async with optimized_pools.get_user_session() as session:
-            result = await session.execute(text("""
-                SELECT status, result, error_details, progress_percent, progress_message
-                FROM job_queue
+            job_data = await fetch_job_row(session, """
+                SELECT status, result, result_ref, error_details, progress_percent, progress_message
+                FROM {table}
                 WHERE id = :job_id AND user_id = :user_id
-            """).execution_options(prepare=False), {'job_id': job_id, 'user_id': str(current_user.id)})
-            job_data = result.fetchone()
+            """, {'job_id': job_id, 'user_id': str(current_user.id)})
 
         if not job_data:
             return JSONResponse(
@@ -481,6 +502,15 @@ async def get_job_result(
                 content=FastHandoffResponse.error("job_not_found", "Job not found")
             )
 
+        if job_data.status == 'completed' and job_data.result_ref:
+            accepts_gzip = 'gzip' in request.headers.get('accept-encoding', '').lower()
+            return StreamingResponse(
+                job_result_store.stream(job_data.result_ref, decompress=not accepts_gzip),
+                status_code=200,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip"} if accepts_gzip else None
+            )
+
         if job_data.status == 'completed' and job_data.result:
             # Return the full response dict — same shape as the sync endpoint
             return JSONResponse(status_code=200, content=_safe_json_parse(job_data.result))
@@ -497,12 +527,15 @@ async def get_job_result(
             )
 
         # Still in progress
+        progress_percent, progress_message = await _live_progress(
+            job_id, job_data.status, job_data.progress_percent, job_data.progress_message
+        )
         return JSONResponse(
             status_code=202,
             content={
                 "status": job_data.status,
-                "progress_percent": job_data.progress_percent or 0,
-                "progress_message": job_data.progress_message or "Processing...",
+                "progress_percent": progress_percent or 0,
+                "progress_message": progress_message or "Processing...",
             }
         )
 
@@ -526,7 +559,7 @@ async def job_status_websocket(websocket: WebSocket, job_id: str):
             # Get current job status (simplified for WebSocket)
             async with optimized_pools.get_user_session() as session:
                 result = await session.execute(text("""
-                    SELECT status, progress_percent, progress_message, result, error_details
+                    SELECT status, progress_percent, progress_message, result, result_ref, error_details
                     FROM job_queue WHERE id = :job_id
                 """).execution_options(prepare=False), {'job_id': job_id})
 
@@ -536,11 +569,14 @@ async def job_status_websocket(websocket: WebSocket, job_id: str):
                 await websocket.send_json({"error": "Job not found"})
                 break
 
+            progress_percent, progress_message = await _live_progress(
+                job_id, job_data.status, job_data.progress_percent, job_data.progress_message
+            )
             current_status = {
                 "job_id": job_id,
                 "status": job_data.status,
-                "progress_percent": job_data.progress_percent,
-                "progress_message": job_data.progress_message,
+                "progress_percent": progress_percent,
+                "progress_message": progress_message,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
 
@@ -551,8 +587,8 @@ async def job_status_websocket(websocket: WebSocket, job_id: str):
 
             # Break if job is completed
             if job_data.status in ['completed', 'failed', 'cancelled']:
-                if job_data.result:
-                    current_status["result"] = _safe_json_parse(job_data.result)
+                if job_data.result or job_data.result_ref:
+                    current_status["result"] = await job_result_store.resolve(job_data.result, job_data.result_ref)
                 if job_data.error_details:
                     current_status["error_details"] = _safe_json_parse(job_data.error_details)
 
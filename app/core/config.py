@@ -41,8 +41,37 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "change-this-to-a-secure-secret-key-in-production")
     
     # Apify API endpoints
-    APIFY_BASE_URL: str = "https://api.apify.com/v2"
+    APIFY_BASE_URL: str = os.getenv("APIFY_BASE_URL", "https://api.apify.com/v2")  # point at scripts/fake_apify_server.py offline
     APIFY_INSTAGRAM_ACTOR: str = "apify/instagram-scraper"
+    # Profile fetches arriving within this many seconds share one actor run (0 = no batching)
+    APIFY_BATCH_WINDOW_SECONDS: float = float(os.getenv("APIFY_BATCH_WINDOW_SECONDS", "1.5"))
+    # Apify budget governor: scraped URLs per hour across all tenants / per tenant (0 = unlimited),
+    # minutes of budget usable in one burst, share of the global bucket kept for interactive
+    # scrapes, and how long a call queues for budget before it fails.
+    # Both budgets are off by default - usage is still recorded in apify_usage; pick limits from
+    # it and set them per environment (a job over its budget queues, then fails after the max wait)
+    APIFY_GLOBAL_BUDGET_PER_HOUR: int = int(os.getenv("APIFY_GLOBAL_BUDGET_PER_HOUR", "0"))
+    APIFY_TENANT_BUDGET_PER_HOUR: int = int(os.getenv("APIFY_TENANT_BUDGET_PER_HOUR", "0"))
+    APIFY_BUDGET_BURST_MINUTES: float = float(os.getenv("APIFY_BUDGET_BURST_MINUTES", "10"))
+    APIFY_INTERACTIVE_RESERVE: float = float(os.getenv("APIFY_INTERACTIVE_RESERVE", "0.25"))
+    APIFY_BUDGET_MAX_WAIT_SECONDS: float = float(os.getenv("APIFY_BUDGET_MAX_WAIT_SECONDS", "600"))
+    # Raw scrape cache: 'redis' (REDIS_URL), 'local' (SCRAPE_CACHE_DIR) or 'off'.
+    # 'local' is per-pod disk - dev / single-host only, so it has to be chosen explicitly
+    SCRAPE_CACHE_BACKEND: str = os.getenv(
+        "SCRAPE_CACHE_BACKEND", "redis" if os.getenv("REDIS_URL") else "off"
+    )
+    SCRAPE_CACHE_DIR: str = os.getenv("SCRAPE_CACHE_DIR", "./scrape_cache")
+    SCRAPE_CACHE_TTL_SECONDS: int = int(os.getenv("SCRAPE_CACHE_TTL_SECONDS", "21600"))  # entries kept 6h
+    # Staleness accepted when the caller does not pass max_age_minutes
+    SCRAPE_CACHE_DEFAULT_MAX_AGE_MINUTES: float = float(os.getenv("SCRAPE_CACHE_DEFAULT_MAX_AGE_MINUTES", "30"))
+    # Offline replay (app/scrapers/scrape_replay.py): corpus served instead of Apify and image hosts
+    # ('' = off), seconds each replayed run takes (unset = the corpus manifest's run_seconds) and
+    # where R2 uploads are written instead
+    SCRAPE_REPLAY_DIR: str = os.getenv("SCRAPE_REPLAY_DIR", "")
+    SCRAPE_REPLAY_RUN_SECONDS: Optional[float] = (
+        float(os.getenv("SCRAPE_REPLAY_RUN_SECONDS")) if os.getenv("SCRAPE_REPLAY_RUN_SECONDS") else None
+    )
+    SCRAPE_REPLAY_UPLOAD_DIR: str = os.getenv("SCRAPE_REPLAY_UPLOAD_DIR", "./replay_uploads")
     
     # AI/ML Configuration
     AI_MODELS_CACHE_DIR: str = os.getenv("AI_MODELS_CACHE_DIR", "./ai_models")
@@ -51,6 +80,17 @@ class Settings(BaseSettings):
     AI_MODEL_DEVICE: str = os.getenv("AI_MODEL_DEVICE", "cpu")  # cpu or cuda
     ENABLE_AI_ANALYSIS: bool = os.getenv("ENABLE_AI_ANALYSIS", "true").lower() == "true"
     AI_ANALYSIS_QUEUE_SIZE: int = int(os.getenv("AI_ANALYSIS_QUEUE_SIZE", "100"))
+
+    # Unified Worker Configuration
+    # 0 = single worker thread inside the API process; N > 0 = N supervised worker processes
+    UNIFIED_WORKER_PROCESSES: int = int(os.getenv("UNIFIED_WORKER_PROCESSES", "0"))
+    # Seconds a stopping worker waits for in-flight jobs before handing the rest back to the queue
+    WORKER_DRAIN_TIMEOUT_SECONDS: int = int(os.getenv("WORKER_DRAIN_TIMEOUT_SECONDS", "20"))
+    # Hours a finished job stays in job_queue before the archiver moves it to job_queue_archive
+    JOB_ARCHIVE_AFTER_HOURS: float = float(os.getenv("JOB_ARCHIVE_AFTER_HOURS", "24"))
+    # Background refreshes of stale tracked profiles enqueued per hour - each costs one Apify profile scrape.
+    # Off (0) by default: set e.g. PROFILE_REFRESH_BUDGET_PER_HOUR=60 per environment to opt in
+    PROFILE_REFRESH_BUDGET_PER_HOUR: int = int(os.getenv("PROFILE_REFRESH_BUDGET_PER_HOUR", "0"))
     
     # CDN Configuration
     INGEST_CONCURRENCY: int = int(os.getenv("INGEST_CONCURRENCY", "4"))
@@ -61,6 +101,16 @@ class Settings(BaseSettings):
     R2_BUCKET_NAME: str = os.getenv("R2_BUCKET_NAME", "")
     CDN_BASE_URL: str = os.getenv("CDN_BASE_URL", "https://cdn.following.ae")
     IMG_MAX_POSTS_PER_PROFILE: int = int(os.getenv("IMG_MAX_POSTS_PER_PROFILE", "12"))
+
+    # Job Result Store - large job results live outside the job_queue row
+    # Backend: 'r2' (private bucket below), 'local' (JOB_RESULTS_DIR) or 'off' (always inline).
+    # 'local' is per-pod disk - dev / single-host only, other replicas cannot read what a worker wrote
+    JOB_RESULTS_BACKEND: str = os.getenv(
+        "JOB_RESULTS_BACKEND", "r2" if os.getenv("JOB_RESULTS_R2_BUCKET") else "off"
+    )
+    JOB_RESULTS_R2_BUCKET: str = os.getenv("JOB_RESULTS_R2_BUCKET", "")  # must NOT be a public CDN bucket
+    JOB_RESULTS_DIR: str = os.getenv("JOB_RESULTS_DIR", "./job_results")
+    JOB_RESULTS_INLINE_MAX_BYTES: int = int(os.getenv("JOB_RESULTS_INLINE_MAX_BYTES", "65536"))
     
     # CORS Proxy Configuration
     CORS_PROXY_URL: str = os.getenv("CORS_PROXY_URL", "https://corsproxy.io")
@@ -5,10 +5,9 @@ Provides reliable, scalable background job processing with comprehensive trackin
 import json
 import logging
 import uuid
-import time
 import random
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass, asdict
 import asyncio
@@ -18,9 +17,79 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.optimized_pools import optimized_pools
+from app.services.job_result_store import job_result_store
 
 logger = logging.getLogger(__name__)
 
+# Postgres NOTIFY channel emitted on every enqueue. Payload is JSON with
+# job_id/job_type/queue_name so each worker can ignore job types it doesn't own.
+JOB_NOTIFY_CHANNEL = "job_queue_new"
+
+# Finished jobs are moved here after JOB_ARCHIVE_AFTER_HOURS (migration 020)
+JOB_ARCHIVE_TABLE = "job_queue_archive"
+
+# Re-queues 'waiting' jobs once every job in their depends_on has finished
+# (migration 015). Idempotent - also run by _initialize_job_schema so code-
+# initialized databases do not rely on release_ready_waiting_jobs alone.
+RELEASE_DEPENDENTS_SQL = f"""
+CREATE INDEX IF NOT EXISTS idx_job_queue_waiting_depends_on
+    ON job_queue USING GIN (depends_on)
+    WHERE status = 'waiting';
+
+CREATE OR REPLACE FUNCTION release_dependent_jobs()
+RETURNS TRIGGER AS $$
+DECLARE
+    released RECORD;
+BEGIN
+    FOR released IN
+        UPDATE job_queue j
+        SET status = 'queued',
+            started_at = NULL,
+            progress_message = 'Dependencies finished - resuming',
+            updated_at = NOW()
+        WHERE j.status = 'waiting'
+        AND j.depends_on @> ARRAY[NEW.id]
+        AND NOT EXISTS (
+            SELECT 1 FROM job_queue d
+            WHERE d.id = ANY(j.depends_on)
+            AND d.id <> NEW.id
+            AND d.status IN ('queued', 'processing', 'retrying', 'waiting')
+        )
+        RETURNING j.id, j.job_type, j.queue_name
+    LOOP
+        PERFORM pg_notify('{JOB_NOTIFY_CHANNEL}', json_build_object(
+            'job_id', released.id,
+            'job_type', released.job_type,
+            'queue_name', released.queue_name
+        )::text);
+    END LOOP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_job_queue_release_dependents ON job_queue;
+CREATE TRIGGER trigger_job_queue_release_dependents
+    AFTER UPDATE OF status ON job_queue
+    FOR EACH ROW
+    WHEN (NEW.status IN ('completed', 'failed', 'cancelled') AND OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION release_dependent_jobs();
+"""
+
+
+async def fetch_job_row(session: AsyncSession, query: str, params: Dict[str, Any]):
+    """
+    Run a single-job SELECT against job_queue, falling back to the archive.
+    `query` names the table as {table}; select only columns both tables share.
+    """
+    for table in ("job_queue", JOB_ARCHIVE_TABLE):
+        result = await session.execute(
+            text(query.format(table=table)).execution_options(prepare=False), params
+        )
+        row = result.fetchone()
+        if row:
+            return row
+    return None
+
 class JobStatus(Enum):
     """Job processing status states"""
     QUEUED = "queued"
@@ -29,6 +98,7 @@ class JobStatus(Enum):
     FAILED = "failed"
     RETRYING = "retrying"
     CANCELLED = "cancelled"
+    WAITING = "waiting"  # Parked until the jobs in depends_on finish
 
 class JobPriority(Enum):
     """Job priority levels"""
@@ -236,9 +306,15 @@ class IndustryStandardJobQueue:
             progress_percent INTEGER DEFAULT 0,
             progress_message TEXT,
             updated_at TIMESTAMPTZ DEFAULT NOW(),
+            checkpoints JSONB,
+            depends_on UUID[],
+            result_ref TEXT,
+            result_size INTEGER,
+            lease_expires_at TIMESTAMPTZ,
+            run_after TIMESTAMPTZ,
 
             -- Constraints
-            CONSTRAINT valid_status CHECK (status IN ('queued', 'processing', 'completed', 'failed', 'retrying', 'cancelled')),
+            CONSTRAINT valid_status CHECK (status IN ('queued', 'processing', 'completed', 'failed', 'retrying', 'cancelled', 'waiting')),
             CONSTRAINT valid_priority CHECK (priority BETWEEN 1 AND 100),
             CONSTRAINT valid_progress CHECK (progress_percent BETWEEN 0 AND 100)
         );
@@ -249,7 +325,21 @@ class IndustryStandardJobQueue:
         CREATE INDEX IF NOT EXISTS idx_job_queue_queue_status ON job_queue (queue_name, status);
         CREATE INDEX IF NOT EXISTS idx_job_queue_idempotency ON job_queue (idempotency_key);
         CREATE INDEX IF NOT EXISTS idx_job_queue_worker_processing ON job_queue (worker_id, status) WHERE status = 'processing';
+        CREATE INDEX IF NOT EXISTS idx_job_queue_lease_expiry ON job_queue (lease_expires_at) WHERE status = 'processing';
+        CREATE INDEX IF NOT EXISTS idx_job_queue_run_after ON job_queue (run_after) WHERE status = 'queued' AND run_after IS NOT NULL;
+        DROP INDEX IF EXISTS idx_job_queue_aged_claim;
+        CREATE INDEX IF NOT EXISTS idx_job_queue_aged_claim_60s ON job_queue (((created_at AT TIME ZONE 'UTC') - priority * INTERVAL '60 seconds')) WHERE status = 'queued';
         CREATE INDEX IF NOT EXISTS idx_job_queue_retry_eligible ON job_queue (status, retry_count, created_at) WHERE status = 'failed';
+        CREATE INDEX IF NOT EXISTS idx_job_queue_live ON job_queue (queue_name, status) WHERE status IN ('queued', 'processing');
+        CREATE INDEX IF NOT EXISTS idx_job_queue_live_user ON job_queue (user_id) WHERE status IN ('queued', 'processing');
+        CREATE INDEX IF NOT EXISTS idx_job_queue_finished ON job_queue ((COALESCE(completed_at, created_at))) WHERE status IN ('completed', 'failed', 'cancelled');
+
+        -- Finished jobs archived out of job_queue (see WorkerDatabase.archive_finished_jobs)
+        CREATE TABLE IF NOT EXISTS job_queue_archive (LIKE job_queue INCLUDING DEFAULTS);
+        ALTER TABLE job_queue_archive ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ DEFAULT NOW();
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_job_queue_archive_id ON job_queue_archive (id);
+        CREATE INDEX IF NOT EXISTS idx_job_queue_archive_user_created ON job_queue_archive (user_id, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_job_queue_archive_archived_at ON job_queue_archive (archived_at);
 
         -- Dead letter queue for failed jobs
         CREATE TABLE IF NOT EXISTS job_dead_letter_queue (
@@ -261,6 +351,7 @@ class IndustryStandardJobQueue:
             created_at TIMESTAMPTZ DEFAULT NOW(),
             last_retry_at TIMESTAMPTZ
         );
+        CREATE INDEX IF NOT EXISTS idx_job_dead_letter_original ON job_dead_letter_queue (original_job_id);
 
         -- Job execution metrics for monitoring
         CREATE TABLE IF NOT EXISTS job_execution_metrics (
@@ -281,19 +372,27 @@ class IndustryStandardJobQueue:
         DROP POLICY IF EXISTS "Users can only access their own jobs" ON job_queue;
         CREATE POLICY "Users can only access their own jobs" ON job_queue
             FOR ALL USING (auth.uid() = user_id);
+
+        ALTER TABLE job_queue_archive ENABLE ROW LEVEL SECURITY;
+        DROP POLICY IF EXISTS "Users can only access their own archived jobs" ON job_queue_archive;
+        CREATE POLICY "Users can only access their own archived jobs" ON job_queue_archive
+            FOR ALL USING (auth.uid() = user_id);
         """
 
         async with optimized_pools.get_user_session() as session:
             await session.execute(text(schema_sql).execution_options(prepare=False))
+            await session.execute(text(RELEASE_DEPENDENTS_SQL).execution_options(prepare=False))
             await session.commit()
 
         logger.info("Job queue database schema initialized")
 
     async def _initialize_queue_monitoring(self) -> None:
-        """Initialize queue depth monitoring in Redis"""
+        """Initialize queue monitoring in Redis"""
         for queue_type in QueueType:
-            await self.redis_client.set(f"queue_depth:{queue_type.value}", 0)
             await self.redis_client.set(f"queue_workers:{queue_type.value}", 0)
+            # Drop the never-consumed Redis mirror of the queue written by
+            # earlier versions - job_queue in Postgres is the dispatch path
+            await self.redis_client.delete(f"queue:{queue_type.value}", f"queue_depth:{queue_type.value}")
 
     async def enqueue_job(
         self,
@@ -323,8 +422,8 @@ class IndustryStandardJobQueue:
                 'retry_after': quota_check.get('retry_after')
             }
 
-        # 2. VALIDATE QUEUE CAPACITY (BACKPRESSURE)
-        queue_depth = await self._get_queue_depth(queue_type)
+        # 2. VALIDATE QUEUE CAPACITY (BACKPRESSURE) - same scan gives the new job's position
+        queue_depth, jobs_ahead = await self._get_queue_depth_and_ahead(queue_type, priority)
         max_depth = self.queue_config[queue_type]['max_depth']
 
         if queue_depth >= max_depth:
@@ -365,17 +464,15 @@ class IndustryStandardJobQueue:
                     'existing': True
                 }
 
-        # 5. PERSIST JOB TO DATABASE
+        # 5. PERSIST JOB TO DATABASE (also wakes workers via pg_notify)
         await self._persist_job(job)
+        await self._trigger_celery_worker(job)
 
-        # 6. ADD TO REDIS QUEUE
-        await self._add_to_redis_queue(job)
-
-        # 7. UPDATE METRICS
+        # 6. UPDATE METRICS
         await self._update_queue_metrics(queue_type, 'enqueued')
 
-        # 8. RETURN SUCCESS RESPONSE
-        queue_position = await self._get_queue_position(job.id, queue_type)
+        # 7. RETURN SUCCESS RESPONSE
+        queue_position = jobs_ahead + 1
         estimated_completion = self._calculate_estimated_completion(
             queue_position, estimated_duration, queue_type
         )
@@ -439,12 +536,41 @@ class IndustryStandardJobQueue:
         return {'allowed': True}
 
     async def _get_queue_depth(self, queue_type: QueueType) -> int:
-        """Get current queue depth from Redis"""
-        depth = await self.redis_client.get(f"queue_depth:{queue_type.value}")
-        return int(depth) if depth else 0
+        """Get current queue depth (queued rows - workers dispatch from job_queue)"""
+        async with optimized_pools.get_user_session() as session:
+            result = await session.execute(text("""
+                SELECT COUNT(*) FROM job_queue
+                WHERE queue_name = :queue_name AND status = 'queued'
+            """).execution_options(prepare=False), {'queue_name': queue_type.value})
+            return result.scalar() or 0
+
+    async def _get_queue_depth_and_ahead(self, queue_type: QueueType, priority: JobPriority) -> Tuple[int, int]:
+        """
+        Queue depth and how many queued jobs a job of `priority` enqueued now
+        would wait behind, in claim order (AGED_CLAIM_KEY) - one scan.
+        """
+        from app.workers.worker_database import AGED_CLAIM_KEY, PRIORITY_AGING_SECONDS_PER_POINT
+
+        async with optimized_pools.get_user_session() as session:
+            result = await session.execute(text(f"""
+                SELECT
+                    COUNT(*) AS depth,
+                    COUNT(*) FILTER (
+                        WHERE {AGED_CLAIM_KEY}
+                              <= (NOW() AT TIME ZONE 'UTC') - CAST(:priority AS integer) * INTERVAL '{PRIORITY_AGING_SECONDS_PER_POINT} seconds'
+                    ) AS ahead
+                FROM job_queue
+                WHERE queue_name = :queue_name AND status = 'queued'
+            """).execution_options(prepare=False), {'queue_name': queue_type.value, 'priority': priority.value})
+            depth, ahead = result.fetchone()
+            return depth or 0, ahead or 0
 
     async def _persist_job(self, job: JobDefinition) -> None:
-        """Persist job to database for durability"""
+        """Persist job to database for durability and wake listening workers.
+
+        pg_notify is transactional: the notification is only delivered once the
+        INSERT commits, so a woken worker is guaranteed to see the row.
+        """
         async with optimized_pools.get_user_session() as session:
             await session.execute(text("""
                 INSERT INTO job_queue (
@@ -467,29 +593,27 @@ class IndustryStandardJobQueue:
                 'idempotency_key': job.idempotency_key,
                 'user_tier': job.user_tier
             })
+            await session.execute(text("""
+                SELECT pg_notify(:channel, :payload)
+            """).execution_options(prepare=False), {
+                'channel': JOB_NOTIFY_CHANNEL,
+                'payload': json.dumps({
+                    'job_id': job.id,
+                    'job_type': job.job_type,
+                    'queue_name': job.queue_name.value
+                })
+            })
             await session.commit()
 
-    async def _add_to_redis_queue(self, job: JobDefinition) -> None:
-        """Add job to Redis priority queue and trigger Celery worker"""
-        # Use sorted set for priority queue (higher score = higher priority)
-        queue_key = f"queue:{job.queue_name.value}"
-        score = job.priority.value + (time.time() / 1000000)  # Priority + timestamp for FIFO within priority
-
-        await self.redis_client.zadd(queue_key, {job.id: score})
-        await self.redis_client.incr(f"queue_depth:{job.queue_name.value}")
-
-        # CRITICAL FIX: Actually trigger Celery worker for the job
-        await self._trigger_celery_worker(job)
-
     async def _trigger_celery_worker(self, job: JobDefinition) -> None:
         """
-        No-op: The in-process UnifiedAsyncWorker polls the job_queue table
-        directly every 2 seconds and will pick up this job automatically.
+        No-op: _persist_job already emitted pg_notify on JOB_NOTIFY_CHANNEL,
+        which wakes the in-process workers blocked on LISTEN.
         No Celery/Redis trigger needed.
         """
         logger.info(
             f"Job {job.id} ({job.job_type}) enqueued - "
-            f"will be picked up by UnifiedAsyncWorker via DB poll"
+            f"workers notified via {JOB_NOTIFY_CHANNEL}"
         )
 
     def _get_celery_queue_name(self, queue_type: QueueType) -> str:
@@ -508,17 +632,15 @@ class IndustryStandardJobQueue:
     async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get comprehensive job status"""
         async with optimized_pools.get_user_session() as session:
-            result = await session.execute(text("""
+            job_data = await fetch_job_row(session, """
                 SELECT
                     id, user_id, job_type, status, priority, queue_name,
-                    params, result, error_details, created_at, started_at, completed_at,
+                    params, result, result_ref, error_details, created_at, started_at, completed_at,
                     estimated_duration, actual_duration, retry_count, max_retries,
                     worker_id, user_tier, progress_percent, progress_message
-                FROM job_queue
+                FROM {table}
                 WHERE id = :job_id
-            """).execution_options(prepare=False), {'job_id': job_id})
-
-            job_data = result.fetchone()
+            """, {'job_id': job_id})
             if not job_data:
                 return None
 
@@ -531,7 +653,7 @@ class IndustryStandardJobQueue:
                 'created_at': job_data.created_at.isoformat(),
                 'started_at': job_data.started_at.isoformat() if job_data.started_at else None,
                 'completed_at': job_data.completed_at.isoformat() if job_data.completed_at else None,
-                'result': json.loads(job_data.result) if job_data.result else None,
+                'result': await job_result_store.resolve(job_data.result, job_data.result_ref),
                 'error_details': json.loads(job_data.error_details) if job_data.error_details else None
             }
 
@@ -593,10 +715,24 @@ class IndustryStandardJobQueue:
             return None
 
     async def _get_queue_position(self, job_id: str, queue_type: QueueType) -> int:
-        """Get job position in queue"""
-        queue_key = f"queue:{queue_type.value}"
-        rank = await self.redis_client.zrevrank(queue_key, job_id)
-        return rank + 1 if rank is not None else 0
+        """Get job position in queue in claim order (aged priority, AGED_CLAIM_KEY); 0 if not queued"""
+        from app.workers.worker_database import AGED_CLAIM_KEY
+
+        async with optimized_pools.get_user_session() as session:
+            # Range scan of idx_job_queue_aged_claim (migration 019)
+            result = await session.execute(text(f"""
+                WITH me AS (
+                    SELECT {AGED_CLAIM_KEY} AS claim_key
+                    FROM job_queue
+                    WHERE id = CAST(:job_id AS uuid) AND status = 'queued'
+                )
+                SELECT COUNT(*)
+                FROM job_queue
+                WHERE status = 'queued'
+                AND queue_name = :queue_name
+                AND {AGED_CLAIM_KEY} <= (SELECT claim_key FROM me)
+            """).execution_options(prepare=False), {'job_id': job_id, 'queue_name': queue_type.value})
+            return result.scalar() or 0
 
     def _calculate_estimated_completion(
         self,
@@ -643,14 +779,23 @@ class IndustryStandardJobQueue:
                 'error_rates': {}
             }
 
+            # Queue counts for every queue in one pass over job_queue
+            async with optimized_pools.get_user_session() as session:
+                result = await session.execute(text("""
+                    SELECT queue_name,
+                           COUNT(*) FILTER (WHERE status = 'queued') AS queued,
+                           COUNT(*) FILTER (WHERE status = 'processing') AS processing
+                    FROM job_queue
+                    WHERE status IN ('queued', 'processing')
+                    GROUP BY queue_name
+                """).execution_options(prepare=False))
+                queue_counts = {row.queue_name: row for row in result.fetchall()}
+
             # Get queue statistics for each queue type
             for queue_type in QueueType:
-                queue_key = f"queue:{queue_type.value}"
-                processing_key = f"processing:{queue_type.value}"
-
-                # Get queue counts
-                queue_size = await self.redis_client.zcard(queue_key) if self.redis_client else 0
-                processing_count = await self.redis_client.hlen(processing_key) if self.redis_client else 0
+                counts = queue_counts.get(queue_type.value)
+                queue_size = counts.queued if counts else 0
+                processing_count = counts.processing if counts else 0
 
                 # Get 24h metrics
                 daily_metrics = {}
@@ -28,6 +28,14 @@ from app.services.location_detection_service import LocationDetectionService
 logger = logging.getLogger(__name__)
 
 
+def _as_int(value: Any) -> int:
+    """Apify counters arrive as int, float, numeric string or None."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
 class ComprehensiveDataService:
     """Unified service for complete Apify data storage and retrieval"""
     
@@ -534,40 +542,7 @@ class ComprehensiveDataService:
                     batch_shortcodes.append(sc)
 
             if batch_shortcodes:
-                from sqlalchemy import text as sa_text
-
-                # Get instagram_post_ids of posts being deleted (for CDN cleanup)
-                old_posts_q = await db.execute(
-                    select(Post.instagram_post_id).where(
-                        Post.profile_id == profile_id,
-                        Post.shortcode.notin_(batch_shortcodes)
-                    )
-                )
-                old_post_ids = [row[0] for row in old_posts_q.fetchall() if row[0]]
-
-                if old_post_ids:
-                    logger.info(f"DATABASE: Replacing {len(old_post_ids)} old posts not in current Apify batch")
-
-                    # Clean up CDN assets for old posts (cascade deletes cdn_image_jobs)
-                    await db.execute(
-                        sa_text("""
-                            DELETE FROM cdn_image_assets
-                            WHERE source_type = 'post_thumbnail'
-                            AND source_id = CAST(:profile_id AS uuid)
-                            AND media_id = ANY(:old_ids)
-                        """).execution_options(prepare=False),
-                        {"profile_id": str(profile_id), "old_ids": old_post_ids}
-                    )
-
-                    # Delete old posts (cascade deletes comment_sentiment, campaign_posts)
-                    await db.execute(
-                        delete(Post).where(
-                            Post.profile_id == profile_id,
-                            Post.shortcode.notin_(batch_shortcodes)
-                        )
-                    )
-                    await db.flush()
-                    logger.info(f"DATABASE: Deleted {len(old_post_ids)} old posts + CDN assets")
+                await self._delete_posts_outside_batch(db, profile_id, batch_shortcodes)
 
             posts_created = 0
             posts_skipped = 0
@@ -649,6 +624,163 @@ class ComprehensiveDataService:
             logger.error(f"Error storing profile posts: {str(e)}")
             return 0
 
+    async def _delete_posts_outside_batch(self, db: AsyncSession, profile_id: UUID, batch_shortcodes: List[str]) -> int:
+        """Delete the profile's posts (and their CDN assets) that are not in the current Apify batch."""
+        # Get instagram_post_ids of posts being deleted (for CDN cleanup)
+        old_posts_q = await db.execute(
+            select(Post.instagram_post_id).where(
+                Post.profile_id == profile_id,
+                Post.shortcode.notin_(batch_shortcodes)
+            )
+        )
+        old_post_ids = [row[0] for row in old_posts_q.fetchall() if row[0]]
+
+        if not old_post_ids:
+            return 0
+
+        logger.info(f"DATABASE: Replacing {len(old_post_ids)} old posts not in current Apify batch")
+
+        # Clean up CDN assets for old posts (cascade deletes cdn_image_jobs)
+        await db.execute(
+            text("""
+                DELETE FROM cdn_image_assets
+                WHERE source_type = 'post_thumbnail'
+                AND source_id = CAST(:profile_id AS uuid)
+                AND media_id = ANY(:old_ids)
+            """).execution_options(prepare=False),
+            {"profile_id": str(profile_id), "old_ids": old_post_ids}
+        )
+
+        # Delete old posts (cascade deletes comment_sentiment, campaign_posts)
+        await db.execute(
+            delete(Post).where(
+                Post.profile_id == profile_id,
+                Post.shortcode.notin_(batch_shortcodes)
+            )
+        )
+        await db.flush()
+        logger.info(f"DATABASE: Deleted {len(old_post_ids)} old posts + CDN assets")
+        return len(old_post_ids)
+
+    async def store_profile_delta(self, db: AsyncSession, profile_id: UUID, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Delta refresh of an already-stored profile from a fresh Apify scrape.
+
+        Only profile counters are updated; the scraped recent posts are
+        diffed by shortcode against stored posts - known posts get their
+        like/comment/view counts and engagement rate updated in one
+        statement, unknown posts are inserted, and posts that dropped out of
+        the recent window are removed (same window as store_complete_profile).
+        Commits, then updates the profile engagement rate.
+
+        Returns new_posts (id, instagram_post_id, display_url of each inserted
+        post), updated_posts and removed_posts.
+        """
+        profile_id = UUID(str(profile_id))
+        user_data = self._extract_user_data_comprehensive(raw_data)
+        if not user_data:
+            raise ValueError(f"No user data in Apify response for profile {profile_id}")
+
+        followers_count = _as_int(user_data.get('followers_count'))
+        await db.execute(
+            text("""
+                UPDATE profiles SET
+                    followers_count = :followers_count,
+                    following_count = :following_count,
+                    posts_count = :posts_count,
+                    refresh_count = COALESCE(refresh_count, 0) + 1,
+                    last_refreshed = NOW()
+                WHERE id = CAST(:profile_id AS uuid)
+            """).execution_options(prepare=False),
+            {
+                'profile_id': str(profile_id),
+                'followers_count': followers_count,
+                'following_count': _as_int(user_data.get('following_count')),
+                'posts_count': _as_int(user_data.get('posts_count')),
+            }
+        )
+
+        scraped = {}
+        for post_node in user_data.get('posts') or []:
+            if post_node.get('shortcode'):
+                scraped.setdefault(post_node['shortcode'], post_node)
+        if not scraped:
+            await db.commit()
+            return {'new_posts': [], 'updated_posts': 0, 'removed_posts': 0}
+
+        stored_r = await db.execute(
+            select(Post.shortcode, Post.profile_id).where(Post.shortcode.in_(list(scraped)))
+        )
+        stored = {row.shortcode: row.profile_id for row in stored_r.fetchall()}
+
+        # Known posts: counters only, one UPDATE for all of them
+        known = [code for code, owner in stored.items() if owner == profile_id]
+        if known:
+            counters = [
+                EngagementRateService.enhance_post_data_with_engagement(
+                    self._map_post_data_comprehensive(scraped[code], profile_id), followers_count
+                )
+                for code in known
+            ]
+            await db.execute(
+                text("""
+                    UPDATE posts p SET
+                        likes_count = c.likes_count,
+                        comments_count = c.comments_count,
+                        video_view_count = c.video_view_count,
+                        engagement_rate = c.engagement_rate
+                    FROM unnest(
+                        CAST(:shortcodes AS text[]),
+                        CAST(:likes AS bigint[]),
+                        CAST(:comments AS bigint[]),
+                        CAST(:views AS bigint[]),
+                        CAST(:rates AS double precision[])
+                    ) AS c(shortcode, likes_count, comments_count, video_view_count, engagement_rate)
+                    WHERE p.shortcode = c.shortcode
+                    AND p.profile_id = CAST(:profile_id AS uuid)
+                """).execution_options(prepare=False),
+                {
+                    'profile_id': str(profile_id),
+                    'shortcodes': known,
+                    'likes': [_as_int(c.get('likes_count')) for c in counters],
+                    'comments': [_as_int(c.get('comments_count')) for c in counters],
+                    'views': [_as_int(c.get('video_view_count')) for c in counters],
+                    'rates': [float(c.get('engagement_rate') or 0) for c in counters],
+                }
+            )
+
+        # Genuinely new posts: full mapping, same as store_complete_profile
+        new_posts = []
+        for code, post_node in scraped.items():
+            if code in stored:
+                continue  # ours (updated above) or owned by another profile (skipped, as in a full store)
+            post_data = EngagementRateService.enhance_post_data_with_engagement(
+                self._map_post_data_comprehensive(post_node, profile_id), followers_count
+            )
+            post = Post(**{key: value for key, value in post_data.items() if hasattr(Post, key)})
+            db.add(post)
+            new_posts.append(post)
+        await db.flush()
+        # Read before commit - expired attributes can't lazy-load in an async session
+        new_post_refs = [
+            {'id': str(post.id), 'instagram_post_id': post.instagram_post_id, 'display_url': post.display_url}
+            for post in new_posts
+        ]
+
+        removed = await self._delete_posts_outside_batch(db, profile_id, list(scraped))
+        await db.commit()
+        await EngagementRateService.update_profile_engagement_rate(db, str(profile_id))
+
+        logger.info(
+            f"DATABASE: Delta refresh of profile {profile_id}: {len(new_post_refs)} new, "
+            f"{len(known)} updated, {removed} removed posts"
+        )
+        return {
+            'new_posts': new_post_refs,
+            'updated_posts': len(known),
+            'removed_posts': removed,
+        }
+
     def _map_post_data_comprehensive(self, post_node: Dict[str, Any], profile_id: UUID) -> Dict[str, Any]:
         """Map ALL post datapoints from Apify response with automatic image proxying"""
         
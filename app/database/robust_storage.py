@@ -6,7 +6,7 @@ import logging
 import traceback
 from typing import Dict, Any, Tuple, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, inspect
+from sqlalchemy import select, inspect, func
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.database.unified_models import Profile
 
@@ -102,6 +102,7 @@ async def store_profile_robust(
                     logger.warning(f"Failed to update fields: {failed_fields}")
                 
                 existing_profile.refresh_count = (existing_profile.refresh_count or 0) + 1
+                existing_profile.last_refreshed = func.now()
                 
                 await db.commit()
                 await db.refresh(existing_profile)
@@ -130,6 +131,7 @@ async def store_profile_robust(
                             if key != 'id' and hasattr(conflicting_profile, key):
                                 setattr(conflicting_profile, key, value)
                         conflicting_profile.refresh_count = (conflicting_profile.refresh_count or 0) + 1
+                        conflicting_profile.last_refreshed = func.now()
                         
                         await db.commit()
                         await db.refresh(conflicting_profile)
@@ -78,7 +78,16 @@ class R2StorageClient:
     async def upload_object(self, key: str, content: bytes, content_type: str, 
                           cache_control: str = None, metadata: Dict[str, str] = None) -> bool:
         """Upload object to R2 with proper headers"""
+        from app.scrapers.scrape_replay import replay_upload
+
         try:
+            # Offline replay writes uploads to SCRAPE_REPLAY_UPLOAD_DIR instead
+            replayed = replay_upload(key, content)
+            if replayed is not None:
+                self.stats['uploads_successful'] += 1
+                self.stats['total_bytes_uploaded'] += len(content)
+                return replayed
+
             extra_args = {
                 'ContentType': content_type
             }
@@ -9,7 +9,7 @@ import psutil
 import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
 import redis
@@ -73,6 +73,9 @@ class SystemMetrics:
     requests_per_minute: int
     error_rate_percent: float
 
+    # Unified worker adaptive concurrency (AIMD lane limits and signals)
+    worker_concurrency: Dict[str, Any] = field(default_factory=dict)
+
 @dataclass
 class AlertRule:
     """Alert rule configuration"""
@@ -148,6 +151,9 @@ class SystemMonitor:
         # Performance metrics
         perf_metrics = await self._collect_performance_metrics()
 
+        # Worker concurrency metrics
+        worker_concurrency = self._collect_worker_concurrency_metrics()
+
         return SystemMetrics(
             timestamp=datetime.now(timezone.utc),
 
@@ -176,7 +182,10 @@ class SystemMonitor:
             # Performance metrics
             avg_response_time_ms=perf_metrics['avg_response_time_ms'],
             requests_per_minute=perf_metrics['requests_per_minute'],
-            error_rate_percent=perf_metrics['error_rate_percent']
+            error_rate_percent=perf_metrics['error_rate_percent'],
+
+            # Worker concurrency metrics
+            worker_concurrency=worker_concurrency
         )
 
     async def _collect_database_metrics(self) -> Dict[str, Any]:
@@ -316,6 +325,37 @@ class SystemMonitor:
                 'error_rate_percent': 0
             }
 
+    def _collect_worker_concurrency_metrics(self) -> Dict[str, Any]:
+        """Collect the unified worker's adaptive lane limits and overload signals"""
+        try:
+            from app.core.config import settings
+
+            if settings.UNIFIED_WORKER_PROCESSES > 0:
+                # Pool mode - children publish only their current lane limits
+                from app.workers.unified_worker_pool import unified_worker_pool
+                status = unified_worker_pool.get_status()
+                return {
+                    'mode': 'process_pool',
+                    'active_jobs': status['active_jobs'],
+                    'concurrency_limit': status['concurrency_limit'],
+                    'max_concurrent': status['max_concurrent'],
+                    'lane_limits': {p['index']: p['lane_limits'] for p in status['processes']},
+                }
+
+            from app.workers.unified_async_worker import unified_async_worker
+            status = unified_async_worker.get_status()
+            return {
+                'mode': 'thread',
+                'active_jobs': status['active_jobs'],
+                'concurrency_limit': status['concurrency_limit'],
+                'max_concurrent': status['max_concurrent'],
+                'lanes': status['lanes'],
+            }
+
+        except Exception as e:
+            logger.error(f"Failed to collect worker concurrency metrics: {e}")
+            return {}
+
     async def check_service_health(self) -> Dict[str, ServiceHealth]:
         """Check health of all system services"""
         services = {}
@@ -685,8 +725,8 @@ class SystemMonitor:
             metrics_dict = self._serialize_for_redis(asdict(metrics))
 
             # Use traditional Redis hset format for compatibility
-            for field, value in metrics_dict.items():
-                self.redis_client.hset(metrics_key, field, value)
+            for metric_name, value in metrics_dict.items():
+                self.redis_client.hset(metrics_key, metric_name, value)
             self.redis_client.expire(metrics_key, 86400)  # 24 hours
         except Exception as e:
             logger.error(f"Failed to store metrics in Redis: {e}")
@@ -1,13 +1,27 @@
 """
 Apify Instagram Client - Surgically Precise Instagram Data Collection
 IDENTICAL interface, IDENTICAL limits, ZERO changes to existing code
+
+Talks to the Apify REST API with httpx.AsyncClient - starting a run, waiting
+for it (long-polled waitForFinish) and paging dataset items never block the
+event loop, so other jobs on the same worker keep running during a scrape.
+Point APIFY_BASE_URL at scripts/fake_apify_server.py to run offline, or set
+SCRAPE_REPLAY_DIR to answer every request in-process from a recorded corpus
+(see app/scrapers/scrape_replay.py).
+
+Every run is started through start_run, which first takes budget from the
+ApifyBudgetGovernor (queueing while the tenant or global budget is spent)
+and reports each run's compute units back to it when the run finishes.
 """
 import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+import random
+import re
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from datetime import datetime, timedelta
-from apify_client import ApifyClient
+
+import httpx
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -18,6 +32,9 @@ from tenacity import (
 )
 
 from app.core.config import settings
+from app.services.raw_scrape_cache import raw_scrape_cache
+from app.services.apify_budget_governor import apify_budget_governor, ApifyBudgetExhausted
+from app.scrapers.scrape_replay import apify_replay_transport
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +53,51 @@ class ApifyProfileNotFoundError(ApifyAPIError):
     """Exception for non-existent profiles that should NOT be retried - matches ApifyProfileNotFoundError"""
     pass
 
+class ApifyBatchRunError(ApifyInstabilityError):
+    """A batched run failed as a whole - its profiles are worth retrying on their own"""
+    pass
+
+class ApifyBudgetExceededError(ApifyAPIError):
+    """Queued too long for Apify budget - retry later rather than right away"""
+    pass
+
+# Seconds the API holds a run-status request open (Apify allows up to 60)
+WAIT_FOR_FINISH_SECS = 60
+
+# Default actor run timeout (Apify aborts the run after this)
+ACTOR_RUN_TIMEOUT_SECS = 300
+
+# Seconds beyond the run timeout before we abort the run ourselves
+RUN_WAIT_GRACE_SECS = 30
+
+# Dataset items fetched per request
+DATASET_PAGE_SIZE = 1000
+
+# Attempts per API request on 429 / 5xx / connection errors (like apify-client)
+HTTP_MAX_ATTEMPTS = 5
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_MAX = 30
+
+# Run statuses that are still in flight
+RUN_ACTIVE_STATUSES = {"READY", "RUNNING", "TIMING-OUT", "ABORTING"}
+
+# Batched profile runs: most usernames per actor run, extra run timeout per
+# additional username, and the long-poll used between dataset reads so
+# finished profiles are streamed back while the run is still going
+BATCH_MAX_PROFILES = 25
+BATCH_TIMEOUT_PER_PROFILE_SECS = 20
+BATCH_POLL_SECS = 5
+
+PROFILE_URL_PATTERN = re.compile(r'instagram\.com/([A-Za-z0-9_.]+)/?(?:\?.*)?$')
+
+# Batched post runs: most post URLs per actor run and extra run timeout per
+# additional URL (a post page is much cheaper than a profile)
+BATCH_MAX_POSTS = 50
+BATCH_TIMEOUT_PER_POST_SECS = 5
+
+POST_URL_PATTERN = re.compile(r'instagram\.com/(?:p|reel|reels|tv)/([A-Za-z0-9_-]+)')
+
+
 class ApifyInstagramClient:
     """
     Apify Instagram Client - Single Scrape Method Only
@@ -47,10 +109,11 @@ class ApifyInstagramClient:
     - ZERO changes required in calling code
     """
 
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, base_url: Optional[str] = None):
         self.api_token = api_token
         self.actor_id = "apify/instagram-scraper"
-        self.client: Optional[ApifyClient] = None
+        self.base_url = (base_url or settings.APIFY_BASE_URL).rstrip("/")
+        self.client: Optional[httpx.AsyncClient] = None
 
         # FINAL APIFY LIMITS (SET ONCE)
         self.POSTS_LIMIT = 12
@@ -65,19 +128,202 @@ class ApifyInstagramClient:
 
     async def __aenter__(self):
         """Async context manager entry - identical to Apify"""
-        self.client = ApifyClient(self.api_token)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_token}"},
+            # Read timeout must outlast a long-polled waitForFinish
+            timeout=httpx.Timeout(WAIT_FOR_FINISH_SECS + 30, connect=10.0),
+            transport=apify_replay_transport(),  # None unless SCRAPE_REPLAY_DIR is set
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit - identical to Apify"""
+        if self.client:
+            await self.client.aclose()
         self.client = None
 
-    async def _run_instagram_scraper(self, run_input: Dict[str, Any]) -> Dict[str, Any]:
+    # ------------------------------------------------------------------
+    # Apify REST API (async)
+    # ------------------------------------------------------------------
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        """
+        One API call with retries on 429, 5xx and connection errors
+        (exponential backoff with jitter, honouring Retry-After).
+        Returns the decoded JSON body.
+        """
+        if not self.client:
+            raise ApifyAPIError("Client not initialized - use async context manager")
+
+        last_error = None
+        last_status = None
+        for attempt in range(HTTP_MAX_ATTEMPTS):
+            retry_after = None
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                last_error = f"{type(e).__name__}: {e}"
+                last_status = None
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                last_status = response.status_code
+                last_error = f"HTTP {response.status_code}: {response.text[:300]}"
+                if response.status_code != 429 and response.status_code < 500:
+                    raise ApifyAPIError(
+                        f"Apify API {method} {path} failed - {last_error}",
+                        status_code=response.status_code,
+                        response_data=self._error_body(response),
+                    )
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt < HTTP_MAX_ATTEMPTS - 1:
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = min(HTTP_BACKOFF_BASE * (2 ** attempt), HTTP_BACKOFF_MAX)
+                    delay = delay / 2 + random.uniform(0, delay / 2)
+                logger.warning(f"[APIFY] {method} {path} - {last_error}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        # Message keeps the status code so overload classification sees "429"
+        raise ApifyInstabilityError(
+            f"Apify API {method} {path} failed after {HTTP_MAX_ATTEMPTS} attempts - {last_error}",
+            status_code=last_status,
+        )
+
+    @staticmethod
+    def _error_body(response: httpx.Response) -> Optional[Dict]:
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    async def start_run(
+        self,
+        run_input: Dict[str, Any],
+        actor_id: Optional[str] = None,
+        timeout_secs: int = ACTOR_RUN_TIMEOUT_SECS
+    ) -> Dict[str, Any]:
+        """
+        Start an actor run and return the run object (does not wait).
+        Queues for budget first (one token per directUrls entry) and raises
+        ApifyBudgetExceededError if none frees up in time.
+        """
+        actor_id = actor_id or self.actor_id
+        cost = len(run_input.get("directUrls") or []) or 1
+        try:
+            waited = await apify_budget_governor.acquire(cost)
+        except ApifyBudgetExhausted as e:
+            raise ApifyBudgetExceededError(str(e))
+
+        body = await self._request(
+            "POST", f"/acts/{actor_id.replace('/', '~')}/runs",
+            params={"timeout": timeout_secs},
+            json=run_input,
+        )
+        run = body["data"]
+        await apify_budget_governor.record_run_started(run["id"], actor_id, cost, waited)
+        return run
+
+    async def wait_for_run(self, run_id: str, timeout_secs: float) -> Dict[str, Any]:
+        """
+        Wait for a run to finish by long-polling its status (each request is
+        held open by Apify for up to WAIT_FOR_FINISH_SECS). Aborts the run if
+        it is still going after `timeout_secs`.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_secs
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                await self.abort_run(run_id)
+                raise ApifyInstabilityError(f"Actor run {run_id} timed out after {timeout_secs:.0f}s")
+
+            try:
+                body = await self._request(
+                    "GET", f"/actor-runs/{run_id}",
+                    params={"waitForFinish": int(max(1, min(WAIT_FOR_FINISH_SECS, remaining)))},
+                )
+            except BaseException:
+                apify_budget_governor.forget_run(run_id)
+                raise
+            run = body["data"]
+            if run.get("status") not in RUN_ACTIVE_STATUSES:
+                await apify_budget_governor.record_run_finished(run)
+                return run
+
+    async def abort_run(self, run_id: str):
+        """Best-effort abort so an abandoned run stops consuming compute units."""
+        try:
+            body = await self._request("POST", f"/actor-runs/{run_id}/abort")
+            await apify_budget_governor.record_run_finished(body["data"])
+        except Exception as e:
+            logger.warning(f"[APIFY] Could not abort run {run_id}: {e}")
+        finally:
+            apify_budget_governor.forget_run(run_id)
+
+    async def iter_dataset_items(self, dataset_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Page through a dataset's items, DATASET_PAGE_SIZE per request."""
+        offset = 0
+        while True:
+            items = await self._request(
+                "GET", f"/datasets/{dataset_id}/items",
+                params={"offset": offset, "limit": DATASET_PAGE_SIZE, "clean": "true", "format": "json"},
+            )
+            for item in items:
+                yield item
+            if len(items) < DATASET_PAGE_SIZE:
+                return
+            offset += len(items)
+
+    async def run_actor(
+        self,
+        run_input: Dict[str, Any],
+        actor_id: Optional[str] = None,
+        timeout_secs: int = ACTOR_RUN_TIMEOUT_SECS,
+        max_age_minutes: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Start an actor run, wait for it and return its dataset items.
+        Raises ApifyInstabilityError if the run does not succeed.
+
+        The raw scrape cache is consulted first: items of an identical run
+        input fetched within max_age_minutes (None = the configured default,
+        0 = always run) are returned without starting a run.
+        """
+        actor_id = actor_id or self.actor_id
+        cached = await raw_scrape_cache.get(actor_id, run_input, max_age_minutes)
+        if cached:
+            return cached["items"]
+
+        run = await self.start_run(run_input, actor_id=actor_id, timeout_secs=timeout_secs)
+        run = await self.wait_for_run(run["id"], timeout_secs + RUN_WAIT_GRACE_SECS)
+
+        if run.get("status") != "SUCCEEDED":
+            raise ApifyInstabilityError(f"Actor run failed with status: {run.get('status')}")
+
+        results = []
+        dataset_id = run.get("defaultDatasetId")
+        if dataset_id:
+            async for item in self.iter_dataset_items(dataset_id):
+                results.append(item)
+
+        # Error items (e.g. not_found) are not worth serving from cache
+        if results and not any(item.get("error") for item in results):
+            await raw_scrape_cache.put(actor_id, run_input, results)
+        return results
+
+    async def _run_instagram_scraper(
+        self, run_input: Dict[str, Any], max_age_minutes: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Run Instagram scraper with retry logic - matches Apify retry patterns
 
         Args:
             run_input: Apify actor input configuration
+            max_age_minutes: Oldest raw scrape cache entry accepted (0 = always scrape)
 
         Returns:
             Processed Instagram data in Apify-compatible format
@@ -93,21 +339,8 @@ class ApifyInstagramClient:
             try:
                 logger.info(f"[APIFY] Starting Instagram scrape for {username} (attempt {attempt + 1}/5)")
 
-                # Run the actor with timeout
-                run = self.client.actor(self.actor_id).call(
-                    run_input=run_input,
-                    timeout_secs=300  # 5 minute timeout like Apify
-                )
-
-                if run.get("status") != "SUCCEEDED":
-                    raise ApifyInstabilityError(f"Actor run failed with status: {run.get('status')}")
-
-                # Get results
-                results = []
-                dataset_id = run.get("defaultDatasetId")
-                if dataset_id:
-                    for item in self.client.dataset(dataset_id).iterate_items():
-                        results.append(item)
+                # Run the actor with timeout (5 minutes) and collect its dataset
+                results = await self.run_actor(run_input, max_age_minutes=max_age_minutes)
 
                 if not results:
                     empty_result_count += 1
@@ -314,20 +547,10 @@ class ApifyInstagramClient:
         except:
             return None
 
-    async def get_instagram_profile_comprehensive(self, username: str) -> Dict[str, Any]:
-        """
-        SINGLE Instagram scrape method - replaces all Apify methods
-
-        EXACT LIMITS (FINAL):
-        - Profile details with 12 recent posts included automatically
-        - 10 related profiles
-        - 12 reels (if available)
-
-        CRITICAL FIX: Single profile scrape - "Scrape details of a profile, photo, hashtag, or place"
-        When scraping a profile URL, Apify automatically includes recent posts in the response
-        """
-        run_input = {
-            "directUrls": [f"https://www.instagram.com/{username}/"],
+    def _profile_run_input(self, usernames: List[str]) -> Dict[str, Any]:
+        """Actor input for profile details (12 posts, 10 related, 12 reels) of one or more usernames"""
+        return {
+            "directUrls": [f"https://www.instagram.com/{username}/" for username in usernames],
             "resultsType": "details",  # Scrape profile details
             "resultsLimit": 12,  # Limit posts returned
             "extendOutputFunction": """
@@ -346,9 +569,298 @@ class ApifyInstagramClient:
             "requestTimeout": 90
         }
 
+    @staticmethod
+    def _item_username(item: Dict[str, Any]) -> Optional[str]:
+        """Which requested username a "details" dataset item belongs to"""
+        for key in ("inputUrl", "url"):
+            match = PROFILE_URL_PATTERN.search(item.get(key) or "")
+            if match:
+                return match.group(1).lower()
+        username = item.get("username")
+        return username.lower() if username else None
+
+    async def get_cached_profile(
+        self, username: str, max_age_minutes: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Profile from the raw scrape cache (same format as a fresh scrape), or None."""
+        cached = await raw_scrape_cache.get(self.actor_id, self._profile_run_input([username]), max_age_minutes)
+        if not cached or not cached["items"]:
+            return None
+        try:
+            return self._transform_to_apify_format(cached["items"], username)
+        except Exception as e:
+            logger.warning(f"[APIFY] Ignoring unusable cached scrape of {username}: {e}")
+            return None
+
+    async def iter_profiles_batch(
+        self, usernames: List[str], max_age_minutes: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Scrape many profiles in ONE actor run and stream them back.
+
+        Yields (username, result, error) as soon as a profile's dataset item
+        appears - the run is long-polled for BATCH_POLL_SECS between dataset
+        reads, so early profiles are not held back by slow ones. Exactly one
+        of result (same format as get_instagram_profile_comprehensive) and
+        error is set. Errors are per username: a private, missing or
+        malformed profile only fails its own entry. If the run itself fails,
+        the profiles it never produced get ApifyBatchRunError.
+
+        Profiles in the raw scrape cache (within max_age_minutes) are yielded
+        first and left out of the run; scraped profiles are cached under
+        their single-username input, so later single fetches hit too.
+        """
+        if not self.client:
+            raise ApifyAPIError("Client not initialized - use async context manager")
+
+        pending: Dict[str, str] = {}
+        for username in usernames:
+            pending.setdefault(username.strip().lstrip("@").lower(), username)
+        for key, username in list(pending.items()):
+            cached = await self.get_cached_profile(username, max_age_minutes)
+            if cached:
+                del pending[key]
+                yield username, cached, None
+        if not pending:
+            return
+
+        timeout_secs = ACTOR_RUN_TIMEOUT_SECS + BATCH_TIMEOUT_PER_PROFILE_SECS * (len(pending) - 1)
+        logger.info(f"[APIFY] Starting batched scrape of {len(pending)} profiles")
+        run = await self.start_run(self._profile_run_input(list(pending)), timeout_secs=timeout_secs)
+        run_id, dataset_id = run["id"], run.get("defaultDatasetId")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_secs + RUN_WAIT_GRACE_SECS
+        offset = 0
+        finished = False
+        try:
+            while pending:
+                # Read the new tail of the dataset before checking the run again
+                items = []
+                if dataset_id:
+                    page = await self._request(
+                        "GET", f"/datasets/{dataset_id}/items",
+                        params={"offset": offset, "limit": DATASET_PAGE_SIZE, "clean": "true", "format": "json"},
+                    )
+                    offset += len(page)
+                    items = page
+                for item in items:
+                    key = self._item_username(item)
+                    if key not in pending:
+                        continue
+                    username = pending.pop(key)
+                    result, error = None, None
+                    try:
+                        result = self._transform_to_apify_format([item], username)
+                        await raw_scrape_cache.put(self.actor_id, self._profile_run_input([username]), [item])
+                    except ApifyAPIError as e:
+                        error = e
+                    except Exception as e:
+                        error = ApifyAPIError(f"Malformed profile item for {username}: {e}")
+                    yield username, result, error
+                if items and len(items) == DATASET_PAGE_SIZE:
+                    continue
+                if finished:
+                    break
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    await self.abort_run(run_id)
+                    run = {"status": "TIMED-OUT"}
+                    break
+                body = await self._request(
+                    "GET", f"/actor-runs/{run_id}",
+                    params={"waitForFinish": int(max(1, min(BATCH_POLL_SECS, remaining)))},
+                )
+                run = body["data"]
+                # One more dataset read after the run ends picks up the last items
+                finished = run.get("status") not in RUN_ACTIVE_STATUSES
+        except BaseException:
+            if not finished:
+                await self.abort_run(run_id)
+            apify_budget_governor.forget_run(run_id)
+            raise
+
+        if finished:
+            await apify_budget_governor.record_run_finished(run)
+        else:
+            apify_budget_governor.forget_run(run_id)  # every profile arrived before the run ended
+        status = run.get("status")
+        for username in pending.values():
+            if status == "SUCCEEDED":
+                yield username, None, ApifyProfileNotFoundError(f"Profile '{username}' not found on Instagram")
+            else:
+                yield username, None, ApifyBatchRunError(f"Batched actor run ended with status: {status}")
+        logger.info(f"[APIFY] Batched scrape finished ({status}), {len(pending)} profiles without data")
+
+    async def get_instagram_profiles_batch(
+        self, usernames: List[str], max_age_minutes: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape many profiles in one actor run.
+
+        Returns {username: result or exception}; per-username failures are
+        returned, not raised.
+        """
+        results: Dict[str, Any] = {}
+        async for username, result, error in self.iter_profiles_batch(usernames, max_age_minutes):
+            results[username] = result if error is None else error
+        return results
+
+    # ------------------------------------------------------------------
+    # Posts
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def post_shortcode(post_url: str) -> Optional[str]:
+        """Shortcode of an Instagram post / reel URL (share links included), or None"""
+        match = POST_URL_PATTERN.search(post_url or "")
+        return match.group(1) if match else None
+
+    @staticmethod
+    def canonical_post_url(shortcode: str) -> str:
+        """One URL per post, so /reel/ and ?igsh= share links hit the same cache entry"""
+        return f"https://www.instagram.com/p/{shortcode}/"
+
+    def _post_run_input(self, post_urls: List[str]) -> Dict[str, Any]:
+        """Actor input for the details of one or more posts"""
+        return {
+            "directUrls": post_urls,
+            "resultsType": "details",
+            "resultsLimit": 1,
+            "addParentData": True,
+            "maxRequestRetries": 2,
+            "sessionPoolSize": 1,
+            "pageTimeout": 60,
+            "requestTimeout": 90
+        }
+
+    @staticmethod
+    def _item_shortcode(item: Dict[str, Any]) -> Optional[str]:
+        """Which requested post a "details" dataset item belongs to"""
+        match = POST_URL_PATTERN.search(item.get("inputUrl") or "")
+        if match:
+            return match.group(1)
+        if item.get("shortCode"):
+            return item["shortCode"]
+        match = POST_URL_PATTERN.search(item.get("url") or "")
+        return match.group(1) if match else None
+
+    async def get_post_details(self, post_url: str, max_age_minutes: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Raw "details" item of one post (raw scrape cache first, see run_actor).
+        Raises ApifyProfileNotFoundError if the post is missing or private.
+        """
+        shortcode = self.post_shortcode(post_url)
+        if shortcode:
+            post_url = self.canonical_post_url(shortcode)
+        results = await self.run_actor(self._post_run_input([post_url]), max_age_minutes=max_age_minutes)
+        if not results or results[0].get("error"):
+            raise ApifyProfileNotFoundError(f"Post '{shortcode or post_url}' not found on Instagram")
+        return results[0]
+
+    async def get_posts_batch(
+        self, post_urls: List[str], max_age_minutes: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape many posts with one actor run per BATCH_MAX_POSTS URLs.
+
+        Returns {shortcode: raw "details" item or exception}, mapped back by
+        shortcode so /p/, /reel/ and share-link URLs of a post are one entry.
+        Errors are per post: a missing or private post gets
+        ApifyProfileNotFoundError; posts of a run that failed as a whole get
+        ApifyBatchRunError (worth retrying on their own); URLs without a
+        shortcode get ApifyAPIError under the URL itself. Cached posts
+        (within max_age_minutes) are not scraped, and scraped posts are cached
+        under their single-URL input so later single fetches hit too.
+        """
+        if not self.client:
+            raise ApifyAPIError("Client not initialized - use async context manager")
+
+        results: Dict[str, Any] = {}
+        pending: List[str] = []
+        for post_url in post_urls:
+            shortcode = self.post_shortcode(post_url)
+            if not shortcode:
+                results[post_url] = ApifyAPIError(f"Not an Instagram post URL: {post_url}")
+                continue
+            if shortcode in results or shortcode in pending:
+                continue
+            cached = await raw_scrape_cache.get(
+                self.actor_id, self._post_run_input([self.canonical_post_url(shortcode)]), max_age_minutes
+            )
+            if cached and cached["items"]:
+                results[shortcode] = cached["items"][0]
+            else:
+                pending.append(shortcode)
+
+        chunks = [pending[i:i + BATCH_MAX_POSTS] for i in range(0, len(pending), BATCH_MAX_POSTS)]
+        if chunks:
+            logger.info(f"[APIFY] Scraping {len(pending)} posts in {len(chunks)} batched runs "
+                        f"({len(results)} from cache)")
+            for chunk_results in await asyncio.gather(*(self._scrape_posts_chunk(chunk) for chunk in chunks)):
+                results.update(chunk_results)
+        return results
+
+    async def _scrape_posts_chunk(self, shortcodes: List[str]) -> Dict[str, Any]:
+        """One actor run for up to BATCH_MAX_POSTS posts (see get_posts_batch)."""
+        timeout_secs = ACTOR_RUN_TIMEOUT_SECS + BATCH_TIMEOUT_PER_POST_SECS * (len(shortcodes) - 1)
+        run_input = self._post_run_input([self.canonical_post_url(code) for code in shortcodes])
+        try:
+            run = await self.start_run(run_input, timeout_secs=timeout_secs)
+            run = await self.wait_for_run(run["id"], timeout_secs + RUN_WAIT_GRACE_SECS)
+            if run.get("status") != "SUCCEEDED":
+                raise ApifyBatchRunError(f"Batched post run ended with status: {run.get('status')}")
+            items = []
+            if run.get("defaultDatasetId"):
+                async for item in self.iter_dataset_items(run["defaultDatasetId"]):
+                    items.append(item)
+        except ApifyBatchRunError as e:
+            return {code: e for code in shortcodes}
+        except Exception as e:
+            error = ApifyBatchRunError(f"Batched post run failed: {e}")
+            return {code: error for code in shortcodes}
+
+        results: Dict[str, Any] = {}
+        for item in items:
+            shortcode = self._item_shortcode(item)
+            if shortcode not in shortcodes or shortcode in results:
+                continue
+            if item.get("error"):
+                results[shortcode] = ApifyProfileNotFoundError(
+                    f"Post '{shortcode}' not found on Instagram ({item.get('error')})"
+                )
+                continue
+            results[shortcode] = item
+            await raw_scrape_cache.put(
+                self.actor_id, self._post_run_input([self.canonical_post_url(shortcode)]), [item]
+            )
+        for shortcode in shortcodes:
+            results.setdefault(shortcode, ApifyProfileNotFoundError(f"Post '{shortcode}' not found on Instagram"))
+        return results
+
+    async def get_instagram_profile_comprehensive(
+        self, username: str, max_age_minutes: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        SINGLE Instagram scrape method - replaces all Apify methods
+
+        EXACT LIMITS (FINAL):
+        - Profile details with 12 recent posts included automatically
+        - 10 related profiles
+        - 12 reels (if available)
+
+        CRITICAL FIX: Single profile scrape - "Scrape details of a profile, photo, hashtag, or place"
+        When scraping a profile URL, Apify automatically includes recent posts in the response
+
+        A raw scrape of the same input at most max_age_minutes old is reused
+        (None = SCRAPE_CACHE_DEFAULT_MAX_AGE_MINUTES, 0 = always scrape).
+        """
+        run_input = self._profile_run_input([username])
+
         try:
             logger.info(f"[APIFY] Fetching profile data for {username} (12 posts, 10 related, 12 reels)")
-            response_data = await self._run_instagram_scraper(run_input)
+            response_data = await self._run_instagram_scraper(run_input, max_age_minutes=max_age_minutes)
             logger.info(f"[APIFY] Successfully fetched profile data for {username}")
             return response_data
 
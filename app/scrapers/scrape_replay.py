@@ -0,0 +1,360 @@
+"""
+Scrape Replay - Serve Recorded Apify Payloads and Images from a Local Corpus
+
+With SCRAPE_REPLAY_DIR set, nothing leaves the machine on the scrape paths:
+
+- ApifyInstagramClient talks to ApifyReplayTransport instead of the Apify
+  API. Runs are started, long-polled and paged exactly as against Apify; the
+  dataset of a run is built from the corpus and the run finishes after
+  SCRAPE_REPLAY_RUN_SECONDS (default: the corpus manifest's run_seconds).
+- Image downloads (CDN processing, CLIP visual analysis) get corpus images.
+- R2 uploads are written under SCRAPE_REPLAY_UPLOAD_DIR.
+
+Corpus layout (scripts/replay_corpus is a small anonymized one):
+
+    manifest.json              {"description": ..., "run_seconds": ...}
+    apify/<username>.json      recorded profile "details" items
+    apify/p_<shortcode>.json   recorded post "details" items
+    images/<name>.(png|jpg)    images; a URL whose file name is in images/
+                               gets that file, any other URL a corpus image
+                               picked by the URL's hash
+
+A username without a recorded payload gets a synthetic creator: a recorded
+profile picked by the username's hash, renamed with rename_profile_item()
+(new ids, shortcodes and image names), so any number of distinct creators
+can be replayed from a handful of recordings. Unknown posts are cloned from
+the recorded profiles' posts the same way. Usernames starting with
+'missing_' return the actor's not_found item.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Host of image URLs in corpus payloads (file name = corpus image)
+REPLAY_IMAGE_HOST = 'replay.invalid'
+
+# Usernames that replay the actor's not_found item
+MISSING_USERNAME_PREFIX = 'missing_'
+
+PROFILE_URL = re.compile(r'instagram\.com/([A-Za-z0-9_.]+)/?(?:\?.*)?$')
+POST_URL = re.compile(r'instagram\.com/(?:p|reel|reels|tv)/([A-Za-z0-9_-]+)')
+MENTION = re.compile(r'@([A-Za-z0-9_.]+)')
+
+IMAGE_CONTENT_TYPES = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.webp': 'image/webp'}
+
+
+def _seed(key: str) -> int:
+    return int(hashlib.sha256(key.encode()).hexdigest()[:12], 16)
+
+
+def replay_image_url(name: str) -> str:
+    return f"https://{REPLAY_IMAGE_HOST}/images/{name}"
+
+
+def rename_profile_item(item: Dict[str, Any], username: str, image_names: List[str]) -> Dict[str, Any]:
+    """
+    Copy of a profile "details" item as if it belonged to `username`: ids,
+    shortcodes, owner fields, mentions of the original handle, related
+    profiles and image URLs are all rewritten, deterministically from the
+    new username. Used for synthetic creators and to anonymize recordings.
+    """
+    item = copy.deepcopy(item)
+    seed = _seed(username)
+    old_username = item.get('username') or ''
+    images = image_names or ['missing.png']
+
+    def image(key: str) -> str:
+        return replay_image_url(images[_seed(key) % len(images)])
+
+    def scrub(text: Optional[str]) -> Optional[str]:
+        if not text:
+            return text
+        return MENTION.sub(
+            lambda m: f"@{username}" if m.group(1).lower() == old_username.lower()
+            else f"@mention_{_seed(m.group(1).lower()) % 10000:04d}",
+            text
+        )
+
+    item.update({
+        'inputUrl': f"https://www.instagram.com/{username}/",
+        'url': f"https://www.instagram.com/{username}",
+        'id': str(seed % 10 ** 11),
+        'username': username,
+        'fullName': username.replace('_', ' ').title(),
+        'biography': scrub(item.get('biography')),
+        'externalUrl': None,
+        'profilePicUrl': image(f"{username}/avatar"),
+        'profilePicUrlHD': image(f"{username}/avatar"),
+    })
+    for key in ('followersCount', 'followsCount', 'followingCount'):
+        if isinstance(item.get(key), int):
+            # +-20% around the recording, so synthetic creators differ
+            item[key] = max(0, int(item[key] * (0.8 + (seed % 401) / 1000)))
+
+    for i, post in enumerate(item.get('latestPosts') or []):
+        shortcode = f"R{seed % 10 ** 8:08d}{i:02d}"
+        post.update({
+            'id': str(seed % 10 ** 9 * 100 + i),
+            'shortCode': shortcode,
+            'url': f"https://www.instagram.com/p/{shortcode}/",
+            'caption': scrub(post.get('caption')),
+            'mentions': [scrub(f"@{m}")[1:] for m in post.get('mentions') or []],
+            'displayUrl': image(f"{shortcode}/display"),
+            'ownerUsername': username,
+            'ownerId': item['id'],
+        })
+        if post.get('videoUrl'):
+            post['videoUrl'] = replay_image_url(f"{shortcode}.mp4")
+        if post.get('images'):
+            post['images'] = [image(f"{shortcode}/{n}") for n in range(len(post['images']))]
+        for n, child in enumerate(post.get('childPosts') or []):
+            child['displayUrl'] = image(f"{shortcode}/{n}")
+        post.pop('coauthorProducers', None)
+        post.pop('taggedUsers', None)
+
+    for i, related in enumerate(item.get('relatedProfiles') or []):
+        related_name = f"{username}_related_{i}"
+        related.update({
+            'username': related_name,
+            'fullName': related_name.replace('_', ' ').title(),
+            'id': str((seed + i + 1) % 10 ** 11),
+            'profilePicUrl': image(f"{related_name}/avatar"),
+        })
+    return item
+
+
+class ScrapeReplayCorpus:
+    """Recorded Apify items and images of one corpus directory"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        manifest_path = self.root / 'manifest.json'
+        self.manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        self.profiles: Dict[str, List[Dict[str, Any]]] = {}
+        self.posts: Dict[str, List[Dict[str, Any]]] = {}
+        for path in sorted((self.root / 'apify').glob('*.json')):
+            items = json.loads(path.read_text())
+            items = items if isinstance(items, list) else [items]
+            if path.stem.startswith('p_'):
+                self.posts[path.stem[2:]] = items
+            else:
+                self.profiles[path.stem.lower()] = items
+        self.images = {
+            path.name: path for path in sorted((self.root / 'images').glob('*'))
+            if path.suffix.lower() in IMAGE_CONTENT_TYPES
+        }
+        self.image_names = sorted(self.images)
+        self.templates = [
+            items[0] for _, items in sorted(self.profiles.items())
+            if items and not items[0].get('error') and items[0].get('latestPosts')
+        ]
+        self.stats = {'profiles': 0, 'synthetic_profiles': 0, 'posts': 0, 'images': 0, 'image_bytes': 0}
+        if not self.templates:
+            logger.warning(f"[SCRAPE-REPLAY] Corpus {self.root} has no profile with posts - unknown usernames replay not_found")
+
+    def items_for_url(self, url: str) -> List[Dict[str, Any]]:
+        """Dataset items the actor would produce for one directUrls entry"""
+        post = POST_URL.search(url)
+        if post:
+            self.stats['posts'] += 1
+            return self._post_items(post.group(1), url)
+        profile = PROFILE_URL.search(url)
+        if not profile:
+            return [{'inputUrl': url, 'error': 'invalid_url'}]
+        self.stats['profiles'] += 1
+        username = profile.group(1).lower()
+        if username in self.profiles:
+            return copy.deepcopy(self.profiles[username])
+        if username.startswith(MISSING_USERNAME_PREFIX) or not self.templates:
+            return [{'inputUrl': url, 'error': 'not_found', 'errorDescription': 'Page not found'}]
+        self.stats['synthetic_profiles'] += 1
+        template = self.templates[_seed(username) % len(self.templates)]
+        return [rename_profile_item(template, username, self.image_names)]
+
+    def _post_items(self, shortcode: str, url: str) -> List[Dict[str, Any]]:
+        if shortcode in self.posts:
+            return copy.deepcopy(self.posts[shortcode])
+        if not self.templates:
+            return [{'inputUrl': url, 'error': 'not_found', 'errorDescription': 'Post does not exist'}]
+        template = self.templates[_seed(shortcode) % len(self.templates)]
+        posts = template['latestPosts']
+        post = copy.deepcopy(posts[_seed(shortcode) % len(posts)])
+        post.update({
+            'inputUrl': f"https://www.instagram.com/p/{shortcode}/",
+            'shortCode': shortcode,
+            'url': f"https://www.instagram.com/p/{shortcode}/",
+            'id': str(_seed(shortcode) % 10 ** 18),
+            'ownerUsername': template.get('username'),
+            'ownerFullName': template.get('fullName'),
+            'ownerId': template.get('id'),
+        })
+        return [post]
+
+    def image_for_url(self, url: str) -> Optional[Tuple[bytes, str]]:
+        """(bytes, content type) served for an image URL, None if the corpus has no images"""
+        if not self.image_names:
+            return None
+        name = Path(urlparse(url).path).name
+        if name not in self.images:
+            name = self.image_names[_seed(url) % len(self.image_names)]
+        data = self.images[name].read_bytes()
+        self.stats['images'] += 1
+        self.stats['image_bytes'] += len(data)
+        return data, IMAGE_CONTENT_TYPES[self.images[name].suffix.lower()]
+
+
+class ApifyReplayTransport(httpx.AsyncBaseTransport):
+    """The slice of the Apify v2 API ApifyInstagramClient uses, answered from a corpus"""
+
+    def __init__(self, corpus: ScrapeReplayCorpus, run_seconds: float):
+        self.corpus = corpus
+        self.run_seconds = run_seconds
+        self.runs: Dict[str, Dict[str, Any]] = {}
+        self.datasets: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        params = request.url.params
+        if request.method == 'POST' and re.search(r'/acts/[^/]+/runs$', path):
+            run_input = json.loads(request.content or b'{}')
+            return self._json({'data': self._start_run(run_input)}, status_code=201)
+
+        match = re.search(r'/actor-runs/([^/]+)(/abort)?$', path)
+        if match and match.group(1) in self.runs:
+            run = self.runs[match.group(1)]
+            if match.group(2):
+                self._finish(run, 'ABORTED')
+            else:
+                remaining = run['_finish_at'] - time.monotonic()
+                wait = float(params.get('waitForFinish') or 0)
+                if remaining > 0 and wait > 0:
+                    await asyncio.sleep(min(remaining, wait))
+                if time.monotonic() >= run['_finish_at']:
+                    self._finish(run, 'SUCCEEDED')
+            return self._json({'data': self._public(run)})
+
+        match = re.search(r'/datasets/([^/]+)/items$', path)
+        if match and match.group(1) in self.datasets:
+            run_id, items = self.datasets[match.group(1)]
+            run = self.runs[run_id]
+            if run['status'] == 'RUNNING' and self.run_seconds > 0:
+                # Items land progressively over the run, as on Apify
+                elapsed = 1 - max(0.0, run['_finish_at'] - time.monotonic()) / self.run_seconds
+                items = items[:int(len(items) * elapsed)]
+            offset = int(params.get('offset') or 0)
+            limit = int(params.get('limit') or 1000)
+            return self._json(items[offset:offset + limit])
+
+        return self._json({'error': {'type': 'record-not-found', 'message': f"Not replayed: {path}"}}, status_code=404)
+
+    def _start_run(self, run_input: Dict[str, Any]) -> Dict[str, Any]:
+        run_id, dataset_id = uuid.uuid4().hex[:17], uuid.uuid4().hex[:17]
+        items = [item for url in run_input.get('directUrls') or [] for item in self.corpus.items_for_url(url)]
+        run = {
+            'id': run_id,
+            'status': 'RUNNING',
+            'defaultDatasetId': dataset_id,
+            'startedAt': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+            'finishedAt': None,
+            '_finish_at': time.monotonic() + self.run_seconds,
+        }
+        self.runs[run_id] = run
+        self.datasets[dataset_id] = (run_id, items)
+        return self._public(run)
+
+    @staticmethod
+    def _finish(run: Dict[str, Any], status: str):
+        if run['status'] == 'RUNNING':
+            run['status'] = status
+            run['finishedAt'] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+            run['stats'] = {'computeUnits': 0}
+            run['usageTotalUsd'] = 0
+
+    @staticmethod
+    def _public(run: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in run.items() if not k.startswith('_')}
+
+    @staticmethod
+    def _json(body: Any, status_code: int = 200) -> httpx.Response:
+        return httpx.Response(status_code, json=body)
+
+
+class ImageReplayTransport(httpx.AsyncBaseTransport):
+    """Any GET answered with a corpus image"""
+
+    def __init__(self, corpus: ScrapeReplayCorpus):
+        self.corpus = corpus
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        image = self.corpus.image_for_url(str(request.url))
+        if image is None:
+            return httpx.Response(404)
+        data, content_type = image
+        return httpx.Response(200, content=data, headers={'Content-Type': content_type})
+
+
+_corpus: Optional[ScrapeReplayCorpus] = None
+
+
+def replay_corpus() -> Optional[ScrapeReplayCorpus]:
+    """The SCRAPE_REPLAY_DIR corpus, or None when replay is off"""
+    global _corpus
+    if not settings.SCRAPE_REPLAY_DIR:
+        return None
+    if _corpus is None or _corpus.root != Path(settings.SCRAPE_REPLAY_DIR):
+        _corpus = ScrapeReplayCorpus(Path(settings.SCRAPE_REPLAY_DIR))
+        logger.info(
+            f"[SCRAPE-REPLAY] Replaying {len(_corpus.profiles)} profiles, {len(_corpus.posts)} posts "
+            f"and {len(_corpus.images)} images from {_corpus.root}"
+        )
+    return _corpus
+
+
+def apify_replay_transport() -> Optional[ApifyReplayTransport]:
+    """Transport for a new ApifyInstagramClient (None = real Apify)"""
+    corpus = replay_corpus()
+    if corpus is None:
+        return None
+    run_seconds = settings.SCRAPE_REPLAY_RUN_SECONDS
+    if run_seconds is None:
+        run_seconds = float(corpus.manifest.get('run_seconds', 0))
+    return ApifyReplayTransport(corpus, run_seconds)
+
+
+def image_replay_transport() -> Optional[ImageReplayTransport]:
+    """Transport for image-downloading httpx clients (None = real network)"""
+    corpus = replay_corpus()
+    return ImageReplayTransport(corpus) if corpus is not None else None
+
+
+def replay_image_bytes(url: str) -> Optional[bytes]:
+    """Image bytes for non-httpx download paths (None = replay off, download for real)"""
+    corpus = replay_corpus()
+    if corpus is None:
+        return None
+    image = corpus.image_for_url(url)
+    return image[0] if image else b''
+
+
+def replay_upload(key: str, content: bytes) -> Optional[bool]:
+    """Write an R2 upload under SCRAPE_REPLAY_UPLOAD_DIR (None = replay off, upload for real)"""
+    if not settings.SCRAPE_REPLAY_DIR:
+        return None
+    path = Path(settings.SCRAPE_REPLAY_UPLOAD_DIR) / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return True
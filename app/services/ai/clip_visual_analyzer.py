@@ -304,6 +304,7 @@ class CLIPVisualAnalyzer:
         """Download post images in parallel using aiohttp"""
         from PIL import Image
         import aiohttp
+        from app.scrapers.scrape_replay import replay_image_bytes
 
         async def _one(post: dict):
             url = (
@@ -314,6 +315,9 @@ class CLIPVisualAnalyzer:
             if not url:
                 return None
             try:
+                replayed = replay_image_bytes(url)  # SCRAPE_REPLAY_DIR corpus, if set
+                if replayed is not None:
+                    return Image.open(BytesIO(replayed)).convert('RGB') if replayed else None
                 timeout = aiohttp.ClientTimeout(total=10)
                 async with aiohttp.ClientSession(timeout=timeout) as session:
                     async with session.get(url) as resp:
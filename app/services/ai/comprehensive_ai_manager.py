@@ -307,10 +307,13 @@ class ComprehensiveAIManager:
             logger.error(f"Failed to initialize {model_type.value}: {e}")
             return False
     
-    async def analyze_profile_comprehensive(self, profile_id: str, profile_data: dict, posts_data: List[dict]) -> Dict[str, Any]:
+    async def analyze_profile_comprehensive(self, profile_id: str, profile_data: dict, posts_data: List[dict],
+                                            model_types: Optional[List[AIModelType]] = None) -> Dict[str, Any]:
         """
         BULLETPROOF comprehensive analysis of profile with ALL 10 AI models
         Uses industry-standard retry mechanisms to ensure COMPLETE data population
+
+        model_types restricts the run to a subset (e.g. the per-post models for a delta refresh).
         """
         job_id = str(uuid.uuid4())
         logger.info(f"[TARGET] COMPREHENSIVE ANALYSIS START: Profile {profile_id} (Job: {job_id})")
@@ -319,7 +322,7 @@ class ComprehensiveAIManager:
         job_status = {
             'job_id': job_id,
             'profile_id': profile_id,
-            'total_models': len(AIModelType),
+            'total_models': len(model_types) if model_types else len(AIModelType),
             'completed_models': 0,
             'failed_models': 0,
             'model_results': {},
@@ -342,6 +345,9 @@ class ComprehensiveAIManager:
             AIModelType.TREND_DETECTION, AIModelType.FRAUD_DETECTION,
             AIModelType.BEHAVIORAL_PATTERNS
         ]
+        if model_types:
+            group_a_models = [m for m in group_a_models if m in model_types]
+            group_b_models = [m for m in group_b_models if m in model_types]
 
         async def _run_model(model_type):
             result = await self._process_model_with_retry(
@@ -391,7 +397,7 @@ class ComprehensiveAIManager:
         
         # Final job status
         job_status['completed_at'] = datetime.now(timezone.utc)
-        job_status['success_rate'] = job_status['completed_models'] / job_status['total_models']
+        job_status['success_rate'] = job_status['completed_models'] / max(job_status['total_models'], 1)
         
         logger.info(f"🏁 COMPREHENSIVE ANALYSIS COMPLETE: Profile {profile_id}")
         logger.info(f"[ANALYTICS] Success Rate: {job_status['success_rate']:.1%} ({job_status['completed_models']}/{job_status['total_models']} models)")
@@ -142,6 +142,103 @@ class ProductionAIOrchestrator:
             analysis_results['success'] = False
             return analysis_results
 
+    async def process_new_posts_ai_analysis(self, profile_id: str, username: str, post_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delta refresh: run the per-post models (sentiment, language, category)
+        on newly stored posts only, then recompute the profile's content
+        aggregates from all stored post results. The profile-level models
+        keep their last full-analysis results.
+
+        Args:
+            profile_id: Profile UUID in database
+            username: Instagram username
+            post_ids: UUIDs of the posts to analyze
+
+        Returns:
+            {'success', 'posts_analyzed', 'completed_models', 'processing_errors'}
+        """
+        post_models = [AIModelType.SENTIMENT, AIModelType.LANGUAGE, AIModelType.CATEGORY]
+        result = {'success': False, 'posts_analyzed': 0, 'completed_models': 0, 'processing_errors': []}
+        if not post_ids:
+            result['success'] = True
+            return result
+
+        try:
+            profile_data, posts_data = await self._fetch_complete_profile_data(profile_id, post_ids=post_ids)
+            if not posts_data:
+                result['success'] = True
+                return result
+
+            ai_analysis = await self.ai_manager.analyze_profile_comprehensive(
+                profile_id=profile_id,
+                profile_data=profile_data,
+                posts_data=posts_data,
+                model_types=post_models
+            )
+            result['completed_models'] = ai_analysis['job_status']['completed_models']
+
+            from app.database.optimized_pools import optimized_pools
+            async with optimized_pools.get_background_session() as db:
+                try:
+                    await self._store_post_ai_analysis(db, posts_data, ai_analysis['analysis_results'])
+                    await self._recompute_post_ai_aggregations(db, profile_id)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+
+            result['posts_analyzed'] = len(posts_data)
+            result['success'] = result['completed_models'] == len(post_models)
+            logger.info(f"[AI-ORCHESTRATOR] Delta AI for {username}: {len(posts_data)} new posts, "
+                        f"{result['completed_models']}/{len(post_models)} models")
+            return result
+
+        except Exception as e:
+            logger.error(f"[AI-ORCHESTRATOR] Delta AI failed for {username}: {e}")
+            result['processing_errors'].append(str(e))
+            return result
+
+    async def _recompute_post_ai_aggregations(self, db: AsyncSession, profile_id: str) -> None:
+        """Rebuild the profile's content/sentiment/language aggregates from its analyzed posts"""
+        await db.execute(
+            text("""
+                WITH analyzed AS (
+                    SELECT ai_content_category, ai_sentiment_score, ai_language_code
+                    FROM posts
+                    WHERE profile_id = CAST(:profile_id AS uuid) AND ai_analyzed_at IS NOT NULL
+                ),
+                categories AS (
+                    SELECT ai_content_category AS category, COUNT(*) AS n,
+                           ROUND(COUNT(*)::numeric / SUM(COUNT(*)) OVER (), 3) AS share
+                    FROM analyzed WHERE ai_content_category IS NOT NULL
+                    GROUP BY ai_content_category
+                ),
+                languages AS (
+                    SELECT ai_language_code AS language, COUNT(*) AS n,
+                           ROUND(COUNT(*)::numeric / SUM(COUNT(*)) OVER (), 3) AS share
+                    FROM analyzed WHERE ai_language_code IS NOT NULL
+                    GROUP BY ai_language_code
+                )
+                UPDATE profiles SET
+                    ai_primary_content_type = COALESCE(
+                        (SELECT category FROM categories ORDER BY n DESC, category LIMIT 1),
+                        ai_primary_content_type),
+                    ai_content_distribution = COALESCE(
+                        (SELECT jsonb_object_agg(category, share)
+                         FROM categories),
+                        ai_content_distribution),
+                    ai_language_distribution = COALESCE(
+                        (SELECT jsonb_object_agg(language, share)
+                         FROM languages),
+                        ai_language_distribution),
+                    ai_avg_sentiment_score = COALESCE(
+                        (SELECT AVG(ai_sentiment_score) FROM analyzed),
+                        ai_avg_sentiment_score)
+                WHERE id = CAST(:profile_id AS uuid)
+            """).execution_options(prepare=False),
+            {'profile_id': str(profile_id)}
+        )
+
     async def _verify_prerequisites(self, profile_id: str) -> Dict[str, Any]:
         """
         Verify that Apify data and CDN processing are complete before AI analysis
@@ -271,12 +368,13 @@ class ProductionAIOrchestrator:
         logger.info(f"[AI-ORCHESTRATOR] {context}: Converted {len(validated_posts)}/{len(posts_data)} posts to valid format")
         return validated_posts
 
-    async def _fetch_complete_profile_data(self, profile_id: str) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    async def _fetch_complete_profile_data(self, profile_id: str, post_ids: Optional[List[str]] = None) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Fetch complete profile and posts data for AI analysis
 
         Args:
             profile_id: Profile UUID
+            post_ids: Only these posts (delta refresh); default the 100 most recent
 
         Returns:
             Tuple of (profile_data, posts_data)
@@ -313,18 +411,22 @@ class ProductionAIOrchestrator:
             }
 
             # Fetch posts data with CDN URLs
-            posts_query = text("""
+            post_filter = "AND id = ANY(CAST(:post_ids AS uuid[]))" if post_ids else ""
+            posts_query = text(f"""
                 SELECT
                     id, instagram_post_id, caption, likes_count, comments_count,
                     display_url, thumbnail_src as thumbnail_url, cdn_thumbnail_url,
                     is_video, video_view_count, posted_at, created_at
                 FROM posts
-                WHERE profile_id = :profile_id
+                WHERE profile_id = :profile_id {post_filter}
                 ORDER BY posted_at DESC
                 LIMIT 100
             """)
 
-            posts_result = await db.execute(posts_query, {'profile_id': profile_id})
+            posts_params = {'profile_id': profile_id}
+            if post_ids:
+                posts_params['post_ids'] = [str(post_id) for post_id in post_ids]
+            posts_result = await db.execute(posts_query, posts_params)
             posts_rows = posts_result.fetchall()
 
             posts_data = []
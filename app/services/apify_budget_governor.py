@@ -0,0 +1,453 @@
+"""
+Apify Budget Governor - Token-Bucket Rate and Cost Budgets for Actor Runs
+
+Every actor run goes through ApifyInstagramClient.start_run, which asks this
+governor for budget first. A run costs one token per URL it scrapes
+(directUrls), drawn from two token buckets:
+
+- the global bucket (APIFY_GLOBAL_BUDGET_PER_HOUR) shared by all tenants;
+  background job types may only drain it down to APIFY_INTERACTIVE_RESERVE
+  of its capacity, so a bulk import cannot starve interactive creator_search
+- the tenant's bucket (APIFY_TENANT_BUDGET_PER_HOUR)
+
+Buckets hold APIFY_BUDGET_BURST_MINUTES worth of budget and refill
+continuously. A call without budget is queued (sleeps until both buckets can
+pay) rather than failed; only after APIFY_BUDGET_MAX_WAIT_SECONDS does it
+raise, which the job queue turns into a delayed retry.
+
+Both budgets default to 0 (unlimited): the governor then only records
+usage. Limits are a per-environment decision, made from apify_usage.
+
+The buckets live in apify_budget_buckets, one row per scope ('global',
+'tenant:<id>'), so every API replica and worker process draws from the same
+budget: a take locks the rows, refills them by the time since their last
+update and writes them back in one transaction. While the database is
+unreachable each process falls back to its own in-memory buckets for
+SHARED_RETRY_SECONDS rather than blocking scrapes.
+
+The tenant and job type are taken from apify_usage_context(), which the
+workers set around each job - contextvars carry it down to the client
+without threading it through every call. Scrapes outside a job are charged
+to 'unattributed' and count as interactive. ApifyProfileBatcher batches
+each caller's usernames separately, so a batch run is charged to the tenant
+and job type whose profiles it scrapes.
+
+Usage is persisted per hour / tenant / job type / actor in apify_usage (runs
+and URLs when a run starts, compute units and USD when it finishes).
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tenant / job type of scrapes made outside apify_usage_context()
+UNATTRIBUTED_TENANT = 'unattributed'
+UNATTRIBUTED_JOB_TYPE = 'direct'
+
+# Job types a user is actively waiting on - they may use the interactive reserve
+INTERACTIVE_JOB_TYPES = {UNATTRIBUTED_JOB_TYPE, 'creator_search', 'post_analysis'}
+
+# Longest single sleep while queued for budget (re-checks in between)
+MAX_QUEUE_SLEEP_SECONDS = 30
+
+# apify_budget_buckets scope of the global bucket (tenants: 'tenant:<id>')
+GLOBAL_SCOPE = 'global'
+
+# Seconds on per-process buckets after the shared ones could not be reached
+SHARED_RETRY_SECONDS = 30
+
+_apify_caller: ContextVar[Tuple[str, str]] = ContextVar(
+    'apify_caller', default=(UNATTRIBUTED_TENANT, UNATTRIBUTED_JOB_TYPE)
+)
+
+
+@contextmanager
+def apify_usage_context(tenant_id: Any, job_type: Optional[str]):
+    """Charge Apify runs made inside this block to tenant_id / job_type."""
+    token = _apify_caller.set((str(tenant_id) if tenant_id else UNATTRIBUTED_TENANT, job_type or UNATTRIBUTED_JOB_TYPE))
+    try:
+        yield
+    finally:
+        _apify_caller.reset(token)
+
+
+def current_apify_caller() -> Tuple[str, str]:
+    """(tenant_id, job_type) Apify runs are currently charged to"""
+    return _apify_caller.get()
+
+
+class ApifyBudgetExhausted(Exception):
+    """Queued longer than APIFY_BUDGET_MAX_WAIT_SECONDS for Apify budget"""
+    pass
+
+
+class TokenBucket:
+    """Refills at per_hour / 3600 tokens per second up to burst_minutes of budget (per_hour 0 = unlimited)"""
+
+    def __init__(self, per_hour: float, burst_minutes: float, tokens: Optional[float] = None, clock=time.monotonic):
+        self.per_hour = per_hour
+        self.rate = per_hour / 3600.0
+        self.capacity = max(1.0, per_hour * burst_minutes / 60.0)
+        self.tokens = self.capacity if tokens is None else min(self.capacity, tokens)
+        self._clock = clock
+        self._updated = clock()
+
+    @classmethod
+    def restore(cls, per_hour: float, burst_minutes: float, tokens: float, idle_seconds: float) -> 'TokenBucket':
+        """Bucket as stored idle_seconds ago with `tokens`, refilled for the time since"""
+        bucket = cls(per_hour, burst_minutes, tokens=tokens)
+        bucket.tokens = min(bucket.capacity, tokens + max(0.0, idle_seconds) * bucket.rate)
+        return bucket
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_hour <= 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_seconds(self, cost: float, floor: float = 0.0) -> float:
+        """Seconds until cost can be taken while leaving floor tokens (0 = now)"""
+        if self.unlimited:
+            return 0.0
+        self._refill(self._clock())
+        # A run bigger than the bucket waits for a full bucket instead of forever
+        cost = min(cost, self.capacity - floor)
+        missing = cost + floor - self.tokens
+        return max(0.0, missing / self.rate) if self.rate else float('inf')
+
+    def take(self, cost: float):
+        if not self.unlimited:
+            self.tokens -= min(cost, self.capacity)
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self.unlimited:
+            return {'per_hour': 0, 'unlimited': True}
+        self._refill(self._clock())
+        return {'per_hour': self.per_hour, 'capacity': round(self.capacity, 1), 'tokens': round(self.tokens, 1)}
+
+
+class ApifyBudgetGovernor:
+    """Global and per-tenant token buckets in front of every Apify actor run, with persisted usage"""
+
+    def __init__(self):
+        self.global_per_hour = settings.APIFY_GLOBAL_BUDGET_PER_HOUR
+        self.tenant_per_hour = settings.APIFY_TENANT_BUDGET_PER_HOUR
+        self.burst_minutes = settings.APIFY_BUDGET_BURST_MINUTES
+        self.interactive_reserve = min(max(settings.APIFY_INTERACTIVE_RESERVE, 0.0), 1.0)
+        self.max_wait_seconds = settings.APIFY_BUDGET_MAX_WAIT_SECONDS
+
+        # Fallback buckets while apify_budget_buckets is unreachable. Plain lock:
+        # the API loop and each worker thread's loop share them
+        self._lock = threading.Lock()
+        self._global = TokenBucket(self.global_per_hour, self.burst_minutes)
+        self._tenants: Dict[str, TokenBucket] = {}
+        self._shared_down_until = 0.0
+        # run id -> (hour, tenant, job type, actor) of runs started, for their finish
+        self._runs: Dict[str, Tuple[datetime, str, str, str]] = {}
+        self.stats = {
+            'granted': 0, 'queued': 0, 'queued_seconds': 0.0, 'exhausted': 0,
+            'persist_errors': 0, 'shared_errors': 0, 'local_grants': 0,
+        }
+
+    def _tenant_bucket(self, tenant_id: str) -> TokenBucket:
+        bucket = self._tenants.get(tenant_id)
+        if bucket is None:
+            bucket = self._tenants[tenant_id] = TokenBucket(self.tenant_per_hour, self.burst_minutes)
+        return bucket
+
+    def _floor(self, job_type: str, bucket: TokenBucket) -> float:
+        """Tokens a job type must leave in the global bucket"""
+        return 0.0 if job_type in INTERACTIVE_JOB_TYPES else bucket.capacity * self.interactive_reserve
+
+    async def acquire(self, cost: int) -> float:
+        """
+        Wait until the current tenant and the global bucket can pay cost
+        tokens, then take them. Returns the seconds spent queued. Raises
+        ApifyBudgetExhausted after APIFY_BUDGET_MAX_WAIT_SECONDS.
+        """
+        tenant_id, job_type = current_apify_caller()
+        cost = max(1, cost)
+
+        started = time.monotonic()
+        announced = False
+        while True:
+            wait = await self._try_take(tenant_id, job_type, cost)
+            if wait <= 0:
+                waited = time.monotonic() - started
+                self.stats['granted'] += 1
+                self.stats['queued_seconds'] += waited
+                return waited
+
+            waited = time.monotonic() - started
+            if waited + wait > self.max_wait_seconds:
+                self.stats['exhausted'] += 1
+                raise ApifyBudgetExhausted(
+                    f"Apify budget exhausted for tenant {tenant_id} ({job_type}): "
+                    f"{cost} URLs need ~{wait:.0f}s more after queueing {waited:.0f}s"
+                )
+            if not announced:
+                announced = True
+                self.stats['queued'] += 1
+                logger.info(f"[APIFY-BUDGET] Queued {job_type} run of {cost} URLs for tenant {tenant_id} (~{wait:.0f}s)")
+            await asyncio.sleep(min(wait, MAX_QUEUE_SLEEP_SECONDS))
+
+    def _limits(self, tenant_id: str) -> Dict[str, float]:
+        """Scope -> per-hour budget of the buckets a tenant's run draws from (unlimited ones left out)"""
+        limits = {}
+        if self.global_per_hour > 0:
+            limits[GLOBAL_SCOPE] = self.global_per_hour
+        if self.tenant_per_hour > 0:
+            limits[f"tenant:{tenant_id}"] = self.tenant_per_hour
+        return limits
+
+    async def _try_take(self, tenant_id: str, job_type: str, cost: int) -> float:
+        """Take cost from both buckets if they can pay now (returns 0), else the seconds to wait."""
+        limits = self._limits(tenant_id)
+        if not limits:
+            return 0.0
+        if time.monotonic() >= self._shared_down_until:
+            try:
+                return await self._try_take_shared(limits, job_type, cost)
+            except Exception as e:
+                self._shared_down_until = time.monotonic() + SHARED_RETRY_SECONDS
+                self.stats['shared_errors'] += 1
+                logger.warning(
+                    f"[APIFY-BUDGET] Shared budget unavailable, using per-process buckets "
+                    f"for {SHARED_RETRY_SECONDS}s: {e}"
+                )
+
+        with self._lock:
+            tenant = self._tenant_bucket(tenant_id)
+            wait = max(self._global.wait_seconds(cost, self._floor(job_type, self._global)), tenant.wait_seconds(cost))
+            if wait <= 0:
+                self._global.take(cost)
+                tenant.take(cost)
+                self.stats['local_grants'] += 1
+            return wait
+
+    async def _try_take_shared(self, limits: Dict[str, float], job_type: str, cost: int) -> float:
+        """_try_take against apify_budget_buckets - the rows stay locked until the take is written back"""
+        from app.database.optimized_pools import optimized_pools
+
+        scopes = sorted(limits)
+        async with optimized_pools.get_background_session() as db:
+            # Missing rows start full; rows are locked in scope order so concurrent takes cannot deadlock
+            await db.execute(
+                text("""
+                    INSERT INTO apify_budget_buckets (scope, tokens, updated_at)
+                    SELECT b.scope, b.tokens, NOW()
+                    FROM unnest(CAST(:scopes AS text[]), CAST(:capacities AS double precision[])) AS b(scope, tokens)
+                    ORDER BY b.scope
+                    ON CONFLICT (scope) DO NOTHING
+                """).execution_options(prepare=False),
+                {
+                    'scopes': scopes,
+                    'capacities': [TokenBucket(limits[scope], self.burst_minutes).capacity for scope in scopes],
+                }
+            )
+            rows = await db.execute(
+                text("""
+                    SELECT scope, tokens, EXTRACT(EPOCH FROM NOW() - updated_at) AS idle_seconds
+                    FROM apify_budget_buckets
+                    WHERE scope = ANY(CAST(:scopes AS text[]))
+                    ORDER BY scope
+                    FOR UPDATE
+                """).execution_options(prepare=False),
+                {'scopes': scopes}
+            )
+            buckets = {
+                row.scope: TokenBucket.restore(
+                    limits[row.scope], self.burst_minutes, float(row.tokens), float(row.idle_seconds or 0)
+                )
+                for row in rows.fetchall()
+            }
+
+            wait = max(
+                bucket.wait_seconds(cost, self._floor(job_type, bucket) if scope == GLOBAL_SCOPE else 0.0)
+                for scope, bucket in buckets.items()
+            )
+            if wait > 0:
+                await db.rollback()
+                return wait
+
+            for bucket in buckets.values():
+                bucket.take(cost)
+            await db.execute(
+                text("""
+                    UPDATE apify_budget_buckets b
+                    SET tokens = v.tokens, updated_at = NOW()
+                    FROM unnest(CAST(:scopes AS text[]), CAST(:tokens AS double precision[])) AS v(scope, tokens)
+                    WHERE b.scope = v.scope
+                """).execution_options(prepare=False),
+                {'scopes': list(buckets), 'tokens': [bucket.tokens for bucket in buckets.values()]}
+            )
+            await db.commit()
+            return 0.0
+
+    async def record_run_started(self, run_id: str, actor_id: str, cost: int, waited_seconds: float):
+        tenant_id, job_type = current_apify_caller()
+        hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        self._runs[run_id] = (hour, tenant_id, job_type, actor_id)
+        await self._persist(hour, tenant_id, job_type, actor_id, runs=1, scraped_urls=cost, wait=waited_seconds)
+
+    async def record_run_finished(self, run: Dict[str, Any]):
+        """Add a finished (or aborted) run's compute units and cost to the hour it started in."""
+        started = self._runs.pop(run.get('id'), None)
+        if not started:
+            return
+        compute_units = float((run.get('stats') or {}).get('computeUnits') or 0)
+        usage_usd = float(run.get('usageTotalUsd') or 0)
+        if compute_units or usage_usd:
+            await self._persist(*started, compute_units=compute_units, usage_usd=usage_usd)
+
+    def forget_run(self, run_id: str):
+        """Run abandoned without a final run object - nothing more to record"""
+        self._runs.pop(run_id, None)
+
+    async def _persist(
+        self, hour: datetime, tenant_id: str, job_type: str, actor_id: str, runs: int = 0,
+        scraped_urls: int = 0, compute_units: float = 0.0, usage_usd: float = 0.0, wait: float = 0.0
+    ):
+        """Add to the hour's usage row - never fails the scrape"""
+        from app.database.optimized_pools import optimized_pools
+
+        try:
+            async with optimized_pools.get_background_session() as db:
+                await db.execute(
+                    text("""
+                        INSERT INTO apify_usage (
+                            hour, tenant_id, job_type, actor_id, runs, scraped_urls,
+                            compute_units, usage_usd, budget_wait_seconds
+                        ) VALUES (
+                            :hour, :tenant_id, :job_type, :actor_id, :runs, :scraped_urls,
+                            CAST(:compute_units AS double precision), CAST(:usage_usd AS double precision),
+                            CAST(:wait AS double precision)
+                        )
+                        ON CONFLICT (hour, tenant_id, job_type, actor_id) DO UPDATE SET
+                            runs = apify_usage.runs + EXCLUDED.runs,
+                            scraped_urls = apify_usage.scraped_urls + EXCLUDED.scraped_urls,
+                            compute_units = apify_usage.compute_units + EXCLUDED.compute_units,
+                            usage_usd = apify_usage.usage_usd + EXCLUDED.usage_usd,
+                            budget_wait_seconds = apify_usage.budget_wait_seconds + EXCLUDED.budget_wait_seconds,
+                            updated_at = NOW()
+                    """).execution_options(prepare=False),
+                    {
+                        'hour': hour, 'tenant_id': tenant_id, 'job_type': job_type, 'actor_id': actor_id,
+                        'runs': runs, 'scraped_urls': scraped_urls, 'compute_units': compute_units,
+                        'usage_usd': usage_usd, 'wait': wait,
+                    }
+                )
+                await db.commit()
+        except Exception as e:
+            self.stats['persist_errors'] += 1
+            logger.warning(f"[APIFY-BUDGET] Could not persist usage for tenant {tenant_id}: {e}")
+
+    async def get_usage(self, db, hours: int = 24) -> Dict[str, Any]:
+        """Spend per tenant over the last `hours` and month to date, plus the live buckets."""
+        rows = await db.execute(
+            text("""
+                WITH per_job_type AS (
+                    SELECT
+                        tenant_id,
+                        job_type,
+                        SUM(runs) FILTER (WHERE hour >= NOW() - make_interval(hours => :hours)) AS runs,
+                        SUM(scraped_urls) FILTER (WHERE hour >= NOW() - make_interval(hours => :hours)) AS scraped_urls,
+                        SUM(compute_units) FILTER (WHERE hour >= NOW() - make_interval(hours => :hours)) AS compute_units,
+                        SUM(usage_usd) FILTER (WHERE hour >= NOW() - make_interval(hours => :hours)) AS usage_usd,
+                        SUM(budget_wait_seconds) FILTER (WHERE hour >= NOW() - make_interval(hours => :hours)) AS budget_wait_seconds,
+                        SUM(compute_units) FILTER (WHERE hour >= date_trunc('month', NOW())) AS month_compute_units,
+                        SUM(usage_usd) FILTER (WHERE hour >= date_trunc('month', NOW())) AS month_usage_usd
+                    FROM apify_usage
+                    WHERE hour >= LEAST(date_trunc('month', NOW()), NOW() - make_interval(hours => :hours))
+                    GROUP BY tenant_id, job_type
+                )
+                SELECT
+                    p.tenant_id,
+                    MAX(u.email) AS email,
+                    SUM(p.runs) AS runs,
+                    SUM(p.scraped_urls) AS scraped_urls,
+                    SUM(p.compute_units) AS compute_units,
+                    SUM(p.usage_usd) AS usage_usd,
+                    SUM(p.budget_wait_seconds) AS budget_wait_seconds,
+                    SUM(p.month_compute_units) AS month_compute_units,
+                    SUM(p.month_usage_usd) AS month_usage_usd,
+                    jsonb_object_agg(p.job_type, ROUND(COALESCE(p.month_usage_usd, 0)::numeric, 4)) AS usd_by_job_type
+                FROM per_job_type p
+                LEFT JOIN users u ON u.id::text = p.tenant_id
+                GROUP BY p.tenant_id
+                ORDER BY SUM(p.month_usage_usd) DESC NULLS LAST, SUM(p.compute_units) DESC NULLS LAST
+            """).execution_options(prepare=False),
+            {'hours': hours}
+        )
+        tenants = [
+            {
+                'tenant_id': row.tenant_id,
+                'email': row.email,
+                'runs': int(row.runs or 0),
+                'scraped_urls': int(row.scraped_urls or 0),
+                'compute_units': round(float(row.compute_units or 0), 4),
+                'usage_usd': round(float(row.usage_usd or 0), 4),
+                'budget_wait_seconds': round(float(row.budget_wait_seconds or 0), 1),
+                'month_compute_units': round(float(row.month_compute_units or 0), 4),
+                'month_usage_usd': round(float(row.month_usage_usd or 0), 4),
+                'month_usd_by_job_type': row.usd_by_job_type or {},
+            }
+            for row in rows.fetchall()
+        ]
+        return {
+            'window_hours': hours,
+            'tenants': tenants,
+            'totals': {
+                key: round(sum(t[key] for t in tenants), 4)
+                for key in ('runs', 'scraped_urls', 'compute_units', 'usage_usd', 'month_compute_units', 'month_usage_usd')
+            },
+            'budgets': {**self.get_stats(), 'shared': await self._shared_buckets(db)},
+        }
+
+    async def _shared_buckets(self, db) -> Dict[str, Any]:
+        """Current level of every shared bucket below capacity, refilled to now"""
+        rows = await db.execute(
+            text("""
+                SELECT scope, tokens, EXTRACT(EPOCH FROM NOW() - updated_at) AS idle_seconds
+                FROM apify_budget_buckets
+                ORDER BY scope
+            """).execution_options(prepare=False)
+        )
+        buckets = {}
+        for row in rows.fetchall():
+            per_hour = self.global_per_hour if row.scope == GLOBAL_SCOPE else self.tenant_per_hour
+            if per_hour <= 0:
+                continue
+            bucket = TokenBucket.restore(per_hour, self.burst_minutes, float(row.tokens), float(row.idle_seconds or 0))
+            if row.scope == GLOBAL_SCOPE or bucket.tokens < bucket.capacity - 1:
+                buckets[row.scope] = bucket.snapshot()
+        return buckets
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters of this process and its fallback buckets (shared buckets: get_usage)"""
+        with self._lock:
+            return {
+                **self.stats,
+                'queued_seconds': round(self.stats['queued_seconds'], 1),
+                'global_per_hour': self.global_per_hour,
+                'tenant_per_hour': self.tenant_per_hour,
+                'interactive_reserve': self.interactive_reserve,
+                'shared_available': time.monotonic() >= self._shared_down_until,
+                'fallback_global': self._global.snapshot(),
+            }
+
+
+# Global instance
+apify_budget_governor = ApifyBudgetGovernor()
@@ -0,0 +1,230 @@
+"""
+Apify Profile Batcher - Many Usernames, One Actor Run
+
+Every profile fetch used to start its own instagram-scraper run, paying the
+actor start-up cost once per username. fetch_profile() instead parks the
+request for APIFY_BATCH_WINDOW_SECONDS; everything that arrives in that
+window (up to BATCH_MAX_PROFILES usernames) is submitted as ONE run whose
+profiles are streamed back and fanned out to the waiting callers as they
+land in the dataset.
+
+- Concurrent fetches of the same username share a single result.
+- Errors are per username: a private, missing or malformed profile only
+  fails its own callers. If the batched run fails as a whole, its profiles
+  are retried one run per username with the client's normal retry logic.
+- The raw scrape cache is checked before a username joins a batch; batched
+  runs themselves always scrape (max_age_minutes=0) and refill the cache.
+- State is per event loop - the API and the worker thread each batch their
+  own requests.
+- Only background job types are batched. A job type a user is waiting on
+  (INTERACTIVE_JOB_TYPES, e.g. creator_search) starts its own run at once:
+  batches never mix callers, so for a single user's search the window would
+  only add latency without saving a run.
+- Batches are per Apify caller (tenant and job type, apify_usage_context):
+  a run is charged to the budget and usage of the caller whose usernames it
+  scrapes, never to whichever tenant happened to open it. A username already
+  in flight for another caller is still shared - the scrape is charged once,
+  to the caller that requested it first.
+"""
+import asyncio
+import copy
+import logging
+import weakref
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.core.config import settings
+from app.scrapers.apify_instagram_client import (
+    ApifyInstagramClient,
+    ApifyAPIError,
+    ApifyBatchRunError,
+    BATCH_MAX_PROFILES,
+)
+from app.services.apify_budget_governor import (
+    INTERACTIVE_JOB_TYPES,
+    apify_usage_context,
+    current_apify_caller,
+)
+
+logger = logging.getLogger(__name__)
+
+# Parallel single-username runs when a batched run has to be retried
+FALLBACK_CONCURRENCY = 5
+
+
+class _LoopBatches:
+    """Open batches (one per Apify caller) and in-flight futures of one event loop"""
+
+    def __init__(self):
+        self.open: Dict[Tuple[str, str], List[str]] = {}
+        self.futures: Dict[str, asyncio.Future] = {}
+        self.timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self.tasks = set()
+
+
+class ApifyProfileBatcher:
+    """Coalesces profile fetches into batched Apify actor runs"""
+
+    def __init__(self, window_seconds: Optional[float] = None, max_batch: int = BATCH_MAX_PROFILES):
+        self.window_seconds = settings.APIFY_BATCH_WINDOW_SECONDS if window_seconds is None else window_seconds
+        self.max_batch = max(1, max_batch)
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopBatches]" = weakref.WeakKeyDictionary()
+        self.stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'coalesced': 0,
+            'interactive': 0,
+            'batch_runs': 0,
+            'single_runs': 0,
+            'profiles_batched': 0,
+            'fallback_profiles': 0,
+        }
+
+    @staticmethod
+    def normalize_username(username: str) -> str:
+        return (username or '').strip().lstrip('@').lower()
+
+    async def fetch_profile(self, username: str, max_age_minutes: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Same result and exceptions as
+        ApifyInstagramClient.get_instagram_profile_comprehensive(username, max_age_minutes).
+        """
+        key = self.normalize_username(username)
+        self.stats['requests'] += 1
+        cached = await ApifyInstagramClient(settings.APIFY_API_TOKEN).get_cached_profile(key, max_age_minutes)
+        if cached:
+            self.stats['cache_hits'] += 1
+            return cached
+        if self.window_seconds <= 0 or self.max_batch == 1:
+            return await self._fetch_single(key)
+
+        loop = asyncio.get_running_loop()
+        batches = self._loops.get(loop)
+        if batches is None:
+            batches = self._loops[loop] = _LoopBatches()
+
+        caller = current_apify_caller()
+        interactive = caller[1] in INTERACTIVE_JOB_TYPES
+        if interactive:
+            self.stats['interactive'] += 1
+
+        future = batches.futures.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            if interactive:
+                # Waiting in a background batch: start that batch now
+                for batch_caller, batch in list(batches.open.items()):
+                    if key in batch:
+                        self._flush(batches, batch_caller)
+        else:
+            future = loop.create_future()
+            # Nobody may be left to retrieve the exception if every caller was cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            batches.futures[key] = future
+            if interactive:
+                self._start(batches, {key: future}, caller)
+            else:
+                batch = batches.open.setdefault(caller, [])
+                batch.append(key)
+                if len(batch) >= self.max_batch:
+                    self._flush(batches, caller)
+                elif caller not in batches.timers:
+                    batches.timers[caller] = loop.call_later(self.window_seconds, self._flush, batches, caller)
+
+        # Shielded: one caller's cancellation must not fail the others
+        result = await asyncio.shield(future)
+        return copy.deepcopy(result)
+
+    def _flush(self, batches: _LoopBatches, caller: Tuple[str, str]):
+        timer = batches.timers.pop(caller, None)
+        if timer is not None:
+            timer.cancel()
+        usernames = batches.open.pop(caller, [])
+        if not usernames:
+            return
+        self._start(batches, {key: batches.futures[key] for key in usernames}, caller)
+
+    def _start(self, batches: _LoopBatches, owned: Dict[str, asyncio.Future], caller: Tuple[str, str]):
+        task = asyncio.get_running_loop().create_task(self._run_batch(batches, owned, caller))
+        batches.tasks.add(task)
+        task.add_done_callback(batches.tasks.discard)
+
+    @staticmethod
+    def _resolve(
+        batches: _LoopBatches,
+        owned: Dict[str, asyncio.Future],
+        key: str,
+        result: Any = None,
+        error: Optional[BaseException] = None
+    ):
+        future = owned.get(key)
+        if future is None or future.done():
+            return
+        # A later fetch of the same username may already have its own future
+        if batches.futures.get(key) is future:
+            del batches.futures[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def _run_batch(self, batches: _LoopBatches, owned: Dict[str, asyncio.Future], caller: Tuple[str, str]):
+        with apify_usage_context(*caller):
+            await self._scrape_batch(batches, owned)
+
+    async def _scrape_batch(self, batches: _LoopBatches, owned: Dict[str, asyncio.Future]):
+        usernames = list(owned)
+        retry_single: List[str] = []
+        try:
+            if len(usernames) == 1:
+                retry_single = usernames
+            else:
+                self.stats['batch_runs'] += 1
+                self.stats['profiles_batched'] += len(usernames)
+                logger.info(f"[APIFY-BATCH] One actor run for {len(usernames)} profiles")
+                try:
+                    async with ApifyInstagramClient(settings.APIFY_API_TOKEN) as client:
+                        async for username, result, error in client.iter_profiles_batch(usernames, max_age_minutes=0):
+                            key = self.normalize_username(username)
+                            if isinstance(error, ApifyBatchRunError):
+                                retry_single.append(key)
+                            else:
+                                self._resolve(batches, owned, key, result, error)
+                except Exception as e:
+                    logger.warning(f"[APIFY-BATCH] Batched run failed, retrying profiles one by one: {e}")
+                    retry_single = [key for key in usernames if not owned[key].done()]
+                if retry_single:
+                    self.stats['fallback_profiles'] += len(retry_single)
+
+            semaphore = asyncio.Semaphore(FALLBACK_CONCURRENCY)
+
+            async def fetch_one(key: str):
+                async with semaphore:
+                    try:
+                        self._resolve(batches, owned, key, await self._fetch_single(key))
+                    except Exception as e:
+                        self._resolve(batches, owned, key, error=e)
+
+            await asyncio.gather(*(fetch_one(key) for key in retry_single))
+        finally:
+            # Nothing may be left waiting - e.g. the task was cancelled on shutdown
+            for key in usernames:
+                self._resolve(batches, owned, key, error=ApifyAPIError(f"Profile fetch for {key} was not completed"))
+
+    async def _fetch_single(self, username: str) -> Dict[str, Any]:
+        self.stats['single_runs'] += 1
+        async with ApifyInstagramClient(settings.APIFY_API_TOKEN) as client:
+            # Cache already checked by fetch_profile
+            return await client.get_instagram_profile_comprehensive(username, max_age_minutes=0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'window_seconds': self.window_seconds,
+            'max_batch': self.max_batch,
+            'queued_profiles': sum(len(batch) for b in list(self._loops.values()) for batch in list(b.open.values())),
+            'in_flight': sum(len(b.futures) for b in list(self._loops.values())),
+        }
+
+
+# Global instance
+apify_profile_batcher = ApifyProfileBatcher()
@@ -220,7 +220,42 @@ class CDNImageService:
                 jobs_created=0,
                 error=str(e)
             )
-    
+
+    async def enqueue_post_assets(self, profile_id: UUID, posts: List[Dict[str, Any]],
+                                  db: AsyncSession = None) -> EnqueueResult:
+        """Enqueue thumbnails of specific posts only (delta refresh - avatar and known posts are skipped)"""
+        session = db or self.db
+        if not session:
+            return EnqueueResult(success=False, jobs_created=0, error="No database session")
+
+        jobs_created = 0
+        errors = []
+        for post in posts:
+            display_url = post.get('display_url')
+            media_id = post.get('instagram_post_id')
+            if not display_url or not media_id:
+                continue
+            try:
+                await self._enqueue_asset(
+                    source_type='post_thumbnail',
+                    source_id=profile_id,
+                    media_id=media_id,
+                    source_url=display_url,
+                    priority=5,
+                    _session=session
+                )
+                jobs_created += 1
+            except Exception as e:
+                errors.append(f"{media_id}: {e}")
+
+        logger.info(f"[SUCCESS] Enqueued {jobs_created} new post thumbnails for profile {profile_id}")
+        return EnqueueResult(
+            success=not errors,
+            jobs_created=jobs_created,
+            message=f"Enqueued {jobs_created} post thumbnails",
+            error="; ".join(errors)
+        )
+
     async def _enqueue_asset(self, source_type: str, source_id: UUID,
                            media_id: str, source_url: str, priority: int = 5,
                            _session=None) -> Optional[UUID]:
@@ -684,8 +719,11 @@ class CDNImageService:
 
             # Download image from Instagram
             logger.info(f"[IMMEDIATE] Downloading image from Instagram...")
+            from app.scrapers.scrape_replay import image_replay_transport
             timeout = httpx.Timeout(30.0, connect=10.0)
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+            async with httpx.AsyncClient(
+                timeout=timeout, follow_redirects=True, transport=image_replay_transport()
+            ) as client:
                 response = await client.get(source_url)
                 if response.status_code != 200:
                     raise Exception(f"Failed to download: HTTP {response.status_code}")
@@ -12,12 +12,15 @@ from sqlalchemy import select, func
 
 from app.database.unified_models import Profile, Post
 from app.database.comprehensive_service import ComprehensiveDataService
-from app.scrapers.apify_instagram_client import ApifyInstagramClient
+from app.services.apify_profile_batcher import apify_profile_batcher
 from app.services.unified_background_processor import unified_background_processor
-from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# A delta refresh only re-runs the per-post AI models; profiles whose full
+# analysis is older than this get a full refresh instead
+DELTA_FULL_REFRESH_DAYS = 30
+
 
 class CreatorAnalyticsTriggerService:
     """
@@ -42,7 +45,8 @@ class CreatorAnalyticsTriggerService:
         db: AsyncSession,
         force_refresh: bool = False,
         is_background_discovery: bool = False,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        max_age_minutes: Optional[float] = None
     ) -> Tuple[Optional[Profile], Dict[str, Any]]:
         """
         Trigger FULL creator analytics with complete rules
@@ -52,10 +56,16 @@ class CreatorAnalyticsTriggerService:
             db: Database session
             force_refresh: Force fresh fetch even if data exists
             is_background_discovery: True if this is background discovery processing (prevents further discovery)
+            max_age_minutes: Oldest raw Apify scrape reused from the scrape cache (0 = always scrape;
+                None = 0 with force_refresh, else SCRAPE_CACHE_DEFAULT_MAX_AGE_MINUTES)
 
         Returns:
             Tuple of (Profile object, metadata dict)
         """
+        if force_refresh and max_age_minutes is None:
+            # A forced refresh reuses a cached scrape only if the caller opts in
+            max_age_minutes = 0
+
         try:
             logger.info(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
             logger.info(f"🚀 FULL CREATOR ANALYTICS TRIGGERED: {username}")
@@ -133,8 +143,8 @@ class CreatorAnalyticsTriggerService:
             if progress_callback:
                 await progress_callback("apify_fetching", "Fetching Instagram data via APIFY...", 20)
 
-            async with ApifyInstagramClient(settings.APIFY_API_TOKEN) as apify_client:
-                apify_data = await apify_client.get_instagram_profile_comprehensive(username)
+            # Batched with other profile fetches arriving at the same time (one actor run)
+            apify_data = await apify_profile_batcher.fetch_profile(username, max_age_minutes=max_age_minutes)
 
             if not apify_data:
                 logger.error(f"❌ Apify returned no data for {username}")
@@ -233,6 +243,100 @@ class CreatorAnalyticsTriggerService:
                 "error": str(e)
             }
 
+    async def refresh_creator_delta(
+        self,
+        username: str,
+        db: AsyncSession,
+        max_age_minutes: Optional[float] = None
+    ) -> Tuple[Optional[Profile], Dict[str, Any]]:
+        """
+        Incremental refresh of an already-analyzed creator (nightly roster refresh)
+
+        Scrapes the profile, updates its counters, diffs the recent posts by
+        shortcode against stored posts and sends only NEW posts through CDN and
+        the per-post AI models. Falls back to trigger_full_creator_analytics
+        (force_refresh) for profiles without stored posts or AI analysis, or
+        whose last full analysis is older than DELTA_FULL_REFRESH_DAYS.
+
+        Returns:
+            Tuple of (Profile object, metadata dict)
+        """
+        profile_result = await db.execute(select(Profile).where(Profile.username == username))
+        existing_profile = profile_result.scalar_one_or_none()
+
+        reason_full = None
+        if not existing_profile:
+            reason_full = "Profile not in database"
+        elif existing_profile.ai_profile_analyzed_at is None:
+            reason_full = "Missing AI analysis"
+        elif datetime.now(timezone.utc) - existing_profile.ai_profile_analyzed_at > timedelta(days=DELTA_FULL_REFRESH_DAYS):
+            reason_full = f"AI analysis older than {DELTA_FULL_REFRESH_DAYS} days"
+        else:
+            posts_count_result = await db.execute(
+                select(func.count(Post.id)).where(Post.profile_id == existing_profile.id)
+            )
+            if not posts_count_result.scalar():
+                reason_full = "No posts stored"
+
+        if reason_full:
+            logger.info(f"[DELTA] Full refresh for {username}: {reason_full}")
+            return await self.trigger_full_creator_analytics(
+                username, db, force_refresh=True, is_background_discovery=True,
+                max_age_minutes=max_age_minutes
+            )
+
+        profile_id = existing_profile.id
+        try:
+            apify_data = await apify_profile_batcher.fetch_profile(username, max_age_minutes=max_age_minutes)
+            if not apify_data:
+                raise ValueError("Apify returned no data")
+
+            delta = await self.comprehensive_service.store_profile_delta(db, profile_id, apify_data)
+        except Exception as e:
+            logger.error(f"[DELTA] Refresh failed for {username}: {e}")
+            await db.rollback()
+            return existing_profile, {
+                "source": "database_fallback",
+                "is_full_analytics": False,
+                "error": str(e)
+            }
+
+        new_posts = delta['new_posts']
+        logger.info(f"[DELTA] {username}: {len(new_posts)} new, {delta['updated_posts']} updated, "
+                    f"{delta['removed_posts']} removed posts")
+
+        if new_posts:
+            try:
+                from app.database.optimized_pools import optimized_pools
+                from app.services.cdn_image_service import cdn_image_service
+                from app.services.ai.production_ai_orchestrator import production_ai_orchestrator
+
+                async with optimized_pools.get_background_session() as cdn_db:
+                    cdn_result = await cdn_image_service.enqueue_post_assets(profile_id, new_posts, cdn_db)
+                if not cdn_result.success:
+                    logger.warning(f"[DELTA] CDN enqueue incomplete for {username}: {cdn_result.error}")
+
+                ai_result = await production_ai_orchestrator.process_new_posts_ai_analysis(
+                    str(profile_id), username, [post['id'] for post in new_posts]
+                )
+                if not ai_result['success']:
+                    logger.warning(f"[DELTA] Per-post AI incomplete for {username}: {ai_result['processing_errors']}")
+            except Exception as processing_error:
+                # Don't fail - counters and posts are already stored
+                logger.error(f"[DELTA] New-post processing failed for {username}: {processing_error}")
+
+        await db.refresh(existing_profile)
+        return existing_profile, {
+            "source": "apify_delta",
+            "is_full_analytics": True,
+            "is_new_profile": False,
+            "followers_count": existing_profile.followers_count,
+            "posts_count": existing_profile.posts_count,
+            "new_posts": len(new_posts),
+            "updated_posts": delta['updated_posts'],
+            "removed_posts": delta['removed_posts']
+        }
+
     async def _process_with_progress_tracking(
         self,
         profile_id: str,
@@ -0,0 +1,228 @@
+"""
+Creator Search Single-Flight - Cross-User Pipeline Coalescing
+Ensures only ONE Apify + CDN + AI pipeline runs per Instagram handle at a time.
+
+The first creator_search job for a handle becomes the OWNER and runs the full
+pipeline. Jobs for the same handle that start while the owner is running
+attach as FOLLOWERS and return immediately (freeing their worker slot). When
+the owner finishes it runs the cheap per-user step (auto-unlock, credit
+charge, notification) for every follower.
+
+State lives in the creator_search_flights table so it works across worker
+replicas; every transition is a single atomic statement. A flight records
+only its owner job, status and profile - late joiners read the owner job's
+stored result rather than a copy of the pipeline output.
+"""
+import logging
+from typing import Dict, Any, List
+
+from sqlalchemy import text
+
+from app.database.optimized_pools import optimized_pools
+from app.services.job_result_store import job_result_store
+
+logger = logging.getLogger(__name__)
+
+# A completed flight is reused by late joiners for this long
+COMPLETED_FLIGHT_REUSE_MINUTES = 10
+
+
+class CreatorSearchSingleFlight:
+    """Owner/follower registry for creator_search jobs keyed by username"""
+
+    ROLE_OWNER = 'owner'
+    ROLE_FOLLOWER = 'follower'
+    ROLE_COMPLETED = 'completed'
+
+    @staticmethod
+    def normalize_username(username: str) -> str:
+        return (username or '').strip().lstrip('@').lower()
+
+    async def join(self, username: str, job_id: str) -> Dict[str, Any]:
+        """
+        Join the flight for `username`.
+
+        Returns a dict with 'role':
+        - 'owner': caller must run the pipeline, then complete() or fail()
+        - 'follower': owner is running; caller should return and wait to be finalized
+        - 'completed': a flight finished moments ago; 'profile_id' and the
+          owner's 'processing_results' (None until the owner job has stored
+          its result) are included so the caller can run its per-user step
+        """
+        key = self.normalize_username(username)
+
+        async with optimized_pools.get_background_session() as db:
+            # Take ownership if there is no flight, the flight is ours (retry),
+            # it failed, it completed too long ago, or its owner is no longer alive
+            owner_r = await db.execute(text(f"""
+                INSERT INTO creator_search_flights
+                    (username, owner_job_id, status, follower_job_ids, started_at, updated_at)
+                VALUES (:username, CAST(:job_id AS uuid), 'running', '{{}}', NOW(), NOW())
+                ON CONFLICT (username) DO UPDATE SET
+                    owner_job_id = EXCLUDED.owner_job_id,
+                    status = 'running',
+                    profile_id = NULL,
+                    error = NULL,
+                    follower_job_ids = array_remove(creator_search_flights.follower_job_ids, EXCLUDED.owner_job_id),
+                    started_at = NOW(),
+                    completed_at = NULL,
+                    updated_at = NOW()
+                WHERE creator_search_flights.owner_job_id = EXCLUDED.owner_job_id
+                   OR creator_search_flights.status = 'failed'
+                   OR (creator_search_flights.status = 'completed'
+                       AND creator_search_flights.completed_at < NOW() - INTERVAL '{COMPLETED_FLIGHT_REUSE_MINUTES} minutes')
+                   OR (creator_search_flights.status = 'running'
+                       AND NOT EXISTS (
+                           SELECT 1 FROM job_queue j
+                           WHERE j.id = creator_search_flights.owner_job_id
+                           AND j.status = 'processing'
+                       ))
+                RETURNING owner_job_id
+            """).execution_options(prepare=False), {'username': key, 'job_id': job_id})
+            owner_row = owner_r.fetchone()
+            await db.commit()
+
+            if owner_row:
+                logger.info(f"[SINGLE-FLIGHT] Job {job_id} owns pipeline for @{key}")
+                return {'role': self.ROLE_OWNER, 'owner_job_id': job_id}
+
+            # Someone else owns it - attach as a follower while it is still running
+            follow_r = await db.execute(text("""
+                UPDATE creator_search_flights
+                SET follower_job_ids = CASE
+                        WHEN CAST(:job_id AS uuid) = ANY(follower_job_ids) THEN follower_job_ids
+                        ELSE array_append(follower_job_ids, CAST(:job_id AS uuid))
+                    END,
+                    updated_at = NOW()
+                WHERE username = :username
+                AND status = 'running'
+                RETURNING owner_job_id
+            """).execution_options(prepare=False), {'username': key, 'job_id': job_id})
+            follow_row = follow_r.fetchone()
+            await db.commit()
+
+            if follow_row:
+                owner_job_id = str(follow_row.owner_job_id)
+                logger.info(f"[SINGLE-FLIGHT] Job {job_id} following owner {owner_job_id} for @{key}")
+                return {'role': self.ROLE_FOLLOWER, 'owner_job_id': owner_job_id}
+
+            # Owner finished between the two statements - reuse its result
+            done_r = await db.execute(text("""
+                SELECT f.owner_job_id, f.profile_id, j.result, j.result_ref
+                FROM creator_search_flights f
+                LEFT JOIN job_queue j
+                    ON j.id = f.owner_job_id
+                    AND j.status = 'completed'
+                WHERE f.username = :username
+                AND f.status = 'completed'
+                AND f.profile_id IS NOT NULL
+            """).execution_options(prepare=False), {'username': key})
+            done_row = done_r.fetchone()
+
+        if done_row:
+            logger.info(f"[SINGLE-FLIGHT] Job {job_id} reusing completed pipeline for @{key}")
+            processing_results = None
+            try:
+                owner_result = await job_result_store.resolve(done_row.result, done_row.result_ref)
+                if isinstance(owner_result, dict):
+                    processing_results = owner_result.get('processing_results')
+            except Exception as e:
+                logger.warning(f"[SINGLE-FLIGHT] Could not read owner result for @{key}: {e}")
+            return {
+                'role': self.ROLE_COMPLETED,
+                'owner_job_id': str(done_row.owner_job_id),
+                'profile_id': str(done_row.profile_id),
+                'processing_results': processing_results,
+            }
+
+        # Flight vanished or changed state under us - run the pipeline uncoordinated
+        logger.warning(f"[SINGLE-FLIGHT] Could not join flight for @{key}, running job {job_id} standalone")
+        return {'role': self.ROLE_OWNER, 'owner_job_id': job_id}
+
+    async def complete(self, username: str, job_id: str, profile_id: str) -> List[str]:
+        """Mark the owner's flight completed; returns the follower job IDs to finalize."""
+        key = self.normalize_username(username)
+
+        async with optimized_pools.get_background_session() as db:
+            # CTE locks the row and captures the follower list before it is cleared
+            result = await db.execute(text("""
+                WITH flight AS (
+                    SELECT username, follower_job_ids
+                    FROM creator_search_flights
+                    WHERE username = :username
+                    AND owner_job_id = CAST(:job_id AS uuid)
+                    FOR UPDATE
+                )
+                UPDATE creator_search_flights f
+                SET status = 'completed',
+                    profile_id = CAST(:profile_id AS uuid),
+                    follower_job_ids = '{}',
+                    completed_at = NOW(),
+                    updated_at = NOW()
+                FROM flight
+                WHERE f.username = flight.username
+                RETURNING flight.follower_job_ids
+            """).execution_options(prepare=False), {
+                'username': key,
+                'job_id': job_id,
+                'profile_id': profile_id,
+            })
+            row = result.fetchone()
+            await db.commit()
+
+        followers = [str(fid) for fid in (row.follower_job_ids if row else None) or []]
+        if followers:
+            logger.info(f"[SINGLE-FLIGHT] @{key} completed by {job_id} with {len(followers)} followers")
+        return followers
+
+    async def fail(self, username: str, job_id: str, error: str) -> List[str]:
+        """
+        Mark the owner's flight failed and release its followers back to the
+        queue, so the next one to run takes ownership. Returns the released IDs.
+        """
+        key = self.normalize_username(username)
+
+        async with optimized_pools.get_background_session() as db:
+            result = await db.execute(text("""
+                WITH flight AS (
+                    SELECT username, follower_job_ids
+                    FROM creator_search_flights
+                    WHERE username = :username
+                    AND owner_job_id = CAST(:job_id AS uuid)
+                    FOR UPDATE
+                )
+                UPDATE creator_search_flights f
+                SET status = 'failed',
+                    error = :error,
+                    follower_job_ids = '{}',
+                    updated_at = NOW()
+                FROM flight
+                WHERE f.username = flight.username
+                RETURNING flight.follower_job_ids
+            """).execution_options(prepare=False), {
+                'username': key,
+                'job_id': job_id,
+                'error': (error or '')[:500],
+            })
+            row = result.fetchone()
+            followers = [str(fid) for fid in (row.follower_job_ids if row else None) or []]
+
+            if followers:
+                await db.execute(text("""
+                    UPDATE job_queue
+                    SET status = 'queued',
+                        started_at = NULL,
+                        progress_message = 'Shared analysis failed - re-queued'
+                    WHERE id = ANY(CAST(:job_ids AS uuid[]))
+                    AND status = 'processing'
+                """).execution_options(prepare=False), {'job_ids': followers})
+
+            await db.commit()
+
+        if followers:
+            logger.warning(f"[SINGLE-FLIGHT] @{key} failed under {job_id}; re-queued {len(followers)} followers")
+        return followers
+
+
+# Global instance
+creator_search_single_flight = CreatorSearchSingleFlight()
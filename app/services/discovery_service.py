@@ -5,7 +5,7 @@ Implements paginated search with credit consumption and profile unlocking
 import logging
 import asyncio
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from uuid import UUID, uuid4
 import json
 
@@ -515,14 +515,187 @@ class DiscoveryService:
             logger.error(f"Error unlocking profile {profile_id} for user {user_id}: {e}")
             raise
 
+    async def bulk_unlock_profiles(
+        self,
+        user_id: UUID,
+        profile_ids: List[str],
+        reference_id: Optional[str] = None,
+        credits_per_profile: int = 25
+    ) -> Dict[str, Any]:
+        """
+        Unlock many profiles in one transaction with a fixed number of statements.
+
+        One query validates every ID (exists, not blacklisted/inactive, access
+        state), one multi-row INSERT grants access, one aggregated wallet spend
+        covers every newly granted profile and one multi-row INSERT records
+        unlocked_influencers. Insufficient credits roll the whole batch back.
+        Profiles with active access are skipped at no cost; expired access is
+        renewed and charged. Results are returned in input order.
+        """
+        from app.database.optimized_pools import optimized_pools
+
+        # Normalize and dedupe, keep input order; malformed IDs are reported invalid without a lookup
+        ordered_ids = []
+        well_formed_ids = []
+        seen = set()
+        for raw_id in profile_ids:
+            try:
+                pid = str(UUID(str(raw_id)))
+                well_formed = True
+            except ValueError:
+                pid = str(raw_id)
+                well_formed = False
+            if pid in seen:
+                continue
+            seen.add(pid)
+            ordered_ids.append(pid)
+            if well_formed:
+                well_formed_ids.append(pid)
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(days=30)
+
+        async with optimized_pools.get_background_session() as session:
+            # 1. Validate every ID and read its current access in one pass
+            rows = (await session.execute(text("""
+                SELECT
+                    r.pid::text AS profile_id,
+                    p.username,
+                    (p.id IS NULL OR COALESCE(p.blacklisted, false) OR COALESCE(p.inactive, false)) AS invalid,
+                    (upa.expires_at IS NOT NULL AND upa.expires_at > :now) AS already_unlocked
+                FROM unnest(CAST(:profile_ids AS uuid[])) AS r(pid)
+                LEFT JOIN profiles p ON p.id = r.pid
+                LEFT JOIN user_profile_access upa
+                    ON upa.user_id = CAST(:user_id AS uuid) AND upa.profile_id = r.pid
+            """).execution_options(prepare=False), {
+                "profile_ids": well_formed_ids,
+                "user_id": str(user_id),
+                "now": now,
+            })).fetchall()
+            profiles = {row.profile_id: row for row in rows}
+            candidates = [
+                pid for pid in well_formed_ids
+                if not profiles[pid].invalid and not profiles[pid].already_unlocked
+            ]
+
+            # 2. Grant access in one statement; only rows actually granted are charged
+            granted: List[str] = []
+            if candidates:
+                granted_rows = await session.execute(text("""
+                    INSERT INTO user_profile_access (id, user_id, profile_id, granted_at, expires_at, created_at)
+                    SELECT gen_random_uuid(), CAST(:user_id AS uuid), pid, :granted_at, :expires_at, :granted_at
+                    FROM unnest(CAST(:profile_ids AS uuid[])) AS pid
+                    ON CONFLICT (user_id, profile_id) DO UPDATE SET
+                        granted_at = EXCLUDED.granted_at,
+                        expires_at = EXCLUDED.expires_at
+                    WHERE user_profile_access.expires_at IS NULL
+                       OR user_profile_access.expires_at <= EXCLUDED.granted_at
+                    RETURNING profile_id::text
+                """).execution_options(prepare=False), {
+                    "user_id": str(user_id),
+                    "profile_ids": candidates,
+                    "granted_at": now,
+                    "expires_at": expires_at,
+                })
+                granted_set = {row[0] for row in granted_rows.fetchall()}
+                granted = [pid for pid in candidates if pid in granted_set]
+
+            # 3. One aggregated credit transaction for the whole batch
+            total_cost = len(granted) * credits_per_profile
+            transaction_id = None
+            if total_cost > 0:
+                try:
+                    transaction = await credit_wallet_service.spend_credits_atomic(
+                        db=session,
+                        user_id=user_id,
+                        action_type="profile_analysis",
+                        credits_amount=total_cost,
+                        reference_id=reference_id,
+                        reference_type="bulk_unlock",
+                        description=f"Bulk unlock of {len(granted)} profiles"
+                    )
+                except Exception as e:
+                    await session.rollback()
+                    if "Insufficient credits" in str(e) or "No wallet found" in str(e):
+                        return {
+                            "error": "insufficient_credits",
+                            "message": str(e),
+                            "credits_required": total_cost
+                        }
+                    raise
+                transaction_id = transaction.id if transaction else None
+
+                # 4. Permanent unlock records in one statement
+                await session.execute(text("""
+                    INSERT INTO unlocked_influencers (user_id, profile_id, username, unlocked_at, credits_spent, transaction_id)
+                    SELECT CAST(:user_id AS uuid), u.pid, u.username, :unlocked_at, :credits_spent, :transaction_id
+                    FROM unnest(CAST(:profile_ids AS uuid[]), CAST(:usernames AS text[])) AS u(pid, username)
+                    ON CONFLICT DO NOTHING
+                """).execution_options(prepare=False), {
+                    "user_id": str(user_id),
+                    "profile_ids": granted,
+                    "usernames": [profiles[pid].username for pid in granted],
+                    "unlocked_at": now,
+                    "credits_spent": credits_per_profile,
+                    "transaction_id": transaction_id,
+                })
+
+            await session.commit()
+
+        if granted:
+            await credit_wallet_service._clear_user_cache(user_id)
+            # Best-effort, outside the unlock transaction so a failure can't abort it
+            try:
+                async with optimized_pools.get_background_session() as session:
+                    await self._record_profile_usage(session, user_id, count=len(granted))
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"[BULK-UNLOCK] Usage tracking failed for user {user_id}: {e}")
+
+        granted_set = set(granted)
+        results = []
+        for pid in ordered_ids:
+            row = profiles.get(pid)
+            if row is None or row.invalid:
+                results.append({
+                    'profile_id': pid,
+                    'success': False,
+                    'credits_spent': 0,
+                    'error_message': 'Profile not found or unavailable',
+                    'already_unlocked': False,
+                })
+            else:
+                # Candidates not granted lost a race to a concurrent unlock - already theirs
+                results.append({
+                    'profile_id': pid,
+                    'success': True,
+                    'credits_spent': credits_per_profile if pid in granted_set else 0,
+                    'already_unlocked': pid not in granted_set,
+                })
+
+        logger.info(
+            f"[BULK-UNLOCK] User {user_id}: {len(granted)} unlocked, "
+            f"{sum(1 for r in results if r['already_unlocked'])} already unlocked, "
+            f"{sum(1 for r in results if not r['success'])} invalid, {total_cost} credits"
+        )
+        return {
+            "successful_unlocks": len(granted),
+            "already_unlocked": sum(1 for r in results if r['already_unlocked']),
+            "failed_unlocks": sum(1 for r in results if not r['success']),
+            "total_credits_spent": total_cost,
+            "transaction_id": transaction_id,
+            "results": results,
+        }
+
     async def _record_profile_usage(
         self,
         db: AsyncSession,
-        user_id: UUID
+        user_id: UUID,
+        count: int = 1
     ) -> None:
         """
         Record profile unlock usage in team-level and individual-level tracking.
         Uses raw SQL for all writes (PGBouncer AUTOCOMMIT compatible).
+        `count` profiles are added at once (bulk unlock).
 
         Updates:
         1. teams.profiles_used_this_month (read by /auth/dashboard for usage display)
@@ -558,21 +731,22 @@ class DiscoveryService:
             # 1. Increment team-level counter
             await db.execute(
                 text(
-                    "UPDATE teams SET profiles_used_this_month = profiles_used_this_month + 1, "
+                    "UPDATE teams SET profiles_used_this_month = profiles_used_this_month + :count, "
                     "updated_at = now() WHERE id = :team_id"
                 ),
-                {"team_id": str(team_id)}
+                {"team_id": str(team_id), "count": count}
             )
 
             # 2. Upsert monthly_usage_tracking for the user (raw SQL)
             await db.execute(text("""
                 INSERT INTO monthly_usage_tracking (id, user_id, team_id, billing_month, profiles_analyzed, emails_unlocked, posts_analyzed)
-                VALUES (gen_random_uuid(), :user_id, :team_id, date_trunc('month', CURRENT_DATE)::date, 1, 0, 0)
+                VALUES (gen_random_uuid(), :user_id, :team_id, date_trunc('month', CURRENT_DATE)::date, :count, 0, 0)
                 ON CONFLICT (team_id, user_id, billing_month)
-                DO UPDATE SET profiles_analyzed = monthly_usage_tracking.profiles_analyzed + 1, updated_at = NOW()
+                DO UPDATE SET profiles_analyzed = monthly_usage_tracking.profiles_analyzed + :count, updated_at = NOW()
             """), {
                 "user_id": str(user_id),
-                "team_id": str(team_id)
+                "team_id": str(team_id),
+                "count": count
             })
 
             logger.info(f"[USAGE] Recorded profile usage for user {user_id} in team {team_id}")
@@ -0,0 +1,158 @@
+"""
+Job Checkpoint Service - Resumable Retries for Multi-Stage Jobs
+Persists the output of each completed pipeline stage on the job_queue row so
+a retried job resumes from the first incomplete stage instead of repeating
+the expensive ones (Apify scrape, profile store, CDN, AI).
+
+Checkpoints are keyed by stage name inside job_queue.checkpoints:
+    {"store": {"data": {...}, "completed_at": "..."}, ...}
+
+Large stage outputs (the raw Apify profile) are checkpointed by reference
+with save_payload(): the payload goes to job_result_store and the row keeps
+only its pointer, so checkpoints do not re-widen the hot job_queue row.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import text
+
+from app.database.optimized_pools import optimized_pools
+from app.services.job_result_store import job_result_store
+
+logger = logging.getLogger(__name__)
+
+
+class JobCheckpointService:
+    """Read/write per-stage checkpoints for a job"""
+
+    # Profile pipeline stages, in execution order
+    STAGE_APIFY = 'apify'
+    STAGE_STORE = 'store'
+    STAGE_CDN = 'cdn'
+    STAGE_AI = 'ai'
+    STAGE_RESPONSE = 'response'
+
+    async def load(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return {stage: data} for every completed stage of the job (empty if none)."""
+        try:
+            async with optimized_pools.get_background_session() as db:
+                result = await db.execute(text("""
+                    SELECT checkpoints FROM job_queue WHERE id = CAST(:job_id AS uuid)
+                """).execution_options(prepare=False), {'job_id': job_id})
+                row = result.fetchone()
+        except Exception as e:
+            logger.warning(f"[CHECKPOINT] Could not load checkpoints for job {job_id}: {e}")
+            return {}
+
+        stages = self._stages(row.checkpoints if row else None)
+        if stages:
+            logger.info(f"[CHECKPOINT] Job {job_id} resuming with completed stages: {list(stages)}")
+        return stages
+
+    async def load_many(self, job_ids: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """load() for a batch of jobs in one query: {job_id: {stage: data}} (jobs without checkpoints omitted)."""
+        if not job_ids:
+            return {}
+        try:
+            async with optimized_pools.get_background_session() as db:
+                result = await db.execute(text("""
+                    SELECT id, checkpoints FROM job_queue
+                    WHERE id = ANY(CAST(:job_ids AS uuid[]))
+                    AND checkpoints IS NOT NULL
+                """).execution_options(prepare=False), {'job_ids': [str(job_id) for job_id in job_ids]})
+                rows = result.fetchall()
+        except Exception as e:
+            logger.warning(f"[CHECKPOINT] Could not load checkpoints for {len(job_ids)} jobs: {e}")
+            return {}
+
+        loaded = {str(row.id): self._stages(row.checkpoints) for row in rows}
+        return {job_id: stages for job_id, stages in loaded.items() if stages}
+
+    @staticmethod
+    def _stages(checkpoints: Any) -> Dict[str, Dict[str, Any]]:
+        if isinstance(checkpoints, str):
+            checkpoints = json.loads(checkpoints)
+        if not checkpoints:
+            return {}
+        return {stage: entry.get('data') or {} for stage, entry in checkpoints.items()}
+
+    async def save(
+        self,
+        job_id: str,
+        stage: str,
+        data: Optional[Dict[str, Any]] = None,
+        drop_stage: Optional[str] = None
+    ) -> None:
+        """
+        Record `stage` as completed with its output. `drop_stage` removes an
+        earlier checkpoint whose data is no longer needed (e.g. the raw Apify
+        payload once the profile is stored). Failures are logged, never raised:
+        a missing checkpoint only costs a repeated stage on retry.
+        """
+        entry = {
+            'data': data or {},
+            'completed_at': datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            async with optimized_pools.get_background_session() as db:
+                await db.execute(text("""
+                    UPDATE job_queue
+                    SET checkpoints = (COALESCE(checkpoints, '{}'::jsonb) - CAST(:drop_stage AS text))
+                                      || jsonb_build_object(CAST(:stage AS text), CAST(:entry AS jsonb))
+                    WHERE id = CAST(:job_id AS uuid)
+                """).execution_options(prepare=False), {
+                    'job_id': job_id,
+                    'stage': stage,
+                    'drop_stage': drop_stage or '',
+                    'entry': json.dumps(entry, default=str),
+                })
+                await db.commit()
+            logger.info(f"[CHECKPOINT] Job {job_id} completed stage '{stage}'")
+        except Exception as e:
+            logger.warning(f"[CHECKPOINT] Could not save stage '{stage}' for job {job_id}: {e}")
+
+    async def save_payload(self, job_id: str, stage: str, payload: Any) -> Dict[str, Any]:
+        """
+        save() a large stage output by reference: {'payload_ref': pointer}
+        into job_result_store, or {'payload': ...} inline when it is below
+        JOB_RESULTS_INLINE_MAX_BYTES or offloading is off. Returns the saved
+        checkpoint data (pass it to load_payload / drop_payload).
+        """
+        _, payload_ref, size = await job_result_store.store(f"{job_id}.{stage}", payload)
+        data = {'payload_ref': payload_ref, 'payload_size': size} if payload_ref else {'payload': payload}
+        await self.save(job_id, stage, data)
+        return data
+
+    async def load_payload(self, data: Optional[Dict[str, Any]]) -> Any:
+        """Payload of a save_payload() checkpoint; None if there is none or its object is gone."""
+        if not data:
+            return None
+        if not data.get('payload_ref'):
+            return data.get('payload')
+        try:
+            return await job_result_store.load(data['payload_ref'])
+        except Exception as e:
+            logger.warning(f"[CHECKPOINT] Could not load payload {data['payload_ref']}: {e}")
+            return None
+
+    async def drop_payload(self, data: Optional[Dict[str, Any]]) -> None:
+        """Delete the stored object of a save_payload() checkpoint that is no longer needed."""
+        if data and data.get('payload_ref'):
+            await job_result_store.delete(data['payload_ref'])
+
+    async def clear(self, job_id: str) -> None:
+        """Drop all checkpoints once the job has completed."""
+        try:
+            async with optimized_pools.get_background_session() as db:
+                await db.execute(text("""
+                    UPDATE job_queue SET checkpoints = NULL WHERE id = CAST(:job_id AS uuid)
+                """).execution_options(prepare=False), {'job_id': job_id})
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"[CHECKPOINT] Could not clear checkpoints for job {job_id}: {e}")
+
+
+# Global instance
+job_checkpoint_service = JobCheckpointService()
@@ -0,0 +1,187 @@
+"""
+Job Progress Channel - Write-Behind Progress Reporting
+Progress updates from running jobs go to Redis (one small hash per job) instead
+of rewriting the job_queue row every time. Postgres only receives progress:
+- on state transitions (started / completed / failed / ...), written by
+  update_job_status - the first progress update of a job this process has not
+  seen yet is such a transition (status='processing', started_at)
+- at most once per FLUSH_INTERVAL_SECONDS while the job is running
+
+A job stops being tracked when its state transition is written here
+(finish), when a flush finds it no longer processing (finished, cancelled or
+re-queued by another process) or after TRACKED_JOB_TTL_SECONDS without a
+flush, so the per-job bookkeeping does not grow with every job ever run.
+
+/api/v1/jobs/{job_id}/status overlays the Redis value on the row, so clients
+still see every update. If Redis is unavailable, clients only see the
+bounded-interval flushes.
+
+Async Redis clients are bound to the event loop that created them, and jobs
+run on worker threads/processes with their own loops - so one client is kept
+per loop.
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+import redis.asyncio as redis
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database.optimized_pools import optimized_pools
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how stale job_queue.progress_* may get while a job runs
+FLUSH_INTERVAL_SECONDS = 15
+
+# Progress keys outlive any job timeout (bulk queue: 30 min)
+PROGRESS_TTL_SECONDS = 6 * 3600
+
+# Seconds before retrying Redis after a connection failure
+REDIS_RETRY_INTERVAL = 60
+
+# A tracked job not flushed for this long is forgotten; its next update is
+# written through again
+TRACKED_JOB_TTL_SECONDS = 3600
+
+
+class JobProgressChannel:
+    """Buffers job progress in Redis and flushes it to Postgres write-behind"""
+
+    def __init__(self):
+        # id(event loop) -> Redis client created on that loop
+        self._clients: Dict[int, redis.Redis] = {}
+        self._redis_down_until = 0.0
+        # job_id -> monotonic time of the last Postgres flush
+        self._last_flush: Dict[str, float] = {}
+        self._last_prune = 0.0
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job_progress:{job_id}"
+
+    def _get_client(self) -> Optional[redis.Redis]:
+        if time.monotonic() < self._redis_down_until:
+            return None
+        loop_id = id(asyncio.get_running_loop())
+        client = self._clients.get(loop_id)
+        if client is None:
+            redis_url = settings.REDIS_URL or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+            client = redis.from_url(
+                redis_url,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            self._clients[loop_id] = client
+        return client
+
+    def _mark_redis_down(self, error: Exception):
+        logger.warning(f"[JOB-PROGRESS] Redis unavailable, progress falls back to interval flushes: {error}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    def is_tracking(self, job_id: str) -> bool:
+        """True once this process has written the job's start (see started)."""
+        return str(job_id) in self._last_flush
+
+    def started(self, job_id: str):
+        """The job's 'processing' row was just written - buffer its progress from now on."""
+        self._last_flush[str(job_id)] = time.monotonic()
+
+    def _prune(self, now: float):
+        if now - self._last_prune < FLUSH_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        for job_id, flushed_at in list(self._last_flush.items()):
+            if now - flushed_at > TRACKED_JOB_TTL_SECONDS:
+                self._last_flush.pop(job_id, None)
+
+    async def report(self, job_id: str, progress_percent: Optional[int], progress_message: Optional[str]):
+        """Record progress for a running job; flushes to Postgres at most every FLUSH_INTERVAL_SECONDS."""
+        job_id = str(job_id)
+        payload = {'updated_at': datetime.now(timezone.utc).isoformat()}
+        if progress_percent is not None:
+            payload['progress_percent'] = int(progress_percent)
+        if progress_message:
+            payload['progress_message'] = progress_message
+
+        client = self._get_client()
+        if client is not None:
+            try:
+                key = self._key(job_id)
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.hset(key, mapping=payload)
+                    pipe.expire(key, PROGRESS_TTL_SECONDS)
+                    await pipe.execute()
+            except Exception as e:
+                self._mark_redis_down(e)
+
+        now = time.monotonic()
+        self._prune(now)
+        last_flush = self._last_flush.get(job_id)
+        if last_flush is None or now - last_flush >= FLUSH_INTERVAL_SECONDS:
+            self._last_flush[job_id] = now
+            if not await self._flush(job_id, progress_percent, progress_message):
+                # Finished, cancelled or re-queued elsewhere
+                await self.finish(job_id)
+
+    async def _flush(self, job_id: str, progress_percent: Optional[int], progress_message: Optional[str]) -> bool:
+        """
+        Write progress to the row - never touches status, so a terminal state
+        is not overwritten. False if the job is no longer processing.
+        """
+        try:
+            async with optimized_pools.get_background_session() as session:
+                result = await session.execute(text("""
+                    UPDATE job_queue
+                    SET progress_percent = COALESCE(:progress_percent, progress_percent),
+                        progress_message = COALESCE(:progress_message, progress_message),
+                        updated_at = NOW()
+                    WHERE id = CAST(:job_id AS uuid)
+                    AND status = 'processing'
+                """).execution_options(prepare=False), {
+                    'job_id': job_id,
+                    'progress_percent': progress_percent,
+                    'progress_message': progress_message,
+                })
+                await session.commit()
+                return result.rowcount != 0
+        except Exception as e:
+            logger.warning(f"[JOB-PROGRESS] Progress flush failed for job {job_id}: {e}")
+            return True
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Latest buffered progress for a job, or None (caller falls back to the row)."""
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            data = await client.hgetall(self._key(str(job_id)))
+        except Exception as e:
+            self._mark_redis_down(e)
+            return None
+        if not data:
+            return None
+        if 'progress_percent' in data:
+            data['progress_percent'] = int(data['progress_percent'])
+        return data
+
+    async def finish(self, job_id: str):
+        """Drop buffered progress once the job's state transition has been written."""
+        job_id = str(job_id)
+        self._last_flush.pop(job_id, None)
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            await client.delete(self._key(job_id))
+        except Exception as e:
+            self._mark_redis_down(e)
+
+
+# Global instance
+job_progress_channel = JobProgressChannel()
@@ -0,0 +1,179 @@
+"""
+Job Result Store - Large Job Results Outside the job_queue Row
+Results above JOB_RESULTS_INLINE_MAX_BYTES (e.g. a creator search response
+with 50 posts and every AI section) are gzip-compressed and written to an
+object store keyed by job id. The job_queue row keeps only a pointer
+(result_ref) and the uncompressed size (result_size), which keeps the hot
+queue table narrow for the claim query and stats scans.
+
+Backends:
+- r2:    private R2 bucket (JOB_RESULTS_R2_BUCKET) - shared by every replica
+- local: JOB_RESULTS_DIR on disk - dev / single-host deployments
+- off:   always store inline (previous behaviour)
+
+Pointers look like r2://<bucket>/<key> or file://<path> and are resolved by
+the backend that wrote them, so changing backend never orphans old results.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import zlib
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bytes per chunk when streaming a stored result
+STREAM_CHUNK_SIZE = 64 * 1024
+
+KEY_PREFIX = "job-results"
+
+
+class JobResultStore:
+    """Write-once store for large job results, addressed by job id"""
+
+    def __init__(self):
+        self.backend = (settings.JOB_RESULTS_BACKEND or 'off').lower()
+        self.inline_max_bytes = settings.JOB_RESULTS_INLINE_MAX_BYTES
+        self.local_dir = Path(settings.JOB_RESULTS_DIR).resolve()
+        self.bucket = settings.JOB_RESULTS_R2_BUCKET
+        self._s3_client = None
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    def _get_s3_client(self):
+        """Lazily build the boto3 R2 client (boto3 is sync - always call via to_thread)."""
+        if self._s3_client is None:
+            import boto3
+            from botocore.config import Config
+
+            self._s3_client = boto3.client(
+                's3',
+                endpoint_url=f'https://{settings.CF_ACCOUNT_ID}.r2.cloudflarestorage.com',
+                aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+                config=Config(
+                    region_name='auto',
+                    retries={'max_attempts': 3},
+                    max_pool_connections=10
+                )
+            )
+        return self._s3_client
+
+    def _put_sync(self, job_id: str, body: bytes) -> str:
+        key = f"{KEY_PREFIX}/{job_id}.json.gz"
+        if self.backend == 'r2':
+            self._get_s3_client().put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body,
+                ContentType='application/json',
+                ContentEncoding='gzip',
+            )
+            return f"r2://{self.bucket}/{key}"
+
+        path = self.local_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)  # atomic - readers never see a partial file
+        return f"file://{path}"
+
+    def _open_sync(self, result_ref: str):
+        """Open a stored result as a binary file-like object of gzip bytes."""
+        if result_ref.startswith('r2://'):
+            bucket, key = result_ref[len('r2://'):].split('/', 1)
+            return self._get_s3_client().get_object(Bucket=bucket, Key=key)['Body']
+        if result_ref.startswith('file://'):
+            return open(result_ref[len('file://'):], 'rb')
+        raise ValueError(f"Unknown result_ref scheme: {result_ref}")
+
+    def _delete_sync(self, result_ref: str):
+        if result_ref.startswith('r2://'):
+            bucket, key = result_ref[len('r2://'):].split('/', 1)
+            self._get_s3_client().delete_object(Bucket=bucket, Key=key)
+        elif result_ref.startswith('file://'):
+            Path(result_ref[len('file://'):]).unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def store(self, job_id: str, result: Any) -> Tuple[Optional[str], Optional[str], int]:
+        """
+        Serialize a job result and decide where it lives.
+
+        Returns (inline_json, result_ref, size): small results (or any result
+        when offloading is off or fails) come back as inline_json for the
+        job_queue.result column with result_ref None; large ones are written
+        to the backend and come back as (None, result_ref, size).
+        """
+        payload = json.dumps(result, default=str).encode('utf-8')
+        size = len(payload)
+
+        if self.backend == 'off' or size <= self.inline_max_bytes:
+            return payload.decode('utf-8'), None, size
+
+        try:
+            body = gzip.compress(payload, compresslevel=6)
+            result_ref = await asyncio.to_thread(self._put_sync, str(job_id), body)
+            logger.info(
+                f"[RESULT-STORE] Job {job_id} result offloaded: {size:,} bytes -> "
+                f"{len(body):,} gzip at {result_ref}"
+            )
+            return None, result_ref, size
+        except Exception as e:
+            logger.error(f"[RESULT-STORE] Offload failed for job {job_id}, storing inline: {e}")
+            return payload.decode('utf-8'), None, size
+
+    async def load(self, result_ref: str) -> Any:
+        """Read and decode a stored result."""
+        def _read():
+            with self._open_sync(result_ref) as fh:
+                return gzip.decompress(fh.read())
+        return json.loads(await asyncio.to_thread(_read))
+
+    async def resolve(self, inline_result: Any, result_ref: Optional[str]) -> Any:
+        """The job's result whether it is inline (JSONB / text) or offloaded."""
+        if result_ref:
+            return await self.load(result_ref)
+        if inline_result is None or isinstance(inline_result, (dict, list)):
+            return inline_result
+        return json.loads(inline_result)
+
+    async def stream(self, result_ref: str, decompress: bool = True) -> AsyncIterator[bytes]:
+        """
+        Stream a stored result in chunks. With decompress=False the raw gzip
+        bytes are yielded (serve with Content-Encoding: gzip).
+        """
+        fh = await asyncio.to_thread(self._open_sync, result_ref)
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if decompress else None
+        try:
+            while True:
+                chunk = await asyncio.to_thread(fh.read, STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield decoder.decompress(chunk) if decoder else chunk
+            if decoder:
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+        finally:
+            await asyncio.to_thread(fh.close)
+
+    async def delete(self, result_ref: str):
+        """Remove a stored result (e.g. when its job row is purged)."""
+        try:
+            await asyncio.to_thread(self._delete_sync, result_ref)
+        except Exception as e:
+            logger.warning(f"[RESULT-STORE] Could not delete {result_ref}: {e}")
+
+
+# Global instance
+job_result_store = JobResultStore()
@@ -224,21 +224,8 @@ class PostAnalyticsService:
                     "requestTimeout": 90
                 }
 
-                # Run the scraper
-                run = client.client.actor("apify/instagram-scraper").call(
-                    run_input=run_input,
-                    timeout_secs=300
-                )
-
-                if run.get("status") != "SUCCEEDED":
-                    raise ApifyAPIError(f"Apify run failed with status: {run.get('status')}")
-
-                # Get results
-                results = []
-                dataset_id = run.get("defaultDatasetId")
-                if dataset_id:
-                    for item in client.client.dataset(dataset_id).iterate_items():
-                        results.append(item)
+                # Run the scraper (async - doesn't block the event loop)
+                results = await client.run_actor(run_input, timeout_secs=300)
 
                 if not results:
                     raise ApifyProfileNotFoundError("No post data found")
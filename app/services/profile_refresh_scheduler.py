@@ -0,0 +1,215 @@
+"""
+Profile Refresh Scheduler - Staleness-Driven Background Refresh
+
+Profiles used to be refreshed only when someone searched them: popular
+creators were re-scraped on every search while tracked-but-unsearched ones
+went stale. The unified worker now calls schedule() every few minutes while
+its scrape lane has idle slots; it enqueues LOW priority 'profile_refresh'
+jobs (delta refresh, see CreatorAnalyticsTriggerService.refresh_creator_delta)
+for the tracked profiles that are most overdue.
+
+Tracked = in a live campaign or in any user list. Each profile's due score is
+
+    hours since last_refreshed * weight / BASE_REFRESH_HOURS
+
+with weight = 1 + CAMPAIGN_WEIGHT (in a live campaign)
+            + LIST_WEIGHT * ln(1 + lists containing it)
+            + FOLLOWER_WEIGHT * log10(followers)
+
+so a 100k-follower creator in a single list is due about every 2-3 days and
+a 1M-follower creator in an active campaign about daily (never more often
+than MIN_REFRESH_HOURS). Profiles with a score >= 1 are due and are
+enqueued most-overdue first, limited by the worker's spare scrape capacity
+and by PROFILE_REFRESH_BUDGET_PER_HOUR (each job costs one Apify profile
+scrape; the budget counts refresh jobs created in the last hour).
+
+The scheduler spends Apify budget on its own, so it is off unless an
+environment opts in with PROFILE_REFRESH_BUDGET_PER_HOUR > 0 (60 refreshes
+an hour is a reasonable start; watch apify_usage for 'profile_refresh').
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REFRESH_JOB_TYPE = 'profile_refresh'
+
+# job_queue.user_id of jobs the system enqueues on its own
+SYSTEM_USER_ID = '00000000-0000-0000-0000-000000000000'
+
+# Campaign statuses whose creators count as tracked
+LIVE_CAMPAIGN_STATUSES = ('active', 'in_review')
+
+# Due-score weights (see module docstring)
+BASE_REFRESH_HOURS = 168
+MIN_REFRESH_HOURS = 12
+CAMPAIGN_WEIGHT = 6.0
+LIST_WEIGHT = 1.0
+FOLLOWER_WEIGHT = 0.25
+
+# Ceiling on jobs enqueued in one pass
+MAX_JOBS_PER_PASS = 10
+
+# Only one worker process schedules at a time (pg_try_advisory_xact_lock key)
+SCHEDULER_LOCK_KEY = 727001
+
+
+class ProfileRefreshScheduler:
+    """Enqueues background refreshes of overdue tracked profiles within an hourly budget"""
+
+    def __init__(self):
+        self.budget_per_hour = settings.PROFILE_REFRESH_BUDGET_PER_HOUR
+        self.stats = {'passes': 0, 'enqueued': 0, 'skipped_no_capacity': 0, 'skipped_budget': 0}
+
+    async def schedule(self, free_slots: int, lane_job_types: Iterable[str]) -> Dict[str, Any]:
+        """
+        One scheduling pass. free_slots is the idle slot count of the lane
+        refresh jobs run in; queued jobs of lane_job_types already claim those
+        slots, so only the remainder is filled.
+        """
+        result = {'enqueued': 0, 'budget_remaining': 0, 'spare_capacity': 0}
+        if self.budget_per_hour <= 0 or free_slots <= 0:
+            return result
+        self.stats['passes'] += 1
+
+        from app.core.job_queue import job_queue, JobPriority, QueueType
+        from app.database.optimized_pools import optimized_pools
+
+        async with optimized_pools.get_background_session() as db:
+            # Held until this transaction ends - other workers skip the pass
+            locked = await db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)").execution_options(prepare=False),
+                {'key': SCHEDULER_LOCK_KEY}
+            )
+            if not locked.scalar():
+                return result
+
+            counts = await db.execute(
+                text("""
+                    SELECT
+                        COUNT(*) FILTER (
+                            WHERE job_type = :job_type AND created_at >= NOW() - INTERVAL '1 hour'
+                        ) AS used_this_hour,
+                        COUNT(*) FILTER (
+                            WHERE status = 'queued' AND job_type = ANY(CAST(:lane_job_types AS text[]))
+                        ) AS lane_backlog
+                    FROM job_queue
+                """).execution_options(prepare=False),
+                {'job_type': REFRESH_JOB_TYPE, 'lane_job_types': list(lane_job_types)}
+            )
+            used_this_hour, lane_backlog = counts.fetchone()
+
+            result['budget_remaining'] = max(0, self.budget_per_hour - used_this_hour)
+            result['spare_capacity'] = max(0, free_slots - lane_backlog)
+            if result['budget_remaining'] <= 0:
+                self.stats['skipped_budget'] += 1
+                return result
+            if result['spare_capacity'] <= 0:
+                self.stats['skipped_no_capacity'] += 1
+                return result
+
+            limit = min(result['budget_remaining'], result['spare_capacity'], MAX_JOBS_PER_PASS)
+            due = await self._due_profiles(db, limit)
+
+            hour_bucket = datetime.now(timezone.utc).strftime('%Y%m%d%H')
+            for profile in due:
+                job = await job_queue.enqueue_job(
+                    user_id=SYSTEM_USER_ID,
+                    job_type=REFRESH_JOB_TYPE,
+                    params={
+                        'username': profile['username'],
+                        'profile_id': profile['id'],
+                        'due_score': profile['due_score'],
+                        'refresh_mode': 'delta',
+                    },
+                    priority=JobPriority.LOW,
+                    queue_type=QueueType.DISCOVERY_QUEUE,
+                    estimated_duration=120,
+                    user_tier='enterprise',  # System operation - no tenant limits
+                    idempotency_key=f"{REFRESH_JOB_TYPE}_{profile['id']}_{hour_bucket}",
+                )
+                if not job.get('success', True):
+                    logger.warning(f"[REFRESH-SCHEDULER] Queue rejected refresh of @{profile['username']}: {job.get('message')}")
+                    break
+                if not job.get('existing'):
+                    result['enqueued'] += 1
+
+        self.stats['enqueued'] += result['enqueued']
+        if result['enqueued']:
+            logger.info(
+                f"[REFRESH-SCHEDULER] Enqueued {result['enqueued']} profile refreshes "
+                f"(budget left this hour: {result['budget_remaining'] - result['enqueued']})"
+            )
+        return result
+
+    async def _due_profiles(self, db, limit: int) -> List[Dict[str, Any]]:
+        """Tracked profiles with a due score >= 1, most overdue first, none already queued."""
+        rows = await db.execute(
+            text("""
+                WITH membership AS (
+                    SELECT profile_id, MAX(in_campaign) AS in_campaign, SUM(in_list) AS list_count
+                    FROM (
+                        SELECT cc.profile_id, 1 AS in_campaign, 0 AS in_list
+                        FROM campaign_creators cc
+                        JOIN campaigns c ON c.id = cc.campaign_id
+                        WHERE c.status = ANY(CAST(:campaign_statuses AS text[]))
+                        UNION ALL
+                        SELECT li.profile_id, 0, 1
+                        FROM user_list_items li
+                    ) tracked
+                    GROUP BY profile_id
+                ),
+                scored AS (
+                    SELECT
+                        p.id,
+                        p.username,
+                        CAST(EXTRACT(EPOCH FROM NOW() - COALESCE(p.last_refreshed, p.created_at, 'epoch'::timestamptz)) / 3600
+                             AS double precision) AS age_hours,
+                        1 + CAST(:campaign_weight AS double precision) * m.in_campaign
+                          + CAST(:list_weight AS double precision) * LN(1 + m.list_count)
+                          + CAST(:follower_weight AS double precision) * LOG(GREATEST(COALESCE(p.followers_count, 0), 1)::double precision)
+                            AS weight
+                    FROM membership m
+                    JOIN profiles p ON p.id = m.profile_id
+                    WHERE COALESCE(p.is_private, false) = false
+                )
+                SELECT s.id, s.username, s.age_hours * s.weight / CAST(:base_hours AS double precision) AS due_score
+                FROM scored s
+                WHERE s.age_hours >= CAST(:min_hours AS double precision)
+                AND s.age_hours * s.weight / CAST(:base_hours AS double precision) >= 1
+                AND NOT EXISTS (
+                    SELECT 1 FROM job_queue j
+                    WHERE j.job_type = :job_type
+                    AND j.status IN ('queued', 'processing')
+                    AND j.params->>'profile_id' = s.id::text
+                )
+                ORDER BY due_score DESC
+                LIMIT :limit
+            """).execution_options(prepare=False),
+            {
+                'campaign_statuses': list(LIVE_CAMPAIGN_STATUSES),
+                'campaign_weight': CAMPAIGN_WEIGHT,
+                'list_weight': LIST_WEIGHT,
+                'follower_weight': FOLLOWER_WEIGHT,
+                'base_hours': float(BASE_REFRESH_HOURS),
+                'min_hours': float(MIN_REFRESH_HOURS),
+                'job_type': REFRESH_JOB_TYPE,
+                'limit': limit,
+            }
+        )
+        return [
+            {'id': str(row.id), 'username': row.username, 'due_score': round(float(row.due_score), 2)}
+            for row in rows.fetchall()
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'budget_per_hour': self.budget_per_hour}
+
+
+# Global instance
+profile_refresh_scheduler = ProfileRefreshScheduler()
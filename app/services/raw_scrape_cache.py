@@ -0,0 +1,251 @@
+"""
+Raw Scrape Cache - Apify Dataset Items Keyed by Actor Input
+A profile re-searched minutes after a scrape, or a job retried after a later
+stage failed, used to start another actor run for JSON we had just fetched.
+The raw dataset items of every successful run are kept here, gzip-compressed,
+under a content address:
+
+    scrape-cache/<actor>/<subject>/<sha256 of the canonical actor input>
+
+where subject is the username or post shortcode of the run's single
+directUrl. Each entry carries its fetch time; readers pass the maximum age
+they accept (max_age_minutes) and anything older is a miss. Entries are
+dropped after SCRAPE_CACHE_TTL_SECONDS regardless.
+
+Backends:
+- redis: REDIS_URL - shared by every replica (SETEX, so Redis expires entries)
+- local: SCRAPE_CACHE_DIR on disk - dev / single-host deployments
+- off:   no caching
+
+Async Redis clients are bound to the event loop that created them, so one
+client is kept per loop (as in job_progress_channel).
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "scrape-cache"
+
+# Seconds before retrying Redis after a connection failure
+REDIS_RETRY_INTERVAL = 60
+
+_SUBJECT_PATTERNS = (
+    re.compile(r'instagram\.com/(?:p|reel)/([A-Za-z0-9_-]+)'),
+    re.compile(r'instagram\.com/([A-Za-z0-9_.]+)/?(?:\?.*)?$'),
+)
+
+
+class RawScrapeCache:
+    """Compressed cache of raw actor dataset items with freshness metadata"""
+
+    def __init__(self):
+        self.backend = (settings.SCRAPE_CACHE_BACKEND or 'off').lower()
+        self.ttl_seconds = settings.SCRAPE_CACHE_TTL_SECONDS
+        self.default_max_age_minutes = settings.SCRAPE_CACHE_DEFAULT_MAX_AGE_MINUTES
+        self.local_dir = Path(settings.SCRAPE_CACHE_DIR).resolve()
+        # id(event loop) -> Redis client created on that loop
+        self._clients: Dict[int, Any] = {}
+        self._redis_down_until = 0.0
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0, 'errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend in ('redis', 'local') and self.ttl_seconds > 0
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def input_hash(run_input: Dict[str, Any]) -> str:
+        canonical = json.dumps(run_input, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def subject(run_input: Dict[str, Any]) -> str:
+        """Username or shortcode of a single-URL run; 'multi' otherwise."""
+        urls = run_input.get('directUrls') or []
+        if len(urls) != 1:
+            return 'multi'
+        for pattern in _SUBJECT_PATTERNS:
+            match = pattern.search(urls[0])
+            if match:
+                return match.group(1).lower()
+        return 'other'
+
+    def key(self, actor_id: str, run_input: Dict[str, Any]) -> str:
+        actor = actor_id.replace('/', '~')
+        return f"{KEY_PREFIX}/{actor}/{self.subject(run_input)}/{self.input_hash(run_input)}"
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    def _get_redis(self):
+        if time.monotonic() < self._redis_down_until:
+            return None
+        loop_id = id(asyncio.get_running_loop())
+        client = self._clients.get(loop_id)
+        if client is None:
+            import redis.asyncio as redis
+
+            redis_url = settings.REDIS_URL or os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+            client = redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+            self._clients[loop_id] = client
+        return client
+
+    def _mark_redis_down(self, error: Exception):
+        logger.warning(f"[SCRAPE-CACHE] Redis unavailable, scrape cache bypassed: {error}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    def _path(self, key: str) -> Path:
+        return self.local_dir / f"{key}.json.gz"
+
+    def _write_file_sync(self, key: str, body: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)  # atomic - readers never see a partial file
+
+    def _read_file_sync(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        if self.backend == 'redis':
+            client = self._get_redis()
+            if client is None:
+                return None
+            try:
+                return await client.get(key)
+            except Exception as e:
+                self._mark_redis_down(e)
+                return None
+        return await asyncio.to_thread(self._read_file_sync, key)
+
+    async def _write(self, key: str, body: bytes):
+        if self.backend == 'redis':
+            client = self._get_redis()
+            if client is None:
+                return
+            try:
+                await client.set(key, body, ex=int(self.ttl_seconds))
+            except Exception as e:
+                self._mark_redis_down(e)
+            return
+        await asyncio.to_thread(self._write_file_sync, key, body)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def resolve_max_age(self, max_age_minutes: Optional[float]) -> float:
+        """Seconds of staleness accepted: None = the configured default, 0 = bypass."""
+        minutes = self.default_max_age_minutes if max_age_minutes is None else max_age_minutes
+        return max(0.0, min(float(minutes) * 60, float(self.ttl_seconds)))
+
+    async def get(
+        self,
+        actor_id: str,
+        run_input: Dict[str, Any],
+        max_age_minutes: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cached entry for this exact actor input if it is at most
+        max_age_minutes old (None = SCRAPE_CACHE_DEFAULT_MAX_AGE_MINUTES,
+        0 = always miss). Returns {'items', 'fetched_at', 'age_seconds', 'key'}.
+        """
+        max_age = self.resolve_max_age(max_age_minutes)
+        if not self.enabled or max_age <= 0:
+            return None
+
+        key = self.key(actor_id, run_input)
+        try:
+            body = await self._read(key)
+            if body is None:
+                self.stats['misses'] += 1
+                return None
+            entry = json.loads(gzip.decompress(body))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"[SCRAPE-CACHE] Unreadable entry {key}: {e}")
+            return None
+
+        age = time.time() - entry.get('fetched_at', 0)
+        if age > max_age:
+            self.stats['stale'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        logger.info(f"[SCRAPE-CACHE] Hit {key} ({age:.0f}s old, {len(entry.get('items') or [])} items)")
+        return {
+            'items': entry.get('items') or [],
+            'fetched_at': entry.get('fetched_at'),
+            'age_seconds': age,
+            'key': key,
+        }
+
+    async def put(self, actor_id: str, run_input: Dict[str, Any], items: List[Dict[str, Any]]):
+        """Store the raw dataset items of a successful run (best-effort)."""
+        if not self.enabled or not items:
+            return
+        key = self.key(actor_id, run_input)
+        entry = {
+            'actor_id': actor_id,
+            'input_hash': self.input_hash(run_input),
+            'subject': self.subject(run_input),
+            'fetched_at': time.time(),
+            'items': items,
+        }
+        try:
+            body = gzip.compress(json.dumps(entry, default=str).encode('utf-8'), compresslevel=6)
+            await self._write(key, body)
+            self.stats['writes'] += 1
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"[SCRAPE-CACHE] Could not store {key}: {e}")
+
+    async def purge_expired(self) -> int:
+        """Delete local entries older than the TTL (Redis expires its own)."""
+        if self.backend != 'local' or not self.local_dir.exists():
+            return 0
+
+        def _purge() -> int:
+            cutoff = time.time() - self.ttl_seconds
+            removed = 0
+            for path in self.local_dir.glob(f"{KEY_PREFIX}/**/*.json.gz"):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+            return removed
+
+        return await asyncio.to_thread(_purge)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'backend': self.backend if self.enabled else 'off',
+            'ttl_seconds': self.ttl_seconds,
+            'default_max_age_minutes': self.default_max_age_minutes,
+        }
+
+
+# Global instance
+raw_scrape_cache = RawScrapeCache()
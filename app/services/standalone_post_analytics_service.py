@@ -14,7 +14,7 @@ from uuid import UUID
 import uuid as uuid_lib
 import json
 
-from app.scrapers.apify_instagram_client import ApifyInstagramClient, ApifyProfileNotFoundError, ApifyAPIError
+from app.scrapers.apify_instagram_client import ApifyInstagramClient, ApifyAPIError
 from app.database.unified_models import Post, Profile, AudienceDemographics
 from app.database.post_analytics_models import CampaignPostAnalytics
 from app.database.connection import get_session
@@ -38,7 +38,14 @@ class StandalonePostAnalyticsService:
     def __init__(self):
         self.apify_token = settings.APIFY_API_TOKEN
 
-    async def analyze_post_by_url(self, post_url: str, db: AsyncSession, user_id: Optional[UUID] = None) -> Dict[str, Any]:
+    async def analyze_post_by_url(
+        self,
+        post_url: str,
+        db: AsyncSession,
+        user_id: Optional[UUID] = None,
+        max_age_minutes: Optional[float] = None,
+        post_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Analyze a single Instagram post by URL
 
@@ -46,6 +53,8 @@ class StandalonePostAnalyticsService:
             post_url: Instagram post URL (any format)
             db: Database session
             user_id: Optional user ID for tracking
+            max_age_minutes: Oldest raw scrape cache entry accepted (None = default, 0 = always scrape)
+            post_data: Raw post data already scraped (see fetch_posts_batch) - skips the Apify fetch
 
         Returns:
             Complete post analytics data
@@ -66,7 +75,8 @@ class StandalonePostAnalyticsService:
                 # 🚀 FETCH APIFY DATA AND CHECK FOR COLLABORATORS (even for existing posts)
                 try:
                     logger.info(f"🔍 Checking for missing collaborators in existing post...")
-                    post_data = await self._fetch_post_data_from_apify(post_url)
+                    if post_data is None:
+                        post_data = await self._fetch_post_data_from_apify(post_url, max_age_minutes)
 
                     if post_data:
                         logger.info(f"✅ Got Apify data for existing post, checking collaborators...")
@@ -96,8 +106,9 @@ class StandalonePostAnalyticsService:
                 return await self._format_post_analytics(existing_post)
 
             try:
-                # Fetch post data using Apify
-                post_data = await self._fetch_post_data_from_apify(post_url)
+                # Fetch post data using Apify (unless the caller batch-scraped it)
+                if post_data is None:
+                    post_data = await self._fetch_post_data_from_apify(post_url, max_age_minutes)
 
                 # Get or create profile for this post
                 profile = await self._get_or_create_profile(db, post_data, user_id)
@@ -165,48 +176,47 @@ class StandalonePostAnalyticsService:
 
         return None
 
-    async def _fetch_post_data_from_apify(self, post_url: str) -> Dict[str, Any]:
-        """Fetch post data using Apify Instagram scraper"""
+    async def _fetch_post_data_from_apify(self, post_url: str, max_age_minutes: Optional[float] = None) -> Dict[str, Any]:
+        """Fetch post data using Apify Instagram scraper (raw scrape cache first)"""
         try:
             async with ApifyInstagramClient(self.apify_token) as client:
-                # Use Apify to scrape individual post
-                run_input = {
-                    "directUrls": [post_url],
-                    "resultsType": "details",
-                    "resultsLimit": 1,
-                    "addParentData": True,
-                    "maxRequestRetries": 2,
-                    "sessionPoolSize": 1,
-                    "pageTimeout": 60,
-                    "requestTimeout": 90
-                }
-
-                # Run the scraper
-                run = client.client.actor("apify/instagram-scraper").call(
-                    run_input=run_input,
-                    timeout_secs=300
-                )
-
-                if run.get("status") != "SUCCEEDED":
-                    raise ApifyAPIError(f"Apify run failed with status: {run.get('status')}")
-
-                # Get results
-                results = []
-                dataset_id = run.get("defaultDatasetId")
-                if dataset_id:
-                    for item in client.client.dataset(dataset_id).iterate_items():
-                        results.append(item)
-
-                if not results:
-                    raise ApifyProfileNotFoundError("No post data found")
+                # Cached raw items of the same input are reused, otherwise the
+                # scraper runs (async - doesn't block the event loop)
+                post_data = await client.get_post_details(post_url, max_age_minutes=max_age_minutes)
 
                 logger.info(f"✅ Fetched post data from Apify")
-                return results[0]
+                return post_data
 
         except Exception as e:
             logger.error(f"❌ Apify fetch failed for {post_url}: {e}")
             raise ApifyAPIError(f"Failed to fetch post data: {e}")
 
+    async def fetch_posts_batch(
+        self, post_urls: List[str], max_age_minutes: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape many posts in shared actor runs (see ApifyInstagramClient.get_posts_batch).
+
+        Returns {post_url: raw post data or exception} for every URL given, ready
+        to be passed to analyze_post_by_url(post_data=...). A failed batch never
+        raises - every URL then maps to the exception.
+        """
+        try:
+            async with ApifyInstagramClient(self.apify_token) as client:
+                by_shortcode = await client.get_posts_batch(post_urls, max_age_minutes=max_age_minutes)
+        except Exception as e:
+            logger.error(f"❌ Batched Apify fetch of {len(post_urls)} posts failed: {e}")
+            error = ApifyAPIError(f"Failed to fetch post data: {e}")
+            return {post_url: error for post_url in post_urls}
+
+        results = {}
+        for post_url in post_urls:
+            shortcode = ApifyInstagramClient.post_shortcode(post_url)
+            results[post_url] = by_shortcode.get(shortcode or post_url)
+        fetched = sum(1 for data in results.values() if isinstance(data, dict))
+        logger.info(f"✅ Batched Apify fetch: {fetched}/{len(post_urls)} posts")
+        return results
+
     async def _get_or_create_profile(self, db: AsyncSession, post_data: Dict[str, Any], user_id: Optional[UUID] = None) -> Profile:
         """Get or create profile for the post owner"""
         try:
@@ -12,6 +12,8 @@ from enum import Enum
 from app.services.cdn_image_service import cdn_image_service
 from app.services.ai.production_ai_orchestrator import production_ai_orchestrator
 from app.database.connection import get_session
+from app.services.job_checkpoint_service import job_checkpoint_service, JobCheckpointService
+from app.utils.json_serializer import safe_json_response
 from sqlalchemy import text
 from uuid import UUID
 
@@ -81,7 +83,12 @@ class UnifiedBackgroundProcessor:
             initialization_results['error'] = str(e)
             return initialization_results
 
-    async def process_profile_complete_pipeline(self, profile_id: str, username: str) -> Dict[str, Any]:
+    async def process_profile_complete_pipeline(
+        self,
+        profile_id: str,
+        username: str,
+        job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Execute complete processing pipeline for a profile
         CRITICAL: Only starts AFTER Apify data is 100% stored
@@ -95,11 +102,14 @@ class UnifiedBackgroundProcessor:
         Args:
             profile_id: Profile UUID in database
             username: Instagram username
+            job_id: Owning job_queue job - when given, successful CDN/AI stages
+                are checkpointed and a retry of the job skips them
 
         Returns:
             Complete processing results
         """
         pipeline_id = str(uuid.uuid4())
+        checkpoints = await job_checkpoint_service.load(job_id) if job_id else {}
         logger.info(f"[UNIFIED-PROCESSOR] Starting complete pipeline for {username} (Profile: {profile_id})")
 
         pipeline_results = {
@@ -146,108 +156,16 @@ class UnifiedBackgroundProcessor:
             pipeline_results['stages']['cdn_processing']['started_at'] = datetime.now(timezone.utc)
             pipeline_results['stages']['cdn_processing']['status'] = ProcessingStatus.PROCESSING.value
 
-            # Use optimized_pools (has statement_cache_size=0 for pgbouncer compatibility)
-            from app.database.optimized_pools import optimized_pools
-            async with optimized_pools.get_background_session() as db:
-                try:
-                    # Get the COMPLETE profile data needed for CDN processing
-                    profile_query = await db.execute(
-                        text("""
-                            SELECT
-                                profile_pic_url_hd,
-                                profile_pic_url,
-                                username,
-                                full_name,
-                                biography,
-                                external_url,
-                                followers_count,
-                                following_count,
-                                posts_count,
-                                is_verified,
-                                is_private,
-                                is_business_account,
-                                category
-                            FROM profiles
-                            WHERE id = :profile_id
-                        """),
-                        {"profile_id": profile_id}
-                    )
-                    profile_row = profile_query.fetchone()
-
-                    if profile_row:
-                        # Reconstruct the Apify data format that CDN service expects
-                        profile_data = {
-                            'profile_pic_url_hd': profile_row[0],
-                            'profile_pic_url': profile_row[1],
-                            'username': profile_row[2],
-                            'full_name': profile_row[3],
-                            'biography': profile_row[4],
-                            'external_url': profile_row[5],
-                            'followers_count': profile_row[6],
-                            'following_count': profile_row[7],
-                            'posts_count': profile_row[8],
-                            'is_verified': profile_row[9],
-                            'is_private': profile_row[10],
-                            'is_business_account': profile_row[11],
-                            'category': profile_row[12]
-                        }
-
-                        # Use optimized_pools (has statement_cache_size=0 for pgbouncer)
-                        from app.database.optimized_pools import optimized_pools
-                        async with optimized_pools.get_background_session() as cdn_db:
-                            try:
-                                # Pass session directly — do NOT use set_db_session() (race condition)
-                                result = await self.cdn_service.enqueue_profile_assets(
-                                    UUID(profile_id), profile_data, cdn_db
-                                )
-                                await cdn_db.commit()  # Ensure transaction is committed
-                            except Exception as cdn_error:
-                                await cdn_db.rollback()
-                                logger.error(f"[UNIFIED-PROCESSOR] CDN transaction error: {cdn_error}")
-                                raise cdn_error
-
-                        # CDN images are processed INLINE by _process_cdn_job_immediately()
-                        # Query actual completion status using the outer db session
-                        cdn_check_query = await db.execute(
-                            text("""
-                                SELECT
-                                    COUNT(*) FILTER (WHERE processing_status = 'completed') as completed,
-                                    COUNT(*) as total
-                                FROM cdn_image_assets
-                                WHERE source_id = :profile_id
-                            """),
-                            {"profile_id": profile_id}
-                        )
-                        cdn_check_row = cdn_check_query.fetchone()
-                        actual_processed = cdn_check_row[0] if cdn_check_row else 0
-                        actual_total = cdn_check_row[1] if cdn_check_row else 0
-
-                        cdn_results = {
-                            'success': True,
-                            'jobs_created': result.jobs_created,
-                            'processed_images': actual_processed,
-                            'total_images': actual_total,
-                            'message': f"CDN complete: {actual_processed}/{actual_total} images processed inline"
-                        }
-
-                        logger.info(f"[UNIFIED-PROCESSOR] CDN processed inline: {actual_processed}/{actual_total} images")
-
-                    else:
-                        cdn_results = {
-                            'success': False,
-                            'error': 'Profile not found for CDN processing',
-                            'processed_images': 0,
-                            'total_images': 0
-                        }
-
-                except Exception as e:
-                    logger.error(f"[UNIFIED-PROCESSOR] CDN processing failed for {username}: {e}")
-                    cdn_results = {
-                        'success': False,
-                        'error': str(e),
-                        'processed_images': 0,
-                        'total_images': 0
-                    }
+            if JobCheckpointService.STAGE_CDN in checkpoints:
+                cdn_results = checkpoints[JobCheckpointService.STAGE_CDN]
+                pipeline_results['stages']['cdn_processing']['resumed'] = True
+                logger.info(f"[UNIFIED-PROCESSOR] Stage 2 resumed from checkpoint for {username}")
+            else:
+                cdn_results = await self._run_cdn_stage(profile_id, username)
+                # Failed CDN is tolerated by the pipeline, but only a successful
+                # run is checkpointed so a retry gets another attempt
+                if job_id and cdn_results['success']:
+                    await job_checkpoint_service.save(job_id, JobCheckpointService.STAGE_CDN, cdn_results)
 
             pipeline_results['results']['cdn_results'] = cdn_results
 
@@ -265,7 +183,16 @@ class UnifiedBackgroundProcessor:
             pipeline_results['stages']['ai_processing']['started_at'] = datetime.now(timezone.utc)
             pipeline_results['stages']['ai_processing']['status'] = ProcessingStatus.PROCESSING.value
 
-            ai_results = await self.ai_orchestrator.process_profile_complete_ai_analysis(profile_id, username)
+            if JobCheckpointService.STAGE_AI in checkpoints:
+                ai_results = checkpoints[JobCheckpointService.STAGE_AI]
+                pipeline_results['stages']['ai_processing']['resumed'] = True
+                logger.info(f"[UNIFIED-PROCESSOR] Stage 3 resumed from checkpoint for {username}")
+            else:
+                ai_results = await self.ai_orchestrator.process_profile_complete_ai_analysis(profile_id, username)
+                if job_id and ai_results.get('success'):
+                    await job_checkpoint_service.save(
+                        job_id, JobCheckpointService.STAGE_AI, safe_json_response(ai_results)
+                    )
             pipeline_results['results']['ai_results'] = ai_results
 
             if not ai_results['success']:
@@ -308,6 +235,113 @@ class UnifiedBackgroundProcessor:
 
             return pipeline_results
 
+    async def _run_cdn_stage(self, profile_id: str, username: str) -> Dict[str, Any]:
+        """Stage 2: enqueue + inline-process the profile's CDN assets, return the CDN results."""
+        # Use optimized_pools (has statement_cache_size=0 for pgbouncer compatibility)
+        from app.database.optimized_pools import optimized_pools
+        async with optimized_pools.get_background_session() as db:
+            try:
+                # Get the COMPLETE profile data needed for CDN processing
+                profile_query = await db.execute(
+                    text("""
+                        SELECT
+                            profile_pic_url_hd,
+                            profile_pic_url,
+                            username,
+                            full_name,
+                            biography,
+                            external_url,
+                            followers_count,
+                            following_count,
+                            posts_count,
+                            is_verified,
+                            is_private,
+                            is_business_account,
+                            category
+                        FROM profiles
+                        WHERE id = :profile_id
+                    """),
+                    {"profile_id": profile_id}
+                )
+                profile_row = profile_query.fetchone()
+
+                if profile_row:
+                    # Reconstruct the Apify data format that CDN service expects
+                    profile_data = {
+                        'profile_pic_url_hd': profile_row[0],
+                        'profile_pic_url': profile_row[1],
+                        'username': profile_row[2],
+                        'full_name': profile_row[3],
+                        'biography': profile_row[4],
+                        'external_url': profile_row[5],
+                        'followers_count': profile_row[6],
+                        'following_count': profile_row[7],
+                        'posts_count': profile_row[8],
+                        'is_verified': profile_row[9],
+                        'is_private': profile_row[10],
+                        'is_business_account': profile_row[11],
+                        'category': profile_row[12]
+                    }
+
+                    # Use optimized_pools (has statement_cache_size=0 for pgbouncer)
+                    from app.database.optimized_pools import optimized_pools
+                    async with optimized_pools.get_background_session() as cdn_db:
+                        try:
+                            # Pass session directly — do NOT use set_db_session() (race condition)
+                            result = await self.cdn_service.enqueue_profile_assets(
+                                UUID(profile_id), profile_data, cdn_db
+                            )
+                            await cdn_db.commit()  # Ensure transaction is committed
+                        except Exception as cdn_error:
+                            await cdn_db.rollback()
+                            logger.error(f"[UNIFIED-PROCESSOR] CDN transaction error: {cdn_error}")
+                            raise cdn_error
+
+                    # CDN images are processed INLINE by _process_cdn_job_immediately()
+                    # Query actual completion status using the outer db session
+                    cdn_check_query = await db.execute(
+                        text("""
+                            SELECT
+                                COUNT(*) FILTER (WHERE processing_status = 'completed') as completed,
+                                COUNT(*) as total
+                            FROM cdn_image_assets
+                            WHERE source_id = :profile_id
+                        """),
+                        {"profile_id": profile_id}
+                    )
+                    cdn_check_row = cdn_check_query.fetchone()
+                    actual_processed = cdn_check_row[0] if cdn_check_row else 0
+                    actual_total = cdn_check_row[1] if cdn_check_row else 0
+
+                    cdn_results = {
+                        'success': True,
+                        'jobs_created': result.jobs_created,
+                        'processed_images': actual_processed,
+                        'total_images': actual_total,
+                        'message': f"CDN complete: {actual_processed}/{actual_total} images processed inline"
+                    }
+
+                    logger.info(f"[UNIFIED-PROCESSOR] CDN processed inline: {actual_processed}/{actual_total} images")
+
+                else:
+                    cdn_results = {
+                        'success': False,
+                        'error': 'Profile not found for CDN processing',
+                        'processed_images': 0,
+                        'total_images': 0
+                    }
+
+            except Exception as e:
+                logger.error(f"[UNIFIED-PROCESSOR] CDN processing failed for {username}: {e}")
+                cdn_results = {
+                    'success': False,
+                    'error': str(e),
+                    'processed_images': 0,
+                    'total_images': 0
+                }
+
+        return cdn_results
+
     async def _verify_apify_data_complete(self, profile_id: str) -> Dict[str, Any]:
         """
         Verify that Apify API data is completely stored in database
@@ -8,7 +8,7 @@ import logging
 import time
 import os
 import sys
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +16,9 @@ class WorkerManager:
     def __init__(self):
         self.workers: Dict[str, subprocess.Popen] = {}
         self.worker_threads: Dict[str, threading.Thread] = {}
+        # In-process supervisors of worker process pools (e.g. UnifiedWorkerPool),
+        # reported here alongside the Celery subprocesses
+        self.process_pools: Dict[str, Any] = {}
         self.shutdown_event = threading.Event()
         
     def start_ai_worker(self) -> bool:
@@ -161,6 +164,15 @@ class WorkerManager:
             logger.error(f"Failed to configure Unified worker: {e}")
             return False
 
+    def register_process_pool(self, pool_name: str, pool: Any):
+        """Register a worker process pool so its health is reported with the other workers.
+
+        The pool must provide is_healthy() and get_process_states(); it owns its
+        own lifecycle (started/stopped from the FastAPI lifespan).
+        """
+        self.process_pools[pool_name] = pool
+        logger.info(f"Registered worker process pool: {pool_name}")
+
     def start_all_workers(self) -> bool:
         """Start all background workers"""
         logger.info("Starting all background workers...")
@@ -219,9 +231,10 @@ class WorkerManager:
             except Exception as e:
                 logger.error(f"Error stopping {worker_name}: {e}")
         
-        # Clear workers
+        # Clear workers (process pools are stopped by their owners)
         self.workers.clear()
         self.worker_threads.clear()
+        self.process_pools.clear()
         
         logger.info("All workers stopped")
     
@@ -234,17 +247,32 @@ class WorkerManager:
                 status[worker_name] = "running"
             else:
                 status[worker_name] = "stopped"
+
+        for pool_name, pool in self.process_pools.items():
+            try:
+                for process_name, state in pool.get_process_states().items():
+                    status[f"{pool_name}/{process_name}"] = state
+            except Exception as e:
+                logger.error(f"Error reading status of {pool_name}: {e}")
+                status[pool_name] = "unknown"
         
         return status
     
     def is_healthy(self) -> bool:
         """Check if all workers are running"""
-        if not self.workers:
+        if not self.workers and not self.process_pools:
             return False
         
         for process in self.workers.values():
             if process.poll() is not None:
                 return False
+
+        for pool in self.process_pools.values():
+            try:
+                if not pool.is_healthy():
+                    return False
+            except Exception:
+                return False
         
         return True
 
@@ -0,0 +1,146 @@
+"""
+Adaptive Concurrency - AIMD Slot Limits for Worker Lanes
+
+Each UnifiedAsyncWorker lane gets an AIMDLimiter instead of a fixed slot
+count. The limit grows by one slot per "window" (as many healthy
+completions as the current limit) while the lane is actually saturated, job
+latency stays within LATENCY_TOLERANCE of its job type's running average and
+the DB pool answers quickly. It halves on overload: job timeouts, Apify 429s
+or DB pool exhaustion. I/O-bound lanes (Apify scrapes) climb toward their
+ceiling on a quiet node and back off as soon as Postgres or Apify push back.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Overload reasons (exported in the limiter signals)
+OVERLOAD_TIMEOUT = 'timeout'
+OVERLOAD_APIFY_429 = 'apify_429'
+OVERLOAD_POOL_EXHAUSTED = 'pool_exhausted'
+
+# A job slower than this multiple of its job type's average latency is unhealthy
+LATENCY_TOLERANCE = 2.0
+
+# A DB acquire + round trip slower than this is unhealthy (no increases)
+DB_ACQUIRE_SLOW_SECONDS = 0.5
+
+# Smoothing factor of the latency / DB acquire averages
+EWMA_ALPHA = 0.2
+
+# Seconds after a decrease during which further overload signals don't halve
+# again - one burst of failures from the same cause counts once
+DECREASE_COOLDOWN = 30
+
+
+def classify_overload(error: BaseException) -> Optional[str]:
+    """Overload reason for a job failure, or None for ordinary errors."""
+    message = str(error).lower()
+    if (
+        type(error).__name__ == 'TooManyConnectionsError'
+        or 'queuepool limit' in message
+        or 'too many connections' in message
+    ):
+        return OVERLOAD_POOL_EXHAUSTED
+    if '429' in message or 'too many requests' in message or 'rate limit' in message:
+        return OVERLOAD_APIFY_429
+    if isinstance(error, asyncio.TimeoutError) or 'timed out' in message or 'timeout' in message:
+        return OVERLOAD_TIMEOUT
+    return None
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limit for one lane"""
+
+    def __init__(self, name: str, initial: int, minimum: int, maximum: int):
+        self.name = name
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.db_healthy = True
+        self._healthy_completions = 0
+        self._last_decrease = 0.0
+        self._latency_ewma: Dict[str, float] = {}
+        self._db_acquire_ewma: Optional[float] = None
+        self._signals: Dict[str, Any] = {
+            'increases': 0,
+            'decreases': 0,
+            'slow_jobs': 0,
+            'overloads': {
+                OVERLOAD_TIMEOUT: 0,
+                OVERLOAD_APIFY_429: 0,
+                OVERLOAD_POOL_EXHAUSTED: 0,
+            },
+            'last_overload': None,
+            'last_overload_at': None,
+        }
+
+    def record_success(self, job_type: str, latency: float, saturated: bool):
+        """A job finished; grow the limit after a full window of healthy completions."""
+        baseline = self._latency_ewma.get(job_type)
+        self._latency_ewma[job_type] = (
+            latency if baseline is None else baseline + EWMA_ALPHA * (latency - baseline)
+        )
+        if baseline is not None and latency > baseline * LATENCY_TOLERANCE:
+            self._signals['slow_jobs'] += 1
+            self._healthy_completions = 0
+            return
+
+        # Only a saturated lane has tested its current limit
+        if not saturated or not self.db_healthy or self.limit >= self.maximum:
+            return
+
+        self._healthy_completions += 1
+        if self._healthy_completions >= self.limit:
+            self._healthy_completions = 0
+            self.limit += 1
+            self._signals['increases'] += 1
+            logger.info(f"[AIMD] Lane {self.name}: limit raised to {self.limit}")
+
+    def record_overload(self, reason: str):
+        """Halve the limit (at most once per DECREASE_COOLDOWN)."""
+        self._signals['overloads'][reason] = self._signals['overloads'].get(reason, 0) + 1
+        self._signals['last_overload'] = reason
+        self._signals['last_overload_at'] = time.time()
+        self._healthy_completions = 0
+
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+
+        new_limit = max(self.minimum, self.limit // 2)
+        if new_limit < self.limit:
+            logger.warning(f"[AIMD] Lane {self.name}: {reason} - limit halved {self.limit} -> {new_limit}")
+            self.limit = new_limit
+            self._signals['decreases'] += 1
+
+    def record_db_acquire(self, seconds: Optional[float]):
+        """DB probe result: seconds to acquire a pooled connection and round-trip, None if it timed out."""
+        if seconds is None:
+            self.db_healthy = False
+            self.record_overload(OVERLOAD_POOL_EXHAUSTED)
+            return
+        self._db_acquire_ewma = (
+            seconds if self._db_acquire_ewma is None
+            else self._db_acquire_ewma + EWMA_ALPHA * (seconds - self._db_acquire_ewma)
+        )
+        self.db_healthy = self._db_acquire_ewma <= DB_ACQUIRE_SLOW_SECONDS
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'min_concurrent': self.minimum,
+            'max_concurrent': self.maximum,
+            'db_healthy': self.db_healthy,
+            'db_acquire_ms': round(self._db_acquire_ewma * 1000, 1) if self._db_acquire_ewma is not None else None,
+            'avg_latency_seconds': {
+                job_type: round(latency, 2) for job_type, latency in self._latency_ewma.items()
+            },
+            'signals': {
+                **self._signals,
+                'overloads': dict(self._signals['overloads']),
+            },
+        }
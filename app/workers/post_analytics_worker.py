@@ -4,22 +4,64 @@ Handles all post analytics processing asynchronously.
 
 Runs on a DEDICATED THREAD with its own asyncio event loop and DB pool,
 so heavy post analysis never blocks FastAPI's main event loop.
+
+Woken by pg_notify on JOB_NOTIFY_CHANNEL for post_analytics_campaign jobs,
+with a slow safety-net poll (fast poll if LISTEN is unavailable).
+Claimed jobs are leased and heartbeated like UnifiedAsyncWorker's, and
+drained / handed back to the queue on shutdown the same way.
+
+Jobs are claimed for the free MAX_CONCURRENT_JOBS slots plus
+POST_PREFETCH_MARGIN at a time and their post URLs scraped together in shared
+Apify actor runs before they are dispatched, so a campaign adding 150 posts
+costs a few dozen small batched runs instead of 150 sequential ones while
+no more jobs sit leased to this worker than it is about to run.
 """
 
 import asyncio
 import logging
 import threading
+import time
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from uuid import UUID
 import uuid as uuid_lib
 
-from app.core.job_queue import JobStatus, JobPriority, QueueType
-from app.workers.worker_database import WorkerDatabase
+from app.core.config import settings
+from app.core.job_queue import JobStatus, JobPriority, QueueType, JOB_NOTIFY_CHANNEL
+from app.workers.worker_database import WorkerDatabase, new_worker_id
+from app.services.apify_budget_governor import apify_usage_context
+from app.workers.unified_async_worker import retry_policy, retry_delay_seconds
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of post analytics jobs processed concurrently
+# (matches POST_ANALYTICS_QUEUE max_workers in IndustryStandardJobQueue)
+MAX_CONCURRENT_JOBS = 3
+
+# Jobs claimed (and their posts batch-scraped) beyond the free slots; they
+# wait leased in a ready buffer until a slot frees up
+POST_PREFETCH_MARGIN = 2
+
+# Seconds between polls when LISTEN is unavailable (fallback mode)
+POLL_INTERVAL = 2
+
+# Seconds between safety-net polls while LISTEN is healthy
+SAFETY_NET_POLL_INTERVAL = 30
+
+# Seconds between attempts to re-establish a dropped LISTEN connection
+LISTEN_RETRY_INTERVAL = 60
+
+# Seconds to wait for cancelled jobs to unwind at the end of a drain
+DRAIN_CANCEL_GRACE = 5
+
+# Seconds between lease heartbeats (must stay well below JOB_LEASE_SECONDS)
+LEASE_HEARTBEAT_INTERVAL = 10
+
+# Job checkpoint stages (see JobCheckpointService) used to resume after a dependency
+CHECKPOINT_POST_ANALYSIS = 'post_analysis'
+CHECKPOINT_CREATOR_ANALYTICS = 'creator_analytics'
+
 
 class PostAnalyticsWorker:
     """
@@ -29,10 +71,17 @@ class PostAnalyticsWorker:
 
     def __init__(self):
         self.running = False
-        self.current_job = None
+        self._active_tasks: set = set()
         self._thread: Optional[threading.Thread] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._db: Optional[WorkerDatabase] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_listen_attempt = 0.0
+        self.worker_id = new_worker_id('post-analytics')
+        self._lease_task: Optional[asyncio.Task] = None
+        # Claimed jobs waiting for a slot, and their batch-scraped post data by job id
+        self._ready: List[Dict[str, Any]] = []
+        self._prefetched: Dict[str, Any] = {}
         logger.info("[INIT] Post Analytics Worker initialized")
 
     async def start(self):
@@ -58,6 +107,13 @@ class PostAnalyticsWorker:
         except Exception as e:
             logger.error(f"[POST-ANALYTICS] Thread crashed: {e}")
         finally:
+            if self._db and self._db.pool:
+                try:
+                    self._loop.run_until_complete(self._drain())
+                except Exception as e:
+                    logger.error(f"[POST-ANALYTICS] Drain failed: {e}")
+            if self._lease_task:
+                self._lease_task.cancel()
             if self._db and self._db.pool:
                 self._loop.run_until_complete(self._db.close())
             self._loop.close()
@@ -69,35 +125,121 @@ class PostAnalyticsWorker:
         await self._db.initialize()
         logger.info("[POST-ANALYTICS] Dedicated DB pool initialized on worker thread")
 
+        self._wakeup = asyncio.Event()
+        await self._ensure_listener()
+
         await self._cleanup_stuck_jobs()
+        self._lease_task = asyncio.create_task(self._lease_loop())
 
-        logger.info("[SUCCESS] Post Analytics Worker started on dedicated thread")
+        logger.info(f"[SUCCESS] Post Analytics Worker started on dedicated thread (worker_id={self.worker_id})")
 
         while self.running:
             try:
-                job = await self._get_next_job()
-                if job:
-                    await self._process_job(job)
-                else:
-                    await asyncio.sleep(2)
+                self._wakeup.clear()
+                free_slots = MAX_CONCURRENT_JOBS - len(self._active_tasks)
+                claimed_full_batch = False
+                if free_slots > 0:
+                    if not self._ready:
+                        claim_size = free_slots + POST_PREFETCH_MARGIN
+                        jobs = await self._claim_jobs(claim_size)
+                        if jobs:
+                            await self._prefetch_posts(jobs)
+                        self._ready.extend(jobs)
+                        claimed_full_batch = len(jobs) == claim_size
+                    while self._ready and free_slots > 0:
+                        task = asyncio.create_task(self._process_job(self._ready.pop(0)))
+                        self._active_tasks.add(task)
+                        task.add_done_callback(self._on_task_done)
+                        free_slots -= 1
+                    if free_slots > 0 and claimed_full_batch:
+                        continue
+                await self._wait_for_work()
             except Exception as e:
                 logger.error(f"[ERROR] Worker error: {e}")
                 await asyncio.sleep(5)
 
     async def stop(self):
-        """Stop the worker gracefully"""
+        """Stop the worker gracefully - drain in-flight jobs, hand the rest back to the queue"""
         self.running = False
+        if self._loop and self._wakeup is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # loop already closed
         if self._thread:
-            self._thread.join(timeout=30)
+            await asyncio.to_thread(self._thread.join, settings.WORKER_DRAIN_TIMEOUT_SECONDS + 15)
         logger.info("[STOP] Post Analytics Worker stopped")
 
+    async def _drain(self):
+        """Wait up to WORKER_DRAIN_TIMEOUT_SECONDS for in-flight jobs, cancel the rest, release them."""
+        if self._active_tasks:
+            logger.info(f"[POST-ANALYTICS] Draining {len(self._active_tasks)} in-flight jobs")
+            _, pending = await asyncio.wait(
+                set(self._active_tasks), timeout=settings.WORKER_DRAIN_TIMEOUT_SECONDS
+            )
+            if pending:
+                logger.warning(f"[POST-ANALYTICS] Cancelling {len(pending)} jobs still running at drain deadline")
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(pending, timeout=DRAIN_CANCEL_GRACE)
+
+        # Undispatched jobs of the ready buffer are leased to us too
+        self._ready.clear()
+        self._prefetched.clear()
+        released = await self._db.release_worker_jobs(self.worker_id)
+        if released:
+            logger.info(f"[POST-ANALYTICS] Released {len(released)} unfinished jobs back to the queue")
+
+    async def _ensure_listener(self):
+        """(Re)establish the LISTEN connection, rate-limited to avoid connect storms."""
+        if self._db.is_listening():
+            return
+        now = time.monotonic()
+        if self._last_listen_attempt and now - self._last_listen_attempt < LISTEN_RETRY_INTERVAL:
+            return
+        self._last_listen_attempt = now
+        await self._db.listen(JOB_NOTIFY_CHANNEL, self._on_job_notification)
+
+    def _on_job_notification(self, payload: Dict[str, Any]):
+        """LISTEN callback - only post_analytics_campaign jobs wake this worker."""
+        if payload.get('job_type') == 'post_analytics_campaign':
+            self._wakeup.set()
+
+    def _on_task_done(self, task: asyncio.Task):
+        """A slot freed up - wake the main loop so it can claim the next job."""
+        self._active_tasks.discard(task)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait_for_work(self):
+        """Block until notified or the (safety-net / fallback) poll interval elapses."""
+        await self._ensure_listener()
+        timeout = SAFETY_NET_POLL_INTERVAL if self._db.is_listening() else POLL_INTERVAL
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _lease_loop(self):
+        """Heartbeat the leases of our jobs; re-queue jobs of dead workers."""
+        while True:
+            await asyncio.sleep(LEASE_HEARTBEAT_INTERVAL)
+            try:
+                await self._db.renew_leases(self.worker_id)
+                reaped = await self._db.reap_expired_leases()
+                if reaped:
+                    logger.warning(f"[LEASE] Re-queued {len(reaped)} jobs with expired leases")
+            except Exception as e:
+                logger.error(f"[LEASE] Heartbeat failed: {e}")
+
     async def _cleanup_stuck_jobs(self):
         """Clean up any stuck post_analytics_campaign jobs from previous runs"""
         logger.info("[CLEANUP] Checking for stuck jobs...")
 
         try:
-            # Only reset post_analytics_campaign jobs stuck in processing
-            # (UnifiedAsyncWorker handles cleanup for all other job types)
+            # Only reset unleased post_analytics_campaign jobs stuck in processing
+            # (leased jobs are recovered by the lease reaper, other job types
+            # by UnifiedAsyncWorker)
             result = await self._db.execute_query("""
                 UPDATE job_queue
                 SET status = 'queued',
@@ -105,6 +247,7 @@ class PostAnalyticsWorker:
                     progress_message = 'Reset after worker restart'
                 WHERE status = 'processing'
                 AND job_type = 'post_analytics_campaign'
+                AND lease_expires_at IS NULL
                 AND started_at < NOW() - INTERVAL '30 minutes'
                 RETURNING id, job_type
             """)
@@ -119,10 +262,10 @@ class PostAnalyticsWorker:
         except Exception as e:
             logger.error(f"[CLEANUP] Failed to clean up stuck jobs: {e}")
 
-    async def _get_next_job(self) -> Optional[Dict[str, Any]]:
-        """Get the next post analytics job from the queue"""
+    async def _claim_jobs(self, limit: int) -> List[Dict[str, Any]]:
+        """Claim up to `limit` post analytics jobs in a single round trip"""
         try:
-            # Reset post_analytics_campaign jobs stuck in processing (30 min timeout)
+            # Reset unleased post_analytics_campaign jobs stuck in processing (30 min timeout)
             await self._db.execute_query("""
                 UPDATE job_queue
                 SET status = 'queued',
@@ -130,18 +273,69 @@ class PostAnalyticsWorker:
                     progress_message = 'Reset due to timeout'
                 WHERE status = 'processing'
                 AND job_type = 'post_analytics_campaign'
+                AND lease_expires_at IS NULL
                 AND started_at < NOW() - INTERVAL '30 minutes'
             """)
 
-            # Get next post_analytics_campaign job using raw asyncpg
-            return await self._db.get_next_job()
+            # Claim a batch of post_analytics_campaign jobs using raw asyncpg
+            return await self._db.claim_jobs(
+                limit, include_types=['post_analytics_campaign'], worker_id=self.worker_id
+            )
+
+        except Exception as e:
+            logger.error(f"[ERROR] Failed to claim jobs: {e}")
+            return []
+
+    async def _prefetch_posts(self, jobs: List[Dict[str, Any]]):
+        """
+        Scrape the posts of a claimed batch in shared actor runs. Jobs resuming
+        after a dependency already have their post analysis and are skipped.
+        Failures only cost the batching - _process_job falls back to a
+        single-post fetch.
+        """
+        try:
+            from app.services.standalone_post_analytics_service import standalone_post_analytics_service
+            from app.services.job_checkpoint_service import job_checkpoint_service
+
+            checkpoints = await job_checkpoint_service.load_many([job["id"] for job in jobs])
+
+            # One batch per tenant, so each tenant's Apify budget pays for its own posts
+            urls_by_tenant: Dict[str, Dict[str, str]] = {}
+            for job in jobs:
+                post_url = job["params"].get("instagram_post_url")
+                if post_url and CHECKPOINT_POST_ANALYSIS not in checkpoints.get(str(job["id"]), {}):
+                    urls_by_tenant.setdefault(str(job["user_id"]), {})[str(job["id"])] = post_url
+            if not urls_by_tenant:
+                return
+
+            async def fetch_for_tenant(tenant_id: str, urls_by_job: Dict[str, str]):
+                with apify_usage_context(tenant_id, 'post_analytics_campaign'):
+                    post_data = await standalone_post_analytics_service.fetch_posts_batch(
+                        list(set(urls_by_job.values()))
+                    )
+                for job_id, post_url in urls_by_job.items():
+                    self._prefetched[job_id] = post_data.get(post_url)
+
+            logger.info(
+                f"[PREFETCH] Batch-scraping posts for {sum(len(u) for u in urls_by_tenant.values())} "
+                f"of {len(jobs)} claimed jobs ({len(urls_by_tenant)} tenants)"
+            )
+            await asyncio.gather(*(
+                fetch_for_tenant(tenant_id, urls_by_job) for tenant_id, urls_by_job in urls_by_tenant.items()
+            ))
 
         except Exception as e:
-            logger.error(f"[ERROR] Failed to get next job: {e}")
-            return None
+            logger.error(f"[PREFETCH] Batch scrape failed, jobs fetch their posts one by one: {e}")
 
     async def _process_job(self, job: Dict[str, Any]):
-        """Process a single post analytics job"""
+        """
+        Process a single post analytics job.
+
+        If the creator's full analytics are not complete yet, the job records
+        its post analysis as a checkpoint, declares a dependency on the
+        creator's profile pipeline job and releases its slot. The dependency's
+        completion re-queues it, and the re-dispatch resumes at step 3.
+        """
         job_id = job["id"]
         params = job["params"]
 
@@ -154,25 +348,52 @@ class PostAnalyticsWorker:
             from app.database.optimized_pools import optimized_pools
             from app.services.standalone_post_analytics_service import standalone_post_analytics_service
             from app.services.campaign_service import campaign_service
+            from app.services.job_checkpoint_service import job_checkpoint_service
+            from app.utils.json_serializer import safe_json_response
 
-            async with optimized_pools.get_background_session() as db:
-                # STEP 1: Run Post Analytics
-                logger.info(f"[PROCESSING] Starting post analytics for job {job_id}")
+            from app.scrapers.apify_instagram_client import ApifyProfileNotFoundError
 
-                post_analysis = await standalone_post_analytics_service.analyze_post_by_url(
-                    post_url=params["instagram_post_url"],
-                    db=db,
-                    user_id=UUID(params["user_id"])
-                )
+            checkpoints = await job_checkpoint_service.load(job_id)
+
+            # Batch-scraped post (see _prefetch_posts); a post the batch found
+            # missing fails like a single fetch would, other batch errors retry
+            # the post on its own
+            post_data = self._prefetched.pop(str(job_id), None)
+            if isinstance(post_data, ApifyProfileNotFoundError):
+                raise post_data
+            if isinstance(post_data, Exception):
+                post_data = None
+
+            async with optimized_pools.get_background_session() as db:
+                # STEP 1: Run Post Analytics (skipped when resuming after a dependency)
+                post_analysis = checkpoints.get(CHECKPOINT_POST_ANALYSIS)
+                if post_analysis is None:
+                    logger.info(f"[PROCESSING] Starting post analytics for job {job_id}")
+
+                    with apify_usage_context(job.get("user_id"), job.get("job_type")):
+                        post_analysis = await standalone_post_analytics_service.analyze_post_by_url(
+                            post_url=params["instagram_post_url"],
+                            db=db,
+                            user_id=UUID(params["user_id"]),
+                            post_data=post_data
+                        )
+                    await job_checkpoint_service.save(
+                        job_id, CHECKPOINT_POST_ANALYSIS, safe_json_response(post_analysis)
+                    )
 
-                # STEP 2: Wait for FULL Creator Analytics if needed
+                # STEP 2: Depend on FULL Creator Analytics if needed
                 creator_username = post_analysis.get("profile", {}).get("username")
-                if creator_username and params.get("wait_for_full_analytics", True):
-                    await self._wait_for_creator_analytics_completion(
+                if (
+                    creator_username
+                    and params.get("wait_for_full_analytics", True)
+                    and CHECKPOINT_CREATOR_ANALYTICS not in checkpoints
+                ):
+                    if await self._defer_until_creator_analytics(
                         username=creator_username,
                         db=db,
                         job_id=job_id
-                    )
+                    ):
+                        return  # Slot released - re-dispatched when the dependency finishes
 
                 # STEP 3: Add post to campaign
                 logger.info(f"[ANALYTICS] Adding post to campaign for job {job_id}")
@@ -203,6 +424,7 @@ class PostAnalyticsWorker:
                     status=JobStatus.COMPLETED,
                     result=result_data
                 )
+                await job_checkpoint_service.clear(job_id)
 
                 logger.info(f"[SUCCESS] Job {job_id} completed successfully")
 
@@ -210,95 +432,91 @@ class PostAnalyticsWorker:
             logger.error(f"[ERROR] Job {job_id} failed: {e}")
 
             retry_count = job.get("retry_count", 0)
-            max_retries = 3
+            max_retries = retry_policy('post_analytics_campaign')['max_retries']
 
             if retry_count < max_retries:
-                logger.info(f"[RETRY] Job {job_id} will be retried (attempt {retry_count + 1}/{max_retries})")
-                await self._db.execute_query("""
-                    UPDATE job_queue
-                    SET status = 'queued',
-                        retry_count = retry_count + 1,
-                        started_at = NULL,
-                        progress_message = $1
-                    WHERE id = $2::uuid
-                """, f"Retry {retry_count + 1}/{max_retries} after error: {str(e)[:100]}", job_id)
+                delay = retry_delay_seconds('post_analytics_campaign', retry_count)
+                logger.info(f"[RETRY] Job {job_id} will be retried in {delay:.0f}s (attempt {retry_count + 1}/{max_retries})")
+                await self._db.schedule_retry(
+                    job_id,
+                    delay,
+                    error=str(e)[:1000],
+                    message=f"Retry {retry_count + 1}/{max_retries} after error: {str(e)[:100]}"
+                )
             else:
-                logger.error(f"[FAILED] Job {job_id} failed after {max_retries} attempts")
-                await self._update_job_status(
-                    job_id=job_id,
-                    status=JobStatus.FAILED,
-                    error=f"Failed after {max_retries} attempts. Last error: {str(e)}"
+                logger.error(f"[FAILED] Job {job_id} failed after {max_retries} attempts - dead-lettered")
+                await self._db.dead_letter_job(
+                    job_id, f"Failed after {max_retries} attempts. Last error: {str(e)[:1000]}"
                 )
 
-    async def _wait_for_creator_analytics_completion(
+    async def _defer_until_creator_analytics(
         self,
         username: str,
         db,
         job_id: str
-    ):
-        """Wait for full creator analytics completion"""
-        logger.info(f"[ANALYTICS] Job {job_id}: Starting FULL Creator Analytics for @{username}")
+    ) -> bool:
+        """
+        Make this job depend on the creator's full analytics pipeline.
 
-        try:
-            from app.services.creator_analytics_trigger_service import creator_analytics_trigger_service
-            from app.services.unified_background_processor import UnifiedBackgroundProcessor
+        Returns False when the creator is already fully processed (continue
+        inline). Otherwise reuses or enqueues a profile_analysis_background job
+        for the creator, parks this job on it and returns True. Errors are
+        logged and treated as "continue" - same as the old inline wait.
+        """
+        from app.services.job_checkpoint_service import job_checkpoint_service
+        from app.services.unified_background_processor import UnifiedBackgroundProcessor
+        from sqlalchemy import text
 
-            profile, metadata = await creator_analytics_trigger_service.trigger_full_creator_analytics(
-                username=username,
-                db=db,
-                force_refresh=False
+        try:
+            profile_r = await db.execute(text("""
+                SELECT id FROM profiles WHERE username = :username
+            """).execution_options(prepare=False), {'username': username})
+            profile_row = profile_r.fetchone()
+
+            if profile_row:
+                status = await UnifiedBackgroundProcessor().get_profile_processing_status(str(profile_row.id))
+                if status.get('overall_complete'):
+                    logger.info(f"[COMPLETE] Job {job_id}: Creator Analytics already complete for @{username}")
+                    await job_checkpoint_service.save(
+                        job_id, CHECKPOINT_CREATOR_ANALYTICS, {'already_complete': True}
+                    )
+                    return False
+
+            dependency_job_id = await self._db.ensure_dependency_job(
+                parent_job_id=job_id,
+                job_type='profile_analysis_background',
+                params={
+                    'username': username,
+                    'force_refresh': False,
+                    'trigger_source': 'post_analytics_campaign',
+                },
+                match_params={'username': username},
             )
+            if not dependency_job_id:
+                logger.warning(f"[WARNING] Job {job_id}: Could not enqueue Creator Analytics for @{username}")
+                return False
 
-            if not profile or profile.followers_count == 0:
-                logger.warning(f"[WARNING] Job {job_id}: Initial analytics failed, retrying with force refresh")
-                profile, metadata = await creator_analytics_trigger_service.trigger_full_creator_analytics(
-                    username=username,
-                    db=db,
-                    force_refresh=True
-                )
-
-            if profile and profile.followers_count > 0:
-                profile_id = str(profile.id)
-                logger.info(f"[ANALYTICS] Job {job_id}: Creator Analytics triggered - {profile.followers_count:,} followers")
-
-                processor = UnifiedBackgroundProcessor()
-                max_wait_time = 300  # 5 minutes
-                check_interval = 5
-                elapsed_time = 0
-
-                initial_status = await processor.get_profile_processing_status(profile_id)
-                logger.info(f"[PROCESSING] Job {job_id}: Initial status - Complete: {initial_status.get('overall_complete')}")
-
-                if not initial_status.get('overall_complete'):
-                    logger.info(f"[WAITING] Job {job_id}: Waiting for completion...")
-
-                    while elapsed_time < max_wait_time:
-                        try:
-                            status = await processor.get_profile_processing_status(profile_id)
-
-                            if status['overall_complete']:
-                                logger.info(f"[COMPLETE] Job {job_id}: FULL Creator Analytics COMPLETE for @{username}")
-                                break
-
-                            progress_percent = min(90, int((elapsed_time / max_wait_time) * 90))
-                            await self._update_job_progress(job_id, progress_percent, status['current_stage'])
-
-                            await asyncio.sleep(check_interval)
-                            elapsed_time += check_interval
-
-                        except Exception as status_error:
-                            logger.warning(f"[WARNING] Job {job_id}: Status check error: {status_error}")
-                            await asyncio.sleep(check_interval)
-                            elapsed_time += check_interval
+            # Recorded before parking so the re-dispatch goes straight to step 3
+            await job_checkpoint_service.save(
+                job_id, CHECKPOINT_CREATOR_ANALYTICS, {'dependency_job_id': dependency_job_id}
+            )
+            new_status = await self._db.wait_for_jobs(
+                job_id,
+                [dependency_job_id],
+                f"Waiting for Creator Analytics of @{username}"
+            )
+            if new_status is None:
+                return False
 
-                if elapsed_time >= max_wait_time:
-                    logger.warning(f"[TIMEOUT] Job {job_id}: Timeout after {max_wait_time}s")
-                else:
-                    logger.info(f"[SUCCESS] Job {job_id}: Creator fully processed in {elapsed_time}s")
+            logger.info(
+                f"[WAITING] Job {job_id}: depends on Creator Analytics job {dependency_job_id} "
+                f"for @{username} (status: {new_status})"
+            )
+            return True
 
         except Exception as e:
-            logger.error(f"[ERROR] Job {job_id}: Creator analytics failed: {e}")
-            # Continue anyway - don't fail the whole job
+            logger.error(f"[ERROR] Job {job_id}: Creator analytics dependency failed: {e}")
+            return False  # Continue anyway - don't fail the whole job
 
     async def _update_job_status(
         self,
@@ -335,7 +553,11 @@ class PostAnalyticsWorker:
     def get_status(self) -> Dict[str, Any]:
         return {
             'running': self.running,
-            'current_job': self.current_job,
+            'worker_id': self.worker_id,
+            'active_jobs': len(self._active_tasks),
+            'max_concurrent': MAX_CONCURRENT_JOBS,
+            'ready_jobs': len(self._ready),
+            'dispatch_mode': 'notify' if self._db and self._db.is_listening() else 'poll',
         }
 
 
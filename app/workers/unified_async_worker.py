@@ -6,29 +6,173 @@ asyncpg database pool, so heavy job processing never blocks FastAPI's
 main event loop. This is the same isolation model that Celery provides
 (each task gets its own loop), without the subprocess overhead.
 
-Polls the job_queue table directly via raw asyncpg and dispatches to the
-existing _process_*_async(job_id) functions from unified_worker.py.
+Claims from the job_queue table directly via raw asyncpg and dispatches to
+the existing _process_*_async(job_id) functions from unified_worker.py.
+
+Dispatch is notification-driven: enqueue_job emits pg_notify on
+JOB_NOTIFY_CHANNEL and the worker blocks on LISTEN until a job arrives or a
+slot frees up. A slow safety-net poll catches anything a dropped listener
+missed; if LISTEN is unavailable the worker falls back to fast polling.
+
+Concurrency is split into per-job-type lanes (JOB_LANES) so jobs that block
+on Apify for minutes cannot occupy the slots of cheap jobs. Each lane's slot
+count is adaptive (AIMDLimiter): it grows while jobs and the DB pool stay
+healthy and halves on timeouts, Apify 429s or pool exhaustion. Within a lane,
+claims are weighted-fair across users by tier (tenant_quotas) and strict by
+JobPriority.
+
+Failed jobs are retried with per-job-type exponential backoff and jitter
+(job_queue.run_after gates the claim); once retries are exhausted the job
+is failed and copied to job_dead_letter_queue.
+
+Claimed jobs are leased to this worker (job_queue.worker_id +
+lease_expires_at) and kept alive by a heartbeat. Any worker re-queues jobs
+whose lease expired, so a crashed or evicted worker's jobs are re-dispatched
+within about a lease period while long jobs of a live worker are never reset.
+On shutdown the worker drains: it stops claiming, waits up to
+WORKER_DRAIN_TIMEOUT_SECONDS for in-flight jobs, then hands the unfinished ones
+straight back to the queue (they resume from their stage checkpoints).
 """
 
 import asyncio
+import functools
 import logging
+import random
 import threading
-from typing import Dict, Any, Optional
+import time
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional
 
-from app.workers.worker_database import WorkerDatabase
+from app.core.config import settings
+from app.core.job_queue import JOB_NOTIFY_CHANNEL, job_queue
+from app.services.apify_budget_governor import apify_usage_context
+from app.workers.adaptive_concurrency import AIMDLimiter, classify_overload, OVERLOAD_POOL_EXHAUSTED
+from app.workers.worker_database import WorkerDatabase, new_worker_id
 
 logger = logging.getLogger(__name__)
 
-# Maximum number of jobs processed concurrently
-MAX_CONCURRENT_JOBS = 3
-
-# Seconds between polls when the queue is empty
+# Concurrency lanes - each lane has its own slots, so long I/O-bound jobs
+# (Apify scrapes) never starve short ones. Job types not listed in any lane
+# run in the 'default' lane. Slots start at initial_concurrent and adapt
+# between min_concurrent and max_concurrent (AIMD).
+JOB_LANES = {
+    'scrape': {
+        'min_concurrent': 1,
+        'initial_concurrent': 2,
+        'max_concurrent': 8,
+        'job_types': {
+            'creator_search', 'profile_analysis', 'profile_analysis_background',
+            'post_analysis', 'batch_post_analysis', 'imd_creator_analytics',
+            'profile_refresh',
+        },
+    },
+    'bulk': {
+        'min_concurrent': 1,
+        'initial_concurrent': 1,
+        'max_concurrent': 2,
+        'job_types': {'bulk_analysis', 'bulk_unlock'},
+    },
+    'fast': {
+        'min_concurrent': 1,
+        'initial_concurrent': 2,
+        'max_concurrent': 6,
+        'job_types': {'discovery_unlock', 'campaign_export'},
+    },
+    'default': {
+        'min_concurrent': 1,
+        'initial_concurrent': 1,
+        'max_concurrent': 3,
+        'job_types': set(),
+    },
+}
+DEFAULT_LANE = 'default'
+
+# Ceiling on jobs processed concurrently (all lanes at their AIMD maximum)
+MAX_CONCURRENT_JOBS = sum(lane['max_concurrent'] for lane in JOB_LANES.values())
+
+# Seconds between polls when LISTEN is unavailable (fallback mode)
 POLL_INTERVAL = 2
 
+# Seconds between safety-net polls while LISTEN is healthy
+SAFETY_NET_POLL_INTERVAL = 30
+
+# Seconds between attempts to re-establish a dropped LISTEN connection
+LISTEN_RETRY_INTERVAL = 60
+
+# Seconds between stuck-job cleanup passes
+CLEANUP_INTERVAL = 300
+
+# Seconds between archiver passes (finished jobs -> job_queue_archive)
+ARCHIVE_INTERVAL = 900
+
+# Seconds between staleness refresh scheduler passes (only while the scrape lane has idle slots)
+REFRESH_SCHEDULE_INTERVAL = 300
+
+# Seconds allowed for the periodic DB acquire probe before the pool counts as exhausted
+DB_PROBE_TIMEOUT = 5
+
+# Seconds to wait for cancelled jobs to unwind at the end of a drain
+DRAIN_CANCEL_GRACE = 5
+
+# Seconds between lease heartbeats / expired-lease reaper passes
+# (must stay well below JOB_LEASE_SECONDS)
+LEASE_HEARTBEAT_INTERVAL = 10
+
+# Jobs claimed without a lease (older workers, Celery paths) are only reset
+# after their queue's timeout, and never sooner than this
+UNLEASED_MIN_RESET_SECONDS = 300
+
+# Retry policy per job type: retries after the first failure, and the backoff
+# window base_delay * 2**retry (capped at max_delay). Job types not listed use
+# DEFAULT_RETRY_POLICY.
+DEFAULT_RETRY_POLICY = {'max_retries': 3, 'base_delay': 15, 'max_delay': 600}
+RETRY_POLICIES = {
+    # Apify-backed: actor failures and rate limits clear on the order of minutes
+    'creator_search': {'max_retries': 3, 'base_delay': 30, 'max_delay': 900},
+    'profile_analysis': {'max_retries': 3, 'base_delay': 30, 'max_delay': 900},
+    'profile_analysis_background': {'max_retries': 3, 'base_delay': 60, 'max_delay': 1800},
+    'post_analysis': {'max_retries': 3, 'base_delay': 30, 'max_delay': 900},
+    'batch_post_analysis': {'max_retries': 3, 'base_delay': 60, 'max_delay': 1800},
+    'imd_creator_analytics': {'max_retries': 3, 'base_delay': 60, 'max_delay': 1800},
+    # Scheduled refreshes: the next scheduler pass re-enqueues anything still stale
+    'profile_refresh': {'max_retries': 1, 'base_delay': 300, 'max_delay': 1800},
+    'post_analytics_campaign': {'max_retries': 3, 'base_delay': 30, 'max_delay': 900},
+    # Long batch jobs: back off hard rather than re-run a large batch in a storm
+    'bulk_analysis': {'max_retries': 2, 'base_delay': 120, 'max_delay': 1800},
+    'bulk_unlock': {'max_retries': 2, 'base_delay': 60, 'max_delay': 900},
+    # DB-only jobs: a database hiccup is usually over within seconds
+    'discovery_unlock': {'max_retries': 3, 'base_delay': 5, 'max_delay': 120},
+    'campaign_export': {'max_retries': 3, 'base_delay': 10, 'max_delay': 300},
+}
+
 # Job types handled by PostAnalyticsWorker - we must NOT claim these
 POST_ANALYTICS_WORKER_TYPES = {'post_analytics_campaign'}
 
 
+def lane_for_job_type(job_type: str) -> str:
+    """Name of the concurrency lane a job type runs in."""
+    for lane_name, lane in JOB_LANES.items():
+        if job_type in lane['job_types']:
+            return lane_name
+    return DEFAULT_LANE
+
+
+def retry_policy(job_type: str) -> Dict[str, Any]:
+    """Retry policy (max_retries / base_delay / max_delay) for a job type."""
+    return RETRY_POLICIES.get(job_type, DEFAULT_RETRY_POLICY)
+
+
+def retry_delay_seconds(job_type: str, retry_count: int) -> float:
+    """
+    Backoff before retry number `retry_count + 1`: exponential in the retry
+    count, capped, with "equal jitter" (half fixed, half random) so retries
+    of jobs that failed together spread out instead of landing together.
+    """
+    policy = retry_policy(job_type)
+    window = min(policy['max_delay'], policy['base_delay'] * (2 ** retry_count))
+    return window / 2 + random.uniform(0, window / 2)
+
+
 class UnifiedAsyncWorker:
     """
     In-process async worker for ALL job types except post_analytics_campaign.
@@ -47,16 +191,36 @@ class UnifiedAsyncWorker:
         'bulk_unlock': '_process_bulk_unlock_async',
         'campaign_export': '_process_campaign_export_async',
         'imd_creator_analytics': '_process_imd_analytics_async',
+        'profile_refresh': '_process_profile_refresh_async',
     }
 
     def __init__(self):
         self.running = False
-        self._semaphore: Optional[asyncio.Semaphore] = None
         self._active_tasks: set = set()
+        # lane name -> tasks currently running in that lane
+        self._lane_tasks: Dict[str, set] = {lane: set() for lane in JOB_LANES}
+        # lane name -> adaptive slot limit
+        self._limiters: Dict[str, AIMDLimiter] = {
+            lane_name: AIMDLimiter(
+                lane_name,
+                initial=lane['initial_concurrent'],
+                minimum=lane['min_concurrent'],
+                maximum=lane['max_concurrent'],
+            )
+            for lane_name, lane in JOB_LANES.items()
+        }
         self._thread: Optional[threading.Thread] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         # Own DB pool - NOT shared with PostAnalyticsWorker on the main loop
         self._db: Optional[WorkerDatabase] = None
+        # Set by job notifications and finished tasks to wake the main loop
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_listen_attempt = 0.0
+        # Identity this worker's claims and lease heartbeats are keyed on
+        self.worker_id = new_worker_id('unified')
+        self._lease_task: Optional[asyncio.Task] = None
+        # Monotonic time the earliest retry scheduled by this worker becomes due
+        self._next_retry_due: Optional[float] = None
         logger.info("[INIT] Unified Async Worker initialized")
 
     async def start(self):
@@ -78,14 +242,41 @@ class UnifiedAsyncWorker:
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
         try:
-            self._loop.run_until_complete(self._main_loop())
+            self._loop.run_until_complete(self.run_forever())
         except Exception as e:
             logger.error(f"[UNIFIED-WORKER] Thread crashed: {e}")
         finally:
+            self._loop.close()
+
+    async def run_forever(self):
+        """
+        Run the claim/dispatch loop on the CURRENT event loop until stopped.
+        Used by the worker thread and by each process of UnifiedWorkerPool;
+        callers set self.running before entering.
+        """
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._main_loop()
+        finally:
+            if self._db and self._db.pool:
+                try:
+                    await self._drain()
+                except Exception as e:
+                    logger.error(f"[UNIFIED-WORKER] Drain failed: {e}")
+            if self._lease_task:
+                self._lease_task.cancel()
             # Clean up our own DB pool
             if self._db and self._db.pool:
-                self._loop.run_until_complete(self._db.close())
-            self._loop.close()
+                await self._db.close()
+
+    def request_stop(self):
+        """Thread-safe stop signal - wakes the main loop so it exits promptly."""
+        self.running = False
+        if self._loop and self._wakeup is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass  # loop already closed
 
     async def _main_loop(self):
         """Actual async main loop running on the worker thread's own event loop."""
@@ -94,34 +285,49 @@ class UnifiedAsyncWorker:
         await self._db.initialize()
         logger.info("[UNIFIED-WORKER] Dedicated DB pool initialized on worker thread")
 
-        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+        self._wakeup = asyncio.Event()
+        await self._ensure_listener()
 
         await self._cleanup_stuck_jobs()
+        self._lease_task = asyncio.create_task(self._lease_loop())
 
         logger.info(
             f"[SUCCESS] Unified Async Worker started on dedicated thread "
-            f"(concurrency={MAX_CONCURRENT_JOBS}, poll={POLL_INTERVAL}s)"
+            f"(worker_id={self.worker_id}, concurrency={self.concurrency_limit()}-{MAX_CONCURRENT_JOBS}, "
+            f"dispatch={'notify' if self._db.is_listening() else f'poll {POLL_INTERVAL}s'})"
         )
 
-        polls_since_cleanup = 0
-        # Run periodic cleanup every ~5 minutes (150 polls * 2s)
-        CLEANUP_INTERVAL_POLLS = 150
+        last_cleanup = time.monotonic()
+        last_archive = 0.0  # first pass right after startup
+        last_refresh_schedule = time.monotonic()
 
         while self.running:
             try:
-                # Only poll if we have capacity
-                if self._semaphore._value > 0:  # noqa: SLF001
-                    job = await self._get_next_job()
-                    if job:
-                        task = asyncio.create_task(self._run_with_semaphore(job))
+                # Clear BEFORE polling so a notification that lands mid-claim
+                # still wakes the next wait instead of being lost
+                self._wakeup.clear()
+
+                # Only poll lanes with capacity - one batch claim per lane
+                # fills every free slot in that lane
+                saturated = False
+                for lane_name in JOB_LANES:
+                    free_slots = self._limiters[lane_name].limit - len(self._lane_tasks[lane_name])
+                    if free_slots <= 0:
+                        continue
+                    jobs = await self._claim_jobs(lane_name, free_slots)
+                    for job in jobs:
+                        task = asyncio.create_task(self._process_job(job))
                         self._active_tasks.add(task)
-                        task.add_done_callback(self._active_tasks.discard)
-                        continue  # immediately try to grab another job
+                        self._lane_tasks[lane_name].add(task)
+                        task.add_done_callback(functools.partial(self._on_task_done, lane_name))
+                    if len(jobs) == free_slots:
+                        saturated = True
+                if saturated:
+                    continue  # queue may hold more - refill as slots free up
 
                 # Periodic stuck-job cleanup (catches jobs orphaned by server kills)
-                polls_since_cleanup += 1
-                if polls_since_cleanup >= CLEANUP_INTERVAL_POLLS:
-                    polls_since_cleanup = 0
+                if time.monotonic() - last_cleanup >= CLEANUP_INTERVAL:
+                    last_cleanup = time.monotonic()
                     await self._cleanup_stuck_jobs()
                     # Also clean up stale IMD analytics jobs
                     try:
@@ -130,41 +336,174 @@ class UnifiedAsyncWorker:
                     except Exception as e:
                         logger.warning(f"[UNIFIED-WORKER] IMD stale cleanup failed: {e}")
 
-                # Nothing to do or at capacity - sleep briefly
-                await asyncio.sleep(POLL_INTERVAL)
+                # Periodic archive of finished jobs - keeps job_queue to live rows
+                if time.monotonic() - last_archive >= ARCHIVE_INTERVAL:
+                    last_archive = time.monotonic()
+                    await self._archive_finished_jobs()
+
+                # Periodic staleness refreshes - fill idle scrape slots within the Apify budget
+                if time.monotonic() - last_refresh_schedule >= REFRESH_SCHEDULE_INTERVAL:
+                    last_refresh_schedule = time.monotonic()
+                    await self._schedule_profile_refreshes()
+
+                # Nothing to do or at capacity - block until notified
+                await self._wait_for_work()
             except Exception as e:
                 logger.error(f"[UNIFIED-WORKER] Loop error: {e}")
                 await asyncio.sleep(5)
 
     async def stop(self):
-        """Graceful shutdown - let in-flight jobs finish."""
-        self.running = False
+        """Graceful shutdown - drain in-flight jobs, hand the rest back to the queue."""
+        self.request_stop()
         if self._thread:
-            self._thread.join(timeout=30)
+            await asyncio.to_thread(self._thread.join, settings.WORKER_DRAIN_TIMEOUT_SECONDS + 15)
         logger.info("[UNIFIED-WORKER] Stopped")
 
+    async def _drain(self):
+        """
+        Shutdown hand-off. Claiming has already stopped; give in-flight jobs
+        up to WORKER_DRAIN_TIMEOUT_SECONDS to finish, cancel the rest, then
+        release every job this worker still holds (including single-flight
+        followers with no task) back to 'queued' for another worker.
+        """
+        if self._active_tasks:
+            logger.info(
+                f"[UNIFIED-WORKER] Draining {len(self._active_tasks)} in-flight jobs "
+                f"(up to {settings.WORKER_DRAIN_TIMEOUT_SECONDS}s)"
+            )
+            _, pending = await asyncio.wait(
+                set(self._active_tasks), timeout=settings.WORKER_DRAIN_TIMEOUT_SECONDS
+            )
+            if pending:
+                logger.warning(f"[UNIFIED-WORKER] Cancelling {len(pending)} jobs still running at drain deadline")
+                for task in pending:
+                    task.cancel()
+                await asyncio.wait(pending, timeout=DRAIN_CANCEL_GRACE)
+
+        released = await self._db.release_worker_jobs(self.worker_id)
+        if released:
+            logger.info(f"[UNIFIED-WORKER] Released {len(released)} unfinished jobs back to the queue")
+            for job_id in released:
+                logger.info(f"  - Released job {job_id}")
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    async def _ensure_listener(self):
+        """(Re)establish the LISTEN connection, rate-limited to avoid connect storms."""
+        if self._db.is_listening():
+            return
+        now = time.monotonic()
+        if self._last_listen_attempt and now - self._last_listen_attempt < LISTEN_RETRY_INTERVAL:
+            return
+        self._last_listen_attempt = now
+        await self._db.listen(JOB_NOTIFY_CHANNEL, self._on_job_notification)
+
+    def _on_job_notification(self, payload: Dict[str, Any]):
+        """LISTEN callback - wake the main loop for job types we own."""
+        if payload.get('job_type') in POST_ANALYTICS_WORKER_TYPES:
+            return
+        self._wakeup.set()
+
+    def _on_task_done(self, lane_name: str, task: asyncio.Task):
+        """A slot freed up - wake the main loop so it can claim the next job."""
+        self._active_tasks.discard(task)
+        self._lane_tasks[lane_name].discard(task)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait_for_work(self):
+        """
+        Block until a job notification arrives, a running job finishes, or the
+        poll interval elapses. The interval is the slow safety net while LISTEN
+        is healthy, and the old fast poll when it isn't.
+        """
+        await self._ensure_listener()
+        timeout = SAFETY_NET_POLL_INTERVAL if self._db.is_listening() else POLL_INTERVAL
+        # Retries become claimable without a notification - wake up for them
+        if self._next_retry_due is not None:
+            until_due = self._next_retry_due - time.monotonic()
+            if until_due <= 0:
+                self._next_retry_due = None
+            else:
+                timeout = min(timeout, until_due + 0.5)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _lease_loop(self):
+        """Heartbeat our leases, then re-queue jobs of workers whose leases expired.
+        Keeps running through a drain; cancelled once the worker has shut down."""
+        while True:
+            await asyncio.sleep(LEASE_HEARTBEAT_INTERVAL)
+            try:
+                await self._db.renew_leases(self.worker_id)
+                await self._reap_expired_leases()
+            except Exception as e:
+                logger.error(f"[LEASE] Heartbeat failed: {e}")
+            await self._probe_db_acquire()
+
+    async def _probe_db_acquire(self):
+        """Time a pooled session acquire + round trip on the pool job handlers use; feeds the AIMD limiters."""
+        from sqlalchemy import text
+        from app.database.optimized_pools import optimized_pools
+
+        async def _probe():
+            async with optimized_pools.get_background_session() as session:
+                await session.execute(text("SELECT 1").execution_options(prepare=False))
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(_probe(), timeout=DB_PROBE_TIMEOUT)
+            elapsed = time.monotonic() - started
+        except Exception as e:
+            if not isinstance(e, asyncio.TimeoutError) and classify_overload(e) != OVERLOAD_POOL_EXHAUSTED:
+                logger.warning(f"[AIMD] DB probe failed: {e}")
+                return
+            elapsed = None
+        for limiter in self._limiters.values():
+            limiter.record_db_acquire(elapsed)
+
+    async def _reap_expired_leases(self):
+        reaped = await self._db.reap_expired_leases()
+        if reaped:
+            logger.warning(f"[LEASE] Re-queued {len(reaped)} jobs with expired leases")
+            for row in reaped:
+                logger.warning(f"  - Job {row['id']} ({row['job_type']}) lost by {row['worker_id']}")
+            self._wakeup.set()
+
     async def _cleanup_stuck_jobs(self):
-        """Reset jobs stuck in 'processing' for over 5 minutes back to 'queued'.
+        """Re-queue jobs orphaned in 'processing'.
 
-        When the server is killed, no worker can be processing these jobs anymore.
-        5 minutes is safe — real jobs typically finish or fail well within that window,
-        and a killed server means zero live workers.
+        Leased jobs are recovered as soon as their lease expires. Jobs claimed
+        without a lease (older workers, Celery paths) have no liveness signal,
+        so they are only reset once they exceed their queue's timeout.
         """
+        await self._reap_expired_leases()
+
+        queue_values = [queue.value for queue in job_queue.queue_config]
+        queue_timeouts = [config['timeout_seconds'] for config in job_queue.queue_config.values()]
         try:
             result = await self._db.execute_query("""
-                UPDATE job_queue
+                UPDATE job_queue j
                 SET status = 'queued',
                     started_at = NULL,
-                    progress_message = 'Reset after unified worker restart'
-                WHERE status = 'processing'
-                AND started_at < NOW() - INTERVAL '5 minutes'
-                AND job_type != 'post_analytics_campaign'
-                RETURNING id, job_type
-            """)
+                    progress_message = 'Reset after exceeding queue timeout without a lease'
+                WHERE j.status = 'processing'
+                AND j.lease_expires_at IS NULL
+                AND j.job_type != 'post_analytics_campaign'
+                AND j.started_at < NOW() - make_interval(secs => GREATEST(
+                    $3::float8,
+                    COALESCE((
+                        SELECT t.timeout_seconds
+                        FROM unnest($1::text[], $2::int[]) AS t(queue_name, timeout_seconds)
+                        WHERE t.queue_name = j.queue_name
+                    ), 0)
+                ))
+                RETURNING j.id, j.job_type
+            """, queue_values, queue_timeouts, float(UNLEASED_MIN_RESET_SECONDS))
             if result:
                 logger.info(f"[CLEANUP] Reset {len(result)} stuck jobs")
                 for row in result:
@@ -174,30 +513,82 @@ class UnifiedAsyncWorker:
         except Exception as e:
             logger.error(f"[CLEANUP] Failed: {e}")
 
-    async def _get_next_job(self) -> Optional[Dict[str, Any]]:
+        try:
+            released = await self._db.release_ready_waiting_jobs()
+            if released:
+                logger.info(f"[CLEANUP] Released {len(released)} waiting jobs with finished dependencies")
+        except Exception as e:
+            logger.error(f"[CLEANUP] Waiting-job release failed: {e}")
+
+    async def _archive_finished_jobs(self):
+        """Move finished jobs older than JOB_ARCHIVE_AFTER_HOURS to job_queue_archive; purge expired raw scrapes."""
+        try:
+            archived = await self._db.archive_finished_jobs(settings.JOB_ARCHIVE_AFTER_HOURS)
+            if archived:
+                logger.info(f"[ARCHIVE] Moved {archived} finished jobs to job_queue_archive")
+        except Exception as e:
+            logger.error(f"[ARCHIVE] Failed: {e}")
+
+        # Expired raw scrapes on local disk (Redis expires its own entries)
+        try:
+            from app.services.raw_scrape_cache import raw_scrape_cache
+            purged = await raw_scrape_cache.purge_expired()
+            if purged:
+                logger.info(f"[ARCHIVE] Purged {purged} expired raw scrape cache entries")
+        except Exception as e:
+            logger.error(f"[ARCHIVE] Scrape cache purge failed: {e}")
+
+    async def _schedule_profile_refreshes(self):
+        """Enqueue background refreshes of stale tracked profiles into idle scrape slots."""
+        lane_name = lane_for_job_type('profile_refresh')
+        free_slots = self._limiters[lane_name].limit - len(self._lane_tasks[lane_name])
+        if free_slots <= 0:
+            return
+        try:
+            from app.services.profile_refresh_scheduler import profile_refresh_scheduler
+            await profile_refresh_scheduler.schedule(free_slots, JOB_LANES[lane_name]['job_types'])
+        except Exception as e:
+            logger.error(f"[REFRESH-SCHEDULER] Pass failed: {e}")
+
+    async def _claim_jobs(self, lane_name: str, limit: int) -> List[Dict[str, Any]]:
         """
-        Poll job_queue for the next queued job (excluding post_analytics_campaign).
-        Atomically claims it by setting status='processing'.
-        Uses FOR UPDATE SKIP LOCKED for safe concurrent access.
+        Claim up to `limit` queued jobs for one lane in a single
+        UPDATE ... RETURNING with FOR UPDATE SKIP LOCKED, weighted-fair
+        across users by their tier's concurrent job quota.
         """
-        return await self._db.get_next_unified_job(
-            exclude_types=list(POST_ANALYTICS_WORKER_TYPES)
+        tenant_limits = {
+            tier: quota['concurrent_jobs']
+            for tier, quota in job_queue.tenant_quotas.items()
+        }
+        if lane_name == DEFAULT_LANE:
+            # Everything no other lane (or PostAnalyticsWorker) owns
+            excluded = set(POST_ANALYTICS_WORKER_TYPES)
+            for lane in JOB_LANES.values():
+                excluded |= lane['job_types']
+            return await self._db.claim_jobs(
+                limit,
+                exclude_types=list(excluded),
+                tenant_limits=tenant_limits,
+                worker_id=self.worker_id,
+            )
+        return await self._db.claim_jobs(
+            limit,
+            include_types=list(JOB_LANES[lane_name]['job_types']),
+            tenant_limits=tenant_limits,
+            worker_id=self.worker_id,
         )
 
-    async def _run_with_semaphore(self, job: Dict[str, Any]):
-        """Acquire a concurrency slot, process the job, release."""
-        async with self._semaphore:
-            await self._process_job(job)
-
     async def _process_job(self, job: Dict[str, Any]):
         """
         Dispatch to the correct _process_*_async(job_id) function.
-        Handles retries (up to 3) on failure.
+        Failures are retried per RETRY_POLICIES with backoff, then dead-lettered.
         """
         job_id = job['id']
         job_type = job['job_type']
         retry_count = job.get('retry_count', 0)
-        max_retries = 3
+        max_retries = retry_policy(job_type)['max_retries']
+        lane_name = lane_for_job_type(job_type)
+        limiter = self._limiters[lane_name]
 
         handler_name = self.JOB_TYPE_HANDLERS.get(job_type)
         if not handler_name:
@@ -217,46 +608,82 @@ class UnifiedAsyncWorker:
             # Call the async handler - it manages its own DB sessions via
             # optimized_pools, which creates new connections on the current
             # event loop (this thread's loop, not the main FastAPI loop)
-            await handler_fn(job_id)
+            # Apify runs made by the handler are charged to the job's tenant;
+            # while retries remain its FAILED write is held back so jobs
+            # depending on this one are not released between attempts
+            started = time.monotonic()
+            retry_guard = uw_module.retryable_job_context(job_id) if retry_count < max_retries else nullcontext()
+            with apify_usage_context(job.get('user_id'), job_type), retry_guard as retry_state:
+                await handler_fn(job_id)
+            if retry_state and retry_state['failure'] is not None:
+                # Handler recorded a failure without raising
+                raise Exception(retry_state['failure'].get('error') or f"{job_type} handler reported failure")
 
             logger.info(f"[UNIFIED-WORKER] Completed {job_type} job {job_id}")
+            limiter.record_success(
+                job_type,
+                time.monotonic() - started,
+                saturated=len(self._lane_tasks[lane_name]) >= limiter.limit,
+            )
 
         except Exception as e:
             logger.error(f"[UNIFIED-WORKER] Job {job_id} ({job_type}) failed: {e}")
+            overload = classify_overload(e)
+            if overload:
+                limiter.record_overload(overload)
 
             if retry_count < max_retries:
+                delay = retry_delay_seconds(job_type, retry_count)
                 logger.info(
                     f"[UNIFIED-WORKER] Re-queuing job {job_id} for retry "
-                    f"({retry_count + 1}/{max_retries})"
+                    f"({retry_count + 1}/{max_retries}) in {delay:.0f}s"
                 )
-                try:
-                    await self._db.execute_query("""
-                        UPDATE job_queue
-                        SET status = 'queued',
-                            retry_count = retry_count + 1,
-                            started_at = NULL,
-                            progress_message = $1
-                        WHERE id = $2::uuid
-                    """, f"Retry {retry_count + 1}/{max_retries}: {str(e)[:200]}", job_id)
-                except Exception as retry_err:
-                    logger.error(f"[UNIFIED-WORKER] Failed to re-queue job {job_id}: {retry_err}")
+                scheduled = await self._db.schedule_retry(
+                    job_id,
+                    delay,
+                    error=str(e)[:1000],
+                    message=f"Retry {retry_count + 1}/{max_retries} in {delay:.0f}s: {str(e)[:200]}"
+                )
+                if scheduled:
+                    due = time.monotonic() + delay
+                    if self._next_retry_due is None or due < self._next_retry_due:
+                        self._next_retry_due = due
             else:
-                try:
-                    await self._db.update_job_status(
-                        job_id, 'failed',
-                        error=f"Failed after {max_retries} retries: {str(e)[:500]}"
-                    )
-                except Exception:
-                    pass
+                logger.error(f"[UNIFIED-WORKER] Job {job_id} ({job_type}) dead-lettered after {max_retries} retries")
+                await self._db.dead_letter_job(
+                    job_id, f"Failed after {max_retries} retries: {str(e)[:1000]}"
+                )
 
     def is_running(self) -> bool:
         return self.running
 
+    def concurrency_limit(self) -> int:
+        """Current total slot limit across lanes."""
+        return sum(limiter.limit for limiter in self._limiters.values())
+
+    def get_lane_limits(self) -> Dict[str, int]:
+        return {lane_name: limiter.limit for lane_name, limiter in self._limiters.items()}
+
     def get_status(self) -> Dict[str, Any]:
+        from app.services.profile_refresh_scheduler import profile_refresh_scheduler
+        from app.services.apify_budget_governor import apify_budget_governor
+
         return {
             'running': self.running,
+            'worker_id': self.worker_id,
             'active_jobs': len(self._active_tasks),
+            'concurrency_limit': self.concurrency_limit(),
             'max_concurrent': MAX_CONCURRENT_JOBS,
+            'lanes': {
+                lane_name: {
+                    'active_jobs': len(self._lane_tasks[lane_name]),
+                    **self._limiters[lane_name].snapshot(),
+                }
+                for lane_name in JOB_LANES
+            },
+            'dispatch_mode': 'notify' if self._db and self._db.is_listening() else 'poll',
+            'refresh_scheduler': profile_refresh_scheduler.get_stats(),
+            'apify_budget': apify_budget_governor.get_stats(),
         }
 
 
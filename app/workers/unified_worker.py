@@ -6,6 +6,8 @@ import os
 import logging
 import json
 import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
@@ -81,6 +83,29 @@ celery_app.conf.update(
 # JOB PROCESSING INFRASTRUCTURE
 # ============================================================================
 
+# Job the current handler runs for while UnifiedAsyncWorker still has retries
+# left for it (see retryable_job_context)
+_retryable_job: ContextVar[Optional[Dict[str, Any]]] = ContextVar('retryable_job', default=None)
+
+
+@contextmanager
+def retryable_job_context(job_id: str):
+    """
+    Handlers write FAILED and re-raise. While the worker will still retry
+    the job, that write is held back and recorded in the yielded state
+    instead: FAILED is terminal and would release jobs waiting on this one
+    (release_dependent_jobs) between attempts. The worker then re-queues
+    the job (schedule_retry) or, once retries run out, dead_letter_job
+    writes the final FAILED.
+    """
+    state = {'job_id': str(job_id), 'failure': None}
+    token = _retryable_job.set(state)
+    try:
+        yield state
+    finally:
+        _retryable_job.reset(token)
+
+
 class JobProcessor:
     """Base class for job processing with reliability patterns"""
 
@@ -120,7 +145,34 @@ class JobProcessor:
         result: Optional[Dict[str, Any]] = None,
         error_details: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Update job status in database"""
+        """
+        Update job status in database.
+
+        Progress-only updates of a running job (PROCESSING with no result or
+        error) are write-behind: they go to job_progress_channel, which
+        buffers them in Redis and flushes to the row at a bounded interval.
+        The first PROCESSING update of a job in this process is written
+        immediately (status and started_at - callers outside the unified
+        worker use it to mark the job started), as is every other state
+        transition. A PROCESSING update never reopens a finished job.
+        """
+        from app.services.job_progress_channel import job_progress_channel
+        from app.services.job_result_store import job_result_store
+
+        retryable = _retryable_job.get()
+        if status == JobStatus.FAILED and retryable and retryable['job_id'] == str(job_id):
+            # Not terminal yet - the worker re-queues the job with this error
+            retryable['failure'] = error_details or {'error': progress_message or 'failed'}
+            logger.info(f"Job {job_id} failed, leaving the final status to the worker's retry")
+            return
+
+        if (
+            status == JobStatus.PROCESSING and not result and not error_details
+            and job_progress_channel.is_tracking(job_id)
+        ):
+            await job_progress_channel.report(job_id, progress_percent, progress_message)
+            return
+
         try:
             async with optimized_pools.get_background_session() as session:
                 update_data = {
@@ -134,7 +186,11 @@ class JobProcessor:
                 if progress_message:
                     update_data['progress_message'] = progress_message
                 if result:
-                    update_data['result'] = json.dumps(result)
+                    # Large results go to the object store; the row keeps a pointer
+                    inline_result, result_ref, result_size = await job_result_store.store(job_id, result)
+                    update_data['result'] = inline_result
+                    update_data['result_ref'] = result_ref
+                    update_data['result_size'] = result_size
                 if error_details:
                     update_data['error_details'] = json.dumps(error_details)
                 if status == JobStatus.PROCESSING:
@@ -145,14 +201,26 @@ class JobProcessor:
                 # Build dynamic UPDATE query
                 set_clause = ', '.join([f"{key} = :{key}" for key in update_data.keys() if key != 'job_id'])
 
-                await session.execute(text(f"""
+                # A late progress update must not reopen a finished or cancelled job
+                guard = (
+                    "AND status NOT IN ('completed', 'failed', 'cancelled')"
+                    if status == JobStatus.PROCESSING else ""
+                )
+
+                updated = await session.execute(text(f"""
                     UPDATE job_queue SET {set_clause}
                     WHERE id = :job_id
+                    {guard}
                 """).execution_options(prepare=False), update_data)
 
                 await session.commit()
                 logger.info(f"Updated job {job_id} status to {status.value}")
 
+            if status == JobStatus.PROCESSING and updated.rowcount:
+                job_progress_channel.started(job_id)
+            else:
+                await job_progress_channel.finish(job_id)
+
         except Exception as e:
             logger.error(f"Failed to update job {job_id} status: {e}")
 
@@ -673,6 +741,8 @@ async def _process_imd_analytics_async(job_id: str) -> Dict[str, Any]:
       4. Sync results to influencer_database record
     No credit deduction (admin operation).
     Mirrors progress to influencer_database record for real-time polling.
+    refresh_mode='delta' refreshes counters and new posts only
+    (CreatorAnalyticsTriggerService.refresh_creator_delta).
     """
     job_details = await job_processor.get_job_details(job_id)
     if not job_details:
@@ -692,6 +762,43 @@ async def _process_imd_analytics_async(job_id: str) -> Dict[str, Any]:
     await _update_imd_progress(influencer_db_id, 'processing', 0, "Starting analytics...")
 
     try:
+        if params.get('refresh_mode') == 'delta':
+            # Roster refresh: counters + new posts only (falls back to full when needed)
+            await job_processor.update_job_status(
+                job_id, JobStatus.PROCESSING,
+                progress_percent=10,
+                progress_message=f"Refreshing @{username} (new posts only)"
+            )
+            await _update_imd_progress(influencer_db_id, 'processing', 10, "Refreshing new posts...")
+
+            async with optimized_pools.get_background_session() as db:
+                profile, analytics_result = await job_processor.analytics_service.refresh_creator_delta(username, db)
+
+            if not profile or not analytics_result.get('is_full_analytics'):
+                raise Exception(f"Delta refresh failed: {analytics_result.get('error', 'Incomplete analytics')}")
+
+            await _update_imd_progress(influencer_db_id, 'processing', 90, "Syncing data to database...")
+            await _sync_analytics_to_imd(influencer_db_id, username)
+
+            final_result = {
+                'username': username,
+                'influencer_db_id': influencer_db_id,
+                'analytics_completed': True,
+                'completion_time': datetime.now(timezone.utc).isoformat(),
+                'refresh_mode': 'delta' if analytics_result.get('source') == 'apify_delta' else 'full',
+                'new_posts': analytics_result.get('new_posts'),
+                'updated_posts': analytics_result.get('updated_posts'),
+                'removed_posts': analytics_result.get('removed_posts'),
+            }
+            await job_processor.update_job_status(
+                job_id, JobStatus.COMPLETED,
+                progress_percent=100,
+                progress_message="Analytics refreshed successfully",
+                result=final_result
+            )
+            logger.info(f"[IMD-ANALYTICS] {final_result['refresh_mode']} refresh completed for @{username} (job: {job_id})")
+            return final_result
+
         # STEP 1: Fetch from Apify (same as creator search)
         await job_processor.update_job_status(
             job_id, JobStatus.PROCESSING,
@@ -700,11 +807,9 @@ async def _process_imd_analytics_async(job_id: str) -> Dict[str, Any]:
         )
         await _update_imd_progress(influencer_db_id, 'processing', 10, "Fetching from Instagram...")
 
-        from app.scrapers.apify_instagram_client import ApifyInstagramClient
-        from app.core.config import settings
+        from app.services.apify_profile_batcher import apify_profile_batcher
 
-        async with ApifyInstagramClient(settings.APIFY_API_TOKEN) as apify_client:
-            apify_data = await apify_client.get_instagram_profile_comprehensive(username)
+        apify_data = await apify_profile_batcher.fetch_profile(username)
 
         if not apify_data:
             raise Exception(f"Apify returned no data for @{username}")
@@ -863,8 +968,16 @@ async def _process_creator_search_async(job_id: str) -> Dict[str, Any]:
     4. Build the full response dict
     5. Auto-unlock profile for the requesting user
     6. Store response in job result for frontend retrieval
+
+    Steps 1-3 are single-flight per username across users: if another job
+    already owns the pipeline for this handle, this job attaches as a follower
+    and the owner runs steps 4-6 for it once the pipeline finishes.
+
+    Every stage is checkpointed on the job row, so a retry resumes from the
+    first stage without a checkpoint instead of re-scraping Apify.
     """
-    from app.services.creator_search_response_builder import build_new_profile_response
+    from app.services.creator_search_single_flight import creator_search_single_flight
+    from app.services.job_checkpoint_service import job_checkpoint_service, JobCheckpointService
 
     job_details = await job_processor.get_job_details(job_id)
     if not job_details:
@@ -873,10 +986,30 @@ async def _process_creator_search_async(job_id: str) -> Dict[str, Any]:
     params = job_details['params']
     username = params.get('username')
     user_id = str(job_details['user_id'])  # Convert UUID to str for supabase_user_id queries
-    user_email = params.get('user_email', '')
 
     logger.info(f"[CREATOR-SEARCH] Processing {username} (job: {job_id})")
 
+    flight = await creator_search_single_flight.join(username, job_id)
+
+    if flight['role'] == creator_search_single_flight.ROLE_FOLLOWER:
+        # Owner will finalize this job; release the worker slot now
+        await job_processor.update_job_status(
+            job_id, JobStatus.PROCESSING,
+            progress_percent=10,
+            progress_message=f"Analysis of @{username} already in progress - sharing results"
+        )
+        logger.info(f"[CREATOR-SEARCH] Job {job_id} coalesced into {flight['owner_job_id']} for {username}")
+        return {'coalesced': True, 'owner_job_id': flight['owner_job_id']}
+
+    checkpoints = await job_checkpoint_service.load(job_id)
+
+    if flight['role'] == creator_search_single_flight.ROLE_COMPLETED:
+        return await _finalize_creator_search_for_user(
+            job_id, user_id, username, flight['profile_id'],
+            checkpoints=checkpoints,
+            processing_results=flight['processing_results']
+        )
+
     await job_processor.update_job_status(
         job_id, JobStatus.PROCESSING,
         progress_percent=5,
@@ -884,34 +1017,54 @@ async def _process_creator_search_async(job_id: str) -> Dict[str, Any]:
     )
 
     try:
-        # STEP 1: Fetch from Apify
-        from app.scrapers.apify_instagram_client import ApifyInstagramClient
-        from app.core.config import settings
+        store_checkpoint = checkpoints.get(JobCheckpointService.STAGE_STORE)
+        if store_checkpoint:
+            profile_id = store_checkpoint['profile_id']
+            logger.info(f"[CREATOR-SEARCH] Resuming {username} after store checkpoint: {profile_id}")
+        else:
+            # STEP 1: Fetch from Apify (checkpointed by reference, see save_payload)
+            apify_checkpoint = checkpoints.get(JobCheckpointService.STAGE_APIFY)
+            apify_data = await job_checkpoint_service.load_payload(apify_checkpoint)
+            if apify_data:
+                logger.info(f"[CREATOR-SEARCH] Resuming {username} from Apify checkpoint")
+            else:
+                from app.services.apify_profile_batcher import apify_profile_batcher
 
-        async with ApifyInstagramClient(settings.APIFY_API_TOKEN) as apify_client:
-            apify_data = await apify_client.get_instagram_profile_comprehensive(username)
+                apify_data = await apify_profile_batcher.fetch_profile(username)
 
-        if not apify_data:
-            raise Exception(f"Apify returned no data for {username}")
+                if not apify_data:
+                    raise Exception(f"Apify returned no data for {username}")
 
-        await job_processor.update_job_status(
-            job_id, JobStatus.PROCESSING,
-            progress_percent=20,
-            progress_message=f"Storing profile data for @{username}"
-        )
-
-        # STEP 2: Store profile + posts
-        from app.database.comprehensive_service import ComprehensiveDataService
-        comprehensive_service = ComprehensiveDataService()
+                apify_checkpoint = await job_checkpoint_service.save_payload(
+                    job_id, JobCheckpointService.STAGE_APIFY, apify_data
+                )
 
-        async with optimized_pools.get_background_session() as db:
-            profile, is_new = await comprehensive_service.store_complete_profile(
-                db, username, apify_data
+            await job_processor.update_job_status(
+                job_id, JobStatus.PROCESSING,
+                progress_percent=20,
+                progress_message=f"Storing profile data for @{username}"
             )
-            await db.commit()
-            profile_id = str(profile.id)
 
-        logger.info(f"[CREATOR-SEARCH] Profile stored: {profile_id} (new: {is_new})")
+            # STEP 2: Store profile + posts
+            from app.database.comprehensive_service import ComprehensiveDataService
+            comprehensive_service = ComprehensiveDataService()
+
+            async with optimized_pools.get_background_session() as db:
+                profile, is_new = await comprehensive_service.store_complete_profile(
+                    db, username, apify_data
+                )
+                await db.commit()
+                profile_id = str(profile.id)
+
+            logger.info(f"[CREATOR-SEARCH] Profile stored: {profile_id} (new: {is_new})")
+
+            # Raw Apify payload is no longer needed once the profile is stored
+            await job_checkpoint_service.save(
+                job_id, JobCheckpointService.STAGE_STORE,
+                {'profile_id': profile_id, 'is_new': is_new},
+                drop_stage=JobCheckpointService.STAGE_APIFY
+            )
+            await job_checkpoint_service.drop_payload(apify_checkpoint)
 
         await job_processor.update_job_status(
             job_id, JobStatus.PROCESSING,
@@ -924,141 +1077,109 @@ async def _process_creator_search_async(job_id: str) -> Dict[str, Any]:
 
         pipeline_results = await unified_background_processor.process_profile_complete_pipeline(
             profile_id=profile_id,
-            username=username
+            username=username,
+            job_id=job_id
         )
 
+        from app.utils.json_serializer import safe_json_response
+        pipeline_results = safe_json_response(pipeline_results)
+
+    except Exception as e:
+        logger.error(f"[CREATOR-SEARCH] Failed for {username}: {e}")
+
+        try:
+            await creator_search_single_flight.fail(username, job_id, str(e))
+        except Exception as flight_err:
+            logger.warning(f"[CREATOR-SEARCH] Could not release followers for {username}: {flight_err}")
+
         await job_processor.update_job_status(
-            job_id, JobStatus.PROCESSING,
-            progress_percent=85,
-            progress_message=f"Building response for @{username}"
+            job_id,
+            JobStatus.FAILED,
+            error_details={
+                'error': str(e),
+                'username': username,
+            }
         )
+        raise
 
-        # STEP 4: Build the full response dict
-        from app.database.unified_models import Profile, Post
-        from sqlalchemy import select, text as sa_text
-
-        async with optimized_pools.get_background_session() as db:
-            # Refresh profile
-            profile_q = select(Profile).where(Profile.id == profile_id)
-            profile_r = await db.execute(profile_q)
-            profile = profile_r.scalar_one_or_none()
+    # Pipeline done - hand the result to any followers before our own per-user step
+    try:
+        follower_job_ids = await creator_search_single_flight.complete(username, job_id, profile_id)
+    except Exception as flight_err:
+        logger.warning(f"[CREATOR-SEARCH] Could not complete flight for {username}: {flight_err}")
+        follower_job_ids = []
+
+    result = await _finalize_creator_search_for_user(
+        job_id, user_id, username, profile_id, pipeline_results,
+        checkpoints=checkpoints
+    )
 
-            if not profile:
-                raise Exception(f"Profile {username} not found after pipeline")
-
-            # Get posts
-            posts_q = select(Post).where(
-                Post.profile_id == profile.id
-            ).order_by(Post.created_at.desc()).limit(50)
-            posts_r = await db.execute(posts_q)
-            posts = posts_r.scalars().all()
-
-            # Get CDN URLs
-            cdn_q = sa_text("""
-                SELECT media_id, cdn_url_512
-                FROM cdn_image_assets
-                WHERE source_id = :profile_id
-                AND source_type = 'post_thumbnail'
-                AND cdn_url_512 IS NOT NULL
-            """)
-            cdn_r = await db.execute(cdn_q, {'profile_id': profile_id})
-            posts_cdn_urls = {str(row[0]): row[1] for row in cdn_r.fetchall()}
-
-            avatar_q = sa_text("""
-                SELECT cdn_url_512
-                FROM cdn_image_assets
-                WHERE source_id = :profile_id
-                AND source_type = 'profile_avatar'
-                AND cdn_url_512 IS NOT NULL
-                LIMIT 1
-            """)
-            avatar_r = await db.execute(avatar_q, {'profile_id': profile_id})
-            avatar_row = avatar_r.fetchone()
-            cdn_avatar_url = avatar_row[0] if avatar_row else profile.cdn_avatar_url
-
-            response_data = build_new_profile_response(
-                profile, posts, posts_cdn_urls, cdn_avatar_url,
-                pipeline_results=pipeline_results
+    for follower_job_id in follower_job_ids:
+        try:
+            follower_details = await job_processor.get_job_details(follower_job_id)
+            if not follower_details:
+                continue
+            await _finalize_creator_search_for_user(
+                follower_job_id, str(follower_details['user_id']), username,
+                profile_id, pipeline_results
             )
+        except Exception as follower_err:
+            # Follower's own failure already recorded by _finalize_creator_search_for_user
+            logger.error(f"[CREATOR-SEARCH] Follower job {follower_job_id} failed: {follower_err}")
+
+    return result
+
+
+async def _finalize_creator_search_for_user(
+    job_id: str,
+    user_id: str,
+    username: str,
+    profile_id: str,
+    pipeline_results: Optional[Dict[str, Any]] = None,
+    checkpoints: Optional[Dict[str, Any]] = None,
+    processing_results: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Per-user tail of creator search (steps 4-6): build the response from the
+    stored profile, auto-unlock + charge credits for this user, store the job
+    result and notify. Runs once per job, whether it owned the pipeline or
+    followed another job's. The response is checkpointed after the unlock so
+    a retry only repeats step 6.
+
+    A job joining an already completed flight has no pipeline_results; it
+    passes the owner job's stored 'processing_results' section instead.
+    """
+    from app.services.job_checkpoint_service import job_checkpoint_service, JobCheckpointService
 
-            # STEP 5: Auto-unlock profile for the user
-            # Uses raw SQL (PGBouncer AUTOCOMMIT compatible) and or_() for dual-ID lookup
-            from app.database.unified_models import User, UserProfileAccess
-            from sqlalchemy import or_
-            from datetime import timedelta
+    if checkpoints is None:
+        checkpoints = await job_checkpoint_service.load(job_id)
 
-            user_q = select(User).where(
-                or_(User.id == str(user_id), User.supabase_user_id == str(user_id))
+    await job_processor.update_job_status(
+        job_id, JobStatus.PROCESSING,
+        progress_percent=85,
+        progress_message=f"Building response for @{username}"
+    )
+
+    try:
+        # STEPS 4-5: Build response + auto-unlock, unless a previous attempt
+        # of this job already got that far
+        response_checkpoint = checkpoints.get(JobCheckpointService.STAGE_RESPONSE)
+        sanitized = await job_checkpoint_service.load_payload(response_checkpoint)
+        if sanitized is not None:
+            logger.info(f"[CREATOR-SEARCH] Job {job_id} resumed from response checkpoint")
+        else:
+            response_data = await _build_creator_search_response_and_unlock(
+                user_id, username, profile_id, pipeline_results
+            )
+            if processing_results is not None:
+                response_data['processing_results'] = processing_results
+            from app.utils.json_serializer import safe_json_response
+            sanitized = safe_json_response(response_data)
+            response_checkpoint = await job_checkpoint_service.save_payload(
+                job_id, JobCheckpointService.STAGE_RESPONSE, sanitized
             )
-            user_r = await db.execute(user_q)
-            app_user = user_r.scalar_one_or_none()
-
-            if app_user:
-                # Cache attributes before further DB ops (avoid greenlet lazy-load)
-                app_user_id = str(app_user.id)
-                profile_id_str = str(profile.id)
-                profile_username = profile.username
-
-                existing_access_q = select(UserProfileAccess).where(
-                    UserProfileAccess.user_id == app_user.id,
-                    UserProfileAccess.profile_id == profile.id,
-                    UserProfileAccess.expires_at > datetime.now(timezone.utc)
-                )
-                existing_access_r = await db.execute(existing_access_q)
-                if not existing_access_r.scalar_one_or_none():
-                    now = datetime.now(timezone.utc)
-                    expires_at = now + timedelta(days=30)
-
-                    # Raw SQL: user_profile_access (PGBouncer AUTOCOMMIT compatible)
-                    await db.execute(text("""
-                        INSERT INTO user_profile_access (id, user_id, profile_id, granted_at, expires_at, created_at)
-                        VALUES (gen_random_uuid(), :user_id, :profile_id, :granted_at, :expires_at, :created_at)
-                        ON CONFLICT (user_id, profile_id) DO UPDATE SET
-                            granted_at = :granted_at, expires_at = :expires_at
-                    """), {
-                        "user_id": app_user_id,
-                        "profile_id": profile_id_str,
-                        "granted_at": now,
-                        "expires_at": expires_at,
-                        "created_at": now
-                    })
-
-                    # Raw SQL: unlocked_influencers (permanent audit record)
-                    await db.execute(text("""
-                        INSERT INTO unlocked_influencers (user_id, profile_id, username, unlocked_at, credits_spent)
-                        VALUES (:user_id, :profile_id, :username, :unlocked_at, :credits_spent)
-                        ON CONFLICT DO NOTHING
-                    """), {
-                        "user_id": app_user_id,
-                        "profile_id": profile_id_str,
-                        "username": profile_username,
-                        "unlocked_at": now,
-                        "credits_spent": 25
-                    })
-
-                    # Spend credits for the auto-unlock
-                    try:
-                        from app.services.credit_wallet_service import credit_wallet_service
-                        from uuid import UUID
-                        await credit_wallet_service.spend_credits(
-                            user_id=UUID(app_user_id),
-                            amount=25,
-                            action_type="profile_unlock",
-                            reference_id=profile_id_str,
-                            reference_type="profile",
-                            description=f"Auto-unlock @{profile_username} (background search)"
-                        )
-                        logger.info(f"[CREATOR-SEARCH] Auto-unlocked + charged 25 credits: {profile_username} for user {app_user_id}")
-                    except Exception as credit_err:
-                        logger.warning(f"[CREATOR-SEARCH] Auto-unlock created but credit charge failed for {app_user_id}: {credit_err}")
-                        # Access record already created — don't fail the job
-            else:
-                logger.warning(f"[CREATOR-SEARCH] Could not find app user for {user_id} — skipping auto-unlock")
 
         # STEP 6: Store response in job result
-        from app.utils.json_serializer import safe_json_response
-        sanitized = safe_json_response(response_data)
-
         await job_processor.update_job_status(
             job_id,
             JobStatus.COMPLETED,
@@ -1066,6 +1187,8 @@ async def _process_creator_search_async(job_id: str) -> Dict[str, Any]:
             progress_message=f"Analysis complete for @{username}",
             result=sanitized
         )
+        await job_checkpoint_service.clear(job_id)
+        await job_checkpoint_service.drop_payload(response_checkpoint)
 
         # Notify user of completion
         await job_processor.create_completion_notification(
@@ -1089,6 +1212,140 @@ async def _process_creator_search_async(job_id: str) -> Dict[str, Any]:
         raise
 
 
+async def _build_creator_search_response_and_unlock(
+    user_id: str,
+    username: str,
+    profile_id: str,
+    pipeline_results: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Steps 4-5 of creator search: build the response dict and auto-unlock for the user."""
+    from app.services.creator_search_response_builder import build_new_profile_response
+
+    # STEP 4: Build the full response dict
+    from app.database.unified_models import Profile, Post
+    from sqlalchemy import select, text as sa_text
+
+    async with optimized_pools.get_background_session() as db:
+        # Refresh profile
+        profile_q = select(Profile).where(Profile.id == profile_id)
+        profile_r = await db.execute(profile_q)
+        profile = profile_r.scalar_one_or_none()
+
+        if not profile:
+            raise Exception(f"Profile {username} not found after pipeline")
+
+        # Get posts
+        posts_q = select(Post).where(
+            Post.profile_id == profile.id
+        ).order_by(Post.created_at.desc()).limit(50)
+        posts_r = await db.execute(posts_q)
+        posts = posts_r.scalars().all()
+
+        # Get CDN URLs
+        cdn_q = sa_text("""
+            SELECT media_id, cdn_url_512
+            FROM cdn_image_assets
+            WHERE source_id = :profile_id
+            AND source_type = 'post_thumbnail'
+            AND cdn_url_512 IS NOT NULL
+        """)
+        cdn_r = await db.execute(cdn_q, {'profile_id': profile_id})
+        posts_cdn_urls = {str(row[0]): row[1] for row in cdn_r.fetchall()}
+
+        avatar_q = sa_text("""
+            SELECT cdn_url_512
+            FROM cdn_image_assets
+            WHERE source_id = :profile_id
+            AND source_type = 'profile_avatar'
+            AND cdn_url_512 IS NOT NULL
+            LIMIT 1
+        """)
+        avatar_r = await db.execute(avatar_q, {'profile_id': profile_id})
+        avatar_row = avatar_r.fetchone()
+        cdn_avatar_url = avatar_row[0] if avatar_row else profile.cdn_avatar_url
+
+        response_data = build_new_profile_response(
+            profile, posts, posts_cdn_urls, cdn_avatar_url,
+            pipeline_results=pipeline_results
+        )
+
+        # STEP 5: Auto-unlock profile for the user
+        # Uses raw SQL (PGBouncer AUTOCOMMIT compatible) and or_() for dual-ID lookup
+        from app.database.unified_models import User, UserProfileAccess
+        from sqlalchemy import or_
+        from datetime import timedelta
+
+        user_q = select(User).where(
+            or_(User.id == str(user_id), User.supabase_user_id == str(user_id))
+        )
+        user_r = await db.execute(user_q)
+        app_user = user_r.scalar_one_or_none()
+
+        if app_user:
+            # Cache attributes before further DB ops (avoid greenlet lazy-load)
+            app_user_id = str(app_user.id)
+            profile_id_str = str(profile.id)
+            profile_username = profile.username
+
+            existing_access_q = select(UserProfileAccess).where(
+                UserProfileAccess.user_id == app_user.id,
+                UserProfileAccess.profile_id == profile.id,
+                UserProfileAccess.expires_at > datetime.now(timezone.utc)
+            )
+            existing_access_r = await db.execute(existing_access_q)
+            if not existing_access_r.scalar_one_or_none():
+                now = datetime.now(timezone.utc)
+                expires_at = now + timedelta(days=30)
+
+                # Raw SQL: user_profile_access (PGBouncer AUTOCOMMIT compatible)
+                await db.execute(text("""
+                    INSERT INTO user_profile_access (id, user_id, profile_id, granted_at, expires_at, created_at)
+                    VALUES (gen_random_uuid(), :user_id, :profile_id, :granted_at, :expires_at, :created_at)
+                    ON CONFLICT (user_id, profile_id) DO UPDATE SET
+                        granted_at = :granted_at, expires_at = :expires_at
+                """), {
+                    "user_id": app_user_id,
+                    "profile_id": profile_id_str,
+                    "granted_at": now,
+                    "expires_at": expires_at,
+                    "created_at": now
+                })
+
+                # Raw SQL: unlocked_influencers (permanent audit record)
+                await db.execute(text("""
+                    INSERT INTO unlocked_influencers (user_id, profile_id, username, unlocked_at, credits_spent)
+                    VALUES (:user_id, :profile_id, :username, :unlocked_at, :credits_spent)
+                    ON CONFLICT DO NOTHING
+                """), {
+                    "user_id": app_user_id,
+                    "profile_id": profile_id_str,
+                    "username": profile_username,
+                    "unlocked_at": now,
+                    "credits_spent": 25
+                })
+
+                # Spend credits for the auto-unlock
+                try:
+                    from app.services.credit_wallet_service import credit_wallet_service
+                    from uuid import UUID
+                    await credit_wallet_service.spend_credits(
+                        user_id=UUID(app_user_id),
+                        amount=25,
+                        action_type="profile_unlock",
+                        reference_id=profile_id_str,
+                        reference_type="profile",
+                        description=f"Auto-unlock @{profile_username} (background search)"
+                    )
+                    logger.info(f"[CREATOR-SEARCH] Auto-unlocked + charged 25 credits: {profile_username} for user {app_user_id}")
+                except Exception as credit_err:
+                    logger.warning(f"[CREATOR-SEARCH] Auto-unlock created but credit charge failed for {app_user_id}: {credit_err}")
+                    # Access record already created — don't fail the job
+        else:
+            logger.warning(f"[CREATOR-SEARCH] Could not find app user for {user_id} — skipping auto-unlock")
+
+    return response_data
+
+
 # ============================================================================
 # CELERY TASKS - POST ANALYSIS
 # ============================================================================
@@ -1308,8 +1565,9 @@ def process_batch_post_analysis(self, job_id: str):
 async def _process_batch_post_analysis_async(job_id: str) -> Dict[str, Any]:
     """
     Async implementation of batch post analysis.
-    Processes each post URL sequentially via standalone_post_analytics_service,
-    updating progress after each post completes.
+    Scrapes all post URLs up front in shared Apify actor runs, then analyzes
+    each post sequentially via standalone_post_analytics_service, updating
+    progress after each post completes.
     """
     from app.services.standalone_post_analytics_service import standalone_post_analytics_service
 
@@ -1331,11 +1589,18 @@ async def _process_batch_post_analysis_async(job_id: str) -> Dict[str, Any]:
         progress_message=f"Starting batch analysis for {total_posts} posts"
     )
 
+    # One batched scrape instead of one actor run per post; posts the batch
+    # could not fetch (other than missing ones) are scraped on their own below
+    from app.scrapers.apify_instagram_client import ApifyProfileNotFoundError
+    prefetched = await standalone_post_analytics_service.fetch_posts_batch(post_urls)
+
     results = []
     successful = 0
     failed = 0
 
     for i, post_url in enumerate(post_urls):
+        post_data = prefetched.get(post_url)
+
         # Update progress before each post
         progress_pct = int(((i) / total_posts) * 95)  # Reserve 5% for finalization
         await job_processor.update_job_status(
@@ -1345,11 +1610,17 @@ async def _process_batch_post_analysis_async(job_id: str) -> Dict[str, Any]:
         )
 
         try:
+            if isinstance(post_data, ApifyProfileNotFoundError):
+                raise post_data
+            if isinstance(post_data, Exception):
+                post_data = None
+
             async with optimized_pools.get_background_session() as db:
                 analysis_result = await standalone_post_analytics_service.analyze_post_by_url(
                     post_url=post_url,
                     db=db,
-                    user_id=user_id
+                    user_id=user_id,
+                    post_data=post_data
                 )
 
             results.append({
@@ -1369,8 +1640,8 @@ async def _process_batch_post_analysis_async(job_id: str) -> Dict[str, Any]:
             })
             failed += 1
 
-        # Brief pause between posts to avoid rate-limiting external APIs
-        if i < total_posts - 1:
+        # Brief pause between single-post scrapes to avoid rate-limiting external APIs
+        if post_data is None and i < total_posts - 1:
             await asyncio.sleep(2)
 
     # Build final result in the same shape as the old sync batch endpoint
@@ -1580,6 +1851,9 @@ def process_bulk_analysis(self, job_id: str):
 
         raise
 
+# Profiles of one bulk analysis job processed at the same time
+BULK_ANALYSIS_CONCURRENCY = 5
+
 async def _process_bulk_analysis_async(job_id: str) -> Dict[str, Any]:
     """Async implementation of bulk analysis with throttling"""
 
@@ -1610,37 +1884,38 @@ async def _process_bulk_analysis_async(job_id: str) -> Dict[str, Any]:
         if not credit_deducted:
             raise Exception("Failed to deduct credits")
 
-        # Process profiles with throttling
+        # Process profiles concurrently so their Apify fetches coalesce into
+        # batched actor runs (apify_profile_batcher); the semaphore bounds DB
+        # sessions and the AI/CDN work that follows each fetch
         successful_analyses = []
         failed_analyses = []
+        semaphore = asyncio.Semaphore(BULK_ANALYSIS_CONCURRENCY)
 
-        for i, username in enumerate(usernames):
-            try:
-                await job_processor.update_job_status(
-                    job_id, JobStatus.PROCESSING,
-                    progress_percent=int((i / len(usernames)) * 90),
-                    progress_message=f"Processing {username} ({i+1}/{len(usernames)})"
-                )
-
-                # Trigger analysis for individual profile
-                analytics_result = await job_processor.analytics_service.trigger_comprehensive_analytics(
-                    username=username,
-                    priority="low",
-                    user_id=user_id
-                )
-
-                if analytics_result.get('success'):
-                    successful_analyses.append(username)
-                else:
+        async def analyze(username: str):
+            async with semaphore:
+                try:
+                    async with optimized_pools.get_background_session() as db:
+                        profile, analytics_result = await job_processor.analytics_service.trigger_full_creator_analytics(
+                            username=username,
+                            db=db,
+                            is_background_discovery=True
+                        )
+                    if profile and analytics_result.get('is_full_analytics'):
+                        successful_analyses.append(username)
+                    else:
+                        failed_analyses.append(username)
+                except Exception as e:
+                    logger.warning(f"Failed to process {username} in bulk job: {e}")
                     failed_analyses.append(username)
 
-                # Throttling: wait between profiles
-                if i < len(usernames) - 1:  # Don't wait after last profile
-                    await asyncio.sleep(2)  # 2 second delay between profiles
+            done = len(successful_analyses) + len(failed_analyses)
+            await job_processor.update_job_status(
+                job_id, JobStatus.PROCESSING,
+                progress_percent=int((done / len(usernames)) * 90),
+                progress_message=f"Processed {username} ({done}/{len(usernames)})"
+            )
 
-            except Exception as e:
-                logger.warning(f"Failed to process {username} in bulk job: {e}")
-                failed_analyses.append(username)
+        await asyncio.gather(*(analyze(username) for username in usernames))
 
         result = {
             'total_profiles': len(usernames),
@@ -1758,7 +2033,8 @@ async def _process_profile_analysis_background_async(job_id: str) -> Dict[str, A
             profile, analytics_result = await job_processor.analytics_service.trigger_full_creator_analytics(
                 username=username,
                 db=db,
-                force_refresh=True,
+                # Dependency jobs from post analytics only fill in incomplete profiles
+                force_refresh=params.get('force_refresh', True),
                 is_background_discovery=True  # PREVENT RECURSIVE DISCOVERY
             )
 
@@ -1809,6 +2085,63 @@ async def _process_profile_analysis_background_async(job_id: str) -> Dict[str, A
 
         raise
 
+# ============================================================================
+# SCHEDULED PROFILE REFRESH (staleness scheduler, no user waiting)
+# ============================================================================
+
+async def _process_profile_refresh_async(job_id: str) -> Dict[str, Any]:
+    """
+    Background refresh of a stale tracked profile, enqueued by
+    ProfileRefreshScheduler. Delta refresh (counters + new posts), falling
+    back to a full refresh when the stored analytics are incomplete.
+    """
+    job_details = await job_processor.get_job_details(job_id)
+    if not job_details:
+        raise Exception(f"Refresh job {job_id} not found")
+
+    params = job_details['params']
+    username = params.get('username')
+
+    await job_processor.update_job_status(
+        job_id, JobStatus.PROCESSING,
+        progress_percent=0,
+        progress_message=f"Refreshing @{username}"
+    )
+
+    try:
+        async with optimized_pools.get_background_session() as db:
+            profile, analytics_result = await job_processor.analytics_service.refresh_creator_delta(username, db)
+
+        if not profile or not analytics_result.get('is_full_analytics'):
+            raise Exception(f"Refresh failed: {analytics_result.get('error', 'Incomplete analytics')}")
+
+        final_result = {
+            'username': username,
+            'profile_id': str(profile.id),
+            'refresh_mode': 'delta' if analytics_result.get('source') == 'apify_delta' else 'full',
+            'due_score': params.get('due_score'),
+            'new_posts': analytics_result.get('new_posts'),
+            'updated_posts': analytics_result.get('updated_posts'),
+            'completion_time': datetime.now(timezone.utc).isoformat(),
+        }
+        await job_processor.update_job_status(
+            job_id, JobStatus.COMPLETED,
+            progress_percent=100,
+            progress_message="Profile refreshed",
+            result=final_result
+        )
+        logger.info(f"[REFRESH-SCHEDULER] {final_result['refresh_mode']} refresh of @{username} completed (job: {job_id})")
+        return final_result
+
+    except Exception as e:
+        logger.error(f"[REFRESH-SCHEDULER] Refresh of @{username} failed: {e}")
+        await job_processor.update_job_status(
+            job_id,
+            JobStatus.FAILED,
+            error_details={'error': str(e), 'username': username}
+        )
+        raise
+
 # ============================================================================
 # CELERY TASKS - DISCOVERY UNLOCK (single profile, async 202)
 # ============================================================================
@@ -2034,7 +2367,7 @@ async def _process_discovery_unlock_async(job_id: str) -> Dict[str, Any]:
 def process_bulk_unlock(self, job_id: str):
     """
     Process bulk profile unlock job.
-    Processes profiles 3-at-a-time with concurrency control.
+    Unlocks all profiles in a single set-based transaction.
     """
     try:
         logger.info(f"Starting bulk unlock job {job_id}")
@@ -2072,9 +2405,10 @@ def process_bulk_unlock(self, job_id: str):
 async def _process_bulk_unlock_async(job_id: str) -> Dict[str, Any]:
     """
     Async implementation of bulk unlock.
-    - Deducts credits upfront for all profiles that need unlocking
-    - Processes profiles 3 at a time with asyncio.Semaphore
-    - Updates progress per profile
+    - Unlocks every profile in one set-based transaction
+      (discovery_service.bulk_unlock_profiles): validation, access grants and
+      a single aggregated credit spend - a handful of statements for any N
+    - Profiles are re-validated at run time; only newly granted ones are charged
     - Stores a BulkProfileUnlockResponse-shaped result
     """
     job_details = await job_processor.get_job_details(job_id)
@@ -2085,8 +2419,6 @@ async def _process_bulk_unlock_async(job_id: str) -> Dict[str, Any]:
     profiles_to_unlock = params.get('profiles_to_unlock', [])
     already_unlocked_ids = params.get('already_unlocked_ids', [])
     invalid_ids = params.get('invalid_ids', [])
-    unlock_reason = params.get('unlock_reason')
-    total_credit_cost = params.get('total_credit_cost', 0)
     total_requested = params.get('total_requested', 0)
     user_id = str(job_details['user_id'])  # Convert UUID to str for supabase_user_id queries
 
@@ -2103,158 +2435,50 @@ async def _process_bulk_unlock_async(job_id: str) -> Dict[str, Any]:
     )
 
     try:
-        # STEP 1: Deduct credits upfront
+        from app.services.discovery_service import discovery_service
+        from uuid import UUID as _UUID
+
         await job_processor.update_job_status(
             job_id, JobStatus.PROCESSING,
-            progress_percent=5,
-            progress_message="Deducting credits"
+            progress_percent=10,
+            progress_message=f"Unlocking {len(profiles_to_unlock)} profiles"
         )
 
-        from app.services.credit_wallet_service import credit_wallet_service
-        from uuid import UUID as _UUID
-
-        if total_credit_cost > 0:
-            permission = await credit_wallet_service.can_perform_action(
-                _UUID(user_id), "profile_analysis", total_credit_cost
-            )
-            if not permission.can_perform:
-                raise Exception(f"Insufficient credits for bulk unlock: {permission.message}")
-
-            await credit_wallet_service.spend_credits(
-                user_id=_UUID(user_id),
-                amount=total_credit_cost,
-                action_type="profile_analysis",
-                reference_id=job_id,
-                reference_type="bulk_unlock",
-                description=f"Bulk unlock of {len(profiles_to_unlock)} profiles"
-            )
-
-        # STEP 2: Process profiles with concurrency control (3 at a time)
-        semaphore = asyncio.Semaphore(3)
-        results = []
-        successful_count = 0
-        failed_count = 0
-
-        async def _unlock_single(index: int, profile_info: Dict[str, Any]) -> Dict[str, Any]:
-            """Unlock a single profile within the semaphore."""
-            nonlocal successful_count, failed_count
-            pid = profile_info['profile_id']
-            uname = profile_info.get('username', 'unknown')
-
-            async with semaphore:
-                try:
-                    # Update progress
-                    progress = 10 + int((index / max(len(profiles_to_unlock), 1)) * 80)
-                    await job_processor.update_job_status(
-                        job_id, JobStatus.PROCESSING,
-                        progress_percent=progress,
-                        progress_message=f"Unlocking @{uname} ({index + 1}/{len(profiles_to_unlock)})"
-                    )
-
-                    # Run the discovery service unlock (handles DB record creation)
-                    from app.services.discovery_service import discovery_service
-                    unlock_data = await discovery_service.unlock_profile(
-                        user_id=_UUID(user_id),
-                        profile_id=_UUID(pid),
-                        unlock_reason=unlock_reason
-                    )
-
-                    if "error" in unlock_data:
-                        failed_count += 1
-                        return {
-                            'profile_id': pid,
-                            'success': False,
-                            'credits_spent': 0,
-                            'error_message': unlock_data.get('message', 'Unlock failed'),
-                            'already_unlocked': False,
-                        }
-
-                    if unlock_data.get('already_unlocked'):
-                        return {
-                            'profile_id': pid,
-                            'success': True,
-                            'credits_spent': 0,
-                            'already_unlocked': True,
-                        }
-
-                    successful_count += 1
-                    return {
-                        'profile_id': pid,
-                        'success': True,
-                        'credits_spent': unlock_data.get('credits_spent', 25),
-                        'unlock_id': str(unlock_data.get('unlock_id', '')),
-                        'already_unlocked': False,
-                    }
-
-                except Exception as exc:
-                    logger.error(f"[BULK-UNLOCK] Failed to unlock {pid} (@{uname}): {exc}")
-                    failed_count += 1
-                    return {
-                        'profile_id': pid,
-                        'success': False,
-                        'credits_spent': 0,
-                        'error_message': str(exc),
-                        'already_unlocked': False,
-                    }
-
-        # Launch all tasks (semaphore limits concurrency to 3)
-        tasks = [
-            _unlock_single(i, p)
-            for i, p in enumerate(profiles_to_unlock)
-        ]
-        unlock_results = await asyncio.gather(*tasks)
-        results.extend(unlock_results)
-
-        # Add already-unlocked and invalid entries
-        for pid in already_unlocked_ids:
-            results.append({
-                'profile_id': pid,
-                'success': True,
-                'credits_spent': 0,
-                'already_unlocked': True,
-            })
-
-        for pid in invalid_ids:
-            results.append({
-                'profile_id': pid,
-                'success': False,
-                'credits_spent': 0,
-                'error_message': 'Profile not found or unavailable',
-                'already_unlocked': False,
-            })
+        # Re-validate everything the route saw - access or availability may have
+        # changed while the job was queued
+        profile_ids = (
+            [p['profile_id'] for p in profiles_to_unlock] + already_unlocked_ids + invalid_ids
+        )
+        unlock_data = await discovery_service.bulk_unlock_profiles(
+            user_id=_UUID(user_id),
+            profile_ids=profile_ids,
+            reference_id=job_id
+        )
 
-        # Calculate actuals
-        actual_credits_spent = sum(r.get('credits_spent', 0) for r in results)
+        if "error" in unlock_data:
+            # Nothing was committed - no credits to refund
+            raise Exception(f"Insufficient credits for bulk unlock: {unlock_data.get('message')}")
 
-        # Refund excess credits if some profiles failed or were already unlocked
-        refund_amount = total_credit_cost - actual_credits_spent
-        if refund_amount > 0:
-            try:
-                await credit_wallet_service.add_credits(
-                    _UUID(user_id), refund_amount,
-                    f"Partial refund for bulk unlock job {job_id} ({failed_count} failed)"
-                )
-                logger.info(f"[BULK-UNLOCK] Refunded {refund_amount} credits for job {job_id}")
-            except Exception as refund_err:
-                logger.error(f"[BULK-UNLOCK] Partial refund failed: {refund_err}")
+        successful_count = unlock_data['successful_unlocks']
 
         # Build final result matching BulkProfileUnlockResponse shape
         final_result = {
-            'total_requested': total_requested,
+            'total_requested': total_requested or len(profile_ids),
             'successful_unlocks': successful_count,
-            'already_unlocked': len(already_unlocked_ids) + sum(
-                1 for r in unlock_results if r.get('already_unlocked')
-            ),
-            'failed_unlocks': failed_count + len(invalid_ids),
-            'total_credits_spent': actual_credits_spent,
-            'results': results,
+            'already_unlocked': unlock_data['already_unlocked'],
+            'failed_unlocks': unlock_data['failed_unlocks'],
+            'total_credits_spent': unlock_data['total_credits_spent'],
+            'results': unlock_data['results'],
             'completion_time': datetime.now(timezone.utc).isoformat(),
         }
 
         await job_processor.update_job_status(
             job_id, JobStatus.COMPLETED,
             progress_percent=100,
-            progress_message=f"Bulk unlock complete: {successful_count} unlocked, {failed_count} failed",
+            progress_message=(
+                f"Bulk unlock complete: {successful_count} unlocked, "
+                f"{unlock_data['failed_unlocks']} failed"
+            ),
             result=final_result
         )
 
@@ -2269,25 +2493,13 @@ async def _process_bulk_unlock_async(job_id: str) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"[BULK-UNLOCK] Job {job_id} failed: {e}")
 
-        # Refund all credits on total failure
-        if total_credit_cost > 0:
-            try:
-                from app.services.credit_wallet_service import credit_wallet_service
-                from uuid import UUID as _UUID
-                await credit_wallet_service.add_credits(
-                    _UUID(user_id), total_credit_cost,
-                    f"Full refund for failed bulk unlock job {job_id}"
-                )
-                logger.info(f"[BULK-UNLOCK] Full refund of {total_credit_cost} credits for job {job_id}")
-            except Exception as refund_err:
-                logger.error(f"[BULK-UNLOCK] Full refund failed: {refund_err}")
-
+        # The unlock transaction rolled back - no credits were taken
         await job_processor.update_job_status(
             job_id, JobStatus.FAILED,
             error_details={
                 'error': str(e),
                 'profiles_requested': len(profiles_to_unlock),
-                'credits_refunded': True,
+                'credits_charged': False,
             }
         )
         raise
@@ -0,0 +1,322 @@
+"""
+Unified Worker Pool - Supervised Multi-Process Mode for the Unified Async Worker
+
+The default UnifiedAsyncWorker runs on one thread inside the API process, so
+every CPU-bound step (PIL encode, transformer inference, spaCy, Prophet)
+shares a single core under the GIL. In pool mode the API process instead
+spawns UNIFIED_WORKER_PROCESSES child processes. Each child runs a full
+UnifiedAsyncWorker on its own event loop with its own WorkerDatabase pool and
+claims through the same UPDATE ... FOR UPDATE SKIP LOCKED protocol, so
+throughput scales with cores instead of with replica count.
+
+A supervisor thread in the parent restarts children that exit and kills
+children whose heartbeat stops for too long. Health is reported through
+worker_manager alongside the Celery subprocesses.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between child heartbeats (also how often children check for stop)
+HEARTBEAT_INTERVAL = 5
+
+# A child whose heartbeat is older than this is reported unhealthy. CPU-bound
+# jobs can block a child's loop for a while, so keep this generous.
+HEARTBEAT_STALE_AFTER = 120
+
+# A child whose heartbeat is older than this is assumed hung and killed
+HEARTBEAT_KILL_AFTER = 600
+
+# Seconds between supervisor passes
+SUPERVISE_INTERVAL = 5
+
+# Restart backoff for crash-looping children (doubles per restart, capped)
+RESTART_BACKOFF_BASE = 2
+RESTART_BACKOFF_MAX = 60
+
+# Seconds beyond WORKER_DRAIN_TIMEOUT_SECONDS to wait for children to exit on
+# shutdown (they drain and hand jobs back first) before terminating them
+STOP_GRACE = 15
+
+
+# ----------------------------------------------------------------------
+# Child process entry point (must be module-level for the spawn context)
+# ----------------------------------------------------------------------
+
+def _worker_process_main(index: int, stop_event, heartbeats, active_jobs, lane_limits):
+    """Entry point of a pool child - runs one UnifiedAsyncWorker until stopped."""
+    # The parent owns Ctrl+C handling and stops children via stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Console only - several processes rotating the same app.log would clash
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - [unified-worker-{index}] %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
+    try:
+        asyncio.run(_worker_process_async(index, stop_event, heartbeats, active_jobs, lane_limits))
+    except Exception as e:
+        logger.error(f"[UNIFIED-POOL] Worker process {index} crashed: {e}")
+        raise
+
+
+async def _worker_process_async(index: int, stop_event, heartbeats, active_jobs, lane_limits):
+    # Handlers may use the legacy session factory as well as optimized_pools
+    # (which initializes lazily), so bring it up like the API process does
+    try:
+        from app.database.connection import init_database
+        await init_database()
+    except Exception as e:
+        logger.warning(f"[UNIFIED-POOL] Worker process {index} legacy DB init failed: {e}")
+
+    from app.workers.unified_async_worker import UnifiedAsyncWorker
+
+    worker = UnifiedAsyncWorker()
+    worker.running = True
+    reporter = asyncio.create_task(
+        _report_health(worker, index, stop_event, heartbeats, active_jobs, lane_limits)
+    )
+    logger.info(f"[UNIFIED-POOL] Worker process {index} started")
+    try:
+        await worker.run_forever()
+    finally:
+        reporter.cancel()
+        logger.info(f"[UNIFIED-POOL] Worker process {index} stopped")
+
+
+async def _report_health(worker, index: int, stop_event, heartbeats, active_jobs, lane_limits):
+    """Publish heartbeat, active job count and lane limits to shared memory; relay stop requests."""
+    from app.workers.unified_async_worker import JOB_LANES
+
+    parent_pid = os.getppid()
+    while True:
+        heartbeats[index] = time.time()
+        active_jobs[index] = len(worker._active_tasks)
+        limits = worker.get_lane_limits()
+        for lane_index, lane_name in enumerate(JOB_LANES):
+            lane_limits[index * len(JOB_LANES) + lane_index] = limits[lane_name]
+        if worker.running and (stop_event.is_set() or os.getppid() != parent_pid):
+            # Stop on request, or if the API process died and orphaned us
+            logger.info(f"[UNIFIED-POOL] Worker process {index} stopping")
+            worker.request_stop()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
+# ----------------------------------------------------------------------
+# Supervisor (runs in the API process)
+# ----------------------------------------------------------------------
+
+class UnifiedWorkerPool:
+    """
+    Spawns and supervises N UnifiedAsyncWorker processes.
+    Uses the 'spawn' start method: forking a process that already runs
+    threads, event loops and DB pools is not safe.
+    """
+
+    def __init__(self):
+        self.running = False
+        self.process_count = 0
+        self._ctx = multiprocessing.get_context('spawn')
+        self._processes: List[Optional[multiprocessing.process.BaseProcess]] = []
+        self._started_at: List[float] = []
+        self._restarts: List[int] = []
+        self._next_restart_at: List[float] = []
+        self._stop_event = None
+        self._heartbeats = None
+        self._active_jobs = None
+        self._lane_limits = None
+        self._supervisor: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        logger.info("[INIT] Unified Worker Pool initialized")
+
+    async def start(self, process_count: int):
+        """Spawn `process_count` worker processes and the supervisor thread."""
+        from app.workers.unified_async_worker import JOB_LANES
+
+        self.process_count = max(1, int(process_count))
+        self.running = True
+
+        self._stop_event = self._ctx.Event()
+        self._heartbeats = self._ctx.Array('d', self.process_count)
+        self._active_jobs = self._ctx.Array('i', self.process_count)
+        # Current AIMD slot limit per (process, lane), row-major in JOB_LANES order
+        self._lane_limits = self._ctx.Array('i', self.process_count * len(JOB_LANES))
+        self._processes = [None] * self.process_count
+        self._started_at = [0.0] * self.process_count
+        self._restarts = [0] * self.process_count
+        self._next_restart_at = [0.0] * self.process_count
+
+        for index in range(self.process_count):
+            self._spawn(index)
+
+        self._supervisor = threading.Thread(
+            target=self._supervise,
+            name="unified-worker-pool-supervisor",
+            daemon=True,
+        )
+        self._supervisor.start()
+
+        logger.info(f"[UNIFIED-POOL] Started {self.process_count} worker processes")
+
+    def _spawn(self, index: int):
+        """Start (or restart) the child process for slot `index`."""
+        with self._lock:
+            self._heartbeats[index] = 0.0
+            self._active_jobs[index] = 0
+            process = self._ctx.Process(
+                target=_worker_process_main,
+                args=(index, self._stop_event, self._heartbeats, self._active_jobs, self._lane_limits),
+                name=f"unified-worker-{index}",
+                # Not daemonic: job handlers may use multiprocessing themselves
+                daemon=False,
+            )
+            process.start()
+            self._processes[index] = process
+            self._started_at[index] = time.time()
+        logger.info(f"[UNIFIED-POOL] Spawned worker process {index} (pid={process.pid})")
+
+    def _heartbeat_age(self, index: int) -> float:
+        """Seconds since the child last reported (counted from spawn until its first beat)."""
+        last = max(self._heartbeats[index], self._started_at[index])
+        return time.time() - last
+
+    def _supervise(self):
+        """Restart dead children (with backoff) and kill hung ones."""
+        while self.running:
+            for index in range(self.process_count):
+                if not self.running:
+                    break
+                process = self._processes[index]
+                try:
+                    if process is not None and process.is_alive():
+                        age = self._heartbeat_age(index)
+                        if age > HEARTBEAT_KILL_AFTER:
+                            logger.error(
+                                f"[UNIFIED-POOL] Worker process {index} (pid={process.pid}) "
+                                f"silent for {age:.0f}s - killing"
+                            )
+                            process.kill()
+                            process.join(timeout=5)
+                        continue
+
+                    now = time.time()
+                    if self._next_restart_at[index] == 0.0:
+                        exitcode = process.exitcode if process is not None else None
+                        delay = min(
+                            RESTART_BACKOFF_BASE ** self._restarts[index],
+                            RESTART_BACKOFF_MAX,
+                        )
+                        self._next_restart_at[index] = now + delay
+                        logger.error(
+                            f"[UNIFIED-POOL] Worker process {index} exited "
+                            f"(exitcode={exitcode}) - restarting in {delay}s"
+                        )
+                    elif now >= self._next_restart_at[index]:
+                        self._next_restart_at[index] = 0.0
+                        self._restarts[index] += 1
+                        self._spawn(index)
+                except Exception as e:
+                    logger.error(f"[UNIFIED-POOL] Supervisor error on process {index}: {e}")
+
+            time.sleep(SUPERVISE_INTERVAL)
+
+    async def stop(self):
+        """Signal every child to stop, wait for them, then terminate stragglers."""
+        if not self.running:
+            return
+        self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._supervisor:
+            await asyncio.to_thread(self._supervisor.join, SUPERVISE_INTERVAL + 1)
+
+        from app.core.config import settings
+
+        deadline = time.monotonic() + settings.WORKER_DRAIN_TIMEOUT_SECONDS + STOP_GRACE
+        for index, process in enumerate(self._processes):
+            if process is None:
+                continue
+            remaining = max(0.0, deadline - time.monotonic())
+            await asyncio.to_thread(process.join, remaining)
+            if process.is_alive():
+                logger.warning(f"[UNIFIED-POOL] Worker process {index} did not exit - terminating")
+                process.terminate()
+                await asyncio.to_thread(process.join, 5)
+                if process.is_alive():
+                    process.kill()
+
+        logger.info("[UNIFIED-POOL] Stopped")
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def is_healthy(self) -> bool:
+        """Every process alive and heartbeating recently."""
+        if not self.running or not self._processes:
+            return False
+        for index, process in enumerate(self._processes):
+            if process is None or not process.is_alive():
+                return False
+            if self._heartbeat_age(index) > HEARTBEAT_STALE_AFTER:
+                return False
+        return True
+
+    def get_process_states(self) -> Dict[str, str]:
+        """Per-process state keyed like worker_manager entries: running / stale / stopped."""
+        states = {}
+        for index, process in enumerate(self._processes):
+            name = f"unified-worker-{index}"
+            if process is None or not process.is_alive():
+                states[name] = "stopped"
+            elif self._heartbeat_age(index) > HEARTBEAT_STALE_AFTER:
+                states[name] = "stale"
+            else:
+                states[name] = "running"
+        return states
+
+    def get_status(self) -> Dict[str, Any]:
+        from app.workers.unified_async_worker import MAX_CONCURRENT_JOBS, JOB_LANES
+
+        processes = []
+        for index, process in enumerate(self._processes):
+            alive = process is not None and process.is_alive()
+            lane_limits = {
+                lane_name: self._lane_limits[index * len(JOB_LANES) + lane_index]
+                for lane_index, lane_name in enumerate(JOB_LANES)
+            }
+            processes.append({
+                'index': index,
+                'pid': process.pid if process is not None else None,
+                'alive': alive,
+                'active_jobs': self._active_jobs[index] if alive else 0,
+                'heartbeat_age_seconds': round(self._heartbeat_age(index), 1),
+                'restarts': self._restarts[index],
+                'lane_limits': lane_limits,
+                'concurrency_limit': sum(lane_limits.values()) if alive else 0,
+            })
+
+        return {
+            'running': self.running,
+            'mode': 'process_pool',
+            'healthy': self.is_healthy(),
+            'processes': processes,
+            'process_count': self.process_count,
+            'active_jobs': sum(p['active_jobs'] for p in processes),
+            'concurrency_limit': sum(p['concurrency_limit'] for p in processes),
+            'max_concurrent': MAX_CONCURRENT_JOBS * self.process_count,
+        }
+
+
+# Global singleton
+unified_worker_pool = UnifiedWorkerPool()
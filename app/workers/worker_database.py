@@ -6,22 +6,66 @@ Bypasses SQLAlchemy ORM to avoid prepared statement issues with pgbouncer
 import asyncpg
 import json
 import os
-from typing import Optional, Dict, Any
-from datetime import datetime, timezone
+import socket
+from typing import Optional, Dict, Any, Callable, List
+from datetime import datetime, timezone, timedelta
 import uuid
 import logging
 from dotenv import load_dotenv
 
+from app.core.job_queue import JOB_NOTIFY_CHANNEL
+from app.services.job_result_store import job_result_store
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Weighted-fair claims rank a window of this many candidates per claimed slot
+FAIR_CLAIM_CANDIDATE_FACTOR = 10
+FAIR_CLAIM_MAX_CANDIDATES = 200
+
+# Priority aging: a queued job gains one priority point for every this many
+# seconds it has waited, so lower priorities (free / standard tiers) are never
+# starved by a sustained stream of higher ones. One point a minute keeps
+# priority meaningful under a backlog: a job climbs one JobPriority level (25
+# points) in 25 minutes, and a BULK job only outranks a fresh CRITICAL one
+# after 90. Claims order by the equivalent "aged deadline" below, which
+# idx_job_queue_aged_claim_60s (migration 024) indexes - change both together.
+PRIORITY_AGING_SECONDS_PER_POINT = 60
+AGED_CLAIM_KEY = (
+    f"(created_at AT TIME ZONE 'UTC') - priority * INTERVAL '{PRIORITY_AGING_SECONDS_PER_POINT} seconds'"
+)
+
+# Weighted-fair claims group aged priorities into bands this many points wide
+# (the gap between JobPriority levels). Aging moves a job up across bands;
+# within a band jobs are ordered by their user's virtual time, not by age.
+PRIORITY_BAND_POINTS = 25
+
+# Archiver: finished jobs move to job_queue_archive in batches of this size
+ARCHIVE_BATCH_SIZE = 1000
+
+# Ownership lease on a claimed job. The owning worker renews it every few
+# seconds; once it expires the worker is presumed dead and the job re-queued.
+JOB_LEASE_SECONDS = 60
+
+
+def aged_claim_key(created_at: datetime, priority: Optional[int]) -> datetime:
+    """AGED_CLAIM_KEY of one job in Python - ascending is claim order"""
+    return created_at - timedelta(seconds=(priority or 0) * PRIORITY_AGING_SECONDS_PER_POINT)
+
+
+def new_worker_id(prefix: str) -> str:
+    """Unique ID for one worker instance (stored in job_queue.worker_id)."""
+    return f"{prefix}:{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[:100]
+
 class WorkerDatabase:
     """Direct asyncpg connection for background workers - no prepared statements"""
 
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        # Dedicated session-level connection for LISTEN (never returned to the pool)
+        self._listen_conn: Optional[asyncpg.Connection] = None
         # USE DIRECT CONNECTION FOR WORKERS (No pgbouncer)
         self.database_url = os.getenv("DIRECT_DATABASE_URL", "")
         if not self.database_url:
@@ -50,11 +94,69 @@ class WorkerDatabase:
             raise
 
     async def close(self):
-        """Close the connection pool"""
+        """Close the connection pool and the LISTEN connection"""
+        await self.unlisten()
         if self.pool:
             await self.pool.close()
             logger.info("Worker database connection pool closed")
 
+    async def listen(self, channel: str, callback: Callable[[Dict[str, Any]], None]) -> bool:
+        """
+        Subscribe to a Postgres NOTIFY channel on a dedicated connection.
+
+        LISTEN is session state, so it cannot live on a pooled connection
+        (or behind pgbouncer in transaction mode). The callback receives the
+        decoded JSON payload and runs on the caller's event loop.
+
+        Returns False if the listener could not be established; callers
+        should fall back to polling.
+        """
+        await self.unlisten()
+
+        def _on_notify(connection, pid, notify_channel, payload):
+            try:
+                data = json.loads(payload) if payload else {}
+            except ValueError:
+                data = {}
+            try:
+                callback(data)
+            except Exception as e:
+                logger.warning(f"Job notification callback failed: {e}")
+
+        try:
+            self._listen_conn = await asyncpg.connect(
+                self.database_url,
+                statement_cache_size=0,
+                server_settings={
+                    'application_name': 'background_workers_listener'
+                }
+            )
+            await self._listen_conn.add_listener(channel, _on_notify)
+            logger.info(f"[SUCCESS] Listening for job notifications on '{channel}'")
+            return True
+        except Exception as e:
+            logger.warning(f"[WARNING] Could not LISTEN on '{channel}', falling back to polling: {e}")
+            if self._listen_conn is not None:
+                try:
+                    await self._listen_conn.close()
+                except Exception:
+                    pass
+            self._listen_conn = None
+            return False
+
+    async def unlisten(self):
+        """Close the LISTEN connection if one is open"""
+        if self._listen_conn is not None:
+            try:
+                await self._listen_conn.close()
+            except Exception as e:
+                logger.warning(f"Failed to close listener connection: {e}")
+            self._listen_conn = None
+
+    def is_listening(self) -> bool:
+        """True while the LISTEN connection is alive"""
+        return self._listen_conn is not None and not self._listen_conn.is_closed()
+
     async def execute_query(self, query: str, *args) -> Optional[list]:
         """Execute a query and return results"""
         if not self.pool:
@@ -70,43 +172,173 @@ class WorkerDatabase:
 
     async def get_next_job(self) -> Optional[Dict[str, Any]]:
         """Get the next pending post analytics job"""
+        jobs = await self.claim_jobs(1, include_types=['post_analytics_campaign'])
+        return jobs[0] if jobs else None
+
+    async def claim_jobs(
+        self,
+        limit: int,
+        include_types: Optional[List[str]] = None,
+        exclude_types: Optional[List[str]] = None,
+        tenant_limits: Optional[Dict[str, int]] = None,
+        worker_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Atomically claim up to `limit` queued jobs in ONE round trip.
+
+        A single UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)
+        RETURNING moves the batch to 'processing', so concurrent workers never
+        see the same row and a burst drains without one handshake per job.
+        Returned jobs are ordered by aged priority: priority plus one point
+        per PRIORITY_AGING_SECONDS_PER_POINT seconds spent queued.
+
+        With `tenant_limits` (user_tier -> concurrent job cap, see
+        IndustryStandardJobQueue.tenant_quotas) the claim is weighted-fair
+        across users: within a band of PRIORITY_BAND_POINTS aged priority
+        points, each user's n-th queued job gets virtual time
+        (n + jobs already processing) / cap and the lowest virtual times are
+        claimed first, so one user's burst cannot starve the others and
+        higher tiers get a larger share. Aging only lifts jobs into higher
+        bands. Users already at their cap are skipped.
+
+        With `worker_id` the claimed rows are leased to that worker for
+        JOB_LEASE_SECONDS; it must keep them alive with renew_leases().
+        """
+        if limit <= 0:
+            return []
+
         if not self.pool:
             await self.initialize()
 
+        args: List[Any] = [limit, datetime.now(timezone.utc)]
+        filters = ""
+        if include_types:
+            args.append(include_types)
+            filters += f" AND job_type = ANY(${len(args)}::text[])"
+        if exclude_types:
+            args.append(exclude_types)
+            filters += f" AND NOT (job_type = ANY(${len(args)}::text[]))"
+
+        set_clause = "status = 'processing', started_at = $2"
+        if worker_id:
+            args.append(worker_id)
+            set_clause += f", worker_id = ${len(args)}"
+            args.append(float(JOB_LEASE_SECONDS))
+            set_clause += f", lease_expires_at = $2 + make_interval(secs => ${len(args)}::float8)"
+
+        if tenant_limits:
+            query = self._fair_claim_query(filters, set_clause, args, tenant_limits, limit)
+        else:
+            query = f"""
+                UPDATE job_queue
+                SET {set_clause}
+                WHERE id IN (
+                    SELECT id
+                    FROM job_queue
+                    WHERE status = 'queued'
+                    AND (run_after IS NULL OR run_after <= NOW())
+                    {filters}
+                    ORDER BY {AGED_CLAIM_KEY} ASC
+                    LIMIT $1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, user_id, job_type, params::text as params,
+                          status, priority, retry_count, created_at
+            """
+
         try:
             async with self.pool.acquire() as conn:
-                async with conn.transaction():
-                    # Get and lock the next job
-                    row = await conn.fetchrow("""
-                        SELECT id, user_id, job_type, params::text as params, status, priority
-                        FROM job_queue
-                        WHERE job_type = 'post_analytics_campaign'
-                        AND status = 'queued'
-                        ORDER BY priority DESC, created_at ASC
-                        LIMIT 1
-                        FOR UPDATE SKIP LOCKED
-                    """)
-
-                    if not row:
-                        return None
-
-                    # Mark as processing
-                    await conn.execute("""
-                        UPDATE job_queue
-                        SET status = 'processing',
-                            started_at = $1
-                        WHERE id = $2
-                    """, datetime.now(timezone.utc), row['id'])
-
-                    return {
-                        "id": str(row['id']),
-                        "user_id": str(row['user_id']),
-                        "params": json.loads(row['params']) if row['params'] else {},
-                        "priority": row['priority']
-                    }
+                rows = await conn.fetch(query, *args)
         except Exception as e:
-            logger.error(f"Failed to get next job: {e}")
-            return None
+            logger.error(f"Failed to claim jobs: {e}")
+            return []
+
+        # UPDATE ... RETURNING does not preserve the subquery's ORDER BY
+        rows = sorted(rows, key=lambda r: aged_claim_key(r['created_at'], r['priority']))
+        return [
+            {
+                "id": str(row['id']),
+                "user_id": str(row['user_id']),
+                "job_type": row['job_type'],
+                "params": json.loads(row['params']) if row['params'] else {},
+                "priority": row['priority'],
+                "retry_count": row['retry_count'] or 0,
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _fair_claim_query(
+        filters: str,
+        set_clause: str,
+        args: List[Any],
+        tenant_limits: Dict[str, int],
+        limit: int
+    ) -> str:
+        """
+        Build the weighted-fair claim statement. Appends its parameters to `args`.
+
+        Row locks (FOR UPDATE SKIP LOCKED) cannot be combined with window
+        functions, so a CTE first locks a bounded candidate window in aged
+        priority order, then the ranking picks the fair subset to claim.
+        Candidates that are not picked are released when the statement commits.
+        """
+        args.append(list(tenant_limits.keys()))
+        tiers_param = len(args)
+        args.append([max(1, int(cap)) for cap in tenant_limits.values()])
+        caps_param = len(args)
+        # Unknown / missing tiers are treated as free, like _check_tenant_quota
+        args.append(max(1, int(tenant_limits.get('free', min(tenant_limits.values())))))
+        default_cap_param = len(args)
+        args.append(min(limit * FAIR_CLAIM_CANDIDATE_FACTOR, FAIR_CLAIM_MAX_CANDIDATES))
+        window_param = len(args)
+
+        return f"""
+            WITH candidates AS (
+                SELECT id, user_id, user_tier, created_at,
+                       priority + FLOOR(
+                           EXTRACT(EPOCH FROM NOW() - created_at) / {PRIORITY_AGING_SECONDS_PER_POINT}
+                       ) AS effective_priority
+                FROM job_queue
+                WHERE status = 'queued'
+                AND (run_after IS NULL OR run_after <= NOW())
+                {filters}
+                ORDER BY {AGED_CLAIM_KEY} ASC
+                LIMIT ${window_param}
+                FOR UPDATE SKIP LOCKED
+            ),
+            in_flight AS (
+                SELECT user_id, COUNT(*) AS running
+                FROM job_queue
+                WHERE status = 'processing'
+                AND user_id IN (SELECT DISTINCT user_id FROM candidates)
+                GROUP BY user_id
+            ),
+            ranked AS (
+                SELECT c.id, c.created_at,
+                       FLOOR(c.effective_priority / {PRIORITY_BAND_POINTS}) AS band,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY c.user_id ORDER BY c.effective_priority DESC, c.created_at ASC
+                       ) + COALESCE(f.running, 0) AS slot,
+                       COALESCE(t.cap, ${default_cap_param}) AS cap
+                FROM candidates c
+                LEFT JOIN in_flight f ON f.user_id = c.user_id
+                LEFT JOIN unnest(${tiers_param}::text[], ${caps_param}::int[]) AS t(tier, cap)
+                    ON t.tier = c.user_tier
+            ),
+            chosen AS (
+                SELECT id
+                FROM ranked
+                WHERE slot <= cap
+                ORDER BY band DESC, slot::float / cap ASC, created_at ASC
+                LIMIT $1
+            )
+            UPDATE job_queue
+            SET {set_clause}
+            WHERE id IN (SELECT id FROM chosen)
+            RETURNING id, user_id, job_type, params::text as params,
+                      status, priority, retry_count, created_at
+        """
 
     async def update_job_status(
         self,
@@ -125,13 +357,18 @@ class WorkerDatabase:
 
                 # Build update query based on status
                 if status == 'completed':
+                    inline_result, result_ref, result_size = (
+                        await job_result_store.store(job_id, result) if result else (None, None, None)
+                    )
                     await conn.execute("""
                         UPDATE job_queue
                         SET status = $1,
                             completed_at = $2,
-                            result = $3::jsonb
-                        WHERE id = $4::uuid
-                    """, status, now, json.dumps(result) if result else None, job_id)
+                            result = $3::jsonb,
+                            result_ref = $4,
+                            result_size = $5
+                        WHERE id = $6::uuid
+                    """, status, now, inline_result, result_ref, result_size, job_id)
 
                 elif status == 'failed':
                     await conn.execute("""
@@ -176,63 +413,352 @@ class WorkerDatabase:
         except Exception as e:
             logger.error(f"Failed to update job {job_id} progress: {e}")
 
-    async def get_next_unified_job(self, exclude_types: list = None) -> Optional[Dict[str, Any]]:
+    async def ensure_dependency_job(
+        self,
+        parent_job_id: str,
+        job_type: str,
+        params: Dict[str, Any],
+        match_params: Dict[str, Any],
+        queue_name: str = 'api_queue',
+        estimated_duration: int = 180
+    ) -> Optional[str]:
         """
-        Get the next queued job of ANY type (except excluded ones).
-        Atomically claims it by setting status='processing' + started_at.
-        Uses FOR UPDATE SKIP LOCKED for safe concurrent access.
+        Return the ID of an unfinished `job_type` job whose params contain
+        `match_params`, creating one (owned by the parent job's user, tier and
+        priority) if none exists. An advisory lock on the match key keeps
+        concurrent callers from creating duplicates.
         """
         if not self.pool:
             await self.initialize()
 
-        exclude_types = exclude_types or []
-
+        lock_key = f"{job_type}:{json.dumps(match_params, sort_keys=True)}"
         try:
             async with self.pool.acquire() as conn:
                 async with conn.transaction():
-                    # Build exclusion clause
-                    if exclude_types:
-                        placeholders = ', '.join(f'${i+1}' for i in range(len(exclude_types)))
-                        exclude_clause = f"AND job_type NOT IN ({placeholders})"
-                        args = exclude_types
-                    else:
-                        exclude_clause = ""
-                        args = []
-
-                    row = await conn.fetchrow(f"""
-                        SELECT id, user_id, job_type, params::text as params,
-                               status, priority, retry_count
-                        FROM job_queue
-                        WHERE status = 'queued'
-                        {exclude_clause}
-                        ORDER BY priority DESC, created_at ASC
+                    await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", lock_key)
+
+                    existing = await conn.fetchrow("""
+                        SELECT id FROM job_queue
+                        WHERE job_type = $1
+                        AND status IN ('queued', 'processing', 'retrying', 'waiting')
+                        AND params @> $2::jsonb
+                        ORDER BY created_at DESC
                         LIMIT 1
-                        FOR UPDATE SKIP LOCKED
-                    """, *args)
-
-                    if not row:
+                    """, job_type, json.dumps(match_params))
+                    if existing:
+                        return str(existing['id'])
+
+                    created = await conn.fetchrow("""
+                        INSERT INTO job_queue (
+                            id, user_id, job_type, status, priority, queue_name,
+                            params, created_at, estimated_duration, user_tier
+                        )
+                        SELECT gen_random_uuid(), user_id, $2, 'queued', priority, $3,
+                               $4::jsonb, NOW(), $5, user_tier
+                        FROM job_queue
+                        WHERE id = $1::uuid
+                        RETURNING id
+                    """, parent_job_id, job_type, queue_name, json.dumps(params), estimated_duration)
+                    if not created:
                         return None
 
-                    # Atomically mark as processing
-                    await conn.execute("""
+                    await conn.execute("SELECT pg_notify($1, $2)", JOB_NOTIFY_CHANNEL, json.dumps({
+                        'job_id': str(created['id']),
+                        'job_type': job_type,
+                        'queue_name': queue_name,
+                    }))
+                    return str(created['id'])
+
+        except Exception as e:
+            logger.error(f"Failed to ensure {job_type} dependency for job {parent_job_id}: {e}")
+            return None
+
+    async def wait_for_jobs(self, job_id: str, depends_on: List[str], message: str) -> Optional[str]:
+        """
+        Park `job_id` in 'waiting' until every job in `depends_on` finishes;
+        the release_dependent_jobs trigger re-queues it. If they have all
+        finished already the job goes straight back to 'queued'.
+        Returns the job's new status.
+        """
+        if not self.pool:
+            await self.initialize()
+
+        try:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow("""
+                    UPDATE job_queue
+                    SET depends_on = $2::uuid[],
+                        status = CASE WHEN EXISTS (
+                            SELECT 1 FROM job_queue d
+                            WHERE d.id = ANY($2::uuid[])
+                            AND d.status IN ('queued', 'processing', 'retrying', 'waiting')
+                        ) THEN 'waiting' ELSE 'queued' END,
+                        started_at = NULL,
+                        worker_id = NULL,
+                        lease_expires_at = NULL,
+                        progress_message = $3,
+                        updated_at = NOW()
+                    WHERE id = $1::uuid
+                    RETURNING status
+                """, job_id, depends_on, message)
+                return row['status'] if row else None
+
+        except Exception as e:
+            logger.error(f"Failed to park job {job_id} on dependencies: {e}")
+            return None
+
+    async def release_ready_waiting_jobs(self) -> List[str]:
+        """
+        Safety net for the release trigger: re-queue waiting jobs whose
+        dependencies have all finished (or no longer exist), e.g. when a
+        dependency finished in the same instant the job was parked.
+        """
+        rows = await self.execute_query("""
+            UPDATE job_queue j
+            SET status = 'queued',
+                started_at = NULL,
+                progress_message = 'Dependencies finished - resuming',
+                updated_at = NOW()
+            WHERE j.status = 'waiting'
+            AND NOT EXISTS (
+                SELECT 1 FROM job_queue d
+                WHERE d.id = ANY(j.depends_on)
+                AND d.status IN ('queued', 'processing', 'retrying', 'waiting')
+            )
+            RETURNING j.id
+        """)
+        return [str(row['id']) for row in rows or []]
+
+    async def schedule_retry(self, job_id: str, delay_seconds: float, error: str, message: str) -> bool:
+        """
+        Re-queue a failed job for another attempt no earlier than
+        `delay_seconds` from now, keeping the error in error_details.
+        """
+        if not self.pool:
+            await self.initialize()
+
+        try:
+            async with self.pool.acquire() as conn:
+                status = await conn.execute("""
+                    UPDATE job_queue
+                    SET status = 'queued',
+                        retry_count = retry_count + 1,
+                        run_after = NOW() + make_interval(secs => $2::float8),
+                        started_at = NULL,
+                        worker_id = NULL,
+                        lease_expires_at = NULL,
+                        error_details = jsonb_build_object(
+                            'error', $3::text,
+                            'attempt', retry_count + 1,
+                            'failed_at', NOW()
+                        ),
+                        progress_message = $4,
+                        updated_at = NOW()
+                    WHERE id = $1::uuid
+                """, job_id, float(delay_seconds), error, message)
+                return status != 'UPDATE 0'
+        except Exception as e:
+            logger.error(f"Failed to schedule retry for job {job_id}: {e}")
+            return False
+
+    async def dead_letter_job(self, job_id: str, error: str) -> bool:
+        """
+        Retries exhausted: mark the job failed with its last error and copy
+        the row into job_dead_letter_queue for inspection / manual replay.
+        """
+        if not self.pool:
+            await self.initialize()
+
+        try:
+            async with self.pool.acquire() as conn:
+                status = await conn.execute("""
+                    WITH failed AS (
                         UPDATE job_queue
-                        SET status = 'processing',
-                            started_at = $1
-                        WHERE id = $2
-                    """, datetime.now(timezone.utc), row['id'])
-
-                    return {
-                        "id": str(row['id']),
-                        "user_id": str(row['user_id']),
-                        "job_type": row['job_type'],
-                        "params": json.loads(row['params']) if row['params'] else {},
-                        "priority": row['priority'],
-                        "retry_count": row['retry_count'] or 0,
-                    }
+                        SET status = 'failed',
+                            completed_at = NOW(),
+                            run_after = NULL,
+                            worker_id = NULL,
+                            lease_expires_at = NULL,
+                            error_details = jsonb_build_object(
+                                'error', $2::text,
+                                'attempts', retry_count + 1,
+                                'dead_lettered', true,
+                                'failed_at', NOW()
+                            ),
+                            progress_message = 'Failed - retries exhausted',
+                            updated_at = NOW()
+                        WHERE id = $1::uuid
+                        RETURNING *
+                    )
+                    INSERT INTO job_dead_letter_queue (original_job_id, job_data, failure_reason, failure_count)
+                    SELECT id, to_jsonb(failed) - 'result', $2, retry_count + 1
+                    FROM failed
+                """, job_id, error)
+                return status != 'INSERT 0 0'
         except Exception as e:
-            logger.error(f"Failed to get next unified job: {e}")
+            logger.error(f"Failed to dead-letter job {job_id}: {e}")
+            return False
+
+    async def renew_leases(self, worker_id: str) -> Optional[List[str]]:
+        """
+        Heartbeat: extend the lease of every job this worker holds in
+        'processing'. Returns the IDs still leased to it, or None if the
+        renewal failed (the caller simply retries on its next heartbeat).
+        """
+        if not self.pool:
+            await self.initialize()
+
+        try:
+            async with self.pool.acquire() as conn:
+                rows = await conn.fetch("""
+                    UPDATE job_queue
+                    SET lease_expires_at = NOW() + make_interval(secs => $2::float8)
+                    WHERE worker_id = $1
+                    AND status = 'processing'
+                    RETURNING id
+                """, worker_id, float(JOB_LEASE_SECONDS))
+                return [str(row['id']) for row in rows]
+        except Exception as e:
+            logger.error(f"Failed to renew leases for {worker_id}: {e}")
             return None
 
+    async def release_worker_jobs(self, worker_id: str) -> List[str]:
+        """
+        Shutdown hand-off: put every job still 'processing' under this
+        worker back to 'queued' right away (instead of waiting for its lease
+        to expire) and notify workers. Stage checkpoints stay on the row, so
+        the next claim resumes where this one stopped.
+        """
+        rows = await self.execute_query("""
+            WITH released AS (
+                UPDATE job_queue
+                SET status = 'queued',
+                    started_at = NULL,
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    run_after = NULL,
+                    progress_message = 'Worker shut down - re-queued to resume',
+                    updated_at = NOW()
+                WHERE worker_id = $1
+                AND status = 'processing'
+                RETURNING id, job_type, queue_name
+            )
+            SELECT id,
+                   pg_notify($2, json_build_object(
+                       'job_id', id, 'job_type', job_type, 'queue_name', queue_name
+                   )::text)
+            FROM released
+        """, worker_id, JOB_NOTIFY_CHANNEL)
+        return [str(row['id']) for row in rows or []]
+
+    async def reap_expired_leases(self) -> List[Dict[str, Any]]:
+        """
+        Re-queue 'processing' jobs whose lease has expired - their worker
+        stopped heartbeating - and notify workers so they are re-dispatched
+        immediately. Safe to run from every worker concurrently (SKIP LOCKED).
+        Returns the reaped jobs with the worker_id that lost them.
+        """
+        rows = await self.execute_query("""
+            WITH expired AS (
+                SELECT id, worker_id
+                FROM job_queue
+                WHERE status = 'processing'
+                AND lease_expires_at < NOW()
+                FOR UPDATE SKIP LOCKED
+            ),
+            reaped AS (
+                UPDATE job_queue j
+                SET status = 'queued',
+                    started_at = NULL,
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    progress_message = 'Worker lease expired - re-queued',
+                    updated_at = NOW()
+                FROM expired
+                WHERE j.id = expired.id
+                RETURNING j.id, j.job_type, j.queue_name, expired.worker_id AS lost_by
+            )
+            SELECT id, job_type, lost_by,
+                   pg_notify($1, json_build_object(
+                       'job_id', id, 'job_type', job_type, 'queue_name', queue_name
+                   )::text)
+            FROM reaped
+        """, JOB_NOTIFY_CHANNEL)
+        return [
+            {'id': str(row['id']), 'job_type': row['job_type'], 'worker_id': row['lost_by']}
+            for row in rows or []
+        ]
+
+    async def archive_finished_jobs(self, older_than_hours: float, max_batches: int = 20) -> int:
+        """
+        Move finished jobs (completed / failed / cancelled) older than
+        `older_than_hours` from job_queue to job_queue_archive, oldest first,
+        ARCHIVE_BATCH_SIZE rows per statement. Each batch is one
+        DELETE ... RETURNING feeding an INSERT, so a row is never in both
+        tables or in neither. An id already in the archive (e.g. a job
+        restored and finished again) is overwritten with the newer row.
+        Safe to run from every worker (SKIP LOCKED).
+        Returns the number of rows archived.
+        """
+        if not self.pool:
+            await self.initialize()
+
+        async with self.pool.acquire() as conn:
+            # Copy the columns both tables share - job_queue may gain columns
+            # before the archive does
+            columns = await conn.fetch("""
+                SELECT a.column_name
+                FROM information_schema.columns a
+                JOIN information_schema.columns q
+                  ON q.table_schema = a.table_schema
+                 AND q.table_name = 'job_queue'
+                 AND q.column_name = a.column_name
+                WHERE a.table_schema = current_schema()
+                AND a.table_name = 'job_queue_archive'
+                ORDER BY a.ordinal_position
+            """)
+            if not columns:
+                logger.warning("[ARCHIVE] job_queue_archive missing - run migration 020")
+                return 0
+            column_list = ', '.join(f'"{row["column_name"]}"' for row in columns)
+            update_list = ', '.join(
+                f'"{row["column_name"]}" = EXCLUDED."{row["column_name"]}"'
+                for row in columns if row['column_name'] != 'id'
+            )
+
+            archived = 0
+            for _ in range(max_batches):
+                status = await conn.execute(f"""
+                    WITH moved AS (
+                        DELETE FROM job_queue
+                        WHERE id IN (
+                            SELECT id FROM job_queue
+                            WHERE status IN ('completed', 'failed', 'cancelled')
+                            AND COALESCE(completed_at, created_at) < NOW() - make_interval(secs => $1::float8)
+                            ORDER BY COALESCE(completed_at, created_at)
+                            LIMIT $2
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING *
+                    )
+                    INSERT INTO job_queue_archive ({column_list})
+                    SELECT {column_list} FROM moved
+                    ON CONFLICT (id) DO UPDATE SET {update_list}
+                """, float(older_than_hours) * 3600, ARCHIVE_BATCH_SIZE)
+                batch = int(status.split()[-1])
+                archived += batch
+                if batch < ARCHIVE_BATCH_SIZE:
+                    break
+            return archived
+
+    async def get_next_unified_job(self, exclude_types: list = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the next queued job of ANY type (except excluded ones).
+        Atomically claims it by setting status='processing' + started_at.
+        """
+        jobs = await self.claim_jobs(1, exclude_types=exclude_types)
+        return jobs[0] if jobs else None
+
 
 # Global instance
 worker_db = WorkerDatabase()
\ No newline at end of file
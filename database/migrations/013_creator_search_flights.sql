@@ -0,0 +1,25 @@
+-- Migration: Cross-user single-flight coalescing for creator_search jobs
+-- Date: 2026-10-16
+-- Description: One row per Instagram handle tracks the creator_search job that
+-- owns the Apify + CDN + AI pipeline. Later jobs for the same handle attach as
+-- followers and only run the per-user step (auto-unlock, credits, notification)
+-- once the owner finishes.
+
+CREATE TABLE IF NOT EXISTS creator_search_flights (
+    username VARCHAR(255) PRIMARY KEY,
+    owner_job_id UUID NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    follower_job_ids UUID[] NOT NULL DEFAULT '{}',
+    profile_id UUID,
+    pipeline_results JSONB,
+    error TEXT,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT valid_flight_status CHECK (status IN ('running', 'completed', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_creator_search_flights_owner ON creator_search_flights (owner_job_id);
+
+COMMENT ON TABLE creator_search_flights IS 'Single-flight registry: one in-flight creator_search pipeline per username, shared across users';
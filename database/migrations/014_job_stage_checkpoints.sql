@@ -0,0 +1,10 @@
+-- Migration: Stage checkpoints for resumable job retries
+-- Date: 2026-10-16
+-- Description: Per-stage checkpoints for the creator search / profile pipeline
+-- (apify, store, cdn, ai, response). A retried job resumes from the first
+-- stage without a checkpoint instead of re-scraping Apify and re-running CDN.
+-- Checkpoints are cleared once the job completes.
+
+ALTER TABLE job_queue ADD COLUMN IF NOT EXISTS checkpoints JSONB;
+
+COMMENT ON COLUMN job_queue.checkpoints IS 'Completed pipeline stages of this job: {stage: {data, completed_at}}; cleared on completion';
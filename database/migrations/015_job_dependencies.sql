@@ -0,0 +1,64 @@
+-- Migration: First-class job dependencies in job_queue
+-- Date: 2026-10-16
+-- Description: A job can park itself in the new 'waiting' status with the IDs
+-- of the jobs it depends on. When the last of those reaches a terminal status
+-- (completed / failed / cancelled), a trigger moves the waiting job back to
+-- 'queued' and emits pg_notify so a worker re-dispatches it. Replaces workers
+-- holding a slot while polling for another pipeline to finish.
+--
+-- A job UnifiedAsyncWorker will still retry never passes through 'failed'
+-- (retryable_job_context holds the handler's FAILED write back and the job
+-- goes straight to 'queued'), so dependents are released only once a
+-- dependency has succeeded or is dead-lettered.
+
+ALTER TABLE job_queue ADD COLUMN IF NOT EXISTS depends_on UUID[];
+
+ALTER TABLE job_queue DROP CONSTRAINT IF EXISTS valid_status;
+ALTER TABLE job_queue ADD CONSTRAINT valid_status
+    CHECK (status IN ('queued', 'processing', 'completed', 'failed', 'retrying', 'cancelled', 'waiting'));
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_waiting_depends_on
+    ON job_queue USING GIN (depends_on)
+    WHERE status = 'waiting';
+
+-- Release waiting dependents when a job finishes. Dependencies that no longer
+-- exist count as finished.
+CREATE OR REPLACE FUNCTION release_dependent_jobs()
+RETURNS TRIGGER AS $$
+DECLARE
+    released RECORD;
+BEGIN
+    FOR released IN
+        UPDATE job_queue j
+        SET status = 'queued',
+            started_at = NULL,
+            progress_message = 'Dependencies finished - resuming',
+            updated_at = NOW()
+        WHERE j.status = 'waiting'
+        AND j.depends_on @> ARRAY[NEW.id]
+        AND NOT EXISTS (
+            SELECT 1 FROM job_queue d
+            WHERE d.id = ANY(j.depends_on)
+            AND d.id <> NEW.id
+            AND d.status IN ('queued', 'processing', 'retrying', 'waiting')
+        )
+        RETURNING j.id, j.job_type, j.queue_name
+    LOOP
+        PERFORM pg_notify('job_queue_new', json_build_object(
+            'job_id', released.id,
+            'job_type', released.job_type,
+            'queue_name', released.queue_name
+        )::text);
+    END LOOP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_job_queue_release_dependents ON job_queue;
+CREATE TRIGGER trigger_job_queue_release_dependents
+    AFTER UPDATE OF status ON job_queue
+    FOR EACH ROW
+    WHEN (NEW.status IN ('completed', 'failed', 'cancelled') AND OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION release_dependent_jobs();
+
+COMMENT ON COLUMN job_queue.depends_on IS 'Jobs that must reach a terminal status before this waiting job is re-queued';
@@ -0,0 +1,12 @@
+-- Migration: Offload large job results out of the job_queue row
+-- Date: 2026-10-16
+-- Description: Results above JOB_RESULTS_INLINE_MAX_BYTES are gzip-compressed
+-- and written to the job result store (private R2 bucket or local disk).
+-- The row keeps only a pointer and the uncompressed size; result stays NULL
+-- for offloaded jobs.
+
+ALTER TABLE job_queue ADD COLUMN IF NOT EXISTS result_ref TEXT;
+ALTER TABLE job_queue ADD COLUMN IF NOT EXISTS result_size INTEGER;
+
+COMMENT ON COLUMN job_queue.result_ref IS 'Pointer to an offloaded result (r2://bucket/key or file://path); NULL when result is inline';
+COMMENT ON COLUMN job_queue.result_size IS 'Uncompressed size in bytes of the serialized result';
@@ -0,0 +1,16 @@
+-- Migration: Lease-and-heartbeat ownership for processing jobs
+-- Date: 2026-10-16
+-- Description: A worker that claims a job stamps its worker_id and a lease
+-- expiry on the row and renews the lease for all of its jobs on every
+-- heartbeat. Jobs whose lease expired (their worker died) are re-queued
+-- within seconds by any live worker; long jobs of a live worker are never
+-- reset, however long they run.
+
+ALTER TABLE job_queue ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+-- Reaper scan: expired leases among processing jobs
+CREATE INDEX IF NOT EXISTS idx_job_queue_lease_expiry
+    ON job_queue (lease_expires_at)
+    WHERE status = 'processing';
+
+COMMENT ON COLUMN job_queue.lease_expires_at IS 'Ownership lease of the worker in worker_id; renewed by its heartbeat, re-queued by the reaper once expired';
@@ -0,0 +1,27 @@
+-- Migration: Delayed retries with backoff, and dead-lettering
+-- Date: 2026-10-16
+-- Description: A failed job is re-queued with run_after set by its job type's
+-- exponential backoff with jitter. The claim query skips rows whose run_after
+-- is in the future. A job that exhausts its retries is marked failed with its
+-- last error and copied to job_dead_letter_queue.
+
+ALTER TABLE job_queue ADD COLUMN IF NOT EXISTS run_after TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_run_after
+    ON job_queue (run_after)
+    WHERE status = 'queued' AND run_after IS NOT NULL;
+
+COMMENT ON COLUMN job_queue.run_after IS 'Earliest time the job may be claimed (retry backoff); NULL = immediately';
+
+CREATE TABLE IF NOT EXISTS job_dead_letter_queue (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    original_job_id UUID NOT NULL,
+    job_data JSONB NOT NULL,
+    failure_reason TEXT NOT NULL,
+    failure_count INTEGER NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    last_retry_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_dead_letter_original ON job_dead_letter_queue (original_job_id);
+CREATE INDEX IF NOT EXISTS idx_job_dead_letter_created ON job_dead_letter_queue (created_at DESC);
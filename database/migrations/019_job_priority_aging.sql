@@ -0,0 +1,11 @@
+-- Migration: Priority aging for job claims
+-- Date: 2026-10-16
+-- Description: Claims order queued jobs by aged priority: priority plus one
+-- point per PRIORITY_AGING_SECONDS_PER_POINT (3s) spent waiting. Because NOW()
+-- is the same for every row, that order equals ascending
+-- created_at - priority * 3s, which is immutable and can be indexed. The
+-- expression must match AGED_CLAIM_KEY in app/workers/worker_database.py.
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_aged_claim
+    ON job_queue (((created_at AT TIME ZONE 'UTC') - priority * INTERVAL '3 seconds'))
+    WHERE status = 'queued';
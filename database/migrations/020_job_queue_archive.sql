@@ -0,0 +1,40 @@
+-- Migration: Archive finished jobs out of job_queue
+-- Date: 2026-10-16
+-- Description: Finished jobs (completed / failed / cancelled) older than
+-- JOB_ARCHIVE_AFTER_HOURS are moved to job_queue_archive by the unified
+-- worker's archiver, in batches of DELETE ... RETURNING feeding an INSERT.
+-- job_queue then holds only live rows plus a short tail of recent results.
+-- Partial indexes on the live statuses serve the claim-adjacent queries
+-- (queue depth, tenant quota, stats, stuck-job cleanup).
+--
+-- The archiver copies the columns the two tables share, so a column added to
+-- job_queue later is simply not archived until it is added here too.
+-- By-id lookups (job status / result endpoints) fall back to the archive.
+
+CREATE TABLE IF NOT EXISTS job_queue_archive (LIKE job_queue INCLUDING DEFAULTS);
+ALTER TABLE job_queue_archive ADD COLUMN IF NOT EXISTS archived_at TIMESTAMPTZ DEFAULT NOW();
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_job_queue_archive_id ON job_queue_archive (id);
+CREATE INDEX IF NOT EXISTS idx_job_queue_archive_user_created ON job_queue_archive (user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_job_queue_archive_archived_at ON job_queue_archive (archived_at);
+
+ALTER TABLE job_queue_archive ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Users can only access their own archived jobs" ON job_queue_archive;
+CREATE POLICY "Users can only access their own archived jobs" ON job_queue_archive
+    FOR ALL USING (auth.uid() = user_id);
+
+-- Live rows only
+CREATE INDEX IF NOT EXISTS idx_job_queue_live
+    ON job_queue (queue_name, status)
+    WHERE status IN ('queued', 'processing');
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_live_user
+    ON job_queue (user_id)
+    WHERE status IN ('queued', 'processing');
+
+-- Archiver scan: oldest finished rows first
+CREATE INDEX IF NOT EXISTS idx_job_queue_finished
+    ON job_queue ((COALESCE(completed_at, created_at)))
+    WHERE status IN ('completed', 'failed', 'cancelled');
+
+COMMENT ON TABLE job_queue_archive IS 'Finished jobs moved out of job_queue after JOB_ARCHIVE_AFTER_HOURS';
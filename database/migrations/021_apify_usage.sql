@@ -0,0 +1,31 @@
+-- Migration: Persisted Apify usage counters
+-- Date: 2026-10-16
+-- Description: One row per hour, tenant, job type and actor with the actor
+-- runs started, URLs scraped, compute units and USD they consumed, and the
+-- seconds callers queued for budget. Written by ApifyBudgetGovernor on every
+-- run start (runs, scraped_urls, budget_wait_seconds) and finish
+-- (compute_units, usage_usd, taken from the finished run object). Read by
+-- the superadmin Apify usage endpoint (the budgets themselves live in
+-- apify_budget_buckets, migration 022).
+--
+-- tenant_id is the job's user_id as text; 'unattributed' covers scrapes made
+-- outside a job (request-time fallbacks).
+
+CREATE TABLE IF NOT EXISTS apify_usage (
+    hour TIMESTAMPTZ NOT NULL,
+    tenant_id TEXT NOT NULL,
+    job_type VARCHAR(100) NOT NULL,
+    actor_id VARCHAR(200) NOT NULL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    scraped_urls INTEGER NOT NULL DEFAULT 0,
+    compute_units DOUBLE PRECISION NOT NULL DEFAULT 0,
+    usage_usd DOUBLE PRECISION NOT NULL DEFAULT 0,
+    budget_wait_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (hour, tenant_id, job_type, actor_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_apify_usage_tenant_hour ON apify_usage (tenant_id, hour DESC);
+
+-- Service role only (written by workers, read by superadmin endpoints)
+ALTER TABLE apify_usage ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,19 @@
+-- Migration: Shared Apify budget token buckets
+-- Date: 2026-10-16
+-- Description: The ApifyBudgetGovernor token buckets, shared by every API
+-- replica and worker process so the hourly budgets hold across all of them.
+-- One row per scope: 'global' and 'tenant:<user id>'. tokens is the level at
+-- updated_at; a take locks the row (SELECT ... FOR UPDATE), refills it by
+-- the time since updated_at, and writes the new level back in the same
+-- transaction. Capacity and refill rate come from the APIFY_*_BUDGET_*
+-- settings, so changing them needs no migration. Rows are created full on
+-- first use.
+
+CREATE TABLE IF NOT EXISTS apify_budget_buckets (
+    scope TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Service role only (written by the governor, read by superadmin endpoints)
+ALTER TABLE apify_budget_buckets ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,7 @@
+-- Migration: Stop copying pipeline results into creator_search_flights
+-- Date: 2026-10-16
+-- Description: A flight row keeps only its owner job, status and profile.
+-- Jobs joining a completed flight read the owner job's stored result
+-- (job_queue.result / result_ref) instead of a JSONB copy held per handle.
+
+ALTER TABLE creator_search_flights DROP COLUMN IF EXISTS pipeline_results;
@@ -0,0 +1,14 @@
+-- Migration: Slower priority aging for job claims
+-- Date: 2026-10-16
+-- Description: At one point per 3s of waiting, a queued BULK job outranked a
+-- fresh CRITICAL one after 270s, so under any sustained backlog priority
+-- stopped mattering. PRIORITY_AGING_SECONDS_PER_POINT is now 60: a job climbs
+-- one JobPriority level in 25 minutes. The claim index expression must match
+-- AGED_CLAIM_KEY in app/workers/worker_database.py, so the 019 index is
+-- replaced (the name carries the rate).
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_aged_claim_60s
+    ON job_queue (((created_at AT TIME ZONE 'UTC') - priority * INTERVAL '60 seconds'))
+    WHERE status = 'queued';
+
+DROP INDEX IF EXISTS idx_job_queue_aged_claim;
@@ -220,15 +220,26 @@ async def lifespan(app: FastAPI):
         print("  - Post analytics will be blocking")
         print("  - Users may experience slower response times")
 
-    # START UNIFIED ASYNC WORKER (In-Process — replaces Celery subprocess)
+    # START UNIFIED ASYNC WORKER (In-Process thread, or supervised process pool)
     try:
-        print("Starting Unified Async Worker...")
-        from app.workers.unified_async_worker import unified_async_worker
+        if settings.UNIFIED_WORKER_PROCESSES > 0:
+            print(f"Starting Unified Worker Pool ({settings.UNIFIED_WORKER_PROCESSES} processes)...")
+            from app.workers.unified_worker_pool import unified_worker_pool
+            from app.services.worker_manager import worker_manager
+
+            await unified_worker_pool.start(settings.UNIFIED_WORKER_PROCESSES)
+            worker_manager.register_process_pool('unified_worker_pool', unified_worker_pool)
+            print("[SUCCESS] Unified Worker Pool started successfully")
+            print("  - Processing all background jobs (creator_search, profile_analysis, etc.)")
+            print("  - One event loop + DB pool per process, supervised with auto-restart")
+        else:
+            print("Starting Unified Async Worker...")
+            from app.workers.unified_async_worker import unified_async_worker
 
-        asyncio.create_task(unified_async_worker.start())
-        print("[SUCCESS] Unified Async Worker started successfully")
-        print("  - Processing all background jobs (creator_search, profile_analysis, etc.)")
-        print("  - In-process async — no Celery subprocess needed")
+            asyncio.create_task(unified_async_worker.start())
+            print("[SUCCESS] Unified Async Worker started successfully")
+            print("  - Processing all background jobs (creator_search, profile_analysis, etc.)")
+            print("  - In-process async — no Celery subprocess needed")
 
     except Exception as e:
         print(f"[WARNING] Failed to start Unified Async Worker: {e}")
@@ -244,23 +255,32 @@ async def lifespan(app: FastAPI):
         await worker_auto_manager.stop_discovery_worker()
         print("Discovery worker stopped")
 
-        # Stop post analytics worker
-        print("Stopping post analytics worker...")
-        try:
-            from app.workers.post_analytics_worker import post_analytics_worker
-            await post_analytics_worker.stop()
-            print("Post analytics worker stopped")
-        except Exception as pa_err:
-            print(f"Post analytics worker stop failed: {pa_err}")
+        # Stop post analytics + unified async workers concurrently - each drains
+        # its in-flight jobs (up to WORKER_DRAIN_TIMEOUT_SECONDS) and hands
+        # unfinished ones back to the queue for the next replica
+        async def _stop_post_analytics_worker():
+            print("Stopping post analytics worker...")
+            try:
+                from app.workers.post_analytics_worker import post_analytics_worker
+                await post_analytics_worker.stop()
+                print("Post analytics worker stopped")
+            except Exception as pa_err:
+                print(f"Post analytics worker stop failed: {pa_err}")
+
+        async def _stop_unified_worker():
+            print("Stopping unified async worker...")
+            try:
+                if settings.UNIFIED_WORKER_PROCESSES > 0:
+                    from app.workers.unified_worker_pool import unified_worker_pool
+                    await unified_worker_pool.stop()
+                else:
+                    from app.workers.unified_async_worker import unified_async_worker
+                    await unified_async_worker.stop()
+                print("Unified async worker stopped")
+            except Exception as uw_err:
+                print(f"Unified async worker stop failed: {uw_err}")
 
-        # Stop unified async worker
-        print("Stopping unified async worker...")
-        try:
-            from app.workers.unified_async_worker import unified_async_worker
-            await unified_async_worker.stop()
-            print("Unified async worker stopped")
-        except Exception as uw_err:
-            print(f"Unified async worker stop failed: {uw_err}")
+        await asyncio.gather(_stop_post_analytics_worker(), _stop_unified_worker())
 
         # Stop other background workers
         print("Stopping background workers...")
@@ -1389,8 +1409,12 @@ async def monitor_workers():
         # Check Unified Async Worker status
         unified_worker_status = {}
         try:
-            from app.workers.unified_async_worker import unified_async_worker
-            unified_worker_status = unified_async_worker.get_status()
+            if settings.UNIFIED_WORKER_PROCESSES > 0:
+                from app.workers.unified_worker_pool import unified_worker_pool
+                unified_worker_status = unified_worker_pool.get_status()
+            else:
+                from app.workers.unified_async_worker import unified_async_worker
+                unified_worker_status = unified_async_worker.get_status()
         except Exception as uw_err:
             unified_worker_status = {"error": str(uw_err)[:50]}
 
@@ -1402,10 +1426,22 @@ async def monitor_workers():
         except Exception as pa_err:
             post_analytics_status = {"error": str(pa_err)[:50]}
 
+        # Supervised worker processes (Celery subprocesses, unified worker pool)
+        managed_workers = {}
+        try:
+            from app.services.worker_manager import worker_manager
+            managed_workers = {
+                "healthy": worker_manager.is_healthy(),
+                "workers": worker_manager.get_worker_status()
+            }
+        except Exception as wm_err:
+            managed_workers = {"error": str(wm_err)[:50]}
+
         return {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "unified_async_worker": unified_worker_status,
             "post_analytics_worker": post_analytics_status,
+            "managed_workers": managed_workers,
             "celery_workers": {
                 "status": celery_status,
                 "active_tasks": active_tasks,
@@ -0,0 +1,264 @@
+"""
+Benchmark: queue wait time per tier under a mixed-tier workload
+
+Enqueues a workload dominated by enterprise/premium jobs (CRITICAL priority)
+with a trickle of free/standard jobs (NORMAL/HIGH), consumes it with a fixed
+number of worker slots that are slower than the arrival rate, and reports
+p50/p95/p99/max queue wait per tier.
+
+Two modes:
+
+  --simulate   In-memory discrete-event model of the claim order. Compares
+               static priority (the old ORDER BY priority DESC, created_at)
+               with aged priority, and exits non-zero if aging raises the
+               CRITICAL p99 wait by more than --critical-tolerance. Needs
+               nothing but Python.
+
+  (default)    Against a real database (DIRECT_DATABASE_URL). Inserts
+               'benchmark_aging' jobs and claims them with
+               WorkerDatabase.claim_jobs - the production claim query,
+               including weighted-fair tenant caps. Benchmark rows are
+               deleted afterwards. Use a dev database: a live
+               UnifiedAsyncWorker on the same database would claim the
+               benchmark jobs through its default lane.
+
+Usage:
+    python scripts/benchmark_priority_aging.py --simulate
+    python scripts/benchmark_priority_aging.py --duration 60 --workers 4
+"""
+import argparse
+import asyncio
+import heapq
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Tier -> (share of arrivals, JobPriority value) - priorities as mapped in fast_handoff_api
+TIER_MIX = {
+    'enterprise': (0.45, 100),
+    'premium': (0.30, 100),
+    'standard': (0.15, 75),
+    'free': (0.10, 50),
+}
+
+BENCHMARK_JOB_TYPE = 'benchmark_aging'
+USERS_PER_TIER = 5
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def pick_tier(rng: random.Random) -> str:
+    roll = rng.random()
+    for tier, (share, _) in TIER_MIX.items():
+        roll -= share
+        if roll <= 0:
+            return tier
+    return 'free'
+
+
+def print_report(title: str, waits: Dict[str, List[float]], unfinished: Dict[str, int]):
+    print(f"\n{title}")
+    print(f"{'tier':<12}{'jobs':>7}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}{'max s':>10}{'unclaimed':>11}")
+    for tier in TIER_MIX:
+        values = waits.get(tier, [])
+        print(
+            f"{tier:<12}{len(values):>7}"
+            f"{percentile(values, 50):>10.1f}{percentile(values, 95):>10.1f}"
+            f"{percentile(values, 99):>10.1f}{max(values, default=0.0):>10.1f}"
+            f"{unfinished.get(tier, 0):>11}"
+        )
+
+
+def critical_p99(waits: Dict[str, List[float]]) -> float:
+    """p99 wait over the tiers enqueued at CRITICAL (the highest) priority"""
+    top = max(priority for _, priority in TIER_MIX.values())
+    return percentile([w for tier, (_, priority) in TIER_MIX.items() if priority == top for w in waits.get(tier, [])], 99)
+
+
+# ----------------------------------------------------------------------
+# In-memory simulation
+# ----------------------------------------------------------------------
+
+def simulate(args, aging_seconds_per_point: float):
+    """Discrete-event model: Poisson arrivals, fixed service time, `workers` slots."""
+    rng = random.Random(args.seed)
+    arrivals = []
+    t = 0.0
+    while t < args.duration:
+        t += rng.expovariate(args.rate)
+        tier = pick_tier(rng)
+        arrivals.append((t, tier, TIER_MIX[tier][1]))
+
+    def claim_key(job):
+        created, _, priority = job
+        if aging_seconds_per_point:
+            return created - priority * aging_seconds_per_point
+        return (-priority, created)
+
+    waits: Dict[str, List[float]] = {tier: [] for tier in TIER_MIX}
+    queue = []  # heap of (claim_key, seq, job)
+    free_at = [0.0] * args.workers
+    heapq.heapify(free_at)
+    next_arrival = 0
+    seq = 0
+
+    # Drain for as long as the arrival window again, then count what is left
+    horizon = args.duration * 2
+    while True:
+        now = heapq.heappop(free_at)
+        if now > horizon:
+            break
+        while next_arrival < len(arrivals) and arrivals[next_arrival][0] <= now:
+            job = arrivals[next_arrival]
+            heapq.heappush(queue, (claim_key(job), seq, job))
+            seq += 1
+            next_arrival += 1
+        if not queue:
+            if next_arrival >= len(arrivals):
+                break
+            heapq.heappush(free_at, arrivals[next_arrival][0])
+            continue
+        _, _, (created, tier, _) = heapq.heappop(queue)
+        waits[tier].append(now - created)
+        heapq.heappush(free_at, now + args.service_time)
+
+    unfinished = {tier: 0 for tier in TIER_MIX}
+    for _, _, (_, tier, _) in queue:
+        unfinished[tier] += 1
+    for created, tier, _ in arrivals[next_arrival:]:
+        unfinished[tier] += 1
+    return waits, unfinished
+
+
+# ----------------------------------------------------------------------
+# Real database
+# ----------------------------------------------------------------------
+
+async def run_database_benchmark(args):
+    from app.core.job_queue import job_queue
+    from app.workers.worker_database import WorkerDatabase
+
+    db = WorkerDatabase()
+    await db.initialize()
+    rng = random.Random(args.seed)
+    users = {tier: [str(uuid.uuid4()) for _ in range(USERS_PER_TIER)] for tier in TIER_MIX}
+    tenant_limits = {tier: quota['concurrent_jobs'] for tier, quota in job_queue.tenant_quotas.items()}
+    waits: Dict[str, List[float]] = {tier: [] for tier in TIER_MIX}
+    producing = True
+
+    async def produce():
+        nonlocal producing
+        deadline = time.monotonic() + args.duration
+        while time.monotonic() < deadline:
+            await asyncio.sleep(rng.expovariate(args.rate))
+            tier = pick_tier(rng)
+            async with db.pool.acquire() as conn:
+                await conn.execute("""
+                    INSERT INTO job_queue (
+                        id, user_id, job_type, status, priority, queue_name,
+                        params, created_at, user_tier
+                    ) VALUES (
+                        gen_random_uuid(), $1::uuid, $2, 'queued', $3, 'api_queue',
+                        $4::jsonb, NOW(), $5
+                    )
+                """, rng.choice(users[tier]), BENCHMARK_JOB_TYPE, TIER_MIX[tier][1],
+                    json.dumps({'benchmark': True}), tier)
+        producing = False
+
+    async def consume():
+        while producing or time.monotonic() < drain_deadline:
+            jobs = await db.claim_jobs(
+                1, include_types=[BENCHMARK_JOB_TYPE], tenant_limits=tenant_limits
+            )
+            if not jobs:
+                await asyncio.sleep(0.05)
+                continue
+            job = jobs[0]
+            async with db.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT user_tier, EXTRACT(EPOCH FROM started_at - created_at) AS wait "
+                    "FROM job_queue WHERE id = $1::uuid", job['id']
+                )
+            waits[row['user_tier']].append(float(row['wait']))
+            await asyncio.sleep(args.service_time)
+            async with db.pool.acquire() as conn:
+                await conn.execute(
+                    "UPDATE job_queue SET status = 'completed', completed_at = NOW() WHERE id = $1::uuid",
+                    job['id']
+                )
+
+    drain_deadline = time.monotonic() + args.duration * 2
+    try:
+        await asyncio.gather(produce(), *(consume() for _ in range(args.workers)))
+        async with db.pool.acquire() as conn:
+            leftover = await conn.fetch("""
+                SELECT user_tier, COUNT(*) AS n FROM job_queue
+                WHERE job_type = $1 AND status = 'queued'
+                GROUP BY user_tier
+            """, BENCHMARK_JOB_TYPE)
+        unfinished = {row['user_tier']: row['n'] for row in leftover}
+        print_report(
+            f"Database claim query ({datetime.now(timezone.utc).isoformat(timespec='seconds')})",
+            waits, unfinished
+        )
+    finally:
+        async with db.pool.acquire() as conn:
+            await conn.execute("DELETE FROM job_queue WHERE job_type = $1", BENCHMARK_JOB_TYPE)
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--simulate', action='store_true', help='In-memory model instead of the database')
+    parser.add_argument('--duration', type=float, default=600, help='Seconds of arrivals (default 600; use ~60 against a DB)')
+    parser.add_argument('--rate', type=float, default=2.2, help='Job arrivals per second')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent worker slots')
+    parser.add_argument('--service-time', type=float, default=2.0, help='Seconds each job occupies a slot')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--critical-tolerance', type=float, default=0.1,
+                        help='--simulate: allowed relative rise of the CRITICAL p99 wait (default 0.1)')
+    args = parser.parse_args()
+
+    capacity = args.workers / args.service_time
+    print(f"Arrival rate {args.rate:.2f}/s vs capacity {capacity:.2f}/s "
+          f"({args.rate / capacity:.0%} load), {args.duration:.0f}s of arrivals")
+
+    if args.simulate:
+        from app.workers.worker_database import PRIORITY_AGING_SECONDS_PER_POINT
+        static = simulate(args, 0)
+        aged = simulate(args, PRIORITY_AGING_SECONDS_PER_POINT)
+        print_report("Static priority (no aging)", *static)
+        print_report(f"Aged priority (+1 point / {PRIORITY_AGING_SECONDS_PER_POINT}s queued)", *aged)
+
+        static_p99, aged_p99 = (critical_p99(waits) for waits, _ in (static, aged))
+        regressed = aged_p99 > static_p99 * (1 + args.critical_tolerance)
+        print(f"\nCRITICAL p99 wait: {static_p99:.1f}s static, {aged_p99:.1f}s aged"
+              f" - {'REGRESSED' if regressed else 'ok'}")
+        if regressed:
+            sys.exit(1)
+    else:
+        asyncio.run(run_database_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+"""
+Fake Apify API server for offline development and testing
+
+Implements the slice of the Apify v2 REST API that ApifyInstagramClient uses:
+
+    POST /v2/acts/{actor}/runs                start a run (body = run input)
+    GET  /v2/actor-runs/{run_id}              run status (?waitForFinish=N long-poll)
+    POST /v2/actor-runs/{run_id}/abort        abort a run
+    GET  /v2/datasets/{dataset_id}/items      dataset items (?offset=&limit=)
+
+Runs take --run-seconds to finish. Each directUrls entry of the run input
+produces dataset items in instagram-scraper "details" format:
+
+    https://www.instagram.com/<username>/   -> one profile item (12 latestPosts)
+    https://www.instagram.com/p/<code>/     -> one post item
+
+Items come from --fixtures DIR (<username>.json or p_<code>.json holding a
+list of items) when present, otherwise they are generated deterministically
+from the username / shortcode. Usernames listed in --not-found return
+{"error": "not_found"} like the real actor; --private usernames return a
+private profile without posts. Items land in the dataset progressively over
+the run (one directUrl after another), as they do on Apify, so batched
+readers can stream them.
+
+Finished runs report stats.computeUnits and usageTotalUsd as if they ran
+with 1 GB of memory (1 compute unit per run hour).
+
+Fault injection: --rate-limit-every N answers every Nth request with
+HTTP 429 (Retry-After: 1); --fail-every N makes every Nth run end FAILED.
+
+Usage:
+    python scripts/fake_apify_server.py --port 8765
+    APIFY_BASE_URL=http://127.0.0.1:8765/v2 APIFY_API_TOKEN=fake uvicorn main:app
+
+    # Self-check: scrape through ApifyInstagramClient while measuring
+    # event-loop lag, then one batched run with a private and a missing
+    # profile, then a batched post scrape against the recorded payloads in
+    # scripts/fixtures/apify (needs the app's dependencies; exits non-zero
+    # if posts are not mapped back to their shortcodes)
+    python scripts/fake_apify_server.py --check
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'apify'
+
+PROFILE_URL = re.compile(r'instagram\.com/([A-Za-z0-9_.]+)/?$')
+POST_URL = re.compile(r'instagram\.com/(?:p|reel)/([A-Za-z0-9_-]+)')
+
+# Apify caps waitForFinish at 60 seconds
+MAX_WAIT_FOR_FINISH = 60
+
+# Reported usage of finished runs: 1 GB memory (1 CU per hour) at this price
+FAKE_USD_PER_COMPUTE_UNIT = 0.4
+
+
+def _seed(key: str) -> int:
+    return int(hashlib.sha256(key.encode()).hexdigest()[:8], 16)
+
+
+def generate_profile_item(username: str, input_url: str, private: bool = False) -> Dict[str, Any]:
+    """Deterministic profile item in instagram-scraper 'details' format."""
+    seed = _seed(username)
+    followers = 1_000 + seed % 2_000_000
+    base_ts = 1_760_000_000 - seed % 1_000_000
+    posts = []
+    for i in range(12):
+        shortcode = f"{username[:6]}{i:02d}{seed % 9973:04d}"
+        posts.append({
+            "id": str(seed * 100 + i),
+            "type": "Video" if i % 4 == 0 else "Image",
+            "shortCode": shortcode,
+            "url": f"https://www.instagram.com/p/{shortcode}/",
+            "caption": f"Post {i + 1} by @{username} #fake #offline",
+            "hashtags": ["fake", "offline"],
+            "likesCount": (followers // 50) + (seed >> i) % 500,
+            "commentsCount": (followers // 2_000) + i,
+            "displayUrl": f"https://fake-cdn.invalid/{shortcode}.jpg",
+            "videoUrl": f"https://fake-cdn.invalid/{shortcode}.mp4" if i % 4 == 0 else None,
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(base_ts - i * 86_400)),
+            "ownerUsername": username,
+        })
+    return {
+        "inputUrl": input_url,
+        "id": str(seed),
+        "username": username,
+        "url": f"https://www.instagram.com/{username}",
+        "fullName": username.replace('_', ' ').title(),
+        "biography": f"Offline fixture profile for @{username}",
+        "externalUrl": None,
+        "followersCount": followers,
+        "followsCount": 100 + seed % 1_500,
+        "followingCount": 100 + seed % 1_500,
+        "postsCount": 50 + seed % 3_000,
+        "isBusinessAccount": seed % 3 == 0,
+        "businessCategoryName": "Creator" if seed % 3 == 0 else None,
+        "category": "Creator" if seed % 3 == 0 else "",
+        "private": private,
+        "verified": seed % 7 == 0,
+        "isVerified": seed % 7 == 0,
+        "profilePicUrl": f"https://fake-cdn.invalid/{username}.jpg",
+        "profilePicUrlHD": f"https://fake-cdn.invalid/{username}_hd.jpg",
+        "latestPosts": [] if private else posts,
+        "relatedProfiles": [
+            {
+                "username": f"{username}_friend{i}",
+                "fullName": f"Friend {i}",
+                "followersCount": 500 + (seed >> i) % 50_000,
+                "profilePicUrl": f"https://fake-cdn.invalid/{username}_friend{i}.jpg",
+                "isVerified": False,
+            }
+            for i in range(10)
+        ],
+    }
+
+
+def generate_post_item(shortcode: str, input_url: str) -> Dict[str, Any]:
+    """Deterministic post item in instagram-scraper 'details' format."""
+    seed = _seed(shortcode)
+    owner = f"owner{seed % 1000}"
+    return {
+        "inputUrl": input_url,
+        "id": str(seed),
+        "type": "Image",
+        "shortCode": shortcode,
+        "url": f"https://www.instagram.com/p/{shortcode}/",
+        "caption": f"Offline fixture post {shortcode} #fake",
+        "hashtags": ["fake"],
+        "mentions": [],
+        "likesCount": 100 + seed % 100_000,
+        "commentsCount": 5 + seed % 2_000,
+        "videoViewCount": None,
+        "displayUrl": f"https://fake-cdn.invalid/{shortcode}.jpg",
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(1_760_000_000 - seed % 5_000_000)),
+        "ownerUsername": owner,
+        "ownerFullName": owner.title(),
+        "ownerId": str(seed % 10_000_000),
+    }
+
+
+class FakeApify:
+    """In-memory runs and datasets shared by the request handler threads"""
+
+    def __init__(self, args):
+        self.run_seconds = args.run_seconds
+        self.fixtures = Path(args.fixtures) if args.fixtures else None
+        self.not_found = {u.lower() for u in (args.not_found or [])}
+        self.private = {u.lower() for u in (args.private or [])}
+        self.rate_limit_every = args.rate_limit_every
+        self.fail_every = args.fail_every
+        self.lock = threading.Condition()
+        self.runs: Dict[str, Dict[str, Any]] = {}
+        self.datasets: Dict[str, List[Dict[str, Any]]] = {}
+        self.dataset_runs: Dict[str, str] = {}
+        self.request_count = 0
+        self.run_count = 0
+
+    def _fixture(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        if not self.fixtures:
+            return None
+        path = self.fixtures / f"{name}.json"
+        if path.exists():
+            data = json.loads(path.read_text())
+            return data if isinstance(data, list) else [data]
+        return None
+
+    def items_for_input(self, run_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+        items = []
+        for url in run_input.get('directUrls') or []:
+            post = POST_URL.search(url)
+            if post:
+                shortcode = post.group(1)
+                items.extend(self._fixture(f"p_{shortcode}") or [generate_post_item(shortcode, url)])
+                continue
+            profile = PROFILE_URL.search(url)
+            if not profile:
+                items.append({"inputUrl": url, "error": "invalid_url"})
+                continue
+            username = profile.group(1).lower()
+            if username in self.not_found:
+                items.append({"inputUrl": url, "error": "not_found", "errorDescription": "Page not found"})
+                continue
+            items.extend(self._fixture(username) or [generate_profile_item(username, url, username in self.private)])
+        return items
+
+    def start_run(self, actor: str, run_input: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        with self.lock:
+            self.run_count += 1
+            failed = bool(self.fail_every) and self.run_count % self.fail_every == 0
+            run_id = uuid.uuid4().hex[:17]
+            dataset_id = uuid.uuid4().hex[:17]
+            self.datasets[dataset_id] = [] if failed else self.items_for_input(run_input)
+            now = time.time()
+            run = {
+                "id": run_id,
+                "actId": actor,
+                "status": "RUNNING",
+                "startedAt": time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(now)),
+                "finishedAt": None,
+                "defaultDatasetId": dataset_id,
+                "_started_at": now,
+                "_finish_at": now + self.run_seconds,
+                "_final_status": "FAILED" if failed else "SUCCEEDED",
+                "_timeout_at": now + timeout if timeout else None,
+            }
+            self.runs[run_id] = run
+            self.dataset_runs[dataset_id] = run_id
+            return run
+
+    def _advance(self, run: Dict[str, Any]):
+        """Move a run to its terminal status once its time has come (lock held)."""
+        if run["status"] != "RUNNING":
+            return
+        now = time.time()
+        if now < self._ends_at(run):
+            return
+        timed_out = run["_timeout_at"] is not None and run["_timeout_at"] < run["_finish_at"]
+        run["status"] = "TIMED-OUT" if timed_out else run["_final_status"]
+        self._stop(run, now)
+
+    def _stop(self, run: Dict[str, Any], now: float):
+        """Record the end of a run and its usage (lock held)."""
+        run["_stopped_at"] = now
+        run["finishedAt"] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(now))
+        compute_units = round((now - run["_started_at"]) / 3600, 6)
+        run["stats"] = {"computeUnits": compute_units, "runTimeSecs": round(now - run["_started_at"], 3)}
+        run["usageTotalUsd"] = round(compute_units * FAKE_USD_PER_COMPUTE_UNIT, 6)
+        self.lock.notify_all()
+
+    @staticmethod
+    def _ends_at(run: Dict[str, Any]) -> float:
+        if run["_timeout_at"] is None:
+            return run["_finish_at"]
+        return min(run["_finish_at"], run["_timeout_at"])
+
+    def get_run(self, run_id: str, wait: float) -> Optional[Dict[str, Any]]:
+        deadline = time.time() + min(wait, MAX_WAIT_FOR_FINISH)
+        with self.lock:
+            run = self.runs.get(run_id)
+            if not run:
+                return None
+            while True:
+                self._advance(run)
+                remaining = deadline - time.time()
+                if run["status"] != "RUNNING" or remaining <= 0:
+                    return run
+                self.lock.wait(timeout=max(0.01, min(remaining, self._ends_at(run) - time.time())))
+
+    def abort_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            run = self.runs.get(run_id)
+            if run:
+                self._advance(run)
+                if run["status"] == "RUNNING":
+                    run["status"] = "ABORTED"
+                    self._stop(run, time.time())
+            return run
+
+    def visible_items(self, dataset_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Items written so far - a running run's dataset fills up evenly over its duration."""
+        with self.lock:
+            items = self.datasets.get(dataset_id)
+            run = self.runs.get(self.dataset_runs.get(dataset_id, ''))
+            if items is None or run is None:
+                return items
+            self._advance(run)
+            if run["status"] == "SUCCEEDED":
+                return items
+            # Running, or stopped early (aborted / timed out) with what it had written
+            started = run["_finish_at"] - self.run_seconds
+            now = run.get("_stopped_at") or time.time()
+            progress = (now - started) / self.run_seconds if self.run_seconds else 1.0
+            return items[:int(len(items) * min(1.0, max(0.0, progress)))]
+
+    def should_rate_limit(self) -> bool:
+        with self.lock:
+            self.request_count += 1
+            return bool(self.rate_limit_every) and self.request_count % self.rate_limit_every == 0
+
+
+def public_run(run: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in run.items() if not k.startswith('_')}
+
+
+def make_handler(state: FakeApify, quiet: bool):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):
+            if not quiet:
+                sys.stderr.write(f"[FAKE-APIFY] {self.address_string()} {fmt % args}\n")
+
+        def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status: int, error_type: str, message: str, headers=None):
+            self._send(status, {"error": {"type": error_type, "message": message}}, headers)
+
+        def _route(self, method: str):
+            parsed = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            parts = [p for p in parsed.path.split('/') if p]
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+
+            if not (self.headers.get('Authorization') or query.get('token')):
+                return self._error(401, "token-not-provided", "Authentication token was not provided")
+            if state.should_rate_limit():
+                return self._error(429, "rate-limit-exceeded", "You have exceeded the rate limit",
+                                   {"Retry-After": "1"})
+            if not parts or parts[0] != 'v2':
+                return self._error(404, "page-not-found", "Not found")
+            parts = parts[1:]
+
+            if method == 'POST' and len(parts) == 3 and parts[0] == 'acts' and parts[2] == 'runs':
+                try:
+                    run_input = json.loads(raw or b'{}')
+                except ValueError:
+                    return self._error(400, "invalid-input", "Run input must be JSON")
+                timeout = float(query['timeout']) if query.get('timeout') else None
+                run = state.start_run(parts[1].replace('~', '/'), run_input, timeout)
+                return self._send(201, {"data": public_run(run)})
+
+            if len(parts) >= 2 and parts[0] == 'actor-runs':
+                if method == 'GET' and len(parts) == 2:
+                    run = state.get_run(parts[1], float(query.get('waitForFinish') or 0))
+                elif method == 'POST' and len(parts) == 3 and parts[2] == 'abort':
+                    run = state.abort_run(parts[1])
+                else:
+                    run = None
+                if not run:
+                    return self._error(404, "record-not-found", "Actor run was not found")
+                return self._send(200, {"data": public_run(run)})
+
+            if method == 'GET' and len(parts) == 3 and parts[0] == 'datasets' and parts[2] == 'items':
+                items = state.visible_items(parts[1])
+                if items is None:
+                    return self._error(404, "record-not-found", "Dataset was not found")
+                offset = int(query.get('offset') or 0)
+                limit = int(query.get('limit') or len(items) or 1)
+                page = items[offset:offset + limit]
+                return self._send(200, page, {
+                    "X-Apify-Pagination-Offset": str(offset),
+                    "X-Apify-Pagination-Limit": str(limit),
+                    "X-Apify-Pagination-Count": str(len(page)),
+                    "X-Apify-Pagination-Total": str(len(items)),
+                })
+
+            return self._error(404, "page-not-found", "Not found")
+
+        def do_GET(self):
+            self._route('GET')
+
+        def do_POST(self):
+            self._route('POST')
+
+    return Handler
+
+
+def serve(args) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(FakeApify(args), args.quiet))
+    server.daemon_threads = True
+    return server
+
+
+def run_check(args):
+    """Scrape a few profiles through ApifyInstagramClient and report event-loop lag."""
+    import asyncio
+    import os
+
+    server = serve(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{args.host}:{server.server_address[1]}/v2"
+    os.environ.setdefault("APIFY_API_TOKEN", "fake")
+    sys.path.append(str(Path(__file__).parent.parent))
+
+    from app.scrapers.apify_instagram_client import ApifyInstagramClient
+
+    async def main():
+        max_lag = 0.0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal max_lag
+            while not stop.is_set():
+                started = time.monotonic()
+                await asyncio.sleep(0.05)
+                max_lag = max(max_lag, time.monotonic() - started - 0.05)
+
+        tick = asyncio.create_task(ticker())
+        usernames = ["fake_creator_one", "fake_creator_two", "fake_creator_three"]
+        started = time.monotonic()
+        async with ApifyInstagramClient("fake", base_url=base_url) as client:
+            results = await asyncio.gather(
+                *(client.get_instagram_profile_comprehensive(u) for u in usernames)
+            )
+        elapsed = time.monotonic() - started
+        stop.set()
+        await tick
+
+        for username, result in zip(usernames, results):
+            data = result["results"][0]["content"]["data"]
+            print(f"@{username}: {data['followers_count']:,} followers, {len(data['posts'])} posts, "
+                  f"{len(data['related_profiles'])} related")
+        print(f"{len(usernames)} concurrent scrapes of {args.run_seconds:.1f}s runs took {elapsed:.1f}s; "
+              f"max event-loop lag {max_lag * 1000:.0f}ms")
+
+        # One run for many usernames, streamed back; failures stay per username
+        batch = [f"fake_batch_{i}" for i in range(8)] + ["fake_private_one", "fake_missing_one"]
+        started = time.monotonic()
+        async with ApifyInstagramClient("fake", base_url=base_url) as client:
+            async for username, result, error in client.iter_profiles_batch(batch):
+                at = time.monotonic() - started
+                if error is not None:
+                    print(f"  +{at:4.1f}s @{username}: {type(error).__name__}: {error}")
+                else:
+                    data = result["results"][0]["content"]["data"]
+                    print(f"  +{at:4.1f}s @{username}: {data['followers_count']:,} followers, "
+                          f"{len(data['posts'])} posts")
+        print(f"Batched run of {len(batch)} profiles took {time.monotonic() - started:.1f}s")
+
+        return await posts_batch_check(base_url)
+
+    try:
+        if not asyncio.run(main()):
+            sys.exit(1)
+    finally:
+        server.shutdown()
+
+
+async def posts_batch_check(base_url: str) -> bool:
+    """
+    Batched post scrape against the recorded payloads in FIXTURES_DIR plus
+    generated posts: every URL must map back to its own shortcode, share
+    links of one post must collapse into one entry, and the recorded
+    not_found payload must surface as ApifyProfileNotFoundError.
+    """
+    from app.scrapers.apify_instagram_client import ApifyInstagramClient, ApifyProfileNotFoundError
+
+    recorded = sorted(path.stem[2:] for path in FIXTURES_DIR.glob('p_*.json'))
+    missing = [code for code in recorded
+               if any(item.get('error') for item in json.loads((FIXTURES_DIR / f"p_{code}.json").read_text()))]
+    found = [code for code in recorded if code not in missing]
+    generated = [f"Cfake{i:06d}" for i in range(6)]
+    urls = [f"https://www.instagram.com/p/{code}/" for code in recorded + generated]
+    urls += [f"https://www.instagram.com/reel/{found[0]}/?igsh=fixture"]  # same post as a share link
+
+    started = time.monotonic()
+    async with ApifyInstagramClient("fake", base_url=base_url) as client:
+        results = await client.get_posts_batch(urls, max_age_minutes=0)
+    elapsed = time.monotonic() - started
+
+    problems = []
+    if set(results) != set(recorded + generated):
+        problems.append(f"expected one entry per shortcode, got {sorted(results)}")
+    for code in found + generated:
+        item = results.get(code)
+        if not isinstance(item, dict) or item.get("shortCode") != code:
+            problems.append(f"{code}: expected its own post item, got {item!r:.120}")
+    for code in found:
+        expected = json.loads((FIXTURES_DIR / f"p_{code}.json").read_text())[0]
+        if isinstance(results.get(code), dict) and results[code] != expected:
+            problems.append(f"{code}: item differs from the recorded payload")
+    for code in missing:
+        if not isinstance(results.get(code), ApifyProfileNotFoundError):
+            problems.append(f"{code}: expected ApifyProfileNotFoundError, got {results.get(code)!r:.120}")
+
+    for code, result in sorted(results.items()):
+        if isinstance(result, Exception):
+            print(f"  post {code}: {type(result).__name__}: {result}")
+        else:
+            print(f"  post {code}: @{result.get('ownerUsername')} {result.get('type')}, "
+                  f"{result.get('likesCount'):,} likes")
+    print(f"Batched scrape of {len(urls)} post URLs ({len(recorded)} recorded) took {elapsed:.1f}s")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='0 = any free port')
+    parser.add_argument('--run-seconds', type=float, default=3.0, help='How long each actor run takes')
+    parser.add_argument('--fixtures', help='Directory of <username>.json / p_<shortcode>.json item lists')
+    parser.add_argument('--not-found', nargs='*', help='Usernames that return not_found')
+    parser.add_argument('--private', nargs='*', help='Usernames that are private accounts')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Answer every Nth request with 429')
+    parser.add_argument('--fail-every', type=int, default=0, help='Every Nth run ends FAILED')
+    parser.add_argument('--quiet', action='store_true', help='No request log')
+    parser.add_argument('--check', action='store_true', help='Run the client self-check and exit')
+    args = parser.parse_args()
+
+    if args.check:
+        args.port = 0
+        args.quiet = True
+        args.private = (args.private or []) + ["fake_private_one"]
+        args.not_found = (args.not_found or []) + ["fake_missing_one"]
+        args.fixtures = args.fixtures or str(FIXTURES_DIR)
+        run_check(args)
+        return
+
+    server = serve(args)
+    print(f"Fake Apify API on http://{args.host}:{server.server_address[1]}/v2 "
+          f"(runs take {args.run_seconds}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Replay benchmark: creator searches through the real pipeline, offline
+
+Runs N creator_search jobs through _process_creator_search_async - single
+flight, Apify batcher and client, store_complete_profile, CDN processing and
+AI analysis - against a local Postgres and Redis, with every scrape answered
+from a recorded corpus (app/scrapers/scrape_replay.py). Nothing is sent to
+Apify, Instagram or R2; uploads land in SCRAPE_REPLAY_UPLOAD_DIR.
+
+Each job searches a distinct synthetic creator (replay_<run>_<n>) cloned from
+the corpus, so no job is served from the database or the raw scrape cache.
+Reports p50/p95/max job latency and throughput; --json-out saves the report
+and --baseline compares with a saved one and exits 1 when p95 latency or
+throughput regressed by more than --threshold.
+
+Use a dev database. Job rows are deleted afterwards; the stored replay_*
+profiles and posts are kept (the next run uses new usernames).
+
+  run         Run the benchmark
+  anonymize   Add a raw Apify profile payload to a corpus under a new name
+
+Usage:
+    python scripts/replay_creator_search.py run --jobs 20 --concurrency 4
+    python scripts/replay_creator_search.py run --jobs 50 --run-seconds 20 --json-out replay.json
+    python scripts/replay_creator_search.py run --baseline replay.json --threshold 0.15
+    python scripts/replay_creator_search.py anonymize raw_dataset.json --name creator_delta
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_CORPUS = Path(__file__).parent / 'replay_corpus'
+
+# Matches profile_refresh_scheduler.SYSTEM_USER_ID (no user to unlock for)
+DEFAULT_USER_ID = '00000000-0000-0000-0000-000000000000'
+
+JOB_TYPE = 'creator_search'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def configure_replay(args):
+    """Settings are read at import time - set them before anything from app/ is imported."""
+    os.environ['SCRAPE_REPLAY_DIR'] = str(Path(args.corpus).resolve())
+    os.environ['SCRAPE_CACHE_BACKEND'] = 'off'
+    if args.run_seconds is not None:
+        os.environ['SCRAPE_REPLAY_RUN_SECONDS'] = str(args.run_seconds)
+    if not args.with_budget:
+        os.environ['APIFY_GLOBAL_BUDGET_PER_HOUR'] = '0'
+        os.environ['APIFY_TENANT_BUDGET_PER_HOUR'] = '0'
+    os.environ.setdefault('APIFY_API_TOKEN', 'replay')
+
+
+async def initialize_services():
+    from app.database.connection import init_database
+    from app.database.optimized_pools import optimized_pools
+    from app.core.job_queue import job_queue
+    from app.services.startup_initialization import startup_service
+
+    await init_database()
+    await optimized_pools.initialize()
+    await job_queue.initialize()
+    try:
+        await startup_service.initialize_all_services()
+    except Exception as e:
+        # AI models may be unavailable locally; the pipeline degrades the same way in production
+        print(f"warning: service initialization incomplete: {e}")
+
+
+async def insert_jobs(user_id: str, usernames: List[str]) -> List[str]:
+    """creator_search rows already 'processing', so a live worker never claims them"""
+    from sqlalchemy import text
+    from app.database.optimized_pools import optimized_pools
+
+    job_ids = [str(uuid.uuid4()) for _ in usernames]
+    async with optimized_pools.get_background_session() as db:
+        for job_id, username in zip(job_ids, usernames):
+            await db.execute(
+                text("""
+                    INSERT INTO job_queue (
+                        id, user_id, job_type, status, priority, queue_name,
+                        params, created_at, started_at, user_tier
+                    ) VALUES (
+                        CAST(:id AS uuid), CAST(:user_id AS uuid), :job_type, 'processing', 100, 'api_queue',
+                        CAST(:params AS jsonb), NOW(), NOW(), 'enterprise'
+                    )
+                """).execution_options(prepare=False),
+                {
+                    'id': job_id,
+                    'user_id': user_id,
+                    'job_type': JOB_TYPE,
+                    'params': json.dumps({'username': username, 'replay': True}),
+                }
+            )
+        await db.commit()
+    return job_ids
+
+
+async def delete_jobs(job_ids: List[str]):
+    from sqlalchemy import text
+    from app.database.optimized_pools import optimized_pools
+
+    async with optimized_pools.get_background_session() as db:
+        await db.execute(
+            text("DELETE FROM job_queue WHERE id = ANY(CAST(:ids AS uuid[]))").execution_options(prepare=False),
+            {'ids': job_ids}
+        )
+        await db.commit()
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    from app.scrapers.scrape_replay import replay_corpus
+    from app.services.apify_budget_governor import apify_usage_context
+    from app.workers.unified_worker import _process_creator_search_async
+
+    corpus = replay_corpus()
+    await initialize_services()
+
+    run_tag = uuid.uuid4().hex[:6]
+    usernames = [f"replay_{run_tag}_{n}" for n in range(args.jobs)]
+    job_ids = await insert_jobs(args.user_id, usernames)
+    latencies: List[float] = []
+    failures: List[Dict[str, str]] = []
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def run_job(job_id: str, username: str):
+        async with slots:
+            started = time.monotonic()
+            try:
+                with apify_usage_context(args.user_id, JOB_TYPE):
+                    await _process_creator_search_async(job_id)
+                latencies.append(time.monotonic() - started)
+            except Exception as e:
+                failures.append({'username': username, 'error': str(e)[:200]})
+
+    print(f"Replaying {args.jobs} creator searches ({args.concurrency} concurrent) from {corpus.root}")
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(run_job(job_id, username) for job_id, username in zip(job_ids, usernames)))
+    finally:
+        wall = time.monotonic() - started
+        await delete_jobs(job_ids)
+
+    return {
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'jobs': args.jobs,
+        'concurrency': args.concurrency,
+        'run_seconds': float(os.environ.get('SCRAPE_REPLAY_RUN_SECONDS') or corpus.manifest.get('run_seconds', 0)),
+        'completed': len(latencies),
+        'failed': len(failures),
+        'wall_seconds': round(wall, 2),
+        'throughput_per_min': round(len(latencies) / wall * 60, 2) if wall > 0 else 0.0,
+        'latency_p50': round(percentile(latencies, 50), 2),
+        'latency_p95': round(percentile(latencies, 95), 2),
+        'latency_max': round(max(latencies, default=0.0), 2),
+        'corpus': dict(corpus.stats),
+        'failures': failures[:10],
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n=== Creator search replay ({report['recorded_at']}) ===")
+    print(f"  jobs {report['jobs']}  concurrency {report['concurrency']}  apify run {report['run_seconds']}s")
+    print(f"  completed {report['completed']}  failed {report['failed']}  wall {report['wall_seconds']:.1f}s")
+    print(f"  throughput {report['throughput_per_min']:.1f} searches/min")
+    print(f"  latency p50 {report['latency_p50']:.2f}s  p95 {report['latency_p95']:.2f}s  max {report['latency_max']:.2f}s")
+    print(f"  corpus {report['corpus']}")
+    for failure in report['failures']:
+        print(f"  FAILED @{failure['username']}: {failure['error']}")
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """True when p95 latency and throughput are within threshold of the baseline"""
+    ok = True
+    p95, base_p95 = report['latency_p95'], baseline.get('latency_p95', 0)
+    if base_p95 and p95 > base_p95 * (1 + threshold):
+        print(f"  REGRESSION: p95 latency {p95:.2f}s vs baseline {base_p95:.2f}s (+{p95 / base_p95 - 1:.0%})")
+        ok = False
+    rate, base_rate = report['throughput_per_min'], baseline.get('throughput_per_min', 0)
+    if base_rate and rate < base_rate * (1 - threshold):
+        print(f"  REGRESSION: throughput {rate:.1f}/min vs baseline {base_rate:.1f}/min ({rate / base_rate - 1:.0%})")
+        ok = False
+    if report['failed'] > baseline.get('failed', 0):
+        print(f"  REGRESSION: {report['failed']} failed jobs vs {baseline.get('failed', 0)} in baseline")
+        ok = False
+    if ok:
+        print(f"  Within {threshold:.0%} of baseline ({baseline.get('recorded_at', 'unknown')})")
+    return ok
+
+
+def anonymize(args) -> int:
+    from app.scrapers.scrape_replay import rename_profile_item
+
+    corpus = Path(args.corpus)
+    items = json.loads(Path(args.raw).read_text())
+    items = items if isinstance(items, list) else [items]
+    profile = next((item for item in items if item.get('username') and not item.get('error')), None)
+    if profile is None:
+        print(f"No profile item in {args.raw}")
+        return 1
+
+    image_names = sorted(path.name for path in (corpus / 'images').glob('*') if path.is_file())
+    anonymized = rename_profile_item(profile, args.name, image_names)
+    anonymized['fullName'] = args.name.replace('_', ' ').title()
+    out = corpus / 'apify' / f"{args.name}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps([anonymized], indent=2, ensure_ascii=False) + "\n")
+    print(f"Wrote {out} ({len(anonymized.get('latestPosts') or [])} posts) - review captions and bio before committing")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=str(DEFAULT_CORPUS), help='Replay corpus directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run creator searches against the corpus')
+    run.add_argument('--jobs', type=int, default=20, help='Creator searches to run')
+    run.add_argument('--concurrency', type=int, default=4, help='Searches in flight at once')
+    run.add_argument('--run-seconds', type=float, help='Simulated Apify run duration (default: corpus manifest)')
+    run.add_argument('--user-id', default=DEFAULT_USER_ID, help='job_queue.user_id of the searches')
+    run.add_argument('--with-budget', action='store_true', help='Keep the Apify budget governor limits from .env')
+    run.add_argument('--json-out', help='Write the report to this file')
+    run.add_argument('--baseline', help='Report to compare with; exit 1 on regression')
+    run.add_argument('--threshold', type=float, default=0.2, help='Allowed regression vs baseline (default 0.2)')
+
+    anon = commands.add_parser('anonymize', help='Add a raw Apify profile payload to the corpus')
+    anon.add_argument('raw', help='Apify dataset JSON with one profile "details" item')
+    anon.add_argument('--name', required=True, help='Corpus username (file name) for the profile')
+
+    args = parser.parse_args()
+
+    if args.command == 'anonymize':
+        sys.exit(anonymize(args))
+
+    configure_replay(args)
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if not compare_with_baseline(report, baseline, args.threshold):
+            sys.exit(1)
+    if report['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Shared fixtures for the test suite
+
+    pip install -r requirements.txt pytest
+    python -m pytest -q
+
+Settings are read when app.core.config is imported, so the environment
+below is set before any test module imports the app: no budget limits, no
+raw scrape cache and no replay corpus unless a test turns them on. Tests
+that need a real Postgres (claim ordering, archiving, single-flight) run
+against TEST_DATABASE_URL and are skipped without it - each test gets a
+scratch schema (scratch_schema) that is dropped afterwards.
+
+fake_apify starts scripts/fake_apify_server.py in-process on a free port
+(runs take FAKE_RUN_SECONDS, recorded payloads from scripts/fixtures/apify).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+os.environ['APIFY_API_TOKEN'] = 'test'
+os.environ['APIFY_GLOBAL_BUDGET_PER_HOUR'] = '0'
+os.environ['APIFY_TENANT_BUDGET_PER_HOUR'] = '0'
+os.environ['SCRAPE_CACHE_BACKEND'] = 'off'
+os.environ['SCRAPE_REPLAY_DIR'] = ''
+
+FIXTURES_DIR = ROOT / 'scripts' / 'fixtures' / 'apify'
+REPLAY_CORPUS = ROOT / 'scripts' / 'replay_corpus'
+
+FAKE_RUN_SECONDS = 0.3
+FAKE_NOT_FOUND = ['fake_missing_one']
+FAKE_PRIVATE = ['fake_private_one']
+
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL', '')
+
+requires_postgres = pytest.mark.skipif(not TEST_DATABASE_URL, reason='TEST_DATABASE_URL not set')
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop (no pytest-asyncio needed)"""
+    return asyncio.run(coro)
+
+
+def start_fake_apify(**overrides):
+    """(server, base_url) of a fake Apify API on a free port"""
+    from fake_apify_server import serve
+
+    args = argparse.Namespace(
+        host='127.0.0.1', port=0, run_seconds=FAKE_RUN_SECONDS, fixtures=str(FIXTURES_DIR),
+        not_found=FAKE_NOT_FOUND, private=FAKE_PRIVATE, rate_limit_every=0, fail_every=0, quiet=True,
+    )
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    server = serve(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v2"
+
+
+@asynccontextmanager
+async def scratch_schema(*ddl):
+    """
+    (conn, schema): an asyncpg connection whose search_path is a fresh schema
+    holding the tables in ddl. The schema is dropped on exit.
+    """
+    import asyncpg
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    conn = await asyncpg.connect(TEST_DATABASE_URL)
+    try:
+        await conn.execute(f"CREATE SCHEMA {schema}")
+        await conn.execute(f"SET search_path TO {schema}")
+        for statement in ddl:
+            await conn.execute(statement)
+        yield conn, schema
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await conn.close()
+
+
+async def schema_pool(schema):
+    """asyncpg pool (as WorkerDatabase.pool) that only sees schema"""
+    import asyncpg
+
+    return await asyncpg.create_pool(
+        TEST_DATABASE_URL, min_size=1, max_size=2, statement_cache_size=0,
+        server_settings={'search_path': schema},
+    )
+
+
+@pytest.fixture
+def fake_apify(monkeypatch):
+    """Base URL of a fake Apify API; ApifyInstagramClient(token) without base_url talks to it too"""
+    pytest.importorskip('httpx')
+    pytest.importorskip('pydantic_settings')
+    from app.core.config import settings
+
+    server, base_url = start_fake_apify()
+    monkeypatch.setattr(settings, 'APIFY_BASE_URL', base_url)
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def apify_runs(monkeypatch):
+    """
+    (tenant_id, job_type, URL count) of every actor run started, in order.
+    Also keeps the budget governor from writing usage rows.
+    """
+    pytest.importorskip('sqlalchemy')
+    from app.services.apify_budget_governor import apify_budget_governor, current_apify_caller
+
+    started = []
+
+    async def record_run_started(run_id, actor_id, cost, waited_seconds):
+        started.append((*current_apify_caller(), cost))
+
+    async def record_run_finished(run):
+        return None
+
+    monkeypatch.setattr(apify_budget_governor, 'record_run_started', record_run_started)
+    monkeypatch.setattr(apify_budget_governor, 'record_run_finished', record_run_finished)
+    return started
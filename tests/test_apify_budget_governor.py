@@ -0,0 +1,143 @@
+"""TokenBucket and the ApifyBudgetGovernor's per-process fallback"""
+import pytest
+
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('pydantic_settings')
+
+from conftest import run
+
+from app.services.apify_budget_governor import (
+    ApifyBudgetExhausted,
+    ApifyBudgetGovernor,
+    TokenBucket,
+    apify_usage_context,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def bucket(clock, per_hour=3600, burst_minutes=1, tokens=None):
+    """3600/h with a 1 minute burst: 1 token per second, 60 tokens capacity"""
+    return TokenBucket(per_hour, burst_minutes, tokens=tokens, clock=clock)
+
+
+def test_bucket_starts_full_and_refills_at_rate(clock):
+    b = bucket(clock)
+    assert b.capacity == 60
+    assert b.wait_seconds(10) == 0
+
+    b.take(10)
+    assert b.wait_seconds(55) == pytest.approx(5)
+    clock.advance(5)
+    assert b.wait_seconds(55) == 0
+
+    clock.advance(1000)
+    assert b.snapshot()['tokens'] == 60
+
+
+def test_floor_is_left_in_the_bucket(clock):
+    b = bucket(clock, tokens=50)
+    assert b.wait_seconds(30, floor=20) == 0
+    assert b.wait_seconds(40, floor=20) == pytest.approx(10)
+
+
+def test_run_bigger_than_the_bucket_waits_for_a_full_bucket(clock):
+    b = bucket(clock, tokens=30)
+    assert b.wait_seconds(500) == pytest.approx(30)
+    clock.advance(30)
+    assert b.wait_seconds(500) == 0
+    b.take(500)
+    assert b.tokens == pytest.approx(0)
+
+
+def test_unlimited_bucket_never_waits(clock):
+    b = bucket(clock, per_hour=0)
+    assert b.unlimited
+    assert b.wait_seconds(10 ** 6) == 0
+    b.take(10 ** 6)
+    assert b.snapshot() == {'per_hour': 0, 'unlimited': True}
+
+
+def test_restore_refills_for_the_idle_time():
+    assert TokenBucket.restore(3600, 1, tokens=10, idle_seconds=30).tokens == pytest.approx(40)
+    assert TokenBucket.restore(3600, 1, tokens=10, idle_seconds=10 ** 6).tokens == pytest.approx(60)
+    assert TokenBucket.restore(3600, 1, tokens=10, idle_seconds=-5).tokens == pytest.approx(10)
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    """Governor with a 3600/h global and 360/h tenant budget whose shared buckets are unreachable"""
+    gov = ApifyBudgetGovernor()
+    gov.global_per_hour = 3600
+    gov.tenant_per_hour = 360
+    gov.burst_minutes = 1
+    gov.interactive_reserve = 0.25
+    gov.max_wait_seconds = 1
+    gov._global = TokenBucket(gov.global_per_hour, gov.burst_minutes)
+    gov._tenants = {}
+    gov.shared_calls = 0
+
+    async def unreachable(limits, job_type, cost):
+        gov.shared_calls += 1
+        raise ConnectionError('database down')
+
+    monkeypatch.setattr(gov, '_try_take_shared', unreachable)
+    return gov
+
+
+def test_falls_back_to_local_buckets_when_shared_ones_fail(governor):
+    async def scenario():
+        with apify_usage_context('tenant-a', 'creator_search'):
+            await governor.acquire(5)
+            # Tenant bucket holds 6 tokens: the next run of 5 has to wait
+            return await governor._try_take('tenant-a', 'creator_search', 5)
+
+    assert run(scenario()) > 0
+    # Only the first take tried the database; the rest stayed local for SHARED_RETRY_SECONDS
+    assert governor.shared_calls == 1
+    assert governor.stats['shared_errors'] == 1
+    assert governor.stats['local_grants'] == 1
+
+
+def test_background_jobs_leave_the_interactive_reserve(governor):
+    governor.tenant_per_hour = 0  # global bucket only
+
+    async def take(job_type, cost):
+        return await governor._try_take('tenant-a', job_type, cost)
+
+    # 60 tokens, 15 of them reserved for interactive job types
+    assert run(take('creator_search', 30)) == 0
+    assert run(take('bulk_analysis', 20)) == pytest.approx(5, abs=0.1)
+    assert run(take('creator_search', 20)) == 0
+
+
+def test_acquire_gives_up_after_max_wait(governor):
+    async def scenario():
+        with apify_usage_context('tenant-a', 'creator_search'):
+            await governor.acquire(6)
+            await governor.acquire(6)
+
+    with pytest.raises(ApifyBudgetExhausted):
+        run(scenario())
+    assert governor.stats['exhausted'] == 1
+
+
+def test_unlimited_budgets_skip_the_database(governor):
+    governor.global_per_hour = 0
+    governor.tenant_per_hour = 0
+    assert run(governor._try_take('tenant-a', 'bulk_analysis', 10 ** 6)) == 0
+    assert governor.shared_calls == 0
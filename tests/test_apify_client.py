@@ -0,0 +1,105 @@
+"""ApifyInstagramClient against the fake Apify API (scripts/fake_apify_server.py)"""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip('httpx')
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('pydantic_settings')
+
+from conftest import run, start_fake_apify
+
+from app.scrapers.apify_instagram_client import (
+    ApifyInstagramClient,
+    ApifyProfileNotFoundError,
+)
+
+
+def profile_data(result):
+    return result['results'][0]['content']['data']
+
+
+def test_profile_scrape_keeps_event_loop_responsive(apify_runs):
+    # Runs long enough that two scrapes done one after the other would show
+    run_seconds = 1.0
+    server, base_url = start_fake_apify(run_seconds=run_seconds)
+
+    async def scrape():
+        max_lag = 0.0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal max_lag
+            while not done.is_set():
+                started = time.monotonic()
+                await asyncio.sleep(0.02)
+                max_lag = max(max_lag, time.monotonic() - started - 0.02)
+
+        tick = asyncio.create_task(ticker())
+        async with ApifyInstagramClient('test', base_url=base_url) as client:
+            results = await asyncio.gather(
+                client.get_instagram_profile_comprehensive('fake_creator_one'),
+                client.get_instagram_profile_comprehensive('fake_creator_two'),
+            )
+        done.set()
+        await tick
+        return results, max_lag
+
+    started = time.monotonic()
+    try:
+        (one, two), max_lag = run(scrape())
+    finally:
+        server.shutdown()
+        server.server_close()
+    elapsed = time.monotonic() - started
+
+    assert profile_data(one)['username'] == 'fake_creator_one'
+    assert profile_data(two)['username'] == 'fake_creator_two'
+    assert len(profile_data(one)['posts']) == 12
+    assert len(profile_data(one)['related_profiles']) == 10
+    # Both runs were in flight together and the loop kept ticking while they ran
+    assert elapsed < 1.8 * run_seconds
+    assert max_lag < 0.25
+    assert [cost for _, _, cost in apify_runs] == [1, 1]
+
+
+def test_missing_profile_raises_not_found(fake_apify, apify_runs):
+    async def scrape():
+        async with ApifyInstagramClient('test', base_url=fake_apify) as client:
+            await client.get_instagram_profile_comprehensive('fake_missing_one')
+
+    with pytest.raises(ApifyProfileNotFoundError):
+        run(scrape())
+    assert len(apify_runs) == 1
+
+
+def test_rate_limited_requests_are_retried(apify_runs):
+    # Every 3rd request is a 429 with Retry-After: 1
+    server, base_url = start_fake_apify(rate_limit_every=3, run_seconds=0.1)
+    try:
+        async def scrape():
+            async with ApifyInstagramClient('test', base_url=base_url) as client:
+                return await client.get_instagram_profile_comprehensive('fake_creator_retry')
+
+        assert profile_data(run(scrape()))['username'] == 'fake_creator_retry'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_profiles_batch_is_one_run_with_per_username_errors(fake_apify, apify_runs):
+    usernames = ['fake_batch_0', 'fake_batch_1', 'fake_private_one', 'fake_missing_one']
+
+    async def scrape():
+        async with ApifyInstagramClient('test', base_url=fake_apify) as client:
+            return await client.get_instagram_profiles_batch(usernames)
+
+    results = run(scrape())
+
+    assert set(results) == set(usernames)
+    assert profile_data(results['fake_batch_0'])['username'] == 'fake_batch_0'
+    assert profile_data(results['fake_batch_1'])['username'] == 'fake_batch_1'
+    assert profile_data(results['fake_private_one'])['posts'] == []
+    assert isinstance(results['fake_missing_one'], ApifyProfileNotFoundError)
+    assert [cost for _, _, cost in apify_runs] == [len(usernames)]
@@ -0,0 +1,59 @@
+"""Batched post scraping against the recorded payloads in scripts/fixtures/apify"""
+import json
+
+import pytest
+
+pytest.importorskip('httpx')
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('pydantic_settings')
+
+from conftest import FIXTURES_DIR, run
+
+from app.scrapers import apify_instagram_client
+from app.scrapers.apify_instagram_client import (
+    ApifyAPIError,
+    ApifyInstagramClient,
+    ApifyProfileNotFoundError,
+)
+
+FOUND = ['C9qW2eRt5Yu', 'DAbC1xYz9Kq']
+MISSING = 'CxGoneAbC12'
+
+
+def recorded(shortcode):
+    return json.loads((FIXTURES_DIR / f"p_{shortcode}.json").read_text())[0]
+
+
+def scrape(base_url, urls):
+    async def scenario():
+        async with ApifyInstagramClient('test', base_url=base_url) as client:
+            return await client.get_posts_batch(urls, max_age_minutes=0)
+    return run(scenario())
+
+
+def test_posts_map_back_to_their_shortcodes(fake_apify, apify_runs):
+    generated = [f"Cfake{i:06d}" for i in range(4)]
+    urls = [f"https://www.instagram.com/p/{code}/" for code in FOUND + [MISSING] + generated]
+    # Share links of a recorded post collapse into its entry
+    urls += [f"https://www.instagram.com/reel/{FOUND[0]}/?igsh=fixture", 'https://example.com/not-a-post']
+
+    results = scrape(fake_apify, urls)
+
+    assert set(results) == set(FOUND + [MISSING] + generated + ['https://example.com/not-a-post'])
+    for code in FOUND:
+        assert results[code] == recorded(code)
+    for code in generated:
+        assert results[code]['shortCode'] == code
+    assert isinstance(results[MISSING], ApifyProfileNotFoundError)
+    assert isinstance(results['https://example.com/not-a-post'], ApifyAPIError)
+    assert [cost for _, _, cost in apify_runs] == [len(FOUND) + 1 + len(generated)]
+
+
+def test_large_batches_are_split_into_runs(fake_apify, apify_runs, monkeypatch):
+    monkeypatch.setattr(apify_instagram_client, 'BATCH_MAX_POSTS', 3)
+    codes = [f"Csplit{i:05d}" for i in range(7)]
+
+    results = scrape(fake_apify, [f"https://www.instagram.com/p/{code}/" for code in codes])
+
+    assert sorted(results) == codes
+    assert sorted(cost for _, _, cost in apify_runs) == [1, 3, 3]
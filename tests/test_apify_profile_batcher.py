@@ -0,0 +1,122 @@
+"""ApifyProfileBatcher against the fake Apify API"""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip('httpx')
+pytest.importorskip('sqlalchemy')
+pytest.importorskip('pydantic_settings')
+
+from conftest import run
+
+from app.scrapers.apify_instagram_client import ApifyProfileNotFoundError
+from app.services.apify_budget_governor import apify_usage_context
+from app.services.apify_profile_batcher import ApifyProfileBatcher
+
+
+def username_of(result):
+    return result['results'][0]['content']['data']['username']
+
+
+async def fetch_as(batcher, username, tenant_id='tenant-a', job_type='bulk_analysis'):
+    with apify_usage_context(tenant_id, job_type):
+        return await batcher.fetch_profile(username)
+
+
+def test_concurrent_fetches_share_one_run(fake_apify, apify_runs):
+    batcher = ApifyProfileBatcher(window_seconds=0.05)
+
+    async def fetch():
+        return await asyncio.gather(
+            fetch_as(batcher, 'fake_batch_a'),
+            fetch_as(batcher, '@Fake_Batch_B'),
+            fetch_as(batcher, 'fake_batch_c'),
+            fetch_as(batcher, 'fake_batch_a'),
+        )
+
+    a, b, c, a_again = run(fetch())
+
+    assert [username_of(r) for r in (a, b, c, a_again)] == ['fake_batch_a', 'fake_batch_b', 'fake_batch_c', 'fake_batch_a']
+    # Coalesced callers get equal but independent copies
+    assert a == a_again and a is not a_again
+    assert [cost for _, _, cost in apify_runs] == [3]
+    assert batcher.stats['batch_runs'] == 1
+    assert batcher.stats['coalesced'] == 1
+    assert batcher.stats['single_runs'] == 0
+
+
+def test_missing_profile_only_fails_its_own_caller(fake_apify, apify_runs):
+    batcher = ApifyProfileBatcher(window_seconds=0.05)
+
+    async def fetch():
+        return await asyncio.gather(
+            fetch_as(batcher, 'fake_batch_ok'),
+            fetch_as(batcher, 'fake_missing_one'),
+            return_exceptions=True,
+        )
+
+    ok, missing = run(fetch())
+
+    assert username_of(ok) == 'fake_batch_ok'
+    assert isinstance(missing, ApifyProfileNotFoundError)
+    assert len(apify_runs) == 1
+
+
+def test_batches_are_charged_to_their_own_caller(fake_apify, apify_runs):
+    batcher = ApifyProfileBatcher(window_seconds=0.05)
+
+    async def fetch():
+        return await asyncio.gather(
+            fetch_as(batcher, 'fake_tenant_a1', 'tenant-a'),
+            fetch_as(batcher, 'fake_tenant_b1', 'tenant-b'),
+            fetch_as(batcher, 'fake_tenant_a2', 'tenant-a'),
+        )
+
+    results = run(fetch())
+
+    assert [username_of(r) for r in results] == ['fake_tenant_a1', 'fake_tenant_b1', 'fake_tenant_a2']
+    assert sorted(apify_runs) == [('tenant-a', 'bulk_analysis', 2), ('tenant-b', 'bulk_analysis', 1)]
+
+
+def test_interactive_fetch_skips_the_window(fake_apify, apify_runs):
+    # A window far longer than a fake run: waiting for it would show
+    batcher = ApifyProfileBatcher(window_seconds=5)
+
+    async def fetch():
+        started = time.monotonic()
+        result = await fetch_as(batcher, 'fake_interactive', job_type='creator_search')
+        return result, time.monotonic() - started
+
+    result, elapsed = run(fetch())
+
+    assert username_of(result) == 'fake_interactive'
+    assert elapsed < 2
+    assert apify_runs == [('tenant-a', 'creator_search', 1)]
+    assert batcher.stats['interactive'] == 1
+    assert batcher.stats['batch_runs'] == 0
+
+
+def test_interactive_fetch_starts_the_batch_it_joins(fake_apify, apify_runs):
+    batcher = ApifyProfileBatcher(window_seconds=5)
+
+    async def fetch():
+        bulk = asyncio.ensure_future(asyncio.gather(
+            fetch_as(batcher, 'fake_shared'),
+            fetch_as(batcher, 'fake_bulk_only'),
+        ))
+        while batcher.get_stats()['queued_profiles'] < 2:
+            await asyncio.sleep(0.01)
+        started = time.monotonic()
+        result = await fetch_as(batcher, 'fake_shared', job_type='creator_search')
+        elapsed = time.monotonic() - started
+        return result, await bulk, elapsed
+
+    result, (shared, bulk_only), elapsed = run(fetch())
+
+    assert username_of(result) == username_of(shared) == 'fake_shared'
+    assert username_of(bulk_only) == 'fake_bulk_only'
+    assert elapsed < 2
+    # The bulk batch ran early, still charged to its own caller
+    assert apify_runs == [('tenant-a', 'bulk_analysis', 2)]
+    assert batcher.stats['coalesced'] == 1
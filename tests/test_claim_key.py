@@ -0,0 +1,116 @@
+"""
+Aged claim order without a database: the Python claim key, its SQL twins
+(AGED_CLAIM_KEY, the claim index) and the order claim_jobs returns jobs in
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+for module in ('asyncpg', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import ROOT, run
+
+from app.core.job_queue import JobPriority
+from app.workers.worker_database import (
+    AGED_CLAIM_KEY,
+    PRIORITY_AGING_SECONDS_PER_POINT,
+    WorkerDatabase,
+    aged_claim_key,
+)
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def queued(minutes_ago, priority):
+    return NOW - timedelta(minutes=minutes_ago), priority
+
+
+def claim_order(*jobs):
+    return sorted(range(len(jobs)), key=lambda n: aged_claim_key(*jobs[n]))
+
+
+def test_priority_wins_over_a_short_wait():
+    bulk = queued(30, JobPriority.BULK.value)
+    critical = queued(0, JobPriority.CRITICAL.value)
+    assert claim_order(bulk, critical) == [1, 0]
+
+
+def test_a_job_climbs_one_level_in_25_minutes():
+    minutes_per_level = 25 * PRIORITY_AGING_SECONDS_PER_POINT / 60
+    assert minutes_per_level == 25
+    fresh_normal = queued(0, JobPriority.NORMAL.value)
+    assert claim_order(fresh_normal, queued(minutes_per_level - 1, JobPriority.LOW.value)) == [0, 1]
+    assert claim_order(fresh_normal, queued(minutes_per_level + 1, JobPriority.LOW.value)) == [1, 0]
+
+
+def test_bulk_overtakes_critical_only_after_90_minutes():
+    critical = queued(0, JobPriority.CRITICAL.value)
+    assert claim_order(critical, queued(89, JobPriority.BULK.value)) == [0, 1]
+    assert claim_order(critical, queued(91, JobPriority.BULK.value)) == [1, 0]
+
+
+def test_equal_priorities_are_first_in_first_out():
+    assert claim_order(queued(1, 50), queued(5, 50), queued(3, 50)) == [1, 2, 0]
+    # A NULL priority ranks like 0
+    assert aged_claim_key(NOW, None) == aged_claim_key(NOW, 0) == NOW
+
+
+def test_claim_index_matches_the_claim_key():
+    # The planner only uses the index if its expression is AGED_CLAIM_KEY verbatim
+    migration = (ROOT / 'database' / 'migrations' / '024_job_priority_aging_rate.sql').read_text()
+    schema = (ROOT / 'app' / 'core' / 'job_queue.py').read_text()
+    assert f"(({AGED_CLAIM_KEY}))" in migration
+    assert f"(({AGED_CLAIM_KEY}))" in schema
+    assert f"idx_job_queue_aged_claim_{PRIORITY_AGING_SECONDS_PER_POINT}s" in migration
+
+
+class FakePool:
+    """Answers the claim UPDATE with `rows` in the given (arbitrary) order"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        return self.rows
+
+
+def claimed_row(created_at, priority):
+    return {
+        'id': uuid.uuid4(), 'user_id': uuid.uuid4(), 'job_type': 'creator_search',
+        'params': '{"username": "creator"}', 'status': 'processing',
+        'priority': priority, 'retry_count': None, 'created_at': created_at,
+    }
+
+
+@pytest.mark.parametrize('tenant_limits', [None, {'free': 3}])
+def test_claimed_jobs_come_back_in_claim_order(tenant_limits):
+    rows = [
+        claimed_row(*queued(10, JobPriority.LOW.value)),
+        claimed_row(*queued(0, JobPriority.CRITICAL.value)),
+        claimed_row(*queued(120, JobPriority.BULK.value)),
+        claimed_row(*queued(5, JobPriority.NORMAL.value)),
+    ]
+    db = WorkerDatabase()
+    db.pool = FakePool(rows)
+
+    jobs = run(db.claim_jobs(4, tenant_limits=tenant_limits))
+
+    # UPDATE ... RETURNING order is arbitrary; claim_jobs restores the aged order
+    assert [job['id'] for job in jobs] == [str(rows[n]['id']) for n in (2, 1, 3, 0)]
+    assert jobs[0]['params'] == {'username': 'creator'}
+    assert jobs[0]['retry_count'] == 0
+    (query,) = db.pool.queries
+    assert f"ORDER BY {AGED_CLAIM_KEY} ASC" in query
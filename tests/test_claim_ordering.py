@@ -0,0 +1,180 @@
+"""
+WorkerDatabase.claim_jobs ordering against a real Postgres
+
+Runs only with TEST_DATABASE_URL set (any scratch database - each test
+creates and drops its own schema with a minimal job_queue table).
+"""
+import uuid
+
+import pytest
+
+for module in ('asyncpg', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import requires_postgres, run, schema_pool, scratch_schema
+
+from app.workers.worker_database import WorkerDatabase
+
+pytestmark = requires_postgres
+
+# The job_queue columns the claim reads and writes
+JOB_QUEUE_TABLE = """
+    CREATE TABLE job_queue (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL,
+        job_type VARCHAR(50) NOT NULL DEFAULT 'creator_search',
+        params JSONB NOT NULL DEFAULT '{}',
+        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+        priority INTEGER NOT NULL DEFAULT 50,
+        retry_count INTEGER NOT NULL DEFAULT 0,
+        user_tier VARCHAR(20) NOT NULL DEFAULT 'free',
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        started_at TIMESTAMPTZ,
+        run_after TIMESTAMPTZ,
+        worker_id TEXT,
+        lease_expires_at TIMESTAMPTZ
+    )
+"""
+
+TIER_CAPS = {'free': 3, 'premium': 10}
+
+CRITICAL, NORMAL, LOW = 100, 50, 25
+
+
+class Queue:
+    """A scratch job_queue and a WorkerDatabase whose pool sees only it"""
+
+    def __init__(self, conn, db):
+        self.conn = conn
+        self.db = db
+
+    async def add(self, user_id, count=1, priority=NORMAL, tier='free', age_seconds=0.0, status='queued'):
+        ids = []
+        for n in range(count):
+            job_id = str(uuid.uuid4())
+            # Earlier jobs of one call are older, so they keep their order
+            await self.conn.execute(
+                """
+                INSERT INTO job_queue (id, user_id, status, priority, user_tier, created_at)
+                VALUES ($1::uuid, $2::uuid, $3, $4, $5, NOW() - make_interval(secs => $6::float8))
+                """,
+                job_id, user_id, status, priority, tier, float(age_seconds + count - n),
+            )
+            ids.append(job_id)
+        return ids
+
+    async def claim(self, limit, tenant_limits=None):
+        return await self.db.claim_jobs(limit, tenant_limits=tenant_limits)
+
+
+def with_queue(scenario):
+    async def main():
+        async with scratch_schema(JOB_QUEUE_TABLE) as (conn, schema):
+            db = WorkerDatabase()
+            db.pool = await schema_pool(schema)
+            try:
+                return await scenario(Queue(conn, db))
+            finally:
+                await db.pool.close()
+    return run(main())
+
+
+def users(count):
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+def claimed_by(jobs):
+    owners = {}
+    for job in jobs:
+        owners[job['user_id']] = owners.get(job['user_id'], 0) + 1
+    return owners
+
+
+def test_claim_follows_aged_priority():
+    (user,) = users(1)
+
+    async def scenario(queue):
+        (old_low,) = await queue.add(user, priority=LOW, age_seconds=3600)
+        (new_high,) = await queue.add(user, priority=75)
+        (recent_normal,) = await queue.add(user, priority=NORMAL, age_seconds=60)
+        jobs = await queue.claim(3)
+        return [job['id'] for job in jobs], [old_low, new_high, recent_normal]
+
+    claimed, expected = with_queue(scenario)
+    # A LOW job queued an hour has aged past a HIGH job queued just now
+    assert claimed == expected
+
+
+def test_fresh_critical_job_beats_a_backlog():
+    (user,) = users(1)
+
+    async def scenario(queue):
+        # 15 minutes of waiting is 15 points - far from the 75 between BULK and CRITICAL
+        await queue.add(user, count=5, priority=10, age_seconds=900)
+        (critical,) = await queue.add(user, priority=CRITICAL)
+        jobs = await queue.claim(1)
+        return [job['id'] for job in jobs], critical
+
+    claimed, critical = with_queue(scenario)
+    assert claimed == [critical]
+
+
+def test_fair_claim_interleaves_users():
+    a, b = users(2)
+
+    async def scenario(queue):
+        await queue.add(a, count=6, age_seconds=5)
+        await queue.add(b, count=2)
+        return await queue.claim(4, TIER_CAPS)
+
+    assert claimed_by(with_queue(scenario)) == {a: 2, b: 2}
+
+
+def test_higher_tiers_get_a_larger_share():
+    premium, free = users(2)
+
+    async def scenario(queue):
+        await queue.add(premium, count=8, tier='premium')
+        await queue.add(free, count=8, tier='free')
+        return await queue.claim(6, {'free': 2, 'premium': 10})
+
+    # Virtual time n / cap: premium 0.1 .. 0.6 against free 0.5, 1.0
+    assert claimed_by(with_queue(scenario)) == {premium: 5, free: 1}
+
+
+def test_users_at_their_cap_are_skipped():
+    busy, idle = users(2)
+
+    async def scenario(queue):
+        await queue.add(busy, count=3, status='processing')
+        await queue.add(busy, count=3, age_seconds=30)
+        await queue.add(idle, count=2)
+        return await queue.claim(4, TIER_CAPS)
+
+    assert claimed_by(with_queue(scenario)) == {idle: 2}
+
+
+def test_priority_band_beats_virtual_time():
+    bulk_user, urgent_user = users(2)
+
+    async def scenario(queue):
+        await queue.add(bulk_user, count=4)
+        (urgent,) = await queue.add(urgent_user, priority=CRITICAL)
+        await queue.add(urgent_user, count=2)
+        return await queue.claim(1, TIER_CAPS), urgent
+
+    jobs, urgent = with_queue(scenario)
+    assert [job['id'] for job in jobs] == [urgent]
+
+
+def test_aging_lifts_a_job_into_a_higher_band():
+    normal_user, low_user = users(2)
+
+    async def scenario(queue):
+        await queue.add(normal_user, count=3)
+        # 25 points plus one per minute: in the NORMAL band after 25 minutes
+        (aged_low,) = await queue.add(low_user, priority=LOW, age_seconds=1800)
+        return await queue.claim(2, TIER_CAPS), aged_low
+
+    jobs, aged_low = with_queue(scenario)
+    assert aged_low in [job['id'] for job in jobs]
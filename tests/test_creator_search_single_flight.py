@@ -0,0 +1,322 @@
+"""
+Creator search single-flight: the creator_search_flights transitions against
+a real Postgres (TEST_DATABASE_URL), and the worker's owner / follower paths
+in _process_creator_search_async with the flight and pipeline faked
+"""
+import json
+import sys
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+for module in ('asyncpg', 'celery', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import TEST_DATABASE_URL, requires_postgres, run, scratch_schema
+
+from app.core.job_queue import JobStatus
+from app.database.optimized_pools import optimized_pools
+from app.services.creator_search_single_flight import CreatorSearchSingleFlight
+from app.services.job_checkpoint_service import JobCheckpointService, job_checkpoint_service
+from app.workers import unified_worker
+
+FLIGHT_TABLES = (
+    """
+    CREATE TABLE job_queue (
+        id UUID PRIMARY KEY,
+        status VARCHAR(20) NOT NULL DEFAULT 'processing',
+        progress_message TEXT,
+        started_at TIMESTAMPTZ DEFAULT NOW(),
+        result JSONB,
+        result_ref TEXT
+    )
+    """,
+    # As migrations 013 and 023
+    """
+    CREATE TABLE creator_search_flights (
+        username VARCHAR(255) PRIMARY KEY,
+        owner_job_id UUID NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'running',
+        follower_job_ids UUID[] NOT NULL DEFAULT '{}',
+        profile_id UUID,
+        error TEXT,
+        started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        completed_at TIMESTAMPTZ,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+)
+
+USERNAME = 'shared_creator'
+
+
+# ----------------------------------------------------------------------
+# creator_search_flights against Postgres
+# ----------------------------------------------------------------------
+
+class Flights:
+    def __init__(self, conn):
+        self.conn = conn
+        self.flight = CreatorSearchSingleFlight()
+
+    async def job(self, status='processing'):
+        job_id = str(uuid.uuid4())
+        await self.conn.execute("INSERT INTO job_queue (id, status) VALUES ($1::uuid, $2)", job_id, status)
+        return job_id
+
+    async def set_status(self, job_id, status, result=None):
+        await self.conn.execute(
+            "UPDATE job_queue SET status = $2, result = COALESCE($3::jsonb, result) WHERE id = $1::uuid",
+            job_id, status, None if result is None else json.dumps(result),
+        )
+
+    async def join(self, job_id, username=USERNAME):
+        return await self.flight.join(username, job_id)
+
+
+def with_flights(scenario):
+    """Runs scenario(Flights) with optimized_pools sessions bound to a scratch schema"""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    async def main():
+        async with scratch_schema(*FLIGHT_TABLES) as (conn, schema):
+            engine = create_async_engine(
+                TEST_DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1),
+                connect_args={'server_settings': {'search_path': schema}, 'statement_cache_size': 0},
+            )
+
+            @asynccontextmanager
+            async def session():
+                async with AsyncSession(engine) as db:
+                    yield db
+
+            original = optimized_pools.get_background_session
+            optimized_pools.get_background_session = session
+            try:
+                return await scenario(Flights(conn))
+            finally:
+                optimized_pools.get_background_session = original
+                await engine.dispose()
+    return run(main())
+
+
+@requires_postgres
+def test_second_job_follows_and_is_handed_to_the_owner():
+    async def scenario(flights):
+        owner, follower = await flights.job(), await flights.job()
+        roles = [(await flights.join(owner))['role'], (await flights.join(follower))['role']]
+        # Same handle, any spelling
+        again = await flights.join(follower, '@Shared_Creator')
+        profile_id = str(uuid.uuid4())
+        followers = await flights.flight.complete(USERNAME, owner, profile_id)
+        return roles, again, followers, follower, owner
+
+    roles, again, followers, follower, owner = with_flights(scenario)
+    assert roles == ['owner', 'follower']
+    assert again == {'role': 'follower', 'owner_job_id': owner}
+    assert followers == [follower]
+
+
+@requires_postgres
+def test_late_joiner_reuses_the_owner_result():
+    async def scenario(flights):
+        owner = await flights.job()
+        await flights.join(owner)
+        profile_id = str(uuid.uuid4())
+        await flights.flight.complete(USERNAME, owner, profile_id)
+        before_result = await flights.join(await flights.job())
+        await flights.set_status(owner, 'completed', {'processing_results': {'ai': 'done'}})
+        after_result = await flights.join(await flights.job())
+        return profile_id, before_result, after_result
+
+    profile_id, before_result, after_result = with_flights(scenario)
+    assert before_result['role'] == after_result['role'] == 'completed'
+    assert before_result['profile_id'] == profile_id
+    # Not stored yet: the joiner falls back to building its own response
+    assert before_result['processing_results'] is None
+    assert after_result['processing_results'] == {'ai': 'done'}
+
+
+@requires_postgres
+def test_owner_failure_requeues_followers():
+    async def scenario(flights):
+        owner, follower = await flights.job(), await flights.job()
+        await flights.join(owner)
+        await flights.join(follower)
+        released = await flights.flight.fail(USERNAME, owner, 'Apify returned no data')
+        # The released follower runs again and now owns the pipeline
+        await flights.set_status(follower, 'processing')
+        return follower, released, (await flights.join(follower))['role']
+
+    follower, released, role = with_flights(scenario)
+    assert released == [follower]
+    assert role == 'owner'
+
+
+@requires_postgres
+def test_owner_dying_mid_flight_hands_its_followers_on():
+    async def scenario(flights):
+        owner, follower = await flights.job(), await flights.job()
+        await flights.join(owner)
+        await flights.join(follower)
+
+        # Worker killed: the reaper re-queued the owner's expired lease
+        await flights.set_status(owner, 'queued')
+        newcomer = await flights.job()
+        takeover = await flights.join(newcomer)
+        finalize = await flights.flight.complete(USERNAME, newcomer, str(uuid.uuid4()))
+        # The original owner finally runs again and joins a completed flight
+        await flights.set_status(owner, 'processing')
+        late = await flights.join(owner)
+        return follower, takeover, finalize, late
+
+    follower, takeover, finalize, late = with_flights(scenario)
+    assert takeover['role'] == 'owner'
+    assert finalize == [follower]
+    assert late['role'] == 'completed'
+
+
+@requires_postgres
+def test_owner_retried_after_its_lease_expired_keeps_ownership():
+    async def scenario(flights):
+        owner, follower = await flights.job(), await flights.job()
+        await flights.join(owner)
+        await flights.join(follower)
+        # Re-queued by the reaper and claimed again: same job, same flight
+        retry = await flights.join(owner)
+        return follower, retry, await flights.flight.complete(USERNAME, owner, str(uuid.uuid4()))
+
+    follower, retry, followers = with_flights(scenario)
+    assert retry['role'] == 'owner'
+    assert followers == [follower]
+
+
+# ----------------------------------------------------------------------
+# _process_creator_search_async with the flight and pipeline faked
+# ----------------------------------------------------------------------
+
+class FakeFlight(CreatorSearchSingleFlight):
+    def __init__(self, role, followers=(), **joined):
+        self.role = role
+        self.followers = list(followers)
+        self.joined = joined
+        self.calls = []
+
+    async def join(self, username, job_id):
+        self.calls.append(('join', job_id))
+        return {'role': self.role, 'owner_job_id': 'owner-job', **self.joined}
+
+    async def complete(self, username, job_id, profile_id):
+        self.calls.append(('complete', job_id, profile_id))
+        return self.followers
+
+    async def fail(self, username, job_id, error):
+        self.calls.append(('fail', job_id, error))
+        return self.followers
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """
+    Owner pipeline resuming after its store checkpoint (profile 'profile-1'),
+    with status writes, the CDN + AI pipeline and the per-user finalize step
+    recorded instead of run
+    """
+    pytest.importorskip('numpy')
+    state = SimpleNamespace(statuses=[], finalized=[], pipeline_error=None, fail_follower=False)
+    users = {'owner-job': 'owner-user', 'follower-a': 'user-a', 'follower-b': 'user-b'}
+
+    async def get_job_details(job_id):
+        return {'user_id': users[job_id], 'params': {'username': USERNAME}}
+
+    async def update_job_status(job_id, status, **kwargs):
+        state.statuses.append((job_id, status, kwargs))
+
+    async def load_checkpoints(job_id):
+        return {JobCheckpointService.STAGE_STORE: {'profile_id': 'profile-1', 'is_new': False}}
+
+    async def pipeline(profile_id, username, job_id):
+        if state.pipeline_error:
+            raise state.pipeline_error
+        return {'ai': {'completed': True}}
+
+    async def finalize(job_id, user_id, username, profile_id, pipeline_results=None,
+                       checkpoints=None, processing_results=None):
+        if job_id == 'follower-a' and state.fail_follower:
+            raise Exception('credit charge failed')
+        state.finalized.append((job_id, user_id, profile_id, pipeline_results, processing_results))
+        return {'job': job_id}
+
+    monkeypatch.setattr(unified_worker.job_processor, 'get_job_details', get_job_details)
+    monkeypatch.setattr(unified_worker.job_processor, 'update_job_status', update_job_status)
+    monkeypatch.setattr(job_checkpoint_service, 'load', load_checkpoints)
+    monkeypatch.setattr(unified_worker, '_finalize_creator_search_for_user', finalize)
+    monkeypatch.setitem(
+        sys.modules, 'app.services.unified_background_processor',
+        SimpleNamespace(unified_background_processor=SimpleNamespace(process_profile_complete_pipeline=pipeline)),
+    )
+    return state
+
+
+def use_flight(monkeypatch, flight):
+    from app.services import creator_search_single_flight as module
+    monkeypatch.setattr(module, 'creator_search_single_flight', flight)
+
+
+def test_follower_returns_without_running_the_pipeline(monkeypatch, worker):
+    flight = FakeFlight(CreatorSearchSingleFlight.ROLE_FOLLOWER)
+    use_flight(monkeypatch, flight)
+
+    result = run(unified_worker._process_creator_search_async('follower-a'))
+
+    assert result == {'coalesced': True, 'owner_job_id': 'owner-job'}
+    assert flight.calls == [('join', 'follower-a')]
+    assert worker.finalized == []
+    # Left 'processing' for the owner to finalize
+    assert [status for _, status, _ in worker.statuses] == [JobStatus.PROCESSING]
+
+
+def test_owner_finalizes_every_follower_with_its_pipeline_results(monkeypatch, worker):
+    flight = FakeFlight(CreatorSearchSingleFlight.ROLE_OWNER, followers=['follower-a', 'follower-b'])
+    use_flight(monkeypatch, flight)
+    worker.fail_follower = True  # one follower's own step failing must not fail the others
+
+    result = run(unified_worker._process_creator_search_async('owner-job'))
+
+    assert result == {'job': 'owner-job'}
+    assert ('complete', 'owner-job', 'profile-1') in flight.calls
+    pipeline_results = {'ai': {'completed': True}}
+    assert worker.finalized == [
+        ('owner-job', 'owner-user', 'profile-1', pipeline_results, None),
+        ('follower-b', 'user-b', 'profile-1', pipeline_results, None),
+    ]
+
+
+def test_joining_a_completed_flight_reuses_the_owner_result(monkeypatch, worker):
+    flight = FakeFlight(
+        CreatorSearchSingleFlight.ROLE_COMPLETED,
+        profile_id='profile-1', processing_results={'ai': 'from owner'},
+    )
+    use_flight(monkeypatch, flight)
+
+    run(unified_worker._process_creator_search_async('follower-a'))
+
+    assert worker.finalized == [('follower-a', 'user-a', 'profile-1', None, {'ai': 'from owner'})]
+
+
+def test_owner_failure_releases_followers_and_fails_the_owner(monkeypatch, worker):
+    flight = FakeFlight(CreatorSearchSingleFlight.ROLE_OWNER, followers=['follower-a'])
+    use_flight(monkeypatch, flight)
+    worker.pipeline_error = RuntimeError('CDN unavailable')
+
+    with pytest.raises(RuntimeError):
+        run(unified_worker._process_creator_search_async('owner-job'))
+
+    assert ('fail', 'owner-job', 'CDN unavailable') in flight.calls
+    assert not any(call[0] == 'complete' for call in flight.calls)
+    assert worker.finalized == []
+    job_id, status, kwargs = worker.statuses[-1]
+    assert (job_id, status) == ('owner-job', JobStatus.FAILED)
+    assert kwargs['error_details']['error'] == 'CDN unavailable'
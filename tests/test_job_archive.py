@@ -0,0 +1,100 @@
+"""
+WorkerDatabase.archive_finished_jobs against a real Postgres
+
+Runs only with TEST_DATABASE_URL set (scratch schema per test, see conftest).
+"""
+import uuid
+
+import pytest
+
+for module in ('asyncpg', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import requires_postgres, run, schema_pool, scratch_schema
+
+from app.workers.worker_database import WorkerDatabase
+
+pytestmark = requires_postgres
+
+JOB_QUEUE_TABLE = """
+    CREATE TABLE job_queue (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+        result JSONB,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        completed_at TIMESTAMPTZ,
+        not_archived_yet TEXT
+    )
+"""
+
+# As migration 020
+ARCHIVE_TABLE = (
+    "CREATE TABLE job_queue_archive (LIKE job_queue INCLUDING DEFAULTS)",
+    "ALTER TABLE job_queue_archive DROP COLUMN not_archived_yet",
+    "ALTER TABLE job_queue_archive ADD COLUMN archived_at TIMESTAMPTZ DEFAULT NOW()",
+    "CREATE UNIQUE INDEX idx_job_queue_archive_id ON job_queue_archive (id)",
+)
+
+
+async def add_job(conn, status, finished_hours_ago=None, result=None):
+    job_id = str(uuid.uuid4())
+    await conn.execute(
+        """
+        INSERT INTO job_queue (id, user_id, status, result, created_at, completed_at)
+        VALUES ($1::uuid, $2::uuid, $3, $4::jsonb, NOW() - INTERVAL '3 days',
+                NOW() - make_interval(secs => $5::float8))
+        """,
+        job_id, str(uuid.uuid4()), status, result,
+        None if finished_hours_ago is None else finished_hours_ago * 3600.0,
+    )
+    return job_id
+
+
+def with_archive(scenario):
+    async def main():
+        async with scratch_schema(JOB_QUEUE_TABLE, *ARCHIVE_TABLE) as (conn, schema):
+            db = WorkerDatabase()
+            db.pool = await schema_pool(schema)
+            try:
+                return await scenario(conn, db)
+            finally:
+                await db.pool.close()
+    return run(main())
+
+
+async def ids_in(conn, table):
+    return {str(row['id']) for row in await conn.fetch(f"SELECT id FROM {table}")}
+
+
+def test_old_finished_jobs_move_to_the_archive():
+    async def scenario(conn, db):
+        old = [await add_job(conn, status, finished_hours_ago=48) for status in ('completed', 'failed', 'cancelled')]
+        recent = await add_job(conn, 'completed', finished_hours_ago=1)
+        live = [await add_job(conn, 'queued'), await add_job(conn, 'processing')]
+
+        archived = await db.archive_finished_jobs(24)
+        return archived, old, recent, live, await ids_in(conn, 'job_queue'), await ids_in(conn, 'job_queue_archive')
+
+    archived, old, recent, live, queue, archive = with_archive(scenario)
+    assert archived == 3
+    assert archive == set(old)
+    assert queue == {recent, *live}
+
+
+def test_job_already_in_the_archive_is_not_lost():
+    async def scenario(conn, db):
+        job_id = await add_job(conn, 'completed', finished_hours_ago=48, result='{"run": 2}')
+        # An earlier copy of the same job, e.g. restored from the archive and re-run
+        await conn.execute(
+            "INSERT INTO job_queue_archive (id, user_id, status, result) VALUES ($1::uuid, $2::uuid, 'failed', '{\"run\": 1}')",
+            job_id, str(uuid.uuid4()),
+        )
+        archived = await db.archive_finished_jobs(24)
+        row = await conn.fetchrow("SELECT status, result FROM job_queue_archive WHERE id = $1::uuid", job_id)
+        return archived, await ids_in(conn, 'job_queue'), row
+
+    archived, queue, row = with_archive(scenario)
+    assert archived == 1
+    assert queue == set()
+    assert (row['status'], row['result']) == ('completed', '{"run": 2}')
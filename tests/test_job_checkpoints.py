@@ -0,0 +1,64 @@
+"""JobCheckpointService: stage decoding and large payloads checkpointed by reference"""
+import pytest
+
+for module in ('sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import run
+
+from app.services import job_checkpoint_service as checkpoint_module
+from app.services.job_checkpoint_service import JobCheckpointService
+from app.services.job_result_store import JobResultStore
+
+JOB_ID = '33333333-3333-3333-3333-333333333333'
+APIFY_PROFILE = {'username': 'creator', 'latestPosts': [{'caption': 'x' * 100} for _ in range(50)]}
+
+
+@pytest.fixture
+def checkpoints(monkeypatch, tmp_path):
+    """Service whose row writes are recorded and whose payloads go to a local store"""
+    store = JobResultStore()
+    store.backend = 'local'
+    store.local_dir = tmp_path
+    store.inline_max_bytes = 1024
+    monkeypatch.setattr(checkpoint_module, 'job_result_store', store)
+
+    service = JobCheckpointService()
+    service.saved = []
+
+    async def save(job_id, stage, data=None, drop_stage=None):
+        service.saved.append((job_id, stage, data, drop_stage))
+
+    monkeypatch.setattr(service, 'save', save)
+    return service
+
+
+def test_large_payload_is_checkpointed_by_reference(checkpoints):
+    data = run(checkpoints.save_payload(JOB_ID, JobCheckpointService.STAGE_APIFY, APIFY_PROFILE))
+
+    assert set(data) == {'payload_ref', 'payload_size'}
+    assert checkpoints.saved == [(JOB_ID, 'apify', data, None)]
+    assert run(checkpoints.load_payload(data)) == APIFY_PROFILE
+
+
+def test_small_payload_is_checkpointed_inline(checkpoints):
+    data = run(checkpoints.save_payload(JOB_ID, JobCheckpointService.STAGE_APIFY, {'username': 'creator'}))
+
+    assert data == {'payload': {'username': 'creator'}}
+    assert run(checkpoints.load_payload(data)) == {'username': 'creator'}
+
+
+def test_dropped_or_missing_payload_means_no_checkpoint(checkpoints):
+    data = run(checkpoints.save_payload(JOB_ID, JobCheckpointService.STAGE_APIFY, APIFY_PROFILE))
+    run(checkpoints.drop_payload(data))
+
+    # A retry then re-runs the stage instead of failing
+    assert run(checkpoints.load_payload(data)) is None
+    assert run(checkpoints.load_payload(None)) is None
+
+
+def test_stages_decode_from_the_row():
+    row = '{"store": {"data": {"profile_id": "p-1"}, "completed_at": "2026-10-16T12:00:00+00:00"}, "cdn": {}}'
+
+    assert JobCheckpointService._stages(row) == {'store': {'profile_id': 'p-1'}, 'cdn': {}}
+    assert JobCheckpointService._stages(None) == {}
@@ -0,0 +1,110 @@
+"""
+Job dependencies against a real Postgres: WorkerDatabase.wait_for_jobs and
+the release_dependent_jobs trigger as _initialize_job_schema creates it
+
+Runs only with TEST_DATABASE_URL set (scratch schema per test, see conftest).
+"""
+import asyncio
+import json
+import uuid
+
+import pytest
+
+for module in ('asyncpg', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import requires_postgres, run, schema_pool, scratch_schema
+
+from app.core.job_queue import JOB_NOTIFY_CHANNEL, RELEASE_DEPENDENTS_SQL
+from app.workers.worker_database import WorkerDatabase
+
+pytestmark = requires_postgres
+
+JOB_QUEUE_TABLE = """
+    CREATE TABLE job_queue (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL,
+        job_type VARCHAR(50) NOT NULL DEFAULT 'creator_search',
+        queue_name VARCHAR(50) NOT NULL DEFAULT 'api_queue',
+        status VARCHAR(20) NOT NULL DEFAULT 'queued',
+        depends_on UUID[],
+        started_at TIMESTAMPTZ,
+        worker_id TEXT,
+        lease_expires_at TIMESTAMPTZ,
+        progress_message TEXT,
+        updated_at TIMESTAMPTZ
+    )
+"""
+
+
+class Jobs:
+    def __init__(self, conn, db):
+        self.conn = conn
+        self.db = db
+
+    async def add(self, status='processing'):
+        job_id = str(uuid.uuid4())
+        await self.conn.execute(
+            "INSERT INTO job_queue (id, user_id, status) VALUES ($1::uuid, $2::uuid, $3)",
+            job_id, str(uuid.uuid4()), status,
+        )
+        return job_id
+
+    async def set_status(self, job_id, status):
+        await self.conn.execute("UPDATE job_queue SET status = $2 WHERE id = $1::uuid", job_id, status)
+
+    async def status(self, job_id):
+        return await self.conn.fetchval("SELECT status FROM job_queue WHERE id = $1::uuid", job_id)
+
+
+def with_jobs(scenario):
+    async def main():
+        # Twice: the schema init runs on every start
+        async with scratch_schema(JOB_QUEUE_TABLE, RELEASE_DEPENDENTS_SQL, RELEASE_DEPENDENTS_SQL) as (conn, schema):
+            db = WorkerDatabase()
+            db.pool = await schema_pool(schema)
+            try:
+                return await scenario(Jobs(conn, db))
+            finally:
+                await db.pool.close()
+    return run(main())
+
+
+def test_waiting_job_is_released_by_its_last_dependency():
+    async def scenario(jobs):
+        first, second = await jobs.add(), await jobs.add()
+        parent = await jobs.add()
+        parked = await jobs.db.wait_for_jobs(parent, [first, second], 'Waiting for dependencies')
+
+        await jobs.set_status(first, 'completed')
+        after_first = await jobs.status(parent)
+        await jobs.set_status(second, 'failed')
+        return parked, after_first, await jobs.status(parent)
+
+    assert with_jobs(scenario) == ('waiting', 'waiting', 'queued')
+
+
+def test_release_wakes_workers():
+    async def scenario(jobs):
+        dependency, parent = await jobs.add(), await jobs.add()
+        await jobs.db.wait_for_jobs(parent, [dependency], 'Waiting for dependencies')
+
+        notified = asyncio.get_running_loop().create_future()
+        await jobs.conn.add_listener(
+            JOB_NOTIFY_CHANNEL, lambda *args: notified.done() or notified.set_result(json.loads(args[-1]))
+        )
+        await jobs.set_status(dependency, 'cancelled')
+        return parent, await asyncio.wait_for(notified, 5)
+
+    parent, payload = with_jobs(scenario)
+    assert payload == {'job_id': parent, 'job_type': 'creator_search', 'queue_name': 'api_queue'}
+
+
+def test_finished_dependencies_do_not_park_the_job():
+    async def scenario(jobs):
+        done = await jobs.add('completed')
+        parent = await jobs.add()
+        missing = str(uuid.uuid4())
+        return await jobs.db.wait_for_jobs(parent, [done, missing], 'Waiting for dependencies')
+
+    assert with_jobs(scenario) == 'queued'
@@ -0,0 +1,141 @@
+"""JobProcessor.update_job_status and the write-behind JobProgressChannel"""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+for module in ('celery', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import run
+
+from app.core.job_queue import JobStatus
+from app.database.optimized_pools import optimized_pools
+from app.services import job_progress_channel as progress_module
+from app.services.job_progress_channel import FLUSH_INTERVAL_SECONDS, TRACKED_JOB_TTL_SECONDS, JobProgressChannel
+from app.workers.unified_worker import JobProcessor
+
+JOB_ID = '11111111-1111-1111-1111-111111111111'
+TERMINAL = ('completed', 'failed', 'cancelled')
+
+
+class FakeJobQueue:
+    """
+    job_queue rows as {job_id: status}. Understands the two statements in play:
+    the progress flush (WHERE status = 'processing') and update_job_status's
+    UPDATE (status guarded against terminal rows for PROCESSING writes).
+    """
+
+    def __init__(self, **statuses):
+        self.status = dict(statuses)
+        self.writes = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        job_id = params['job_id']
+        if "AND status = 'processing'" in sql:
+            hit = self.status.get(job_id) == 'processing'
+            self.writes.append(('progress', params, hit))
+        else:
+            guarded = "NOT IN ('completed', 'failed', 'cancelled')" in sql
+            hit = not (guarded and self.status.get(job_id) in TERMINAL)
+            if hit:
+                self.status[job_id] = params['status']
+            self.writes.append(('status', params, hit))
+        return SimpleNamespace(rowcount=int(hit))
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    queue = FakeJobQueue(**{JOB_ID: 'queued'})
+
+    @asynccontextmanager
+    async def session():
+        yield queue
+
+    monkeypatch.setattr(optimized_pools, 'get_background_session', session)
+    return queue
+
+
+@pytest.fixture
+def channel(monkeypatch):
+    channel = JobProgressChannel()
+    monkeypatch.setattr(channel, '_get_client', lambda: None)  # no Redis: only the row
+    monkeypatch.setattr(progress_module, 'job_progress_channel', channel)
+    return channel
+
+
+def progress(job_id, percent):
+    return JobProcessor().update_job_status(
+        job_id, JobStatus.PROCESSING, progress_percent=percent, progress_message=f"{percent}%"
+    )
+
+
+def age_last_flush(channel, job_id, seconds):
+    channel._last_flush[job_id] -= seconds
+
+
+def test_first_progress_update_marks_the_job_started(jobs, channel):
+    run(progress(JOB_ID, 10))
+
+    assert jobs.status[JOB_ID] == 'processing'
+    ((kind, params, hit),) = jobs.writes
+    assert (kind, hit) == ('status', True)
+    assert params['started_at'] is not None and params['progress_percent'] == 10
+    assert channel.is_tracking(JOB_ID)
+
+
+def test_later_ticks_are_buffered_then_flushed(jobs, channel):
+    run(progress(JOB_ID, 10))
+    run(progress(JOB_ID, 20))
+    assert len(jobs.writes) == 1
+
+    age_last_flush(channel, JOB_ID, FLUSH_INTERVAL_SECONDS)
+    run(progress(JOB_ID, 30))
+
+    kind, params, hit = jobs.writes[-1]
+    assert (kind, params['progress_percent'], hit) == ('progress', 30, True)
+    assert jobs.status[JOB_ID] == 'processing'
+
+
+def test_progress_never_reopens_a_cancelled_job(jobs, channel):
+    jobs.status[JOB_ID] = 'cancelled'
+
+    run(progress(JOB_ID, 50))
+
+    assert jobs.status[JOB_ID] == 'cancelled'
+    assert not channel.is_tracking(JOB_ID)
+
+
+def test_job_finished_by_another_process_is_forgotten(jobs, channel):
+    run(progress(JOB_ID, 10))
+    jobs.status[JOB_ID] = 'completed'  # e.g. the async worker's own completion write
+
+    age_last_flush(channel, JOB_ID, FLUSH_INTERVAL_SECONDS)
+    run(progress(JOB_ID, 90))
+
+    assert jobs.writes[-1][0] == 'progress' and jobs.writes[-1][2] is False
+    assert not channel.is_tracking(JOB_ID)
+    assert jobs.status[JOB_ID] == 'completed'
+
+
+def test_terminal_status_stops_tracking(jobs, channel):
+    run(progress(JOB_ID, 10))
+    run(JobProcessor().update_job_status(JOB_ID, JobStatus.COMPLETED, result={'ok': True}))
+
+    assert jobs.status[JOB_ID] == 'completed'
+    assert not channel.is_tracking(JOB_ID)
+
+
+def test_silent_jobs_are_pruned(jobs, channel):
+    channel.started('silent-job')
+    age_last_flush(channel, 'silent-job', TRACKED_JOB_TTL_SECONDS + 1)
+
+    run(progress(JOB_ID, 10))
+    run(progress(JOB_ID, 20))
+
+    assert not channel.is_tracking('silent-job')
+    assert channel.is_tracking(JOB_ID)
@@ -0,0 +1,74 @@
+"""JobResultStore (local backend): when results are offloaded, and reading them back"""
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip('pydantic_settings')
+
+from conftest import run
+
+from app.services.job_result_store import JobResultStore
+
+JOB_ID = '22222222-2222-2222-2222-222222222222'
+LARGE = {'posts': [{'caption': 'x' * 100, 'n': n} for n in range(50)]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobResultStore()
+    store.backend = 'local'
+    store.local_dir = tmp_path
+    store.inline_max_bytes = 1024
+    return store
+
+
+def test_small_result_stays_inline(store):
+    inline, ref, size = run(store.store(JOB_ID, {'ok': True}))
+
+    assert (json.loads(inline), ref) == ({'ok': True}, None)
+    assert size == len(inline)
+
+
+def test_large_result_is_offloaded_and_read_back(store, tmp_path):
+    inline, ref, size = run(store.store(JOB_ID, LARGE))
+
+    assert inline is None
+    assert ref == f"file://{tmp_path}/job-results/{JOB_ID}.json.gz"
+    assert size == len(json.dumps(LARGE))
+    assert run(store.load(ref)) == LARGE
+    assert run(store.resolve(None, ref)) == LARGE
+
+
+def test_stream_yields_the_result_or_its_gzip_bytes(store):
+    _, ref, _ = run(store.store(JOB_ID, LARGE))
+
+    async def collect(decompress):
+        return b''.join([chunk async for chunk in store.stream(ref, decompress=decompress)])
+
+    assert json.loads(run(collect(True))) == LARGE
+    assert json.loads(gzip.decompress(run(collect(False)))) == LARGE
+
+
+def test_offloading_off_keeps_everything_inline(store):
+    store.backend = 'off'
+
+    inline, ref, _ = run(store.store(JOB_ID, LARGE))
+
+    assert ref is None and json.loads(inline) == LARGE
+
+
+def test_inline_results_resolve_from_the_row(store):
+    assert run(store.resolve({'ok': True}, None)) == {'ok': True}
+    assert run(store.resolve('{"ok": true}', None)) == {'ok': True}
+    assert run(store.resolve(None, None)) is None
+
+
+def test_delete_removes_the_stored_object(store):
+    _, ref, _ = run(store.store(JOB_ID, LARGE))
+
+    run(store.delete(ref))
+    run(store.delete(ref))  # already gone: logged, not raised
+
+    with pytest.raises(FileNotFoundError):
+        run(store.load(ref))
@@ -0,0 +1,114 @@
+"""RawScrapeCache (local backend) and the Apify client reading through it"""
+import gzip
+import json
+import time
+
+import pytest
+
+pytest.importorskip('pydantic_settings')
+
+from conftest import run
+
+from app.services.raw_scrape_cache import RawScrapeCache
+
+ACTOR = 'apify/instagram-scraper'
+
+
+def profile_input(username, **extra):
+    return {'directUrls': [f"https://www.instagram.com/{username}/"], 'resultsType': 'details', **extra}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = RawScrapeCache()
+    cache.backend = 'local'
+    cache.local_dir = tmp_path
+    cache.ttl_seconds = 3600
+    cache.default_max_age_minutes = 30
+    return cache
+
+
+def test_key_is_content_addressed(cache):
+    key = cache.key(ACTOR, profile_input('Some.Creator'))
+    assert key.startswith('scrape-cache/apify~instagram-scraper/some.creator/')
+    # Same input in another key order -> same entry; any other input -> another one
+    reordered = dict(reversed(list(profile_input('Some.Creator').items())))
+    assert cache.key(ACTOR, reordered) == key
+    assert cache.key(ACTOR, profile_input('Some.Creator', resultsLimit=12)) != key
+    assert cache.subject({'directUrls': ['https://www.instagram.com/p/Cabc123/']}) == 'cabc123'
+    assert cache.subject({'directUrls': ['a', 'b']}) == 'multi'
+
+
+def test_round_trip_and_max_age(cache):
+    items = [{'username': 'creator', 'followersCount': 10}]
+
+    async def scenario():
+        await cache.put(ACTOR, profile_input('creator'), items)
+        return (
+            await cache.get(ACTOR, profile_input('creator')),
+            await cache.get(ACTOR, profile_input('creator'), max_age_minutes=0),
+            await cache.get(ACTOR, profile_input('other')),
+        )
+
+    hit, bypassed, miss = run(scenario())
+
+    assert hit['items'] == items
+    assert hit['age_seconds'] < 60
+    assert bypassed is None
+    assert miss is None
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1 and cache.stats['writes'] == 1
+
+
+def test_entries_older_than_max_age_are_stale(cache):
+    key = cache.key(ACTOR, profile_input('creator'))
+    entry = {'fetched_at': time.time() - 45 * 60, 'items': [{'username': 'creator'}]}
+
+    async def scenario():
+        await cache._write(key, gzip.compress(json.dumps(entry).encode()))
+        return (
+            await cache.get(ACTOR, profile_input('creator')),
+            await cache.get(ACTOR, profile_input('creator'), max_age_minutes=60),
+        )
+
+    default_age, hour = run(scenario())
+
+    assert default_age is None
+    assert cache.stats['stale'] == 1
+    assert hour['items'] == entry['items']
+
+
+def test_off_backend_never_stores(tmp_path):
+    cache = RawScrapeCache()
+    cache.backend = 'off'
+    cache.local_dir = tmp_path
+
+    async def scenario():
+        await cache.put(ACTOR, profile_input('creator'), [{'username': 'creator'}])
+        return await cache.get(ACTOR, profile_input('creator'))
+
+    assert run(scenario()) is None
+    assert not any(tmp_path.iterdir())
+
+
+def test_client_serves_repeat_scrapes_from_cache(fake_apify, apify_runs, monkeypatch, tmp_path):
+    pytest.importorskip('sqlalchemy')
+    from app.scrapers.apify_instagram_client import ApifyInstagramClient
+    from app.services.raw_scrape_cache import raw_scrape_cache
+
+    monkeypatch.setattr(raw_scrape_cache, 'backend', 'local')
+    monkeypatch.setattr(raw_scrape_cache, 'local_dir', tmp_path)
+    monkeypatch.setattr(raw_scrape_cache, 'ttl_seconds', 3600)
+    monkeypatch.setattr(raw_scrape_cache, 'default_max_age_minutes', 30)
+
+    async def scenario():
+        async with ApifyInstagramClient('test') as client:
+            first = await client.get_instagram_profile_comprehensive('fake_cached_one')
+            cached = await client.get_instagram_profile_comprehensive('fake_cached_one')
+            forced = await client.get_instagram_profile_comprehensive('fake_cached_one', max_age_minutes=0)
+            return first, cached, forced
+
+    first, cached, forced = run(scenario())
+
+    assert first == cached == forced
+    # The first scrape and the forced one ran; the repeat came from the cache
+    assert len(apify_runs) == 2
@@ -0,0 +1,37 @@
+"""Retry backoff of the unified async worker (RETRY_POLICIES)"""
+import pytest
+
+for module in ('asyncpg', 'redis', 'sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from app.workers import unified_async_worker
+from app.workers.unified_async_worker import (
+    DEFAULT_RETRY_POLICY,
+    RETRY_POLICIES,
+    retry_delay_seconds,
+    retry_policy,
+)
+
+
+def test_unknown_job_types_get_the_default_policy():
+    assert retry_policy('no_such_job_type') == DEFAULT_RETRY_POLICY
+    assert retry_policy('creator_search') == RETRY_POLICIES['creator_search']
+
+
+@pytest.mark.parametrize('job_type', sorted(RETRY_POLICIES) + ['no_such_job_type'])
+def test_delay_is_equal_jitter_within_the_capped_window(job_type):
+    policy = retry_policy(job_type)
+    for retry_count in range(8):
+        window = min(policy['max_delay'], policy['base_delay'] * 2 ** retry_count)
+        for _ in range(50):
+            assert window / 2 <= retry_delay_seconds(job_type, retry_count) <= window
+
+
+def test_delay_doubles_until_the_cap(monkeypatch):
+    # Jitter pinned to its maximum: the delay is the whole window
+    monkeypatch.setattr(unified_async_worker.random, 'uniform', lambda low, high: high)
+    delays = [retry_delay_seconds('creator_search', n) for n in range(7)]
+    assert delays == [30, 60, 120, 240, 480, 900, 900]
+
+    monkeypatch.setattr(unified_async_worker.random, 'uniform', lambda low, high: low)
+    assert retry_delay_seconds('creator_search', 2) == 60
@@ -0,0 +1,118 @@
+"""Scrape replay corpus, transports and benchmark report helpers (scripts/replay_corpus)"""
+import json
+
+import pytest
+
+pytest.importorskip('httpx')
+pytest.importorskip('pydantic_settings')
+
+from conftest import REPLAY_CORPUS, run
+
+from app.scrapers import scrape_replay
+from app.scrapers.scrape_replay import (
+    ScrapeReplayCorpus,
+    rename_profile_item,
+    replay_image_url,
+)
+
+
+@pytest.fixture
+def corpus():
+    return ScrapeReplayCorpus(REPLAY_CORPUS)
+
+
+@pytest.fixture
+def replay_on(monkeypatch, tmp_path):
+    """SCRAPE_REPLAY_DIR pointed at the checked-in corpus, uploads under tmp_path"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, 'SCRAPE_REPLAY_DIR', str(REPLAY_CORPUS))
+    monkeypatch.setattr(settings, 'SCRAPE_REPLAY_RUN_SECONDS', 0.2)
+    monkeypatch.setattr(settings, 'SCRAPE_REPLAY_UPLOAD_DIR', str(tmp_path))
+    monkeypatch.setattr(scrape_replay, '_corpus', None)
+    return tmp_path
+
+
+def profile_url(username):
+    return f"https://www.instagram.com/{username}/"
+
+
+def test_recorded_profiles_replay_as_recorded(corpus):
+    recorded = json.loads((REPLAY_CORPUS / 'apify' / 'creator_alpha.json').read_text())
+    assert corpus.items_for_url(profile_url('creator_alpha')) == recorded
+    assert corpus.items_for_url(profile_url('missing_creator'))[0]['error'] == 'not_found'
+    assert corpus.items_for_url(profile_url('missing_never_recorded'))[0]['error'] == 'not_found'
+
+
+def test_synthetic_creators_are_distinct_and_deterministic(corpus):
+    one = corpus.items_for_url(profile_url('replay_test_1'))[0]
+    again = corpus.items_for_url(profile_url('replay_test_1'))[0]
+    two = corpus.items_for_url(profile_url('replay_test_2'))[0]
+
+    assert one == again
+    assert one['username'] == 'replay_test_1' and two['username'] == 'replay_test_2'
+    assert one['id'] != two['id']
+    shortcodes = {post['shortCode'] for post in one['latestPosts']}
+    assert len(shortcodes) == len(one['latestPosts'])
+    assert not shortcodes & {post['shortCode'] for post in two['latestPosts']}
+    assert all(post['ownerUsername'] == 'replay_test_1' for post in one['latestPosts'])
+    assert corpus.stats['synthetic_profiles'] == 3
+
+
+def test_rename_leaves_no_trace_of_the_recorded_handle(corpus):
+    template = corpus.profiles['creator_bravo'][0]
+    renamed = rename_profile_item(template, 'someone_else', corpus.image_names)
+
+    assert 'creator_bravo' not in json.dumps(renamed)
+    assert renamed['profilePicUrl'].startswith(replay_image_url(''))
+    assert len(renamed['latestPosts']) == len(template['latestPosts'])
+    # The template itself is untouched
+    assert template['username'] == 'creator_bravo'
+
+
+def test_images_come_from_the_corpus(corpus):
+    data, content_type = corpus.image_for_url(replay_image_url('img_03.png'))
+    assert data == (REPLAY_CORPUS / 'images' / 'img_03.png').read_bytes()
+    assert content_type == 'image/png'
+    # Any other URL gets a corpus image picked by its hash, always the same one
+    assert corpus.image_for_url('https://cdn.example/a.jpg') == corpus.image_for_url('https://cdn.example/a.jpg')
+
+
+def test_client_scrapes_through_the_replay_transport(replay_on, apify_runs):
+    from app.scrapers.apify_instagram_client import ApifyInstagramClient, ApifyProfileNotFoundError
+
+    async def scenario():
+        async with ApifyInstagramClient('test') as client:
+            single = await client.get_instagram_profile_comprehensive('replay_client_one')
+            batch = await client.get_instagram_profiles_batch(['creator_alpha', 'replay_client_two', 'missing_creator'])
+            return single, batch
+
+    single, batch = run(scenario())
+
+    assert single['results'][0]['content']['data']['username'] == 'replay_client_one'
+    assert batch['creator_alpha']['results'][0]['content']['data']['username'] == 'creator_alpha'
+    assert batch['replay_client_two']['results'][0]['content']['data']['posts']
+    assert isinstance(batch['missing_creator'], ApifyProfileNotFoundError)
+    assert [cost for _, _, cost in apify_runs] == [1, 3]
+
+
+def test_uploads_are_written_locally(replay_on):
+    assert scrape_replay.replay_upload('thumbnails/p/1.webp', b'webp') is True
+    assert (replay_on / 'thumbnails' / 'p' / '1.webp').read_bytes() == b'webp'
+
+
+def test_benchmark_baseline_comparison():
+    pytest.importorskip('dotenv')
+    import replay_creator_search as bench
+
+    assert bench.percentile([], 95) == 0.0
+    assert bench.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+    assert bench.percentile([float(n) for n in range(1, 101)], 95) == 95.0
+
+    baseline = {'latency_p95': 10.0, 'throughput_per_min': 60.0, 'failed': 0}
+    steady = {'latency_p95': 11.0, 'throughput_per_min': 55.0, 'failed': 0}
+    slower = {'latency_p95': 13.0, 'throughput_per_min': 60.0, 'failed': 0}
+    failing = {'latency_p95': 10.0, 'throughput_per_min': 60.0, 'failed': 1}
+    assert bench.compare_with_baseline(steady, baseline, 0.2)
+    assert not bench.compare_with_baseline(slower, baseline, 0.2)
+    assert not bench.compare_with_baseline(failing, baseline, 0.2)
@@ -0,0 +1,153 @@
+"""ComprehensiveDataService.store_profile_delta post diffing"""
+import uuid
+from collections import namedtuple
+
+import pytest
+
+for module in ('sqlalchemy', 'pydantic_settings', 'dotenv'):
+    pytest.importorskip(module)
+
+from conftest import run
+
+from app.database.comprehensive_service import ComprehensiveDataService
+from app.services.engagement_rate_service import EngagementRateService
+
+StoredPost = namedtuple('StoredPost', 'shortcode profile_id')
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeSession:
+    """
+    Records the statements store_profile_delta sends. The stored-post lookup
+    (the only ORM select it makes) answers from `stored`: shortcode -> owner.
+    """
+
+    def __init__(self, stored=None):
+        self.stored = stored or {}
+        self.statements = []
+        self.added = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params))
+        if sql.lstrip().upper().startswith('SELECT'):
+            return FakeResult([StoredPost(code, owner) for code, owner in self.stored.items()])
+        return FakeResult([])
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        for obj in self.added:
+            if obj.id is None:
+                obj.id = uuid.uuid4()
+
+    async def commit(self):
+        self.commits += 1
+
+    def params_of(self, prefix):
+        return [params for sql, params in self.statements if sql.strip().startswith(prefix)]
+
+
+def scraped_profile(posts, followers=10_000):
+    """Apify-format profile as returned by ApifyInstagramClient"""
+    return {'results': [{'content': {'data': {
+        'username': 'creator',
+        'followers_count': followers,
+        'following_count': '321',
+        'posts_count': 42.0,
+        'posts': posts,
+    }}}]}
+
+
+def post(shortcode, likes=100, comments=10):
+    return {
+        'shortcode': shortcode,
+        'caption': f"Post {shortcode} #delta",
+        'likes_count': likes,
+        'comments_count': comments,
+        'display_url': f"https://cdn.example/{shortcode}.jpg",
+        'video_url': '',
+        'taken_at_timestamp': 1_760_000_000,
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = ComprehensiveDataService()
+    service.deleted = []
+
+    async def delete_outside_batch(db, profile_id, batch_shortcodes):
+        service.deleted.append((profile_id, sorted(batch_shortcodes)))
+        return 1
+
+    async def update_engagement(db, profile_id):
+        service.engagement_updated = profile_id
+        return True
+
+    monkeypatch.setattr(service, '_delete_posts_outside_batch', delete_outside_batch)
+    monkeypatch.setattr(EngagementRateService, 'update_profile_engagement_rate', staticmethod(update_engagement))
+    return service
+
+
+def test_known_posts_are_updated_new_ones_inserted(service):
+    profile_id = uuid.uuid4()
+    other_profile = uuid.uuid4()
+    db = FakeSession(stored={'KNOWN1': profile_id, 'KNOWN2': profile_id, 'OTHERS': other_profile})
+    raw = scraped_profile([
+        post('KNOWN1', likes=500, comments=50),
+        post('NEW1'),
+        post('KNOWN2', likes=700),
+        post('OTHERS'),
+        post('NEW2'),
+        post('KNOWN1', likes=1),  # duplicate in the scrape - first one wins
+    ])
+
+    result = run(service.store_profile_delta(db, profile_id, raw))
+
+    assert result['updated_posts'] == 2
+    assert result['removed_posts'] == 1
+    assert sorted(p['instagram_post_id'] for p in result['new_posts']) == ['shortcode_NEW1', 'shortcode_NEW2']
+    assert all(p['id'] != 'None' for p in result['new_posts'])
+
+    # Known posts: one UPDATE carrying only their counters
+    (counters,) = db.params_of('UPDATE posts')
+    updated = dict(zip(counters['shortcodes'], zip(counters['likes'], counters['comments'])))
+    assert updated == {'KNOWN1': (500, 50), 'KNOWN2': (700, 10)}
+    assert all(rate > 0 for rate in counters['rates'])
+
+    # New posts only - a post stored under another profile is left alone
+    assert sorted(p.shortcode for p in db.added) == ['NEW1', 'NEW2']
+    assert all(p.profile_id == profile_id for p in db.added)
+
+    (profile_update,) = db.params_of('UPDATE profiles')
+    assert (profile_update['followers_count'], profile_update['following_count'], profile_update['posts_count']) == (10_000, 321, 42)
+
+    assert service.deleted == [(profile_id, ['KNOWN1', 'KNOWN2', 'NEW1', 'NEW2', 'OTHERS'])]
+    assert db.commits == 1
+    assert service.engagement_updated == str(profile_id)
+
+
+def test_profile_without_posts_only_updates_counters(service):
+    profile_id = uuid.uuid4()
+    db = FakeSession()
+
+    result = run(service.store_profile_delta(db, str(profile_id), scraped_profile([])))
+
+    assert result == {'new_posts': [], 'updated_posts': 0, 'removed_posts': 0}
+    assert [sql.strip().split()[:2] for sql, _ in db.statements] == [['UPDATE', 'profiles']]
+    assert service.deleted == []
+    assert db.commits == 1
+
+
+def test_scrape_without_user_data_is_rejected(service):
+    with pytest.raises(ValueError):
+        run(service.store_profile_delta(FakeSession(), uuid.uuid4(), {'results': []}))